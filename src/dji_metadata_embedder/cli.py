@@ -14,6 +14,8 @@ from typing import Any
 
 from . import __version__
 from .embedder import DJIMetadataEmbedder, run_doctor
+from .utils.cache import TelemetryCache, use_cache
+from .utils.exiftool import pooled_exiftool
 from .utils.provision import EXIFTOOL_VERSION, provision_exiftool
 from .metadata_check import check_metadata, media_files_in
 from .telemetry_converter import (
@@ -38,10 +40,12 @@ from .geo import (
     write_flights_geojson,
     write_flights_html,
     write_flights_3d_html,
+    write_flight_tiles,
     write_flights_kml,
     write_mixed_html,
     write_photos_geojson,
     parse_popup_fields,
+    parse_thumb_dir,
     write_photos_html,
     write_photos_kml,
 )
@@ -54,6 +58,12 @@ from .geo.panoedit import (
 )
 from .geo.airspace.overlay import zones_to_overlay_json
 from .geo.flightlog import FlightLogError, merge_into_flights, parse_flight_log
+from .geo.flightmap_manifest import (
+    FlightManifest,
+    manifest_path,
+    options_digest,
+    scan_key,
+)
 from .geo.logfetch import LogFetchError, cache_path, fetch_log
 from .geo.media import resolve_media
 from .geo.record import build_records
@@ -259,6 +269,65 @@ _progress_option = click.option(
     "stdout; warnings and logs still go to stderr.",
 )
 
+# Shared by the telemetry readers (flightmap/map/convert/verify-sun) and the
+# photo scans (photomap/map). Opt-in: without it nothing is written outside
+# the output paths. See utils/cache.py and geo/photomap._scan_cached.
+_cache_option = click.option(
+    "--cache",
+    "use_telemetry_cache",
+    is_flag=True,
+    help="Reuse parsed telemetry and photo metadata from the per-user cache "
+    "while a source file is unchanged (size + mtime), and store new results "
+    "there. "
+    "Manage it with 'dji-embed cache'.",
+)
+
+
+# Shared by the SRT folder scanners (flightmap/map). Parsing dominates a
+# large archive and each file is independent; see geo/flightmap.scan_flights.
+_scan_jobs_option = click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    metavar="N",
+    help="Parse the .SRT files in N worker processes. The map, warnings "
+    "and progress events are the same for any N.",
+)
+
+
+# Shared by the track writers (flightmap/map/convert). See
+# geo/geometry.simplify_indices.
+_simplify_option = click.option(
+    "--simplify",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    metavar="METRES",
+    help="Draw each track with as few points as keep it within METRES of "
+    "the recorded path (horizontally and in altitude), instead of one "
+    "point per second: hovers collapse to a few points, turns keep their "
+    "detail.",
+)
+
+# Shared by the flat HTML maps (flightmap/map). See geo/flightmap_split.py.
+_split_data_option = click.option(
+    "--split-data",
+    is_flag=True,
+    help="Embed only an index of the flights in the HTML map and write each "
+    "flight's points to its own file in NAME-data/ beside it; the map loads "
+    "a flight when it comes into view or is played. Browsers block those "
+    "loads on maps opened from disk: open the map with 'dji-embed serve'.",
+)
+
+
+def _cache_summary(cache: TelemetryCache | None) -> dict[str, int]:
+    """``cache_hits``/``cache_misses`` for a JSONL result summary (--cache only)."""
+    if cache is None:
+        return {}
+    return {"cache_hits": cache.hits, "cache_misses": cache.misses}
+
+
 # Shared by photomap and flightmap (#311). Keyless OpenStreetMap-data styles
 # only; the choice affects the HTML basemap, other formats carry no basemap.
 _tile_style_option = click.option(
@@ -311,6 +380,31 @@ _tile_style_option = click.option(
     help="Opt-in: extract the HOME/launch point (operator location) into the "
     "JSON sidecar. Never written to the MP4. Subject to --redact.",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    metavar="N",
+    help="Embed N clips at a time. Results and warnings are reported in "
+    "file order regardless of N.",
+)
+@click.option(
+    "--device-jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    metavar="N",
+    help="With --jobs, run at most N muxes at a time against any one disk "
+    "or card. Default: 1 for a device whose read probe is slow (SD card, "
+    "hard disk), otherwise --jobs.",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Re-embed every clip. By default a clip whose output the last run "
+    "finished, from the same inputs and options, is skipped as up to date.",
+)
 @_progress_option
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output")
 @click.option("-q", "--quiet", is_flag=True, help="Suppress progress output")
@@ -325,6 +419,9 @@ def embed(
     redact: str,
     container: str,
     extract_home: bool,
+    jobs: int,
+    device_jobs: int | None,
+    force: bool,
     progress_mode: str | None,
     verbose: bool,
     quiet: bool,
@@ -351,11 +448,28 @@ def embed(
             container=container.lower(),
             extract_home=extract_home,
             audio_sidecar=audio_sidecar,
+            jobs=jobs,
+            device_jobs=device_jobs,
+            force=force,
+            on_clip_progress=(
+                (
+                    lambda name, update: progress.item_progress(
+                        name,
+                        fraction=update.fraction,
+                        bytes=update.total_size,
+                        bytes_per_s=update.bytes_per_s,
+                        eta_s=update.eta_s,
+                    )
+                )
+                if progress.active
+                else None
+            ),
         )
-        result = embedder.process_directory(
-            use_exiftool=exiftool,
-            on_progress=progress.advance if progress.active else None,
-        )
+        with pooled_exiftool(jobs):
+            result = embedder.process_directory(
+                use_exiftool=exiftool,
+                on_progress=progress.advance if progress.active else None,
+            )
         if progress.active:
             for message in result["warnings"] + result["errors"]:
                 progress.warning(message)
@@ -372,6 +486,16 @@ def embed(
                     "warnings": len(result["warnings"]),
                     "errors": len(result["errors"]),
                     "output_directory": out_dir,
+                    # Clips skipped because the journal shows their output
+                    # is current; not counted in "processed".
+                    **(
+                        {"up_to_date": result["up_to_date"]}
+                        if "up_to_date" in result
+                        else {}
+                    ),
+                    # Per-stage timings: which of probe/parse, mux and
+                    # validate/JSON is the bottleneck on this machine.
+                    **({"stages": result["stages"]} if "stages" in result else {}),
                 },
             )
 
@@ -430,14 +554,15 @@ def check(
             if not progress.active:
                 click.echo(f"{directory}: not found or unreadable")
         files: dict[str, dict] = {}
-        for index, target in enumerate(targets, start=1):
-            progress.advance(index, len(targets), item=target)
-            result = check_metadata(target)
-            files[target] = result
-            if not result:
-                progress.warning("Not found or unreadable", item=target)
-            if not progress.active:
-                click.echo(f"{target}: {result}")
+        with pooled_exiftool():
+            for index, target in enumerate(targets, start=1):
+                progress.advance(index, len(targets), item=target)
+                result = check_metadata(target)
+                files[target] = result
+                if not result:
+                    progress.warning("Not found or unreadable", item=target)
+                if not progress.active:
+                    click.echo(f"{target}: {result}")
         progress.result(
             ok=True,
             outputs=[],
@@ -503,6 +628,8 @@ def check(
     help="Opt-in: extract the HOME/launch point (operator location) into "
     "gpx/csv/geojson output. Subject to --redact.",
 )
+@_simplify_option
+@_cache_option
 @_progress_option
 @click.option("-v", "--verbose", is_flag=True)
 @click.option("-q", "--quiet", is_flag=True)
@@ -519,6 +646,8 @@ def convert(
     footprint_interval: float,
     model: str | None,
     extract_home: bool,
+    simplify: float | None,
+    use_telemetry_cache: bool,
     progress_mode: str | None,
     verbose: bool,
     quiet: bool,
@@ -542,6 +671,10 @@ def convert(
 
         if batch and not src.is_dir():
             raise click.ClickException("--batch requires a directory input")
+        if simplify is not None and command not in ("geojson", "kml", "html"):
+            raise click.UsageError(
+                "--simplify applies to the geojson, kml and html formats"
+            )
 
         # -o pointing at an existing directory means "write <stem>.<ext> in
         # there", matching embed -o semantics (#257).
@@ -549,7 +682,9 @@ def convert(
             suffix = ".cot.xml" if command == "cot" else f".{command}"
             output = str(Path(output) / (src.stem + suffix))
 
-        def run_one(srt: Path, out: str | None) -> Path:
+        cache = TelemetryCache() if use_telemetry_cache else None
+
+        def convert_one(srt: Path, out: str | None) -> Path:
             if command == "gpx":
                 return extract_telemetry_to_gpx(
                     srt, out, tz_offset=offset,
@@ -562,13 +697,13 @@ def convert(
                 return convert_to_geojson(
                     srt, out, redact=redact,
                     footprint=footprint, footprint_interval=footprint_interval,
-                    model=model, extract_home=extract_home,
+                    model=model, extract_home=extract_home, simplify=simplify,
                 )
             elif command == "kml":
                 return convert_to_kml(
                     srt, out, redact=redact,
                     footprint=footprint, footprint_interval=footprint_interval,
-                    model=model,
+                    model=model, simplify=simplify,
                 )
             elif command == "cot":
                 return convert_to_cot(
@@ -576,34 +711,40 @@ def convert(
                     interval=interval, cot_type=cot_type,
                 )
             else:  # html
-                return convert_to_html(srt, out, redact=redact)
+                return convert_to_html(srt, out, redact=redact, simplify=simplify)
+
+        def run_one(srt: Path, out: str | None) -> Path:
+            with use_cache(cache):
+                return convert_one(srt, out)
 
         outputs: list[Path] = []
         skipped = 0
-        if batch:
-            patterns = ("*.SRT", "*.srt", "*.MP4", "*.mp4", "*.MOV", "*.mov")
-            seen: set[Path] = set()
-            targets: list[Path] = []
-            for pattern in patterns:
-                for path in src.glob(pattern):
-                    if path not in seen:
-                        seen.add(path)
-                        targets.append(path)
-            for index, path in enumerate(targets, start=1):
-                progress.advance(index, len(targets), item=path.name)
+        # One ExifTool worker serves every MP4 in a --batch run.
+        with pooled_exiftool():
+            if batch:
+                patterns = ("*.SRT", "*.srt", "*.MP4", "*.mp4", "*.MOV", "*.mov")
+                seen: set[Path] = set()
+                targets: list[Path] = []
+                for pattern in patterns:
+                    for path in src.glob(pattern):
+                        if path not in seen:
+                            seen.add(path)
+                            targets.append(path)
+                for index, path in enumerate(targets, start=1):
+                    progress.advance(index, len(targets), item=path.name)
+                    try:
+                        outputs.append(run_one(path, None))
+                    except Mp4TelemetryError as e:
+                        skipped += 1
+                        progress.warning(str(e), item=path.name)
+                        if not progress.active:
+                            click.echo(f"Skipping {path.name}: {e}", err=True)
+            else:
+                progress.advance(1, 1, item=src.name)
                 try:
-                    outputs.append(run_one(path, None))
+                    outputs.append(run_one(src, output))
                 except Mp4TelemetryError as e:
-                    skipped += 1
-                    progress.warning(str(e), item=path.name)
-                    if not progress.active:
-                        click.echo(f"Skipping {path.name}: {e}", err=True)
-        else:
-            progress.advance(1, 1, item=src.name)
-            try:
-                outputs.append(run_one(src, output))
-            except Mp4TelemetryError as e:
-                raise click.ClickException(str(e))
+                    raise click.ClickException(str(e))
         progress.result(
             ok=True,
             outputs=[str(p.resolve()) for p in outputs],
@@ -611,6 +752,7 @@ def convert(
                 "converted": len(outputs),
                 "skipped": skipped,
                 "format": command,
+                **_cache_summary(cache),
             },
         )
 
@@ -669,7 +811,15 @@ def convert(
          "view (GPano initial-view tags; set them with 'dji-embed "
          "panoedit'). Panoramas without a saved view keep the 2:1 strip.",
 )
+@click.option(
+    "--thumb-dir", default=None, metavar="DIR",
+    help="Write the popup thumbnails as JPEG files in DIR, a folder inside "
+         "the map's (e.g. thumbs), instead of embedding them in the HTML. "
+         "Identical thumbnails are stored once; each loads when its popup "
+         "first opens. Keep DIR with the map when you move it.",
+)
 @_tile_style_option
+@_cache_option
 @_progress_option
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output")
 @click.option("-q", "--quiet", is_flag=True, help="Suppress info output")
@@ -685,7 +835,9 @@ def photomap(
     redact: str,
     serve_map: bool,
     pano_view_thumbs: bool,
+    thumb_dir: str | None,
     tile_style: str,
+    use_telemetry_cache: bool,
     progress_mode: str | None,
     verbose: bool,
     quiet: bool,
@@ -737,6 +889,18 @@ def photomap(
                 f"{fmt.lower()} is unchanged",
                 err=True,
             )
+    thumb_path = None
+    if thumb_dir is not None:
+        try:
+            thumb_path = parse_thumb_dir(thumb_dir)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="'--thumb-dir'")
+        if fmt.lower() not in ("html", "all"):
+            click.echo(
+                "Note: --thumb-dir only affects HTML output; "
+                f"{fmt.lower()} is unchanged",
+                err=True,
+            )
     if link_originals and fmt.lower() not in ("html", "all"):
         click.echo(
             "Note: --link-originals only affects HTML output; "
@@ -747,9 +911,11 @@ def photomap(
     # HTML; otherwise the user-supplied prefix.
     html_link_base = (link_base or "") if link_originals else None
     src = Path(directory)
+    cache = TelemetryCache() if use_telemetry_cache else None
     with _jsonl_terminal(progress, "photomap"):
         try:
-            points, skipped = scan_photos(src, recursive=recursive)
+            with use_cache(cache):
+                points, skipped = scan_photos(src, recursive=recursive)
         except PhotomapError as e:
             raise click.ClickException(str(e))
         if redact.lower() == "fuzz":
@@ -821,6 +987,7 @@ def photomap(
                         link_base=html_link_base,
                         popup_fields=popup_field_set,
                         tile_style=tile_style.lower(),
+                        thumb_dir=thumb_path,
                     )
                 elif f == "kml":
                     write_photos_kml(points, out, map_title)
@@ -831,7 +998,11 @@ def photomap(
         progress.result(
             ok=True,
             outputs=[str(out.resolve()) for _f, out in targets],
-            summary={"photos": len(points), "skipped": len(skipped)},
+            summary={
+                "photos": len(points),
+                "skipped": len(skipped),
+                **_cache_summary(cache),
+            },
         )
     if serve_map:
         html_out = next(out for f, out in targets if f == "html")
@@ -852,10 +1023,13 @@ def photomap(
 @click.option(
     "-f", "--format", "fmt",
     type=click.Choice(
-        ["html", "kml", "geojson", "record", "all"], case_sensitive=False
+        ["html", "kml", "geojson", "record", "tiles", "all"], case_sensitive=False
     ),
     default="html", show_default=True,
-    help="Map output format. 'record' (also written by 'all') writes a "
+    help="Map output format. 'tiles' writes a z/x/y pyramid of track tiles "
+         "and a viewer page that loads them as you pan (for archives too "
+         "big for one page; open it with 'dji-embed serve'). "
+         "'record' (also written by 'all') writes a "
          "printable flight record; building it fetches airspace data from "
          "official feeds (FAA / ED-269) and terrain tiles from Mapterhorn. "
          "These fetches — and --airspace's — are the command's only network "
@@ -930,7 +1104,25 @@ def photomap(
          "several flights. Enable the UTC timestamp and the gimbal "
          "pitch/yaw fields in the decoder's export settings.",
 )
+@click.option(
+    "--incremental", is_flag=True,
+    help="Keep a manifest beside the output (.NAME.manifest.json) so that "
+         "reruns parse only new or changed .SRT files and rewrite the "
+         "outputs only when a flight changed. The result is identical to a "
+         "full rebuild. Not with --redact: the manifest keeps exact "
+         "coordinates.",
+)
+@_simplify_option
+@click.option(
+    "--compact", is_flag=True,
+    help="Embed the tracks in the HTML map as compactly encoded arrays "
+         "(positions to ~0.1 m) that the page decodes on load: a much "
+         "smaller file that opens faster. GeoJSON output is unaffected.",
+)
+@_split_data_option
 @_tile_style_option
+@_cache_option
+@_scan_jobs_option
 @_progress_option
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output")
 @click.option("-q", "--quiet", is_flag=True, help="Suppress info output")
@@ -949,7 +1141,13 @@ def flightmap(
     link_originals: bool,
     link_base: str | None,
     flight_logs: tuple[str, ...],
+    incremental: bool,
+    simplify: float | None,
+    compact: bool,
+    split_data: bool,
     tile_style: str,
+    use_telemetry_cache: bool,
+    jobs: int,
     progress_mode: str | None,
     verbose: bool,
     quiet: bool,
@@ -1032,15 +1230,74 @@ def flightmap(
                 "or --airspace",
                 err=True,
             )
+        if compact and fmt.lower() not in ("html", "all"):
+            click.echo(
+                "Note: --compact only changes the HTML map; "
+                f"{fmt.lower()} output is written as usual",
+                err=True,
+            )
+        if split_data and three_d:
+            raise click.UsageError(
+                "--split-data works with the 2D map only: the 3D view "
+                "builds its scene from every flight's points on load"
+            )
+        if split_data and fmt.lower() not in ("html", "all"):
+            click.echo(
+                "Note: --split-data only changes the HTML map; "
+                f"{fmt.lower()} output is written as usual",
+                err=True,
+            )
+        if incremental and redact.lower() != "none":
+            raise click.UsageError(
+                "--incremental keeps exact coordinates in its manifest; "
+                "drop --redact or --incremental"
+            )
         src = Path(directory)
-        tracks, skipped = scan_flights(
-            src,
-            recursive=recursive,
-            redact=redact.lower(),
-            join_gap=join_gap,
-            tz_offset=offset,
-            on_file=progress.advance if progress.active else None,
+        map_title = title or src.resolve().name
+        if fmt.lower() == "all":
+            base = Path(output) if output else src / "flightmap.html"
+            targets = [
+                (f, base.with_suffix(f".{f}")) for f in ("html", "kml", "geojson")
+            ]
+            if skip_record_for_redact:
+                click.echo(
+                    "Note: the flight record is skipped under --redact — "
+                    "records must carry exact coordinates",
+                    err=True,
+                )
+            else:
+                targets.append(("record", base.parent / "flight-record.html"))
+        else:
+            f = fmt.lower()
+            default_name = (
+                "flightmap-3d.html" if three_d
+                else "flight-record.html" if f == "record"
+                else "flightmap-tiles.html" if f == "tiles"
+                else f"flightmap.{f}"
+            )
+            out = Path(output) if output else src / default_name
+            targets = [(f, out)]
+        manifest = (
+            FlightManifest(
+                manifest_path(targets[0][1]),
+                scan_key(src, recursive, join_gap, offset, simplify),
+            )
+            if incremental
+            else None
         )
+        cache = TelemetryCache() if use_telemetry_cache else None
+        with use_cache(cache), pooled_exiftool():
+            tracks, skipped = scan_flights(
+                src,
+                recursive=recursive,
+                redact=redact.lower(),
+                join_gap=join_gap,
+                tz_offset=offset,
+                on_file=progress.advance if progress.active else None,
+                jobs=jobs,
+                manifest=manifest,
+                simplify=simplify,
+            )
         total = len(tracks) + len(skipped)
         if total == 0:
             raise click.ClickException(
@@ -1106,29 +1363,6 @@ def flightmap(
                     f"Joined {files_joined} files into "
                     f"{len(joined)} flight{'s' if len(joined) != 1 else ''}"
                 )
-        map_title = title or src.resolve().name
-        if fmt.lower() == "all":
-            base = Path(output) if output else src / "flightmap.html"
-            targets = [
-                (f, base.with_suffix(f".{f}")) for f in ("html", "kml", "geojson")
-            ]
-            if skip_record_for_redact:
-                click.echo(
-                    "Note: the flight record is skipped under --redact — "
-                    "records must carry exact coordinates",
-                    err=True,
-                )
-            else:
-                targets.append(("record", base.parent / "flight-record.html"))
-        else:
-            f = fmt.lower()
-            default_name = (
-                "flightmap-3d.html" if three_d
-                else "flight-record.html" if f == "record"
-                else f"flightmap.{f}"
-            )
-            out = Path(output) if output else src / default_name
-            targets = [(f, out)]
         if link_originals:
             resolve_media(tracks, src, link_base)
         overlay_json = None
@@ -1151,46 +1385,81 @@ def flightmap(
             for t, d in zip(tracks, per_track):
                 if d.gap_reason:
                     click.echo(f"Note: {t.name}: {d.gap_reason}", err=True)
-        for f, out in targets:
-            try:
-                if f == "html":
-                    if three_d:
-                        write_flights_3d_html(
-                            tracks, out, map_title, redact=redact.lower(),
-                            airspace_json=overlay_json,
-                        )
-                    else:
-                        write_flights_html(
+        outputs = [out for _f, out in targets]
+        output_options = options_digest(
+            {
+                "format": fmt.lower(),
+                "title": map_title,
+                "tile_style": tile_style.lower(),
+                "three_d": three_d,
+                "compact": compact,
+                "split_data": split_data,
+            }
+        )
+        tiles_written = None
+        # Outputs that depend on more than the flights and these options
+        # (fetched airspace, flight logs, linked videos) are always written.
+        outputs_unchanged = (
+            manifest is not None
+            and not (airspace or wants_record or flight_logs or link_originals)
+            and manifest.outputs_current(output_options, outputs)
+        )
+        if outputs_unchanged:
+            if not quiet:
+                click.echo(
+                    "No flight changed since the last run; outputs are up to date"
+                )
+        else:
+            for f, out in targets:
+                try:
+                    if f == "html":
+                        if three_d:
+                            write_flights_3d_html(
+                                tracks, out, map_title, redact=redact.lower(),
+                                airspace_json=overlay_json, compact=compact,
+                            )
+                        else:
+                            write_flights_html(
+                                tracks, out, map_title,
+                                tile_style=tile_style.lower(),
+                                redact=redact.lower(),
+                                airspace_json=overlay_json,
+                                compact=compact,
+                                split_data=split_data,
+                            )
+                    elif f == "kml":
+                        write_flights_kml(tracks, out, map_title)
+                    elif f == "tiles":
+                        tiles_written = write_flight_tiles(
                             tracks, out, map_title,
                             tile_style=tile_style.lower(),
                             redact=redact.lower(),
-                            airspace_json=overlay_json,
                         )
-                elif f == "kml":
-                    write_flights_kml(tracks, out, map_title)
-                elif f == "record":
-                    records = build_records(
-                        tracks,
-                        cache_dir=out.parent / "airspace-cache",
-                        # The overlay loop above already refreshed this
-                        # same cache in this run — a second refresh pass
-                        # would refetch the feed it just wrote (#424).
-                        # Terrain tiles have no refresh notion, so nothing
-                        # else is suppressed.
-                        refresh=airspace_refresh and not airspace,
-                        announce=lambda m: click.echo(m, err=True),
-                    )
-                    write_flight_record(records, out, map_title)
-                    for rec in records:
-                        if rec.airspace.gap_reason:
-                            click.echo(
-                                f"Note: {rec.name}: {rec.airspace.gap_reason}",
-                                err=True,
-                            )
-                else:
-                    write_flights_geojson(tracks, out, redact=redact.lower())
-            except OSError as e:
-                raise click.ClickException(f"Could not write {out}: {e}")
+                    elif f == "record":
+                        records = build_records(
+                            tracks,
+                            cache_dir=out.parent / "airspace-cache",
+                            # The overlay loop above already refreshed this
+                            # same cache in this run — a second refresh pass
+                            # would refetch the feed it just wrote (#424).
+                            # Terrain tiles have no refresh notion, so nothing
+                            # else is suppressed.
+                            refresh=airspace_refresh and not airspace,
+                            announce=lambda m: click.echo(m, err=True),
+                        )
+                        write_flight_record(records, out, map_title)
+                        for rec in records:
+                            if rec.airspace.gap_reason:
+                                click.echo(
+                                    f"Note: {rec.name}: {rec.airspace.gap_reason}",
+                                    err=True,
+                                )
+                    else:
+                        write_flights_geojson(tracks, out, redact=redact.lower())
+                except OSError as e:
+                    raise click.ClickException(f"Could not write {out}: {e}")
+        if manifest is not None:
+            manifest.save(output_options, outputs)
         progress.result(
             ok=True,
             outputs=[str(out.resolve()) for _f, out in targets],
@@ -1198,6 +1467,16 @@ def flightmap(
                 "flights": len(tracks),
                 "skipped": len(skipped),
                 "joined_files": files_joined,
+                **({"tiles": tiles_written} if tiles_written is not None else {}),
+                **_cache_summary(cache),
+                **(
+                    {
+                        "parsed_files": manifest.parsed,
+                        "outputs_unchanged": outputs_unchanged,
+                    }
+                    if manifest is not None
+                    else {}
+                ),
             },
         )
 
@@ -1347,8 +1626,9 @@ def serve(
 ) -> None:
     """Serve a generated map folder at a private local address (this computer only).
 
-    Maps open fine straight from disk except the 360° panorama viewer,
-    which browsers block on file:// pages; serving over local HTTP
+    Maps open fine straight from disk except the 360° panorama viewer
+    and the track files of a --split-data map, which browsers block on
+    file:// pages; serving over local HTTP
     (http://127.0.0.1, loopback only) unblocks it. Serves DIRECTORY until
     Ctrl+C. Equivalent to the server behind 'photomap --serve', without
     rebuilding the map first.
@@ -1392,6 +1672,10 @@ def serve(
          "Links each pin to its original photo and enables the 360° viewer, "
          "which browsers block on maps opened straight from disk.",
 )
+@_simplify_option
+@_split_data_option
+@_cache_option
+@_scan_jobs_option
 @_progress_option
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output")
 @click.option("-q", "--quiet", is_flag=True, help="Suppress info output")
@@ -1400,6 +1684,10 @@ def map_cmd(
     output: str | None,
     redact: str,
     serve_map: bool,
+    simplify: float | None,
+    split_data: bool,
+    use_telemetry_cache: bool,
+    jobs: int,
     progress_mode: str | None,
     verbose: bool,
     quiet: bool,
@@ -1432,21 +1720,26 @@ def map_cmd(
     with _jsonl_terminal(progress, "map"):
         # A photo-less tree skips ExifTool entirely, so a tracks-only
         # archive maps on a machine without it.
+        cache = TelemetryCache() if use_telemetry_cache else None
         if folder_has_photos(src):
             try:
-                points, photo_skipped = scan_photos(src, recursive=True)
+                with use_cache(cache):
+                    points, photo_skipped = scan_photos(src, recursive=True)
             except PhotomapError as e:
                 raise click.ClickException(str(e))
         else:
             points, photo_skipped = [], []
         if redact.lower() == "fuzz":
             points = redact_photo_points(points, "fuzz")
-        tracks, srt_skipped = scan_flights(
-            src,
-            recursive=True,
-            redact=redact.lower(),
-            on_file=progress.advance if progress.active else None,
-        )
+        with use_cache(cache), pooled_exiftool():
+            tracks, srt_skipped = scan_flights(
+                src,
+                recursive=True,
+                redact=redact.lower(),
+                on_file=progress.advance if progress.active else None,
+                jobs=jobs,
+                simplify=simplify,
+            )
         if not points and not tracks:
             found = len(photo_skipped) + len(srt_skipped)
             if found:
@@ -1529,6 +1822,7 @@ def map_cmd(
             write_mixed_html(
                 points, tracks, out, src.resolve().name,
                 link_base=link_base, redact=redact.lower(),
+                split_data=split_data,
             )
         except OSError as e:
             raise click.ClickException(f"Could not write {out}: {e}")
@@ -1539,6 +1833,7 @@ def map_cmd(
                 "photos": len(points),
                 "flights": len(tracks),
                 "skipped": len(photo_skipped) + len(srt_skipped),
+                **_cache_summary(cache),
             },
         )
     if serve_map:
@@ -1634,16 +1929,18 @@ def panoedit(
     # Queue the handler I/O so a request thread can never block on stderr.
     make_logging_nonblocking()
     try:
-        run_editor(
-            Path(directory),
-            recursive=recursive,
-            port=port,
-            open_browser=not no_browser,
-            bare_url=url_only,
-            stop_on_stdin_eof=exit_with_stdin,
-            max_width=max_width,
-            backup=not no_backup,
-        )
+        # The scan and every save share one ExifTool worker for the session.
+        with pooled_exiftool():
+            run_editor(
+                Path(directory),
+                recursive=recursive,
+                port=port,
+                open_browser=not no_browser,
+                bare_url=url_only,
+                stop_on_stdin_eof=exit_with_stdin,
+                max_width=max_width,
+                backup=not no_backup,
+            )
     except PanoEditError as exc:
         raise click.ClickException(str(exc)) from exc
 
@@ -1925,6 +2222,7 @@ def validate(
     show_default=True,
     help="Output format",
 )
+@_cache_option
 @_progress_option
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output")
 @click.option("-q", "--quiet", is_flag=True, help="Suppress info output")
@@ -1934,6 +2232,7 @@ def verify_sun(
     srt: str,
     tz_offset: str,
     fmt: str,
+    use_telemetry_cache: bool,
     progress_mode: str | None,
     verbose: bool,
     quiet: bool,
@@ -1953,6 +2252,7 @@ def verify_sun(
         quiet = True  # stdout belongs to the JSONL events
     log_json = ctx.obj.get("log_json", False)
     setup_logging(verbose, quiet, log_json)
+    cache = TelemetryCache() if use_telemetry_cache else None
 
     if progress.active:
         with _jsonl_terminal(progress, "verify-sun"):
@@ -1960,12 +2260,17 @@ def verify_sun(
                 offset = parse_utc_offset(tz_offset)
             except ValueError as e:
                 raise click.BadParameter(str(e), param_hint="--tz-offset")
-            sun_summary = summarize_sun(Path(srt), tz_offset=offset)
+            with use_cache(cache):
+                sun_summary = summarize_sun(Path(srt), tz_offset=offset)
             # Flags (night, very_low_sun, sun_not_computable) are findings
             # about the footage, not command failures: warn and stay ok.
             for flag in sun_summary["flags"]:
                 progress.warning(flag)
-            progress.result(ok=True, outputs=[], summary=sun_summary)
+            progress.result(
+                ok=True,
+                outputs=[],
+                summary={**sun_summary, **_cache_summary(cache)},
+            )
         return
 
     try:
@@ -1974,7 +2279,8 @@ def verify_sun(
         raise click.BadParameter(str(e), param_hint="--tz-offset")
 
     try:
-        summary = summarize_sun(Path(srt), tz_offset=offset)
+        with use_cache(cache):
+            summary = summarize_sun(Path(srt), tz_offset=offset)
     except Exception as e:
         msg = f"verify-sun failed: {e}"
         if log_json:
@@ -2007,5 +2313,78 @@ def verify_sun(
     sys.exit(ExitCode.SUCCESS)
 
 
+@main.group(name="cache")
+def cache_group() -> None:
+    """Inspect or empty the parsed-telemetry cache used by --cache.
+
+    The cache lives in the per-user cache directory (DJIEMBED_CACHE_DIR
+    overrides) and is bounded by DJIEMBED_CACHE_MAX_MB (default 512);
+    the least recently used entries are evicted first.
+    """
+
+
+def _format_mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+@cache_group.command(name="stats")
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["text", "json"], case_sensitive=False),
+    default="text",
+    show_default=True,
+    help="Output format",
+)
+def cache_stats(fmt: str) -> None:
+    """Show where the cache is, how many entries it holds, and its size."""
+    stats = TelemetryCache().stats()
+    if fmt.lower() == "json":
+        click.echo(json.dumps(stats))
+        return
+    click.echo(f"Cache: {stats['path']}")
+    click.echo(f"Entries: {stats['entries']}")
+    click.echo(
+        f"Size: {_format_mb(stats['bytes'])} "
+        f"(limit {_format_mb(stats['max_bytes'])})"
+    )
+
+
+@cache_group.command(name="prune")
+@click.option(
+    "--max-size",
+    type=click.FloatRange(min=0),
+    default=None,
+    metavar="MB",
+    help="Evict least recently used entries until the cache is at most MB "
+    "(default: the configured limit).",
+)
+@click.option(
+    "--older-than",
+    type=click.FloatRange(min=0),
+    default=None,
+    metavar="DAYS",
+    help="Also evict every entry not used for DAYS.",
+)
+def cache_prune(max_size: float | None, older_than: float | None) -> None:
+    """Evict entries down to a size limit and/or by age."""
+    cache = TelemetryCache()
+    removed = cache.prune(
+        max_bytes=None if max_size is None else int(max_size * 1024 * 1024),
+        older_than_s=None if older_than is None else older_than * 86400,
+    )
+    click.echo(
+        f"Removed {removed} entr{'ies' if removed != 1 else 'y'}; "
+        f"{_format_mb(cache.stats()['bytes'])} left"
+    )
+
+
+@cache_group.command(name="clear")
+def cache_clear() -> None:
+    """Remove every cached entry."""
+    removed = TelemetryCache().clear()
+    click.echo(f"Removed {removed} entr{'ies' if removed != 1 else 'y'}")
+
+
 if __name__ == "__main__":  # pragma: no cover
     main()
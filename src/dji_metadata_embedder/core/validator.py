@@ -6,6 +6,10 @@ from typing import Dict, List, Any, Optional, Tuple
 import re
 from datetime import datetime
 
+from ..srt_tokenizer import SrtParseStats, cue_to_seconds, read_srt_records
+from ..utils.inventory import DirectoryInventory
+from ..utils.media_probe import media_duration
+
 
 logger = logging.getLogger(__name__)
 
@@ -46,45 +50,21 @@ def parse_srt_timestamps(srt_path: Path) -> List[Tuple[float, str]]:
     
     Returns list of (timestamp_seconds, timecode_string) tuples.
     """
-    content = srt_path.read_text(encoding="utf-8")
-    blocks = content.strip().split("\n\n")
     timestamps = []
-    
-    for block in blocks:
-        lines = block.strip().split("\n")
-        if len(lines) < 2:
+    for rec in read_srt_records(srt_path):
+        # Only well-formed "00:00:01,000 --> 00:00:02,000" timing lines count
+        if rec.cue is None or rec.cue_end is None:
             continue
-            
-        # Parse SRT timestamp line "00:00:01,000 --> 00:00:02,000"
-        ts_line = lines[1]
-        ts_match = re.search(r"(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})", ts_line)
-        if ts_match:
-            start_time = ts_match.group(1)
-            # Convert to seconds
-            h, m, s_ms = start_time.split(":")
-            s, ms = s_ms.split(",")
-            total_seconds = int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000
-            timestamps.append((total_seconds, start_time))
+        seconds = cue_to_seconds(rec.cue)
+        if seconds is not None:
+            timestamps.append((seconds, rec.cue))
     
     return timestamps
 
 
 def get_video_duration(mp4_path: Path) -> float:
-    """Get video duration in seconds using ffprobe."""
-    import subprocess
-    
-    try:
-        cmd = [
-            "ffprobe", "-v", "quiet", 
-            "-show_entries", "format=duration",
-            "-of", "csv=p=0", str(mp4_path)
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode == 0 and result.stdout.strip():
-            return float(result.stdout.strip())
-    except (subprocess.TimeoutExpired, ValueError, FileNotFoundError):
-        pass
-    return 0.0
+    """Get video duration in seconds using ffprobe (0.0 when unreadable)."""
+    return media_duration(mp4_path) or 0.0
 
 
 def analyze_drift(srt_path: Path, mp4_path: Path, threshold: float = 1.0) -> Dict[str, Any]:
@@ -186,27 +166,16 @@ def validate_directory(directory: Path, drift_threshold: float = 1.0) -> Dict[st
     }
     
     try:
-        # Find video files. Deduplicated via a set — a case-insensitive
-        # filesystem (Windows, macOS) matches "*.mp4" and "*.MP4" with the
-        # same file — and sorted for a deterministic report order.
-        video_globs = ("*.mp4", "*.MP4", "*.mov", "*.MOV")
-        video_files = sorted(
-            {f for pattern in video_globs for f in directory.glob(pattern)}
-        )
+        # Find video files: one listing of the folder also answers every
+        # clip's SRT lookup. Suffixes match in any case; sorted for a
+        # deterministic report order.
+        inventory = DirectoryInventory.scan(directory)
+        video_files = inventory.files((".mp4", ".mov"))
         result["total_files"] = len(video_files)
 
         for mp4_file in video_files:
             # Look for corresponding SRT
-            srt_candidates = [
-                mp4_file.with_suffix(".SRT"),
-                mp4_file.with_suffix(".srt")
-            ]
-            
-            srt_file = None
-            for candidate in srt_candidates:
-                if candidate.exists():
-                    srt_file = candidate
-                    break
+            srt_file = inventory.companion(mp4_file.stem, (".SRT", ".srt"))
             
             if not srt_file:
                 result["issues"].append(f"No SRT file found for {mp4_file.name}")
@@ -245,14 +214,8 @@ def validate_srt_format(srt_path: Path, lenient: bool = True) -> Dict[str, Any]:
     }
     
     try:
-        content = srt_path.read_text(encoding="utf-8")
-        blocks = content.strip().split("\n\n")
-        
-        if not blocks:
-            validation["valid"] = False
-            validation["issues"].append("Empty SRT file")
-            return validation
-        
+        total_blocks = 0
+        parse_stats = SrtParseStats()
         telemetry_points = []
         format_votes = {
             "mini3_4pro": 0,
@@ -262,52 +225,40 @@ def validate_srt_format(srt_path: Path, lenient: bool = True) -> Dict[str, Any]:
             "p4rtk_compact": 0,
         }
         
-        for i, block in enumerate(blocks):
-            lines = block.strip().split("\n")
-            if len(lines) < 3:
+        for rec in read_srt_records(srt_path, parse_stats):
+            total_blocks += 1
+            if not rec.complete:
                 if lenient:
-                    validation["warnings"].append(f"Block {i+1}: Incomplete block (expected >= 3 lines)")
+                    validation["warnings"].append(f"Block {rec.index}: Incomplete block (expected >= 3 lines)")
                     continue
                 else:
-                    validation["issues"].append(f"Block {i+1}: Invalid format - too few lines")
+                    validation["issues"].append(f"Block {rec.index}: Invalid format - too few lines")
                     continue
             
             # Check timestamp format
-            ts_line = lines[1]
-            if not re.search(r"\d{2}:\d{2}:\d{2},\d{3}\s*-->\s*\d{2}:\d{2}:\d{2},\d{3}", ts_line):
+            if rec.cue_end is None:
                 if lenient:
-                    validation["warnings"].append(f"Block {i+1}: Invalid timestamp format")
+                    validation["warnings"].append(f"Block {rec.index}: Invalid timestamp format")
                     continue
                 else:
-                    validation["issues"].append(f"Block {i+1}: Invalid timestamp format")
+                    validation["issues"].append(f"Block {rec.index}: Invalid timestamp format")
                     continue
             
-            # Analyze telemetry line(s)
-            tele_line = " ".join(lines[2:])
-            
             # Detect format
-            if "[latitude:" in tele_line and "[longitude:" in tele_line:
-                if "<font" in tele_line:
-                    format_votes["html_extended"] += 1
-                else:
-                    format_votes["mini3_4pro"] += 1
-            elif re.search(r"GPS\s*\(", tele_line):
-                # P4 RTK compact single-line family uses ``GPS (...)`` (with
-                # space) plus free-standing ``F/N`` aperture tokens.
-                if " F/" in tele_line or tele_line.lstrip().startswith("F/"):
-                    format_votes["p4rtk_compact"] += 1
-                # Legacy-with-unit (M300 lineage) pins an altitude unit
-                # suffix inside the GPS tuple, e.g. ``GPS(lat,lon,0.0M)``.
-                elif re.search(r"GPS\s*\([^)]*[A-Za-z]\)", tele_line):
-                    format_votes["legacy_unit"] += 1
-                else:
-                    format_votes["legacy_gps"] += 1
+            family = rec.family
+            if family is not None:
+                format_votes[family] += 1
             elif lenient:
-                validation["warnings"].append(f"Block {i+1}: Unrecognized telemetry format")
+                validation["warnings"].append(f"Block {rec.index}: Unrecognized telemetry format")
             else:
-                validation["issues"].append(f"Block {i+1}: Invalid telemetry format")
+                validation["issues"].append(f"Block {rec.index}: Invalid telemetry format")
             
-            telemetry_points.append(tele_line)
+            telemetry_points.append(rec.text)
+        
+        if not total_blocks:
+            validation["valid"] = False
+            validation["issues"].append("Empty SRT file")
+            return validation
         
         # Determine primary format
         if format_votes:
@@ -315,15 +266,16 @@ def validate_srt_format(srt_path: Path, lenient: bool = True) -> Dict[str, Any]:
             validation["statistics"]["format_confidence"] = format_votes
         
         validation["telemetry_points"] = len(telemetry_points)
-        validation["statistics"]["total_blocks"] = len(blocks)
+        validation["statistics"]["total_blocks"] = total_blocks
+        validation["statistics"]["parser"] = parse_stats.as_dict()
         
         # Additional validation checks
         if validation["telemetry_points"] == 0:
             validation["valid"] = False
             validation["issues"].append("No valid telemetry points found")
-        elif validation["telemetry_points"] < len(blocks) * 0.5:  # Less than 50% valid
+        elif validation["telemetry_points"] < total_blocks * 0.5:  # Less than 50% valid
             if lenient:
-                validation["warnings"].append(f"Low telemetry extraction rate: {validation['telemetry_points']}/{len(blocks)}")
+                validation["warnings"].append(f"Low telemetry extraction rate: {validation['telemetry_points']}/{total_blocks}")
             else:
                 validation["valid"] = False
                 validation["issues"].append("Too many invalid telemetry blocks")
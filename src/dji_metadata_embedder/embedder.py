@@ -3,16 +3,28 @@ import json
 import logging
 import os
 import re
-import subprocess
 from collections.abc import Callable
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 from rich.progress import Progress
 
 from .dat_parser import parse_v13 as parse_dat_v13
-from .utilities import apply_redaction, is_gps_fix, parse_home, setup_logging
+from .srt_tokenizer import cue_to_seconds, read_srt_cues, read_srt_records
+from .utilities import Home, apply_redaction, is_gps_fix, setup_logging
 from .utils import system_info
+from .utils.bmff import BmffError
+from .utils.devices import DeviceSlots, auto_device_cap, device_id
+from .utils.exiftool import call_exiftool
+from .utils.ffmpeg_progress import FfmpegProgress, run_ffmpeg
+from .utils.inventory import DirectoryInventory
+from .utils.journal import EmbedJournal, file_identity, input_identities, options_digest
+from .utils.media_probe import media_duration, probe_media
+from .utils.mp4_append import append_subtitle_track, can_append_in_place
+from .utils.pipeline import Stage, run_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -22,27 +34,7 @@ _TEMP_SUFFIX = ".tmp"
 
 def _ffprobe_duration(path: Path) -> Optional[float]:
     """Return media duration in seconds via ffprobe, or None if unreadable."""
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "csv=p=0",
-                str(path),
-            ],
-            capture_output=True, text=True, timeout=30,
-        )
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return None
-    if result.returncode != 0:
-        return None
-    raw = (result.stdout or "").strip()
-    if not raw:
-        return None
-    try:
-        return float(raw)
-    except ValueError:
-        return None
+    return media_duration(path)
 
 
 def _dji_data_stream_tags(path: Path) -> list[str]:
@@ -52,32 +44,8 @@ def _dji_data_stream_tags(path: Path) -> list[str]:
     missing/unreadable — detection is best-effort and must never block
     processing (issue #478).
     """
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-select_streams", "d",
-                "-show_entries", "stream=codec_tag_string",
-                "-of", "json",
-                str(path),
-            ],
-            capture_output=True, text=True, timeout=30,
-        )
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return []
-    if result.returncode != 0:
-        return []
-    try:
-        payload = json.loads(result.stdout or "{}")
-    except json.JSONDecodeError:
-        return []
-    if not isinstance(payload, dict):
-        return []
-    return [
-        s["codec_tag_string"]
-        for s in payload.get("streams", [])
-        if isinstance(s, dict) and s.get("codec_tag_string") in ("djmd", "dbgi")
-    ]
+    probe = probe_media(path)
+    return probe.data_stream_tags() if probe is not None else []
 
 
 def _validate_embedded_output(original_path: Path, temp_path: Path) -> bool:
@@ -133,6 +101,15 @@ def _validate_embedded_output(original_path: Path, temp_path: Path) -> bool:
     return True
 
 
+def _discard_temp(path: Path) -> None:
+    """Best-effort removal of a temp output that will not be moved into place."""
+    if path.exists():
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
 # Video container extensions the embedder can mux a subtitle track into.
 # ``.osv``/``.lrf`` are DJI's 360 video and low-res proxy formats (Avata 360);
 # both are ISO BMFF (MP4-family) containers ffmpeg reads like a normal ``.mp4``.
@@ -141,19 +118,62 @@ def _validate_embedded_output(original_path: Path, temp_path: Path) -> bool:
 _VIDEO_EXTENSIONS = ("mp4", "osv", "lrf")
 
 
-def discover_video_files(directory: Path) -> list[Path]:
+# Per-clip outcomes of DJIMetadataEmbedder._process_video.
+_PROCESSED, _UP_TO_DATE, _FAILED = "processed", "up_to_date", "failed"
+
+# How the mux stage embedded a clip (_ClipJob.muxed).
+_IN_PLACE, _TEMP = "in_place", "temp"
+
+
+@dataclass
+class _ClipJob:
+    """One clip between the prepare, mux and finish stages."""
+
+    video_path: Path
+    srt_path: Path
+    audio_file: Path | None
+    output_path: Path
+    temp_output_path: Path
+    identities: dict[str, Any]
+    telemetry: dict[str, Any]
+    in_place: bool
+    warnings: list[str]
+    muxed: str | None = None  # _IN_PLACE, _TEMP, or None when it failed
+
+
+def _describe_mux(name: str, update: FfmpegProgress) -> str:
+    """Progress-bar label for a running mux: ``name 42% 85.3 MB/s ETA 12s``."""
+    parts = [name]
+    if update.fraction is not None:
+        parts.append(f"{update.fraction:.0%}")
+    if update.bytes_per_s:
+        parts.append(f"{update.bytes_per_s / 1e6:.1f} MB/s")
+    if update.eta_s is not None and not update.done:
+        parts.append(f"ETA {update.eta_s:.0f}s")
+    return " ".join(parts)
+
+
+def _scan_inventory(directory: Path) -> DirectoryInventory:
+    """List *directory* once; an unreadable one is simply empty."""
+    try:
+        return DirectoryInventory.scan(directory)
+    except OSError as e:
+        logger.debug("Cannot list %s: %s", directory, e)
+        return DirectoryInventory(directory)
+
+
+def discover_video_files(
+    directory: Path, inventory: DirectoryInventory | None = None
+) -> list[Path]:
     """Return the video files in *directory* the embedder can process.
 
-    Globs each supported extension in both cases (``*.mp4`` and ``*.MP4``) so
-    discovery works on case-sensitive file systems too, then returns a sorted,
-    de-duplicated list. On case-insensitive file systems the two globs would
-    otherwise yield the same path twice, hence the set.
+    Suffixes match in any case, so discovery works on case-sensitive file
+    systems too; the list is sorted. Pass the directory's *inventory* when
+    the caller already has one, to skip re-listing it.
     """
-    matches: set[Path] = set()
-    for ext in _VIDEO_EXTENSIONS:
-        matches.update(directory.glob(f"*.{ext}"))
-        matches.update(directory.glob(f"*.{ext.upper()}"))
-    return sorted(matches)
+    if inventory is None:
+        inventory = _scan_inventory(directory)
+    return inventory.files(f".{ext}" for ext in _VIDEO_EXTENSIONS)
 
 
 class DJIMetadataEmbedder:
@@ -174,6 +194,14 @@ class DJIMetadataEmbedder:
     redact: GPS redaction mode ("none", "drop", "fuzz")
     time_offset: time offset in seconds to align SRT with MP4
     resample_strategy: resampling strategy for SRT↔MP4 alignment ("linear", "nearest", "cubic")
+    jobs: number of clips to process concurrently (default 1, sequential)
+    device_jobs: cap on concurrent muxes reading or writing any one device
+        (``st_dev``); ``None`` picks one per device (see
+        :mod:`.utils.devices`)
+    force: re-embed every clip, even ones the output directory's completion
+        journal records as already done from the same inputs and options
+    on_clip_progress: called as ``(video name, FfmpegProgress)`` while each
+        clip's ffmpeg mux runs (from a worker thread)
 
     Usage:
         embedder = DJIMetadataEmbedder("/videos", time_offset=0.5)
@@ -193,6 +221,10 @@ class DJIMetadataEmbedder:
         container: str = "mp4",
         extract_home: bool = False,
         audio_sidecar: bool = False,
+        jobs: int = 1,
+        device_jobs: int | None = None,
+        force: bool = False,
+        on_clip_progress: Callable[[str, FfmpegProgress], None] | None = None,
     ):
         self.directory = Path(directory)
         self.output_dir = (
@@ -216,6 +248,22 @@ class DJIMetadataEmbedder:
         # Opt-in: Neo 2 records audio to a separate .m4a; when set, auto-pair and
         # mux the same-basename sidecar into the output (issue #246).
         self.audio_sidecar = audio_sidecar
+        # Clips processed concurrently by process_directory. Each clip's
+        # pipeline is dominated by ffmpeg/ffprobe subprocesses, so threads
+        # are enough to keep several of them busy.
+        self.jobs = max(1, jobs)
+        # ...but a spinning disk or SD card serves one stream faster than
+        # several; muxes touching the same device are capped separately.
+        self.device_jobs = device_jobs
+        # Outputs are journaled as they finish so a rerun can skip the ones
+        # still current; force re-embeds regardless (the journal is still
+        # updated).
+        self.force = force
+        self.on_clip_progress = on_clip_progress
+        self._inventory: DirectoryInventory | None = None
+        self._journal: EmbedJournal | None = None
+        self._devices: DeviceSlots | None = None
+        self._options = ""
 
     def parse_dji_srt(self, srt_path: Path) -> Dict[str, Any]:
         """Parse DJI SRT file and extract telemetry data."""
@@ -236,175 +284,44 @@ class DJIMetadataEmbedder:
         }
 
         try:
-            with open(srt_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Split into subtitle blocks
-            blocks = content.strip().split("\n\n")
-
-            for block in blocks:
-                lines = block.strip().split("\n")
-                if len(lines) >= 3:
-                    # Parse timestamp
-                    timestamp_line = lines[1]
-                    timestamp_match = re.search(
-                        r"(\d{2}:\d{2}:\d{2},\d{3})", timestamp_line
-                    )
-                    if timestamp_match:
-                        telemetry_data["timestamps"].append(timestamp_match.group(1))
-
-                    # Parse telemetry data (usually in the 3rd line onward)
-                    telemetry_line = " ".join(lines[2:])
-
-                    # Remove HTML tags if present (newer DJI format)
-                    if "<font" in telemetry_line:
-                        telemetry_line = re.sub(r"<[^>]+>", "", telemetry_line)
-
-                    # Detect comprehensive format with frame counters. Older
-                    # firmware labels this ``SrtCnt``; newer firmware (Neo,
-                    # Mini 5 Pro, Avata 360) uses ``FrameCnt``. Accept either
-                    # spelling and store under the existing ``srt_counts`` key
-                    # for backwards compatibility.
-                    counter_match = re.search(
-                        r"(?:Srt|Frame)Cnt\s*:\s*(\d+)", telemetry_line
-                    )
-                    diff_time_match = re.search(
-                        r"DiffTime\s*:\s*([^\s]+)", telemetry_line
-                    )
-                    if counter_match or diff_time_match:
-                        telemetry_data.setdefault("srt_counts", []).append(
-                            int(counter_match.group(1)) if counter_match else None
-                        )
-                        telemetry_data.setdefault("diff_times", []).append(
-                            diff_time_match.group(1) if diff_time_match else None
-                        )
-
-                    # Extract GPS coordinates - Multiple format support
-                    # Format 1: [latitude: xx.xxx] [longitude: xx.xxx]
-                    lat_match = re.search(
-                        r"\[latitude:\s*([+-]?\d+\.?\d*)\]", telemetry_line
-                    )
-                    lon_match = re.search(
-                        r"\[longitude:\s*([+-]?\d+\.?\d*)\]", telemetry_line
-                    )
-
-                    # Format 2: GPS(lat,lon,alt) — also tolerates a unit
-                    # suffix on altitude (e.g. M300 emits ``GPS(lat,lon,0.0M)``)
-                    # and an optional space between ``GPS`` and ``(`` used by
-                    # the P4 RTK compact single-line family.
-                    if not lat_match or not lon_match:
-                        gps_match = re.search(
-                            r"GPS\s*\(([+-]?\d+\.?\d*),\s*([+-]?\d+\.?\d*),\s*([+-]?\d+\.?\d*)[A-Za-z]*\)",
-                            telemetry_line,
-                        )
-                        if gps_match:
-                            lat_match = gps_match
-                            lon_match = gps_match
-                            lat = float(gps_match.group(1))
-                            lon = float(gps_match.group(2))
-                        else:
-                            lat = None
-                            lon = None
-                    else:
-                        lat = float(lat_match.group(1))
-                        lon = float(lon_match.group(1))
-
-                    if lat is not None and lon is not None:
-                        telemetry_data["gps_coords"].append((lat, lon))
-
-                    # Extract altitudes - [rel_alt: x.xxx abs_alt: xxx.xxx]
-                    alt_match = re.search(
-                        r"\[rel_alt:\s*([+-]?\d+\.?\d*)\s*abs_alt:\s*([+-]?\d+\.?\d*)\]",
-                        telemetry_line,
-                    )
-                    if alt_match:
-                        rel_alt = float(alt_match.group(1))
-                        abs_alt = float(alt_match.group(2))
-                        telemetry_data["rel_altitudes"].append(rel_alt)
-                        telemetry_data["altitudes"].append(abs_alt)
-
-                    # Extract barometric altitude. Two delimiter variants exist:
-                    # Avata 2 parenthesised ``BAROMETER(91.2)`` and Matrice 300
-                    # colon form ``BAROMETER:0.3M`` (optional trailing unit).
-                    # Barometric height is more reliable than GPS altitude in
-                    # tight / FPV environments.
-                    baro_match = re.search(
-                        r"BAROMETER[(:]\s*([+-]?\d+\.?\d*)[A-Za-z]*\)?",
-                        telemetry_line,
-                    )
-                    if baro_match:
-                        telemetry_data["barometers"].append(
-                            float(baro_match.group(1))
-                        )
-
-                    # Extract camera info including extended fields
-                    iso_match = re.search(r"\[iso\s*:\s*(\d+)\]", telemetry_line)
-                    shutter_match = re.search(
-                        r"\[shutter\s*:\s*([^\]]+)\]", telemetry_line
-                    )
-                    # Aperture is reported two ways: legacy models use an
-                    # f-number*100 integer (``[fnum : 170]`` → f/1.7) while
-                    # current models (Avata 360, Mini 5 Pro, …) emit a literal
-                    # decimal (``[fnum: 1.9]``). Capture both; the value is
-                    # stored verbatim without interpretation.
-                    fnum_match = re.search(
-                        r"\[fnum\s*:\s*([+-]?\d+\.?\d*)\]", telemetry_line
-                    )
-                    ev_match = re.search(r"\[ev\s*:\s*([^\]]+)\]", telemetry_line)
-                    # P4 RTK compact single-line family uses free-standing
-                    # tokens (``F/5.6, SS 400, ISO 100, EV 0``) rather than
-                    # the bracketed ``[fnum:…]`` syntax. Fall back to those
-                    # when the bracket form did not match.
-                    if not fnum_match:
-                        fnum_match = re.search(
-                            r"(?<![A-Za-z])F/(\d+\.?\d*)", telemetry_line
-                        )
-                    if not shutter_match:
-                        shutter_match = re.search(
-                            r"(?<![A-Za-z])SS\s+(\d+(?:\.\d+)?)", telemetry_line
-                        )
-                    if not iso_match:
-                        iso_match = re.search(
-                            r"(?<![A-Za-z])ISO\s+(\d+)", telemetry_line
-                        )
-                    if not ev_match:
-                        ev_match = re.search(
-                            r"(?<![A-Za-z])EV\s+([+-]?\d+\.?\d*)", telemetry_line
-                        )
-                    ct_match = re.search(r"\[ct\s*:\s*([^\]]+)\]", telemetry_line)
-                    color_md_match = re.search(
-                        r"\[color_md\s*:\s*([^\]]+)\]", telemetry_line
-                    )
-                    focal_len_match = re.search(
-                        r"\[focal_len\s*:\s*([^\]]+)\]", telemetry_line
-                    )
-
-                    if (
-                        iso_match
-                        or shutter_match
-                        or fnum_match
-                        or ev_match
-                        or ct_match
-                        or color_md_match
-                        or focal_len_match
-                    ):
-                        camera_data = {}
-                        if iso_match:
-                            camera_data["iso"] = iso_match.group(1)
-                        if shutter_match:
-                            camera_data["shutter"] = shutter_match.group(1)
-                        if fnum_match:
-                            camera_data["fnum"] = fnum_match.group(1)
-                        if ev_match:
-                            camera_data["ev"] = ev_match.group(1)
-                        if ct_match:
-                            camera_data["ct"] = ct_match.group(1)
-                        if color_md_match:
-                            camera_data["color_md"] = color_md_match.group(1)
-                        if focal_len_match:
-                            camera_data["focal_len"] = focal_len_match.group(1)
-
-                        telemetry_data["camera_info"].append(camera_data)
+            home = None
+            for rec in read_srt_records(srt_path):
+                if not rec.complete:
+                    continue
+                if rec.cue is not None:
+                    telemetry_data["timestamps"].append(rec.cue)
+
+                # Comprehensive format with frame counters. Older firmware
+                # labels this ``SrtCnt``; newer firmware (Neo, Mini 5 Pro,
+                # Avata 360) uses ``FrameCnt``. Either is stored under the
+                # existing ``srt_counts`` key for backwards compatibility.
+                if rec.frame_count is not None or rec.diff_time is not None:
+                    telemetry_data["srt_counts"].append(rec.frame_count)
+                    telemetry_data["diff_times"].append(rec.diff_time)
+
+                # GPS: bracket ``[latitude: …] [longitude: …]`` first, then
+                # the ``GPS(lat,lon,alt)`` compact form (legacy, M300 unit
+                # suffix, P4 RTK).
+                if rec.lat is not None and rec.lon is not None:
+                    telemetry_data["gps_coords"].append((rec.lat, rec.lon))
+                elif rec.gps is not None:
+                    telemetry_data["gps_coords"].append(rec.gps[:2])
+
+                if rec.alt_pair is not None:
+                    telemetry_data["rel_altitudes"].append(float(rec.alt_pair[0]))
+                    telemetry_data["altitudes"].append(float(rec.alt_pair[1]))
+
+                # Barometric height is more reliable than GPS altitude in
+                # tight / FPV environments.
+                if rec.barometer is not None:
+                    telemetry_data["barometers"].append(rec.barometer)
+
+                camera_data = rec.camera
+                if camera_data:
+                    telemetry_data["camera_info"].append(camera_data)
+
+                if home is None and rec.home is not None:
+                    home = rec.home
 
             # Calculate summary statistics. Exclude pre-GPS-lock ``(0, 0)``
             # no-fix frames so the clip is not geotagged at Null Island and the
@@ -437,7 +354,8 @@ class DJIMetadataEmbedder:
                 telemetry_data["camera_settings"] = telemetry_data["camera_info"][0]
 
             if self.extract_home:
-                telemetry_data["home"] = parse_home(content)
+                # HOME is constant within a file, so the first one is used.
+                telemetry_data["home"] = Home(*home) if home is not None else None
 
         except Exception as e:
             logger.error("Error parsing SRT file %s: %s", srt_path, e)
@@ -451,6 +369,7 @@ class DJIMetadataEmbedder:
         telemetry: Dict[str, Any],
         output_path: Path,
         audio_path: Optional[Path] = None,
+        on_progress: Callable[[FfmpegProgress], None] | None = None,
     ) -> bool:
         """Embed SRT as subtitle track and add metadata using ffmpeg.
 
@@ -458,6 +377,10 @@ class DJIMetadataEmbedder:
         issue #246), it is added as a third input and its audio stream is muxed
         into the output. Audio is appended last so the SRT keeps input index 1
         and the existing ``-map 1`` subtitle mapping stays correct.
+
+        *on_progress* receives ffmpeg's live progress (output time, bytes
+        written, and the fraction/throughput/ETA derived from them) while
+        the mux runs.
         """
         import os
         import platform
@@ -539,8 +462,12 @@ class DJIMetadataEmbedder:
             # Output file
             cmd.extend(["-y", str(output_path)])
 
-            # Run ffmpeg
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Run ffmpeg, streaming its progress as it goes.
+            result = run_ffmpeg(
+                cmd,
+                duration=_ffprobe_duration(video_path) if on_progress else None,
+                on_progress=on_progress,
+            )
 
             if result.returncode == 0:
                 logger.info("Successfully processed: %s", video_path.name)
@@ -553,28 +480,94 @@ class DJIMetadataEmbedder:
             logger.error("Error processing %s: %s", video_path.name, e)
             return False
 
+    def append_metadata_in_place(
+        self, video_path: Path, srt_path: Path, telemetry: Dict[str, Any]
+    ) -> bool:
+        """Embed SRT and metadata into *video_path* itself, without a remux.
+
+        The overwrite-mode counterpart of :meth:`embed_metadata_ffmpeg`:
+        the SRT becomes a mov_text track and the location and filename date
+        become ``©xyz`` and the creation time, appended after the existing
+        media (see :mod:`.utils.mp4_append`). Only a few MB are written
+        however large the clip, and DJI's djmd/dbgi tracks are kept.
+
+        Returns False with the file unchanged when the clip cannot be
+        appended to or the result fails the duration check; the caller
+        then remuxes with ffmpeg.
+        """
+        # Cue text as the remux path's SRT conversion keeps it: line breaks
+        # and all, so both paths write the same subtitle track.
+        cues = []
+        try:
+            for cue, cue_end, text in read_srt_cues(srt_path):
+                start = cue_to_seconds(cue)
+                end = cue_to_seconds(cue_end)
+                if start is not None and end is not None:
+                    cues.append((start, end, text))
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning("Cannot read %s: %s", srt_path.name, e)
+            return False
+
+        location = None
+        if telemetry["first_gps"]:
+            lat, lon = telemetry["first_gps"]
+            location = f"{lat:+.6f}{lon:+.6f}/"
+        # The remux path hands ffmpeg the filename's wall-clock time without
+        # a zone, which it reads as local time; read it the same way here.
+        creation_time = None
+        m = re.search(r"DJI_(\d{8})_(\d{6})", video_path.stem)
+        if m:
+            try:
+                creation_time = datetime.strptime(
+                    m[1] + m[2], "%Y%m%d%H%M%S"
+                ).astimezone()
+            except ValueError:
+                pass
+
+        src_duration = _ffprobe_duration(video_path)
+        try:
+            appended = append_subtitle_track(
+                video_path, cues, location=location, creation_time=creation_time
+            )
+        except (OSError, BmffError) as e:
+            logger.info(
+                "Cannot embed %s in place (%s); remuxing", video_path.name, e
+            )
+            return False
+
+        # Same 1 s tolerance as _validate_embedded_output; the source's
+        # duration was read before the append changed the file.
+        out_duration = _ffprobe_duration(video_path)
+        if out_duration is None or (
+            src_duration is not None and out_duration + 1.0 < src_duration
+        ):
+            logger.warning(
+                "In-place embed of %s failed validation; restoring and remuxing",
+                video_path.name,
+            )
+            try:
+                appended.rollback()
+            except OSError as e:
+                logger.error("Could not restore %s: %s", video_path.name, e)
+            return False
+
+        logger.info(
+            "Successfully processed in place: %s (%d subtitle samples)",
+            video_path.name, appended.samples,
+        )
+        return True
+
     def embed_metadata_exiftool(
         self, video_path: Path, telemetry: Dict[str, Any]
     ) -> bool:
         """Use exiftool to embed GPS metadata (alternative/additional method)."""
-        import os
-        import platform
-
         try:
             if not telemetry["first_gps"]:
                 return False
 
             lat, lon = telemetry["first_gps"]
 
-            # Check for exiftool in environment variable first (Windows)
-            exiftool_cmd = "exiftool"
-            if platform.system() == "Windows":
-                env_exiftool = os.environ.get("DJIEMBED_EXIFTOOL_PATH")
-                if env_exiftool and Path(env_exiftool).exists():
-                    exiftool_cmd = env_exiftool
-
-            cmd = [
-                exiftool_cmd,
+            args = [
                 f"-GPSLatitude={abs(lat)}",
                 f'-GPSLatitudeRef={"N" if lat >= 0 else "S"}',
                 f"-GPSLongitude={abs(lon)}",
@@ -584,18 +577,29 @@ class DJIMetadataEmbedder:
             ]
 
             if telemetry["max_altitude"]:
-                cmd.insert(-2, f'-GPSAltitude={telemetry["max_altitude"]}')
-                cmd.insert(-2, "-GPSAltitudeRef=0")  # Above sea level
+                args.insert(-2, f'-GPSAltitude={telemetry["max_altitude"]}')
+                args.insert(-2, "-GPSAltitudeRef=0")  # Above sea level
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = call_exiftool(args)
             return result.returncode == 0
 
         except Exception as e:
             logger.error("ExifTool error: %s", e)
             return False
 
+    def _inventory_for(self, video_path: Path) -> DirectoryInventory:
+        """The run's listing of *video_path*'s folder (scanned if foreign)."""
+        inventory = self._inventory
+        if inventory is None or inventory.directory != video_path.parent:
+            inventory = _scan_inventory(video_path.parent)
+        return inventory
+
     @staticmethod
-    def _find_dat_log(video_path: Path, warnings: list[str]) -> Optional[Path]:
+    def _find_dat_log(
+        video_path: Path,
+        warnings: list[str],
+        inventory: DirectoryInventory | None = None,
+    ) -> Optional[Path]:
         """Locate the DAT log named after *video_path* for --dat-auto.
 
         Exact ``<video>.DAT`` (either case) wins; otherwise name-prefix
@@ -605,16 +609,12 @@ class DJIMetadataEmbedder:
         multi-match names the (alphabetically first) log it picked, so
         neither case is a silent no-op (issue #339).
         """
-        for ext in (".DAT", ".dat"):
-            cand = video_path.with_suffix(ext)
-            if cand.exists():
-                return cand
-        stem = video_path.stem.lower()
-        matches = sorted(
-            p
-            for p in video_path.parent.iterdir()
-            if p.suffix.lower() == ".dat" and p.stem.lower().startswith(stem)
-        )
+        if inventory is None:
+            inventory = _scan_inventory(video_path.parent)
+        exact = inventory.companion(video_path.stem, (".DAT", ".dat"))
+        if exact is not None:
+            return exact
+        matches = inventory.stem_prefixed(video_path.stem, ".dat")
         if not matches:
             msg = f"No DAT flight log found for: {video_path.name}"
             logger.warning(msg)
@@ -629,6 +629,321 @@ class DJIMetadataEmbedder:
             warnings.append(msg)
         return matches[0]
 
+    def _prepare_clip(self, video_path: Path) -> _ClipJob | tuple[str, list[str]]:
+        """Probe/parse stage: pair *video_path* with its companions and
+        parse its telemetry.
+
+        Returns the clip's job for the mux stage, or its final outcome and
+        warnings when there is nothing to mux (no SRT, or the journal shows
+        the output is current). The stages touch no shared state but the
+        thread-safe journal, so ``process_directory`` can run several clips
+        at once.
+        """
+        warnings: list[str] = []
+        inventory = self._inventory_for(video_path)
+        # Look for corresponding SRT file
+        srt_path = inventory.companion(video_path.stem, (".srt", ".SRT"))
+
+        if srt_path is None:
+            warning_msg = f"No SRT file found for: {video_path.name}"
+            logger.warning(warning_msg)
+            warnings.append(warning_msg)
+            return _FAILED, warnings
+
+        logger.debug("Processing %s", video_path.name)
+
+        # Overwriting an MP4 with no audio to mux in needs no remux: the
+        # subtitle track and metadata are appended to the file as it is.
+        in_place = (
+            self.overwrite
+            and self.container != "mkv"
+            and not self.audio_sidecar
+            and can_append_in_place(video_path)
+        )
+
+        # The MP4 muxer cannot carry DJI's djmd/dbgi data streams
+        # (see embed_metadata_ffmpeg), so the "with metadata" output
+        # would silently lose the manufacturer's own embedded
+        # telemetry. Say so instead of staying quiet (issue #478). An
+        # in-place append keeps every existing track.
+        if self.container != "mkv" and not in_place:
+            dji_tags = _dji_data_stream_tags(video_path)
+            if dji_tags:
+                streams = "/".join(dji_tags)
+                if self.overwrite:
+                    warning_msg = (
+                        f"{video_path.name} carries embedded DJI "
+                        f"telemetry ({streams}) that MP4 output cannot "
+                        "include; overwrite mode replaces the original, "
+                        "so this telemetry will be LOST. Use "
+                        "--container mkv to preserve it."
+                    )
+                else:
+                    warning_msg = (
+                        f"{video_path.name} carries embedded DJI "
+                        f"telemetry ({streams}) that MP4 output cannot "
+                        "include; the original file remains the "
+                        "authoritative source for it. Use --container "
+                        "mkv to preserve it in the output."
+                    )
+                logger.warning(warning_msg)
+                warnings.append(warning_msg)
+
+        # Optional DAT flight log (parsed below, once the clip is known to
+        # need embedding).
+        dat_file = None
+        if self.dat_path:
+            dat_file = self.dat_path
+        elif self.dat_autoscan:
+            dat_file = self._find_dat_log(video_path, warnings, inventory)
+        if dat_file is not None and not dat_file.exists():
+            dat_file = None
+
+        # Optionally pair a separate audio sidecar. The Neo 2 records
+        # audio to a same-basename .m4a next to the silent video; mux it
+        # back in on request (issue #246). Warn-and-continue when absent
+        # so mixed folders (some clips with audio, some without) still
+        # process every video.
+        audio_file = None
+        if self.audio_sidecar:
+            audio_file = inventory.companion(video_path.stem, (".m4a", ".M4A"))
+            if audio_file is None:
+                warning_msg = (
+                    f"No .m4a audio sidecar found for: {video_path.name}"
+                )
+                logger.warning(warning_msg)
+                warnings.append(warning_msg)
+            else:
+                # Sanity check: flag a large video/audio length gap (wrong
+                # pairing, truncated recording) but still mux — the user
+                # opted in and may want whatever audio exists. The tolerance
+                # is relative (max of a 2s floor and 5% of the clip) so
+                # normal container-rounding gaps on a correctly paired clip
+                # don't cry wolf, while gross mispairings still warn.
+                video_dur = _ffprobe_duration(video_path)
+                audio_dur = _ffprobe_duration(audio_file)
+                if (
+                    video_dur is not None
+                    and audio_dur is not None
+                    and abs(video_dur - audio_dur) > max(2.0, 0.05 * video_dur)
+                ):
+                    warning_msg = (
+                        f"Audio sidecar duration ({audio_dur:.1f}s) differs "
+                        f"from video ({video_dur:.1f}s) for "
+                        f"{video_path.name}; muxing anyway"
+                    )
+                    logger.warning(warning_msg)
+                    warnings.append(warning_msg)
+
+        # Final output path; write to temp first, then atomic move (issue #162).
+        # When overwrite (issue #163), destination = same as input file.
+        if self.overwrite:
+            output_path = video_path
+        else:
+            # MKV mode rewrites the extension so the preserved
+            # djmd/dbgi data streams land in a Matroska container.
+            out_suffix = (
+                ".mkv" if self.container == "mkv" else video_path.suffix
+            )
+            output_path = (
+                self.output_dir / f"{video_path.stem}_metadata{out_suffix}"
+            )
+        temp_output_path = output_path.with_name(
+            output_path.stem + _TEMP_SUFFIX + output_path.suffix
+        )
+
+        # Resume: an output the journal recorded from these exact inputs
+        # and options is already done (a rerun after an interrupted run).
+        identities = input_identities(
+            {"video": video_path, "srt": srt_path, "audio": audio_file, "dat": dat_file}
+        )
+        journal = self._journal
+        if (
+            journal is not None
+            and not self.force
+            and journal.is_current(video_path, output_path, identities, self._options)
+        ):
+            logger.info("%s is up to date; skipping", video_path.name)
+            return _UP_TO_DATE, warnings
+
+        # Parse SRT telemetry
+        telemetry = self.parse_dji_srt(srt_path)
+        apply_redaction(telemetry, self.redact)
+
+        # Optionally parse DAT telemetry
+        if dat_file is not None:
+            try:
+                dat_data = parse_dat_v13(dat_file)
+                telemetry["dat_records"] = dat_data.get("records", [])
+            except Exception as e:
+                logger.warning(
+                    "Failed to parse DAT file %s: %s", dat_file.name, e
+                )
+
+        return _ClipJob(
+            video_path=video_path,
+            srt_path=srt_path,
+            audio_file=audio_file,
+            output_path=output_path,
+            temp_output_path=temp_output_path,
+            identities=identities,
+            telemetry=telemetry,
+            in_place=in_place,
+            warnings=warnings,
+        )
+
+    def _mux_clip(
+        self,
+        job: _ClipJob,
+        on_ffmpeg_progress: Callable[[FfmpegProgress], None] | None = None,
+    ) -> None:
+        """Mux stage: embed *job*'s SRT and metadata, setting ``job.muxed``.
+
+        In place when possible; otherwise (or if that fails, leaving the
+        clip untouched) remux with ffmpeg into the temp output.
+        """
+        touched = [job.video_path, job.temp_output_path]
+        if job.audio_file is not None:
+            touched.append(job.audio_file)
+        with self._devices.hold(touched) if self._devices else nullcontext():
+            if job.in_place and self.append_metadata_in_place(
+                job.video_path, job.srt_path, job.telemetry
+            ):
+                job.muxed = _IN_PLACE
+            elif self.embed_metadata_ffmpeg(
+                job.video_path,
+                job.srt_path,
+                job.telemetry,
+                job.temp_output_path,
+                audio_path=job.audio_file,
+                on_progress=on_ffmpeg_progress,
+            ):
+                job.muxed = _TEMP
+            else:
+                _discard_temp(job.temp_output_path)
+
+    def _finish_clip(self, job: _ClipJob, use_exiftool: bool) -> tuple[str, list[str]]:
+        """Finish stage: validate and move the output into place, then
+        write the telemetry JSON and the journal record."""
+        video_path, output_path = job.video_path, job.output_path
+        temp_output_path, telemetry = job.temp_output_path, job.telemetry
+        identities, warnings = job.identities, job.warnings
+        journal = self._journal
+        if job.muxed is None:
+            return _FAILED, warnings
+        if job.muxed == _TEMP:
+            if not _validate_embedded_output(video_path, temp_output_path):
+                logger.error(
+                    "Validation failed for %s; output not saved.",
+                    video_path.name,
+                )
+                _discard_temp(temp_output_path)
+                if journal is not None:
+                    journal.record(
+                        video_path, output_path, identities, self._options,
+                        validated=False,
+                    )
+                return _FAILED, warnings
+            try:
+                os.replace(temp_output_path, output_path)
+            except OSError as e:
+                logger.error(
+                    "Failed to move temp output to %s: %s",
+                    output_path,
+                    e,
+                )
+                _discard_temp(temp_output_path)
+                return _FAILED, warnings
+
+        # Optionally use exiftool for additional metadata
+        if use_exiftool:
+            self.embed_metadata_exiftool(output_path, telemetry)
+
+        # Save telemetry summary as JSON (atomic write)
+        json_path = output_path.parent / f"{video_path.stem}_telemetry.json"
+        json_tmp_path = Path(str(json_path) + _TEMP_SUFFIX)
+        json_data = {
+            "filename": video_path.name,
+            "first_gps": telemetry["first_gps"],
+            "average_gps": telemetry["avg_gps"],
+            "max_altitude": telemetry["max_altitude"],
+            "max_relative_altitude": telemetry.get("max_rel_altitude"),
+            "flight_duration": telemetry["flight_duration"],
+            "num_gps_points": len(telemetry["gps_coords"]),
+            "camera_settings": telemetry.get("camera_settings", {}),
+            "dat_records": len(telemetry.get("dat_records", [])),
+        }
+        # Barometric altitude is only present on some formats
+        # (Avata 2 / Matrice 300); include it when captured.
+        if telemetry.get("barometers"):
+            json_data["barometers"] = telemetry["barometers"]
+        # HOME is opt-in; emit the key only when extracted. It is
+        # null when requested but absent/dropped, present as a
+        # marker otherwise. Never affects the MP4 itself.
+        if "home" in telemetry:
+            h = telemetry["home"]
+            json_data["home"] = (
+                {"lat": h.lat, "lon": h.lon, "alt": h.alt} if h else None
+            )
+        try:
+            with open(json_tmp_path, "w", encoding="utf-8") as f:
+                json.dump(json_data, f, indent=2)
+            os.replace(json_tmp_path, json_path)
+        except OSError as e:
+            logger.warning("Failed to write telemetry JSON: %s", e)
+            _discard_temp(json_tmp_path)
+        if journal is not None:
+            if self.overwrite:
+                # The source now *is* the output; a rerun will see this.
+                identities["video"] = file_identity(output_path)
+            journal.record(video_path, output_path, identities, self._options)
+        return _PROCESSED, warnings
+
+    def _process_video(
+        self,
+        video_path: Path,
+        use_exiftool: bool,
+        on_ffmpeg_progress: Callable[[FfmpegProgress], None] | None = None,
+    ) -> tuple[str, list[str]]:
+        """Run all three stages for one clip, back to back.
+
+        Returns the outcome (``"processed"``, ``"up_to_date"`` when the
+        journal shows the output is already current, or ``"failed"``) and
+        the clip's warnings, in the order they arose.
+        """
+        job = self._prepare_clip(video_path)
+        if not isinstance(job, _ClipJob):
+            return job
+        self._mux_clip(job, on_ffmpeg_progress)
+        return self._finish_clip(job, use_exiftool)
+
+    def _device_slots(self, video_files: list[Path], workers: int) -> DeviceSlots:
+        """Per-device mux caps for this run's source and output devices."""
+        destination = self.directory if self.overwrite else self.output_dir
+        samples: dict[int, Path | None] = {}
+        for video_path in video_files:
+            dev = device_id(video_path)
+            if dev is not None:
+                samples.setdefault(dev, video_path)
+        dev = device_id(destination)
+        if dev is not None:
+            samples.setdefault(dev, None)
+        caps = {
+            dev: min(
+                workers,
+                self.device_jobs
+                if self.device_jobs is not None
+                else auto_device_cap(dev, sample, workers),
+            )
+            for dev, sample in samples.items()
+        }
+        for dev, cap in caps.items():
+            logger.info(
+                "Device %s: up to %d concurrent mux%s",
+                dev, cap, "" if cap == 1 else "es",
+            )
+        return DeviceSlots(caps)
+
     def process_directory(
         self,
         use_exiftool: bool = False,
@@ -638,17 +953,40 @@ class DJIMetadataEmbedder:
 
         ``on_progress(index, total, name)`` is called (1-based) as each video
         is picked up; passing it also disables the interactive progress bar
-        (the caller owns the display).
+        (the caller owns the display). With ``jobs > 1`` clips run
+        concurrently, but ``index`` still counts up by one per call and the
+        result's warnings keep the sorted file order of a sequential run.
+
+        Clips flow through three stages (probe/parse, mux, validate/JSON)
+        that overlap across clips even with ``jobs == 1``; the result's
+        ``stages`` maps each to its :class:`~.utils.pipeline.StageStats`
+        timings.
 
         Returns:
             Dict containing processing results and statistics
         """
-        # Find all supported video files (.mp4 plus DJI 360 .osv/.lrf).
-        video_files = discover_video_files(self.directory)
+        # One listing of the folder answers discovery (.mp4 plus DJI 360
+        # .osv/.lrf) and every clip's SRT/audio/DAT companion lookup.
+        self._inventory = _scan_inventory(self.directory)
+        video_files = discover_video_files(self.directory, self._inventory)
+        self._journal = EmbedJournal(
+            self.directory if self.overwrite else self.output_dir
+        )
+        self._options = options_digest(
+            {
+                "overwrite": self.overwrite,
+                "container": self.container,
+                "redact": self.redact,
+                "extract_home": self.extract_home,
+                "audio_sidecar": self.audio_sidecar,
+                "exiftool": use_exiftool,
+            }
+        )
 
         # Initialize result structure
         result: Dict[str, Any] = {
             "processed": 0,
+            "up_to_date": 0,
             "total_files": len(video_files),
             "warnings": [],
             "errors": [],
@@ -667,219 +1005,90 @@ class DJIMetadataEmbedder:
         else:
             logger.info("Output directory: %s\n", self.output_dir)
 
-        success_count = 0
+        total = len(video_files)
+        picked = 0
 
         # The caller owns the display when it passes a callback.
         bar = Progress(disable=True) if on_progress is not None else Progress()
         with bar as progress:
-            task = progress.add_task("Processing videos", total=len(video_files))
-            for index, video_path in enumerate(video_files, start=1):
-                if on_progress is not None:
-                    on_progress(index, len(video_files), video_path.name)
-                # Look for corresponding SRT file
-                srt_path = video_path.with_suffix(".srt")
-                if not srt_path.exists():
-                    srt_path = video_path.with_suffix(".SRT")
-
-                if not srt_path.exists():
-                    warning_msg = f"No SRT file found for: {video_path.name}"
-                    logger.warning(warning_msg)
-                    result["warnings"].append(warning_msg)
-                    progress.advance(task)
-                    continue
+            task = progress.add_task("Processing videos", total=total)
 
+            def prepare(video_path: Path) -> _ClipJob | tuple[str, list[str]]:
+                nonlocal picked
+                # One prepare worker picks clips up in order, so the
+                # callback sees 1..total in order.
+                picked += 1
+                if on_progress is not None:
+                    on_progress(picked, total, video_path.name)
                 progress.update(task, description=video_path.name)
-                logger.debug("Processing %s", video_path.name)
-
-                # The MP4 muxer cannot carry DJI's djmd/dbgi data streams
-                # (see embed_metadata_ffmpeg), so the "with metadata" output
-                # would silently lose the manufacturer's own embedded
-                # telemetry. Say so instead of staying quiet (issue #478).
-                if self.container != "mkv":
-                    dji_tags = _dji_data_stream_tags(video_path)
-                    if dji_tags:
-                        streams = "/".join(dji_tags)
-                        if self.overwrite:
-                            warning_msg = (
-                                f"{video_path.name} carries embedded DJI "
-                                f"telemetry ({streams}) that MP4 output cannot "
-                                "include; overwrite mode replaces the original, "
-                                "so this telemetry will be LOST. Use "
-                                "--container mkv to preserve it."
-                            )
-                        else:
-                            warning_msg = (
-                                f"{video_path.name} carries embedded DJI "
-                                f"telemetry ({streams}) that MP4 output cannot "
-                                "include; the original file remains the "
-                                "authoritative source for it. Use --container "
-                                "mkv to preserve it in the output."
-                            )
-                        logger.warning(warning_msg)
-                        result["warnings"].append(warning_msg)
-
-                # Parse SRT telemetry
-                telemetry = self.parse_dji_srt(srt_path)
-                apply_redaction(telemetry, self.redact)
-
-                # Optionally parse DAT telemetry
-                dat_file = None
-                if self.dat_path:
-                    dat_file = self.dat_path
-                elif self.dat_autoscan:
-                    dat_file = self._find_dat_log(video_path, result["warnings"])
-                if dat_file and dat_file.exists():
-                    try:
-                        dat_data = parse_dat_v13(dat_file)
-                        telemetry["dat_records"] = dat_data.get("records", [])
-                    except Exception as e:
-                        logger.warning(
-                            "Failed to parse DAT file %s: %s", dat_file.name, e
-                        )
-
-                # Optionally pair a separate audio sidecar. The Neo 2 records
-                # audio to a same-basename .m4a next to the silent video; mux it
-                # back in on request (issue #246). Warn-and-continue when absent
-                # so mixed folders (some clips with audio, some without) still
-                # process every video.
-                audio_file = None
-                if self.audio_sidecar:
-                    for ext in (".m4a", ".M4A"):
-                        cand = video_path.with_suffix(ext)
-                        if cand.exists():
-                            audio_file = cand
-                            break
-                    if audio_file is None:
-                        warning_msg = (
-                            f"No .m4a audio sidecar found for: {video_path.name}"
-                        )
-                        logger.warning(warning_msg)
-                        result["warnings"].append(warning_msg)
-                    else:
-                        # Sanity check: flag a large video/audio length gap (wrong
-                        # pairing, truncated recording) but still mux — the user
-                        # opted in and may want whatever audio exists. The tolerance
-                        # is relative (max of a 2s floor and 5% of the clip) so
-                        # normal container-rounding gaps on a correctly paired clip
-                        # don't cry wolf, while gross mispairings still warn.
-                        video_dur = _ffprobe_duration(video_path)
-                        audio_dur = _ffprobe_duration(audio_file)
-                        if (
-                            video_dur is not None
-                            and audio_dur is not None
-                            and abs(video_dur - audio_dur) > max(2.0, 0.05 * video_dur)
-                        ):
-                            warning_msg = (
-                                f"Audio sidecar duration ({audio_dur:.1f}s) differs "
-                                f"from video ({video_dur:.1f}s) for "
-                                f"{video_path.name}; muxing anyway"
-                            )
-                            logger.warning(warning_msg)
-                            result["warnings"].append(warning_msg)
-
-                # Final output path; write to temp first, then atomic move (issue #162).
-                # When overwrite (issue #163), destination = same as input file.
-                if self.overwrite:
-                    output_path = video_path
-                else:
-                    # MKV mode rewrites the extension so the preserved
-                    # djmd/dbgi data streams land in a Matroska container.
-                    out_suffix = (
-                        ".mkv" if self.container == "mkv" else video_path.suffix
-                    )
-                    output_path = (
-                        self.output_dir / f"{video_path.stem}_metadata{out_suffix}"
-                    )
-                temp_output_path = output_path.with_name(
-                    output_path.stem + _TEMP_SUFFIX + output_path.suffix
-                )
-
-                # Embed metadata using ffmpeg into temp file
-                if self.embed_metadata_ffmpeg(
-                    video_path,
-                    srt_path,
-                    telemetry,
-                    temp_output_path,
-                    audio_path=audio_file,
-                ):
-                    if _validate_embedded_output(video_path, temp_output_path):
-                        try:
-                            os.replace(temp_output_path, output_path)
-                        except OSError as e:
-                            logger.error(
-                                "Failed to move temp output to %s: %s",
-                                output_path,
-                                e,
-                            )
-                            if temp_output_path.exists():
-                                try:
-                                    temp_output_path.unlink()
-                                except OSError:
-                                    pass
-                            progress.advance(task)
-                            continue
-                        success_count += 1
-
-                        # Optionally use exiftool for additional metadata
-                        if use_exiftool:
-                            self.embed_metadata_exiftool(output_path, telemetry)
-
-                        # Save telemetry summary as JSON (atomic write)
-                        json_path = output_path.parent / f"{video_path.stem}_telemetry.json"
-                        json_tmp_path = Path(str(json_path) + _TEMP_SUFFIX)
-                        json_data = {
-                            "filename": video_path.name,
-                            "first_gps": telemetry["first_gps"],
-                            "average_gps": telemetry["avg_gps"],
-                            "max_altitude": telemetry["max_altitude"],
-                            "max_relative_altitude": telemetry.get("max_rel_altitude"),
-                            "flight_duration": telemetry["flight_duration"],
-                            "num_gps_points": len(telemetry["gps_coords"]),
-                            "camera_settings": telemetry.get("camera_settings", {}),
-                            "dat_records": len(telemetry.get("dat_records", [])),
-                        }
-                        # Barometric altitude is only present on some formats
-                        # (Avata 2 / Matrice 300); include it when captured.
-                        if telemetry.get("barometers"):
-                            json_data["barometers"] = telemetry["barometers"]
-                        # HOME is opt-in; emit the key only when extracted. It is
-                        # null when requested but absent/dropped, present as a
-                        # marker otherwise. Never affects the MP4 itself.
-                        if "home" in telemetry:
-                            h = telemetry["home"]
-                            json_data["home"] = (
-                                {"lat": h.lat, "lon": h.lon, "alt": h.alt} if h else None
-                            )
-                        try:
-                            with open(json_tmp_path, "w", encoding="utf-8") as f:
-                                json.dump(json_data, f, indent=2)
-                            os.replace(json_tmp_path, json_path)
-                        except OSError as e:
-                            logger.warning("Failed to write telemetry JSON: %s", e)
-                            if json_tmp_path.exists():
-                                try:
-                                    json_tmp_path.unlink()
-                                except OSError:
-                                    pass
-                    else:
-                        logger.error(
-                            "Validation failed for %s; output not saved.",
-                            video_path.name,
-                        )
-                        if temp_output_path.exists():
-                            try:
-                                temp_output_path.unlink()
-                            except OSError:
-                                pass
+                job = self._prepare_clip(video_path)
+                if not isinstance(job, _ClipJob):
                     progress.advance(task)
-                else:
-                    if temp_output_path.exists():
-                        try:
-                            temp_output_path.unlink()
-                        except OSError:
-                            pass
+                return job
+
+            def mux(job: _ClipJob | tuple[str, list[str]]):
+                if not isinstance(job, _ClipJob):
+                    return job
+                name = job.video_path.name
+
+                def report(update: FfmpegProgress) -> None:
+                    progress.update(task, description=_describe_mux(name, update))
+                    if self.on_clip_progress is not None:
+                        self.on_clip_progress(name, update)
+
+                self._mux_clip(job, report)
+                return job
+
+            def finish(job: _ClipJob | tuple[str, list[str]]) -> tuple[str, list[str]]:
+                if not isinstance(job, _ClipJob):
+                    return job
+                try:
+                    return self._finish_clip(job, use_exiftool)
+                except BaseException:
+                    _discard_temp(job.temp_output_path)
+                    raise
+                finally:
                     progress.advance(task)
 
+            # Probe/parse -> mux -> validate/JSON, each stage in its own
+            # thread(s) so clip n+1 parses while clip n muxes and clip n-1
+            # validates. ``jobs`` muxes run at once. The bounded queues
+            # keep at most jobs + 2 temp outputs on disk: one per running
+            # mux, one waiting for the finish stage and one being finished.
+            # If the run stops early, the ones not finished are removed.
+            workers = min(self.jobs, total)
+            self._devices = (
+                self._device_slots(video_files, workers) if workers > 1 else None
+            )
+
+            def drop(job: _ClipJob | tuple[str, list[str]]) -> None:
+                # A clip the pipeline stopped before finishing (a failed
+                # stage, Ctrl-C): its mux output will never be moved into
+                # place.
+                if isinstance(job, _ClipJob):
+                    _discard_temp(job.temp_output_path)
+
+            outcomes, stats = run_pipeline(
+                video_files,
+                [
+                    Stage("prepare", prepare),
+                    Stage("mux", mux, workers=workers, capacity=workers, discard=drop),
+                    Stage("finish", finish, discard=drop),
+                ],
+            )
+        result["stages"] = {st.name: st.as_dict() for st in stats}
+        for st in stats:
+            logger.debug(
+                "stage %s: %d items, busy %.2fs, waiting %.2fs, blocked %.2fs",
+                st.name, st.items, st.busy_s, st.wait_s, st.blocked_s,
+            )
+
+        # Merge in input order: the result reads the same for any --jobs.
+        success_count = 0
+        for status, warnings in outcomes:
+            success_count += status == _PROCESSED
+            result["up_to_date"] += status == _UP_TO_DATE
+            result["warnings"].extend(warnings)
         result["processed"] = success_count
         
         logger.info(
@@ -887,6 +1096,11 @@ class DJIMetadataEmbedder:
             success_count,
             len(video_files),
         )
+        if result["up_to_date"]:
+            logger.info(
+                "%d already up to date (use --force to re-embed them)",
+                result["up_to_date"],
+            )
         logger.info("Processed files saved to: %s", self.output_dir)
         
         return result
@@ -18,6 +18,7 @@ from .flightmap import (
 )
 from .flightmap3d_html import flights_to_3d_html, write_flights_3d_html
 from .flightmap_html import flights_to_html, write_flights_html
+from .flightmap_tiles import write_flight_tiles
 from .footprint import FOV_TABLE, Footprint, build_footprints, lens_for
 from .geojson import convert_to_geojson, track_to_geojson
 from .html_viewer import convert_to_html, track_to_html
@@ -35,6 +36,7 @@ from .photomap import (
     write_photos_kml,
 )
 from .photomap_html import parse_popup_fields, photos_to_html, write_photos_html
+from .photomap_thumbs import parse_thumb_dir
 from .serve import serve_directory
 from .tiles import DEFAULT_TILE_STYLE, TILE_STYLES, TileStyle
 from .solar import sun_position
@@ -67,6 +69,7 @@ __all__ = [
     "photos_to_kml",
     "write_photos_kml",
     "parse_popup_fields",
+    "parse_thumb_dir",
     "photos_to_html",
     "write_photos_html",
     "DEFAULT_TILE_STYLE",
@@ -87,6 +90,7 @@ __all__ = [
     "write_flights_html",
     "flights_to_3d_html",
     "write_flights_3d_html",
+    "write_flight_tiles",
     "write_mixed_html",
     "serve_directory",
 ]
@@ -12,7 +12,9 @@ from __future__ import annotations
 import json
 import logging
 import posixpath
-from collections.abc import Callable
+from array import array
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -20,10 +22,26 @@ from statistics import median
 from xml.sax.saxutils import escape
 
 from .. import utilities
-from ..utilities import load_samples, redact_coords
+from ..utilities import (
+    _NO_DATETIME,
+    _ONE_US,
+    TelemetryFrame,
+    load_frame,
+    redact_coords,
+)
+from ..utils.cache import TelemetryCache, active_cache, use_cache
+from ..utils.journal import _stat_identity
+from .flightmap_manifest import FlightManifest, _dt, _us
 from .footprint import DEFAULT_LENS, fov_degrees
-from .geometry import haversine_m
-from .track import Track, TrackPoint, _cue_seconds, build_track_from_samples
+from .geometry import haversine_m, simplify_indices
+from .track import (
+    Track,
+    TrackPoint,
+    _cue_seconds,
+    _resolve_offset,
+    _track_point,
+    _utc_column,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +71,13 @@ _MAX_SPEED_MS = 30.0
 
 @dataclass
 class _ScanEntry:
-    """A scanned track plus its raw SRT wall-clock boundaries.
+    """A scanned SRT in columnar form plus its raw SRT wall-clock boundaries.
+
+    ``frame`` holds every GPS-fixed sample at full rate and ``utc_us`` their
+    resolved UTC (see :func:`.track._utc_column`). ``track`` carries the
+    flight's name and clock metadata but no points: DJI logs ~30 samples a
+    second and display keeps one, so :func:`_materialize_flight` builds
+    :class:`TrackPoint` objects only for the rows that survive decimation.
 
     ``first_dt``/``last_dt`` are the *unresolved local* datetimes straight from
     the SRT blocks (``None`` for formats without a datetime line). Split-file
@@ -61,11 +85,58 @@ class _ScanEntry:
     both segments share the same unknown offset, so the gap is exact even when
     timezone auto-detection fails, and it never falls back to file mtimes,
     which zip/cloud copies rewrite.
+
+    ``first_fix``/``last_fix`` and ``first_utc_us``/``last_utc_us`` are the
+    boundary rows joining looks at. An entry restored from a
+    :class:`.flightmap_manifest.FlightManifest` has only these, with
+    ``frame``/``utc_us`` left ``None`` until its chain must be rebuilt.
+
+    ``shift_us`` is the clock rebase :func:`join_split_flights` applies when
+    the entry continues a previous segment.
+
+    ``key`` is the SRT's path below the scan root, suffix included. Unlike
+    ``track.name`` it is unique — ``DJI_0001.SRT`` and ``DJI_0001.srt`` are
+    two files on a case-sensitive file system — so the manifest is keyed by it.
     """
 
     track: Track
+    key: str
     first_dt: datetime | None
     last_dt: datetime | None
+    first_fix: tuple[float, float]
+    last_fix: tuple[float, float]
+    first_utc_us: int
+    last_utc_us: int
+    frame: TelemetryFrame | None = None
+    utc_us: array | None = None
+    shift_us: int = 0
+
+    @classmethod
+    def from_frame(
+        cls, track: Track, key: str, frame: TelemetryFrame, utc_us: array
+    ) -> "_ScanEntry":
+        return cls(
+            track,
+            key,
+            frame.dt(0),
+            frame.dt(-1),
+            (frame.lat[0], frame.lon[0]),
+            (frame.lat[-1], frame.lon[-1]),
+            utc_us[0],
+            utc_us[-1],
+            frame,
+            utc_us,
+        )
+
+    def end_utc_us(self) -> int:
+        """UTC of the last row after the join rebase (``_NO_DATETIME`` if unknown)."""
+        us = self.last_utc_us
+        return us if us == _NO_DATETIME else us + self.shift_us
+
+    def columns(self) -> tuple[TelemetryFrame, array]:
+        """``frame`` and ``utc_us``, which every entry of a chain being built has."""
+        assert self.frame is not None and self.utc_us is not None
+        return self.frame, self.utc_us
 
 
 def _joinable(prev: _ScanEntry, nxt: _ScanEntry, max_gap_s: float) -> bool:
@@ -79,14 +150,13 @@ def _joinable(prev: _ScanEntry, nxt: _ScanEntry, max_gap_s: float) -> bool:
     # marginally before the old file's last one is flushed.
     if not -1.0 <= gap <= max_gap_s:
         return False
-    a, b = prev.track.points[-1], nxt.track.points[0]
     limit = _JITTER_FLOOR_M + max(gap, 0.0) * _MAX_SPEED_MS
-    return haversine_m(a.lat, a.lon, b.lat, b.lon) <= limit
+    return haversine_m(*prev.last_fix, *nxt.first_fix) <= limit
 
 
 def join_split_flights(
     entries: list[_ScanEntry], max_gap_s: float = 15.0
-) -> list[Track]:
+) -> list[list[_ScanEntry]]:
     """Chain size-split recordings into single flights.
 
     DJI closes the MP4/SRT pair when it hits the 4 GB container limit and
@@ -96,46 +166,44 @@ def join_split_flights(
     of the previous one ending, and the track resumes within the distance the
     drone could plausibly have covered in that gap. Consecutive file numbers
     are deliberately not required — photos share DJI's numbering counter, so
-    segment numbers can skip. A joined track keeps the first segment's name
-    and lists all sources in :attr:`Track.segments`.
+    segment numbers can skip. Returns one chain of entries per flight;
+    :func:`_materialize_flight` turns a chain into a track that keeps the
+    first segment's name and lists all sources in :attr:`Track.segments`.
+
+    Each directory is chained on its own, in time order, so a flight in
+    another folder recorded in between cannot break a chain — and a folder's
+    flights depend only on its own files.
     """
     ordered = sorted(
         entries,
-        key=lambda e: (e.first_dt is None, e.first_dt or datetime.min, e.track.name),
+        key=lambda e: (
+            posixpath.dirname(e.track.name),
+            e.first_dt is None,
+            e.first_dt or datetime.min,
+            e.track.name,
+        ),
     )
-    flights: list[_ScanEntry] = []
+    flights: list[list[_ScanEntry]] = []
     for entry in ordered:
-        if flights and _joinable(flights[-1], entry, max_gap_s):
-            prev = flights[-1]
-            if prev.track.segments is None:
-                prev.track.segments = [prev.track.name]
-            prev.track.segments.append(entry.track.name)
+        if flights and _joinable(flights[-1][-1], entry, max_gap_s):
+            prev = flights[-1][-1]
             # Rebase the appended segment's clock onto the previous one using
             # the raw SRT gap. When each file's UTC was synthesized from its
             # own mtime (timezone auto-detection failed), the segments'
             # timelines don't line up and the joined duration would collapse
             # to one file's length; with properly resolved offsets the shift
             # is zero.
-            prev_end_utc = prev.track.points[-1].utc
-            first_utc = entry.track.points[0].utc
-            if prev_end_utc is not None and first_utc is not None:
+            prev_end_us = prev.end_utc_us()
+            first_us = entry.first_utc_us
+            if prev_end_us != _NO_DATETIME and first_us != _NO_DATETIME:
                 # _joinable guaranteed both boundary datetimes exist.
                 assert prev.last_dt is not None and entry.first_dt is not None
-                shift = prev_end_utc + (entry.first_dt - prev.last_dt) - first_utc
-                if shift:
-                    for p in entry.track.points:
-                        if p.utc is not None:
-                            p.utc += shift
-            # Stamp before extending: segments was appended just above, so the
-            # index of the segment being added is len(segments) - 1.
-            seg_index = len(prev.track.segments) - 1
-            for p in entry.track.points:
-                p.segment = seg_index
-            prev.track.points.extend(entry.track.points)
-            prev.last_dt = entry.last_dt
+                gap_us = (entry.first_dt - prev.last_dt) // _ONE_US
+                entry.shift_us = prev_end_us + gap_us - first_us
+            flights[-1].append(entry)
         else:
-            flights.append(entry)
-    return [e.track for e in flights]
+            flights.append([entry])
+    return flights
 
 
 # DJI logs one GPS point per video frame (~30 Hz); at archive scale that
@@ -151,7 +219,8 @@ def _decimate_points(
 
     Timing comes from each point's resolved UTC; points without one are kept
     (no basis for thinning). Must run *after* split-joining — the continuity
-    check needs the raw boundary fixes.
+    check needs the raw boundary fixes. :func:`_materialize_flight` applies
+    the same rule to scanned columns.
     """
     if len(points) <= 2:
         return points
@@ -167,6 +236,63 @@ def _decimate_points(
     return kept
 
 
+def _materialize_flight(
+    chain: list[_ScanEntry],
+    interval_s: float = _DISPLAY_INTERVAL_S,
+    simplify_m: float | None = None,
+) -> Track:
+    """Build the :class:`Track` for one flight chain, decimated on the fly.
+
+    Walks the chained frames in order with the :func:`_decimate_points` rule
+    (first and last rows kept, others at most one per *interval_s* of rebased
+    UTC) and materialises only the kept rows, each stamped with the index of
+    its source segment. With *simplify_m* the rows are chosen instead by
+    :func:`.geometry.simplify_indices` on each segment's full-rate columns,
+    so no kept point strays more than *simplify_m* metres (horizontally or
+    in altitude) from the drawn line.
+    """
+    track = chain[0].track
+    if len(chain) > 1:
+        track.segments = [e.track.name for e in chain]
+    points: list[TrackPoint] = []
+    if simplify_m is not None:
+        for segment, entry in enumerate(chain):
+            frame, utc_us = entry.columns()
+            shift_us = entry.shift_us
+            lat, lon = frame.lat, frame.lon
+            for i in simplify_indices(lat, lon, frame.alt, simplify_m):
+                us = utc_us[i]
+                if us != _NO_DATETIME:
+                    us += shift_us
+                points.append(_track_point(frame, i, lat[i], lon[i], us, segment))
+        track.points = points
+        return track
+    last_row = sum(len(e.columns()[0]) for e in chain) - 1
+    kept_us = _NO_DATETIME
+    row = 0
+    for segment, entry in enumerate(chain):
+        frame, utc_us = entry.columns()
+        shift_us = entry.shift_us
+        lat, lon = frame.lat, frame.lon
+        for i in range(len(frame)):
+            us = utc_us[i]
+            if us != _NO_DATETIME:
+                us += shift_us
+            if (
+                0 < row < last_row
+                and us != _NO_DATETIME
+                and kept_us != _NO_DATETIME
+                and (us - kept_us) / 1e6 < interval_s
+            ):
+                row += 1
+                continue
+            points.append(_track_point(frame, i, lat[i], lon[i], us, segment))
+            kept_us = us
+            row += 1
+    track.points = points
+    return track
+
+
 class _TzWarningAggregator(logging.Filter):
     """Collapse per-file timezone auto-detection warnings into one summary.
 
@@ -190,6 +316,179 @@ class _TzWarningAggregator(logging.Filter):
         return True
 
 
+# What scanning one SRT yields: its GPS-fixed rows, their resolved UTC, the
+# local offset and the ``utc_source`` label. ``None`` when the file has no
+# fix; an error message when it could not be read.
+_Scanned = tuple[TelemetryFrame, array, timedelta | None, str]
+
+# A _Scanned as a --jobs worker sends it back: both columns as raw bytes.
+_Packed = tuple[bytes, bytes, timedelta | None, str]
+
+
+def _scan_file(path: Path, tz_offset: timedelta | None) -> _Scanned | str | None:
+    """Load *path* and resolve each row's UTC (see :func:`scan_flights`)."""
+    try:
+        frame = load_frame(path)
+        if not len(frame):
+            return None
+        mtime_utc = datetime.fromtimestamp(
+            path.stat().st_mtime, tz=timezone.utc
+        ).replace(tzinfo=None)
+        offset, utc_source = _resolve_offset(
+            frame, assume_utc=False, tz_offset=tz_offset, mtime_utc=mtime_utc
+        )
+        return frame, _utc_column(frame, offset, mtime_utc), offset, utc_source
+    except (OSError, ValueError) as exc:
+        return str(exc)
+
+
+class _RecordCapture(logging.Handler):
+    """Hold a scan worker's log records for the parent to re-emit.
+
+    Records are flattened to their final message so they pickle, and the
+    parent replays them in file order through the logger that made them —
+    where :class:`_TzWarningAggregator` counts them as if the file had been
+    scanned in-process.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+# Per-process state of a --jobs scan worker, set by _init_scan_worker.
+_worker_capture = _RecordCapture()
+_worker_cache: TelemetryCache | None = None
+_worker_tz_offset: timedelta | None = None
+
+
+def _init_scan_worker(
+    level: int,
+    cache_spec: tuple[Path, int] | None,
+    tz_offset: timedelta | None,
+) -> None:
+    """Pool initializer: route package logging into the record capture."""
+    global _worker_cache, _worker_tz_offset
+    package = logging.getLogger(__name__.partition(".")[0])
+    package.handlers[:] = [_worker_capture]
+    package.setLevel(level)
+    package.propagate = False
+    # A forked worker inherits the parent's aggregator; the parent must see
+    # every timezone warning to count it.
+    util_logger = logging.getLogger(utilities.__name__)
+    for f in list(util_logger.filters):
+        if isinstance(f, _TzWarningAggregator):
+            util_logger.removeFilter(f)
+    _worker_cache = TelemetryCache(*cache_spec) if cache_spec else None
+    _worker_tz_offset = tz_offset
+
+
+def _scan_worker(
+    path: Path,
+) -> tuple[_Packed | str | None, list[logging.LogRecord], int, int]:
+    """Pool task: :func:`_scan_file` with the columns packed as raw bytes.
+
+    A :class:`TelemetryFrame` crosses the process boundary as its cache
+    serialization and the UTC column as raw ``q`` values — a few memcpys,
+    where pickling per-row objects would cost more than the parse. Also
+    returns the file's log records and the cache hits/misses it caused.
+    """
+    _worker_capture.records = []
+    cache = _worker_cache
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    with use_cache(cache):
+        outcome = _scan_file(path, _worker_tz_offset)
+    if cache is not None:
+        hits, misses = cache.hits - hits, cache.misses - misses
+    if isinstance(outcome, tuple):
+        frame, utc_us, offset, utc_source = outcome
+        packed: _Packed = (frame.to_bytes(), utc_us.tobytes(), offset, utc_source)
+        return packed, _worker_capture.records, hits, misses
+    return outcome, _worker_capture.records, hits, misses
+
+
+def _scan_pool(
+    files: list[Path], tz_offset: timedelta | None, jobs: int
+) -> Generator[_Scanned | str | None, None, None]:
+    """Scan *files* in *jobs* processes, yielding outcomes in *files* order.
+
+    Each outcome's log records are re-emitted and its cache counts merged
+    into the active cache just before it is yielded, so warnings follow the
+    same order as an in-process scan.
+    """
+    cache = active_cache()
+    cache_spec = (cache.root, cache.max_bytes) if cache is not None else None
+    level = logging.getLogger(__name__.partition(".")[0]).getEffectiveLevel()
+    # Small chunks keep the in-order consumer close behind the workers.
+    chunksize = max(1, min(8, len(files) // (jobs * 4)))
+    pool = ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_scan_worker,
+        initargs=(level, cache_spec, tz_offset),
+    )
+    try:
+        for packed, records, hits, misses in pool.map(
+            _scan_worker, files, chunksize=chunksize
+        ):
+            for record in records:
+                logging.getLogger(record.name).handle(record)
+            if cache is not None:
+                cache.merge_counts(hits, misses)
+            if not isinstance(packed, tuple):
+                yield packed
+                continue
+            frame_bytes, utc_bytes, offset, utc_source = packed
+            utc_us = array("q")
+            utc_us.frombytes(utc_bytes)
+            yield TelemetryFrame.from_bytes(frame_bytes), utc_us, offset, utc_source
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _entry_record(entry: _ScanEntry) -> dict:
+    """What a manifest keeps of a scanned entry: enough to join it again."""
+    offset = entry.track.local_offset
+    return {
+        "utc_source": entry.track.utc_source,
+        "local_offset": None if offset is None else offset // _ONE_US,
+        "first_dt": _us(entry.first_dt),
+        "last_dt": _us(entry.last_dt),
+        "first_fix": list(entry.first_fix),
+        "last_fix": list(entry.last_fix),
+        "first_utc_us": entry.first_utc_us,
+        "last_utc_us": entry.last_utc_us,
+    }
+
+
+def _entry_from_record(name: str, key: str, record: dict) -> _ScanEntry:
+    """Inverse of :func:`_entry_record`, without the frame."""
+    offset = record["local_offset"]
+    track = Track(
+        name=name,
+        points=[],
+        utc_source=record["utc_source"],
+        local_offset=None if offset is None else timedelta(microseconds=offset),
+    )
+    return _ScanEntry(
+        track,
+        key,
+        _dt(record["first_dt"]),
+        _dt(record["last_dt"]),
+        tuple(record["first_fix"]),
+        tuple(record["last_fix"]),
+        record["first_utc_us"],
+        record["last_utc_us"],
+    )
+
+
 def scan_flights(
     directory: Path | str,
     recursive: bool = False,
@@ -197,6 +496,9 @@ def scan_flights(
     join_gap: float = 15.0,
     tz_offset: timedelta | None = None,
     on_file: Callable[[int, int, str], None] | None = None,
+    jobs: int = 1,
+    manifest: FlightManifest | None = None,
+    simplify: float | None = None,
 ) -> tuple[list[Track], list[str]]:
     """Scan *directory* for ``.SRT`` files and return ``(tracks, skipped)``.
 
@@ -212,57 +514,140 @@ def scan_flights(
     per file from the mtime, falling back to mtime-based start times (with one
     aggregated warning) when the mtimes were rewritten by a transfer.
     ``on_file(index, total, name)`` is called (1-based) as each SRT file is
-    picked up, for progress reporting.
+    picked up, for progress reporting. ``jobs`` > 1 parses the files in that
+    many worker processes; the result, the warnings and the ``on_file``
+    order are the same as for a sequential scan.
+
+    With a *manifest* (see :mod:`.flightmap_manifest`) only files that are
+    new or changed since the previous run are parsed, only their directories
+    are joined again, and every other flight is taken from the manifest; the
+    result is the same as a full scan. The manifest keeps exact coordinates,
+    so it cannot be combined with ``redact``.
+
+    ``simplify`` (metres) swaps the one-point-per-second display thinning
+    for error-bounded simplification, see :func:`_materialize_flight`.
     """
+    if manifest is not None and redact != "none":
+        raise ValueError("an incremental scan cannot be redacted")
     root = Path(directory)
     files: set[Path] = set()
     for pattern in _SRT_PATTERNS:
         files.update(root.rglob(pattern) if recursive else root.glob(pattern))
+    # Display names drop the suffix, so two files can share one; everything
+    # that must tell files apart goes by the key (path below root, suffix kept).
+    scanned = [
+        (_display_name(path, root, recursive), path.relative_to(root).as_posix(), path)
+        for path in sorted(files)
+    ]
+    paths = {key: path for _name, key, path in scanned}
+    identities: dict[str, dict | None] = {}
+    reused: dict[str, dict] = {}
+    dirty: set[str] = set()  # directories whose flights must be rebuilt
+    if manifest is not None:
+        for _name, key, path in scanned:
+            identities[key] = _stat_identity(path)
+            record = manifest.unchanged(key, identities[key])
+            if record is not None:
+                reused[key] = record
+            else:
+                dirty.add(posixpath.dirname(key))
+        gone = set(manifest.previous_files) - set(paths)
+        dirty.update(posixpath.dirname(key) for key in gone)
+        manifest.changed = bool(dirty)
     entries: list[_ScanEntry] = []
     skipped: list[str] = []
     tz_warnings = _TzWarningAggregator()
     util_logger = logging.getLogger(utilities.__name__)
     util_logger.addFilter(tz_warnings)
+    to_parse = [path for _name, key, path in scanned if key not in reused]
+    pooled = (
+        _scan_pool(to_parse, tz_offset, jobs)
+        if jobs > 1 and len(to_parse) > 1
+        else None
+    )
     try:
-        files_sorted = sorted(files)
-        for index, path in enumerate(files_sorted, start=1):
-            name = _display_name(path, root, recursive)
+        for index, (name, key, path) in enumerate(scanned, start=1):
             if on_file is not None:
-                on_file(index, len(files_sorted), name)
-            try:
-                samples = load_samples(path)
-                if not samples:
+                on_file(index, len(scanned), name)
+            record = reused.get(key)
+            if record is not None:
+                # Report what parsing the file reported the last time.
+                assert manifest is not None
+                manifest.record_file(key, record)
+                tz_warnings.count += record["tz_failed"]
+                if record["error"] is not None:
+                    logger.warning("Skipping %s: %s", path, record["error"])
+                if record["entry"] is None:
                     skipped.append(name)
-                    continue
-                mtime_utc = datetime.fromtimestamp(
-                    path.stat().st_mtime, tz=timezone.utc
-                ).replace(tzinfo=None)
-                track = build_track_from_samples(
-                    name, samples, tz_offset=tz_offset, mtime_utc=mtime_utc
-                )
-            except (OSError, ValueError) as exc:
-                logger.warning("Skipping %s: %s", path, exc)
-                skipped.append(name)
+                else:
+                    entries.append(_entry_from_record(name, key, record["entry"]))
                 continue
-            entries.append(_ScanEntry(track, samples[0].dt, samples[-1].dt))
+            tz_before = tz_warnings.count
+            outcome = (
+                next(pooled) if pooled is not None else _scan_file(path, tz_offset)
+            )
+            entry = None
+            if isinstance(outcome, str):
+                logger.warning("Skipping %s: %s", path, outcome)
+                skipped.append(name)
+            elif outcome is None:
+                skipped.append(name)
+            else:
+                frame, utc_us, offset, utc_source = outcome
+                track = Track(
+                    name=name, points=[], utc_source=utc_source, local_offset=offset
+                )
+                entry = _ScanEntry.from_frame(track, key, frame, utc_us)
+                entries.append(entry)
+            if manifest is not None:
+                manifest.parsed += 1
+                manifest.record_file(
+                    key,
+                    {
+                        "id": identities[key],
+                        "error": outcome if isinstance(outcome, str) else None,
+                        "tz_failed": tz_warnings.count > tz_before,
+                        "entry": None if entry is None else _entry_record(entry),
+                    },
+                )
+        tz_failed = tz_warnings.count
+        chains = _chain_entries(entries, join_gap, manifest, dirty)
+        tracks = []
+        for chain in chains:
+            segments = [e.key for e in chain]
+            if manifest is not None and all(e.frame is None for e in chain):
+                reused_track = manifest.reuse_flight(segments)
+                if reused_track is not None:
+                    tracks.append(reused_track)
+                    continue
+            for e in chain:
+                if e.frame is None:
+                    # An unchanged file in a chain that changed: parse it
+                    # again. Its warnings were already reported above.
+                    rescanned = _scan_file(paths[e.key], tz_offset)
+                    if not isinstance(rescanned, tuple):
+                        raise OSError(f"{paths[e.key]} changed during the scan")
+                    e.frame, e.utc_us = rescanned[0], rescanned[1]
+                    assert manifest is not None
+                    manifest.parsed += 1
+            track = _materialize_flight(chain, simplify_m=simplify)
+            if manifest is not None:
+                manifest.record_flight(segments, track)
+            tracks.append(track)
     finally:
+        if pooled is not None:
+            pooled.close()
         util_logger.removeFilter(tz_warnings)
-    if tz_warnings.count:
+    if tz_failed:
         logger.warning(
             "Timezone auto-detection failed for %d of %d SRT files: their "
             "mtimes do not match the recording window (common after zip/cloud "
             "transfers), so those start times fall back to the file mtime and "
             "may be wrong. Pass --tz-offset to set the recording timezone "
             "explicitly.",
-            tz_warnings.count,
-            len(files),
+            tz_failed,
+            len(scanned),
         )
-    if join_gap > 0:
-        tracks = join_split_flights(entries, max_gap_s=join_gap)
-    else:
-        tracks = [e.track for e in entries]
-    for track in tracks:
-        track.points = _decimate_points(track.points)
     if redact == "fuzz":
         for track in tracks:
             coords = redact_coords([(p.lat, p.lon) for p in track.points], "fuzz")
@@ -273,6 +658,33 @@ def scan_flights(
     return tracks, skipped
 
 
+def _chain_entries(
+    entries: list[_ScanEntry],
+    join_gap: float,
+    manifest: FlightManifest | None,
+    dirty: set[str],
+) -> list[list[_ScanEntry]]:
+    """Group *entries* into flights; clean directories keep the manifest's chains."""
+    if join_gap <= 0:
+        return [[e] for e in entries]
+    if manifest is None:
+        return join_split_flights(entries, max_gap_s=join_gap)
+    by_dir: dict[str, list[_ScanEntry]] = {}
+    for e in entries:
+        by_dir.setdefault(posixpath.dirname(e.key), []).append(e)
+    chains: list[list[_ScanEntry]] = []
+    for directory, dir_entries in by_dir.items():
+        if directory in dirty:
+            chains.extend(join_split_flights(dir_entries, max_gap_s=join_gap))
+        else:
+            by_key = {e.key: e for e in dir_entries}
+            chains.extend(
+                [by_key[key] for key in segments]
+                for segments in manifest.chains_in(directory)
+            )
+    return chains
+
+
 def format_duration(seconds: int) -> str:
     """Format whole seconds for display: ``243`` -> ``4:03``, ``3723`` -> ``1:02:03``."""
     h, rest = divmod(seconds, 3600)
@@ -419,7 +831,16 @@ def flights_to_geojson(tracks: list[Track], redact: str = "none") -> dict:
     archive scale they would swamp the map and the file.
     The top-level ``redacted`` member records the CLI redaction mode so viewers can badge fuzzed positions honestly (#372).
     """
-    features: list[dict] = []
+    return {"type": "FeatureCollection", "redacted": redact,
+            "features": list(flight_features(tracks))}
+
+
+def flight_features(tracks: Iterable[Track]) -> Iterator[dict]:
+    """Yield the :func:`flights_to_geojson` feature of each track in turn.
+
+    The streaming HTML writers (:mod:`.html_stream`) encode each feature as
+    it is built, so only one flight's feature is alive at a time.
+    """
     for track in tracks:
         coords = [[p.lon, p.lat, p.alt] for p in track.points]
         properties = _flight_properties(track)
@@ -430,15 +851,11 @@ def flights_to_geojson(tracks: list[Track], redact: str = "none") -> dict:
             _add_media_props(properties, track)
         else:
             geometry = {"type": "Point", "coordinates": coords[0]}
-        features.append(
-            {
-                "type": "Feature",
-                "geometry": geometry,
-                "properties": properties,
-            }
-        )
-    return {"type": "FeatureCollection", "redacted": redact,
-            "features": features}
+        yield {
+            "type": "Feature",
+            "geometry": geometry,
+            "properties": properties,
+        }
 
 
 def write_flights_geojson(
@@ -22,12 +22,16 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Iterable, Iterator
 from html import escape
 from pathlib import Path
 
-from .flightmap import flights_to_geojson
+from .flightmap import flight_features
 from .flightmap3d_airspace_js import AIRSPACE_3D_JS
 from .flightmap3d_gaze_js import GAZE_JS
+from .flightmap_compact import COMPACT_MEMBER, EXPAND_JS, compact_feature
+from .flightmap_lod import with_levels
+from .html_stream import DATA_SLOT, collection_chunks, page_chunks, write_chunks
 from .provenance import attribution_credit, stamp
 from .flightmap_js import FLIGHT_POPUP_JS
 from .track import Track
@@ -137,7 +141,7 @@ _TEMPLATE = """<!DOCTYPE html>
 
 _APP_JS = """
 const data = JSON.parse(document.getElementById('flight-data').textContent);
-const REDACTED = data.redacted || 'none';
+__COMPACT_JS__const REDACTED = data.redacted || 'none';
 __SHARED_JS__
 
 // Collect flights: draped 2D geometry only -- the third GeoJSON coordinate
@@ -167,6 +171,8 @@ const allCoords = [];
     entry.media = p.media || null;
     entry.cue = p.cue_s || null;
     entry.segi = p.seg_i || null;
+    entry.lod = p.lod || null;
+    entry.level = -1;                        // full track until the map zooms
   } else {                                             // single-fix clip
     const c = f.geometry.coordinates;
     entry.geometry = { type: 'Point', coordinates: [c[0], c[1]] };
@@ -250,9 +256,10 @@ if (map) {
 
   map.on('load', () => {
     map.setTerrain({ source: 'terrain', exaggeration: 1 });
+    applyLod();
     flights.forEach((f, fi) => {
       map.addSource(f.id, { type: 'geojson', data: {
-        type: 'Feature', geometry: f.geometry, properties: {} } });
+        type: 'Feature', geometry: lodGeometry(f), properties: {} } });
       if (f.geometry.type === 'LineString') {
         map.addLayer({ id: f.id, type: 'line', source: f.id,
           layout: { 'line-cap': 'round', 'line-join': 'round' },
@@ -286,7 +293,7 @@ if (map) {
       });
       addSculpture(f, fi);
     });
-    map.on('zoomend', rebuildSculpture);
+    map.on('zoomend', () => rebuildSculpture(applyLod()));
     sculptSettle();
     buildPanel();
     mountPlayback();
@@ -684,6 +691,42 @@ const SCULPT_PX = 3;          // target plank width, screen pixels
 const SCULPT_MIN_M = 4, SCULPT_MAX_M = 60;
 const sculpture = { on: true, widthM: null };
 
+// Level of detail (flightmap_lod.py): the draped line and the sculpture are
+// built from the coarsest level within a pixel of the full track; ghost,
+// gaze and playback keep the full arrays. Half a pixel at the centre,
+// because the tilt brings the foreground closer than the centre.
+const LOD_PX = 0.5;
+
+function lodIdx(fl) {
+  const lv = fl.lod && fl.lod[fl.level];
+  return lv ? lv.idx : null;
+}
+
+function lodGeometry(fl) {
+  const idx = lodIdx(fl);
+  if (!idx) return fl.geometry;
+  const cs = fl.geometry.coordinates;
+  return { type: 'LineString', coordinates: idx.map(i => cs[i]) };
+}
+
+function applyLod() {
+  // True when any flight changed level (its planks need rebuilding too).
+  const mPerPx = 40075016.686 * Math.cos(map.getCenter().lat * Math.PI / 180)
+               / (512 * Math.pow(2, map.getZoom()));
+  let changed = false;
+  flights.forEach(fl => {
+    if (!fl.lod) return;
+    const k = lodLevel(fl.lod, mPerPx * LOD_PX);
+    if (k === fl.level) return;
+    fl.level = k;
+    changed = true;
+    const src = map.getSource(fl.id);
+    if (src) src.setData({ type: 'Feature', geometry: lodGeometry(fl),
+                           properties: {} });
+  });
+  return changed;
+}
+
 function sculptWidthM() {
   // Hold a roughly constant screen width: a fixed metre width vanishes
   // when you zoom out to see the whole flight, and becomes a slab up close.
@@ -694,17 +737,23 @@ function sculptWidthM() {
 }
 
 function planksFor(fl, widthM) {
-  // One rectangle per consecutive pair that has AGL at both ends.
+  // One rectangle per consecutive pair (of the current level of detail)
+  // that has AGL at both ends.
   const feats = [];
   if (!fl.pts || !fl.agl) return feats;
   const half = widthM / 2;
   const tElev = takeoffElev(fl);
-  for (let i = 0; i < fl.pts.length - 1; i++) {
-    const a = fl.pts[i], b = fl.pts[i + 1];
-    const aglA = fl.agl[i], aglB = fl.agl[i + 1];
+  const idx = lodIdx(fl);
+  const n = idx ? idx.length : fl.pts.length;
+  for (let k = 0; k < n - 1; k++) {
+    const i = idx ? idx[k] : k, j = idx ? idx[k + 1] : k + 1;
+    const a = fl.pts[i], b = fl.pts[j];
+    const aglA = fl.agl[i], aglB = fl.agl[j];
     // A null AGL breaks the curtain: the gap length is unknown, so
-    // interpolating across it would invent altitude.
+    // interpolating across it would invent altitude. A coarse plank
+    // spanning a null breaks too.
     if (aglA == null || aglB == null) continue;
+    if (j > i + 1 && fl.agl.slice(i + 1, j).includes(null)) continue;
     const agl = (aglA + aglB) / 2;
     const lElev = tElev == null
       ? null : terrainElevAt([(a[0] + b[0]) / 2, (a[1] + b[1]) / 2]);
@@ -795,10 +844,11 @@ function setSculptData() {
   });
 }
 
-function rebuildSculpture() {
+function rebuildSculpture(levelChanged) {
   const w = sculptWidthM();
   // Ignore trivial changes: setData on every zoom frame would churn.
-  if (sculpture.widthM != null && Math.abs(w - sculpture.widthM) < 0.5) return;
+  if (!levelChanged && sculpture.widthM != null &&
+      Math.abs(w - sculpture.widthM) < 0.5) return;
   sculpture.widthM = w;
   setSculptData();
   renderGaze();
@@ -1069,20 +1119,38 @@ __AIRSPACE_3D_JS__
 
 def flights_to_3d_html(
     tracks: list[Track], title: str, redact: str = "none",
-    airspace_json: dict | None = None,
+    airspace_json: dict | None = None, compact: bool = False,
 ) -> str:
     """Return a complete 3D-terrain HTML flight map (draped tracks).
 
     ``airspace_json`` (#424): the overlay dict from
     :func:`~.airspace.overlay.zones_to_overlay_json`; None renders the
     map exactly as before.
+
+    ``compact``: as for :func:`.flightmap_html.flights_to_html`.
     """
-    geojson = flights_to_geojson(tracks, redact=redact)
-    # Escape "<" to "\\u003c" (a JSON Unicode escape) so JSON.parse round-trips
-    # it while no literal "</script>" can break out of the data block.
-    data = json.dumps(geojson).replace("<", "\\u003c")
+    return "".join(_flights_3d_page(
+        tracks, title, redact=redact, airspace_json=airspace_json, compact=compact
+    ))
+
+
+def _flights_3d_page(
+    tracks: Iterable[Track], title: str, *, redact: str,
+    airspace_json: dict | None, compact: bool,
+) -> Iterator[str]:
+    """The page in chunks, one flight at a time (see :mod:`.html_stream`)."""
+    header: dict = {"type": "FeatureCollection", "redacted": redact}
+    features = map(with_levels, flight_features(tracks))
+    if compact:
+        header["compact"] = COMPACT_MEMBER
+        features = map(compact_feature, features)
+    data = collection_chunks(
+        header, features, separators=(",", ":") if compact else None
+    )
     airspace_block = airspace_js = ""
     if airspace_json is not None:
+        # Escape "<" to "\\u003c" (a JSON Unicode escape) so JSON.parse
+        # round-trips it while no literal "</script>" can break out.
         adata = json.dumps(airspace_json).replace("<", "\\u003c")
         airspace_block = (
             '\n<script type="application/json" id="airspace-data">\n'
@@ -1090,34 +1158,40 @@ def flights_to_3d_html(
         )
         airspace_js = AIRSPACE_3D_JS
     app_js = (
-        _APP_JS.replace("__SHARED_JS__", FLIGHT_POPUP_JS)
+        _APP_JS.replace(
+            "__COMPACT_JS__", EXPAND_JS + "expandFlights(data);\n" if compact else ""
+        )
+        .replace("__SHARED_JS__", FLIGHT_POPUP_JS)
         .replace("__GAZE_JS__", GAZE_JS)
         .replace("__AIRSPACE_3D_JS__", airspace_js)
         .replace("__OSM_TILES__", _OSM_TILES)
         .replace("__MAPTERHORN__", _MAPTERHORN_TILEJSON)
         .replace("__CREDIT__", attribution_credit())
     )
-    return stamp(_TEMPLATE.format(
+    page = stamp(_TEMPLATE.format(
         title=escape(title),
         maplibre=_MAPLIBRE_VERSION,
         css_sri=_MAPLIBRE_CSS_SRI,
         js_sri=_MAPLIBRE_JS_SRI,
-        data=data,
+        data=DATA_SLOT,
         airspace_block=airspace_block,
         app_js=app_js,
     ))
+    return page_chunks(page, data)
 
 
 def write_flights_3d_html(
     tracks: list[Track], output_path: Path, title: str, redact: str = "none",
-    airspace_json: dict | None = None,
+    airspace_json: dict | None = None, compact: bool = False,
 ) -> Path:
-    """Write *tracks* as a 3D HTML map to *output_path* and return it."""
-    output_path.write_text(
-        flights_to_3d_html(
-            tracks, title, redact=redact, airspace_json=airspace_json
-        ),
-        encoding="utf-8",
-    )
+    """Write *tracks* as a 3D HTML map to *output_path* and return it.
+
+    Streamed to disk and swapped into place once complete, as for
+    :func:`.flightmap_html.write_flights_html`.
+    """
+    write_chunks(output_path, _flights_3d_page(
+        tracks, title, redact=redact, airspace_json=airspace_json,
+        compact=compact,
+    ))
     logger.info("3D HTML flight map created: %s", output_path)
     return output_path
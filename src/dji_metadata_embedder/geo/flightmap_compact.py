@@ -0,0 +1,185 @@
+"""Compact encoding of the flight GeoJSON embedded in the HTML maps.
+
+The flight maps embed :func:`.flightmap.flights_to_geojson` as JSON, and at
+archive scale the per-point data dominates the file: every coordinate is a
+full-precision float triple and ``times_s``, ``cue_s``, ``seg_i`` and the
+ghost-pose arrays repeat the pattern once per point. With ``compact`` the
+writers pass the collection through :func:`compact_flights` instead, which
+replaces each of those arrays by a short string, and embed
+:data:`EXPAND_JS` to restore them in place right after ``JSON.parse`` — so
+the rest of the page sees the usual GeoJSON.
+
+Each value is quantised to a fixed step (:data:`COORDINATE_SCALES`,
+:data:`PROPERTY_SCALES`), stored as the difference from the previous
+non-null value in its column, zigzag-mapped to a non-negative integer plus
+one (0 means null) and written as base-32 digits in the ``?``..``~``
+character range, as in Google's encoded polyline format. Coordinates
+interleave their three columns per point, and the index lists of the
+:mod:`.flightmap_lod` levels are encoded exactly. The property steps match
+the rounding :mod:`.flightmap` already applies, so those arrays decode to
+the very same numbers; positions are kept to 1e-6 degrees (~0.1 m) and
+altitudes to 0.1 m.
+
+GeoJSON files are never encoded: only the HTML embedding changes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+# Steps per unit: lon/lat to 1e-6 degrees, altitude to 0.1 m.
+COORDINATE_SCALES = (1_000_000, 1_000_000, 10)
+
+# Per-point LineString properties and their steps per unit.
+PROPERTY_SCALES = {
+    "times_s": 10,
+    "cue_s": 1000,
+    "seg_i": 1,
+    "agl_m": 10,
+    "gyaw_deg": 10,
+    "gpitch_deg": 10,
+}
+
+# The collection's ``compact`` member: the steps :data:`EXPAND_JS` decodes with.
+COMPACT_MEMBER = {
+    "coordinates": list(COORDINATE_SCALES),
+    "properties": PROPERTY_SCALES,
+}
+
+
+def encode_columns(rows: Sequence[Sequence[float | None]], scales: Sequence[int]) -> str:
+    """Encode *rows* (each ``len(scales)`` values, ``None`` allowed) as a string."""
+    last = [0] * len(scales)
+    out: list[str] = []
+    for row in rows:
+        for col, (value, scale) in enumerate(zip(row, scales)):
+            if value is None:
+                code = 0
+            else:
+                q = round(value * scale)
+                delta = q - last[col]
+                last[col] = q
+                code = (delta << 1 if delta >= 0 else ~(delta << 1)) + 1
+            while code >= 32:
+                out.append(chr((32 | (code & 31)) + 63))
+                code >>= 5
+            out.append(chr(code + 63))
+    return "".join(out)
+
+
+def decode_columns(text: str, scales: Sequence[int]) -> list[list[float | None]]:
+    """Inverse of :func:`encode_columns` (the Python twin of :data:`EXPAND_JS`)."""
+    width = len(scales)
+    last = [0] * width
+    rows: list[list[float | None]] = []
+    row: list[float | None] = []
+    code = shift = 0
+    for ch in text:
+        b = ord(ch) - 63
+        code |= (b & 31) << shift
+        shift += 5
+        if b >= 32:
+            continue
+        col = len(row)
+        if code == 0:
+            row.append(None)
+        else:
+            code -= 1
+            last[col] += -((code + 1) >> 1) if code & 1 else code >> 1
+            row.append(last[col] / scales[col])
+        code = shift = 0
+        if len(row) == width:
+            rows.append(row)
+            row = []
+    return rows
+
+
+def compact_flights(geojson: dict[str, Any]) -> dict[str, Any]:
+    """A copy of *geojson* with every LineString's per-point arrays encoded.
+
+    Point features (single-fix clips) and the per-flight properties are
+    left as they are. The ``compact`` member records the steps for
+    :data:`EXPAND_JS`.
+    """
+    return {
+        **geojson,
+        "compact": COMPACT_MEMBER,
+        "features": [compact_feature(f) for f in geojson.get("features", [])],
+    }
+
+
+def compact_feature(feature: dict[str, Any]) -> dict[str, Any]:
+    """*feature* encoded as in :func:`compact_flights` (Points unchanged)."""
+    geometry = feature.get("geometry") or {}
+    if geometry.get("type") != "LineString":
+        return feature
+    properties = dict(feature.get("properties") or {})
+    for key, scale in PROPERTY_SCALES.items():
+        if key in properties:
+            properties[key] = encode_columns(
+                [(v,) for v in properties[key]], (scale,)
+            )
+    if "lod" in properties:
+        properties["lod"] = [
+            {**level, "idx": encode_columns([(i,) for i in level["idx"]], (1,))}
+            for level in properties["lod"]
+        ]
+    return {
+        **feature,
+        "geometry": {
+            "type": "LineString",
+            "coordinates": encode_columns(geometry["coordinates"], COORDINATE_SCALES),
+        },
+        "properties": properties,
+    }
+
+
+# Browser side of :func:`decode_columns`. Arithmetic rather than bitwise
+# ops, which JS truncates to 32 bits; dividing the integer by the step gives
+# the same double as the decimal literal would.
+EXPAND_JS = """function decodeColumns(s, scales) {
+  const width = scales.length, last = new Array(width).fill(0), flat = [];
+  let code = 0, mult = 1, col = 0;
+  for (let i = 0, n = s.length; i < n; i++) {
+    const b = s.charCodeAt(i) - 63;
+    if (b >= 32) { code += (b - 32) * mult; mult *= 32; continue; }
+    code += b * mult;
+    if (code === 0) {
+      flat.push(null);
+    } else {
+      last[col] += code % 2 ? (code - 1) / 2 : -code / 2;
+      flat.push(last[col] / scales[col]);
+    }
+    code = 0;
+    mult = 1;
+    if (++col === width) col = 0;
+  }
+  if (width === 1) return flat;
+  const rows = new Array(flat.length / width);
+  for (let r = 0, j = 0; r < rows.length; r++, j += width) {
+    rows[r] = flat.slice(j, j + width);
+  }
+  return rows;
+}
+
+// Restore the per-point arrays flightmap_compact.compact_flights encoded.
+function expandFlights(fc) {
+  const c = fc.compact;
+  if (!c) return fc;
+  (fc.features || []).forEach(f => {
+    const g = f.geometry, p = f.properties || {};
+    if (g && typeof g.coordinates === 'string') {
+      g.coordinates = decodeColumns(g.coordinates, c.coordinates);
+    }
+    Object.keys(c.properties).forEach(k => {
+      if (typeof p[k] === 'string') p[k] = decodeColumns(p[k], [c.properties[k]]);
+    });
+    (p.lod || []).forEach(l => {
+      if (typeof l.idx === 'string') l.idx = decodeColumns(l.idx, [1]);
+    });
+  });
+  delete fc.compact;
+  return fc;
+}
+"""
@@ -12,12 +12,17 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Iterable, Iterator
 from html import escape
 from pathlib import Path
 
-from .flightmap import flights_to_geojson
+from .flightmap import flight_features
 from .flightmap_airspace_js import AIRSPACE_OVERLAY_JS
-from .flightmap_js import FLIGHT_POPUP_JS, PLAYBACK_JS
+from .flightmap_compact import COMPACT_MEMBER, EXPAND_JS, compact_feature
+from .flightmap_js import FLIGHT_POPUP_JS, LOD_JS, PLAYBACK_JS, SPLIT_DATA_JS
+from .flightmap_lod import with_levels
+from .flightmap_split import clear_split_data, split_features
+from .html_stream import DATA_SLOT, collection_chunks, page_chunks, write_chunks
 from .provenance import stamp
 from .tiles import DEFAULT_TILE_STYLE, tile_layer_js
 from .track import Track
@@ -74,12 +79,13 @@ _TEMPLATE = """<!DOCTYPE html>
 
 _APP_JS = """
 const data = JSON.parse(document.getElementById('flight-data').textContent);
-const map = L.map('map');
+__COMPACT_JS__const map = L.map('map');
 __TILE_LAYER__
 
 __SHARED_JS__
 
-const overlays = {};
+__LOD_JS__
+__SPLIT_JS__const overlays = {};
 const allLatLngs = [];
 const runs = [];   // playback (#267): flights with usable per-point times
 (data.features || []).forEach((f, i) => {
@@ -88,9 +94,14 @@ const runs = [];   // playback (#267): flights with usable per-point times
   const p = f.properties || {};
   const group = L.layerGroup();
   let latlngs;
-  if (f.geometry.type === 'LineString') {
+  if (p.data) {                                        // --split-data index
+    const c = f.geometry.coordinates, b = f.bbox;
+    latlngs = [[c[1], c[0]], [b[1], b[0]], [b[3], b[2]]];   // start, bbox
+    const run = splitFlight(f, color, group, p.name || `flight ${i + 1}`);
+    if (run) runs.push(run);
+  } else if (f.geometry.type === 'LineString') {
     latlngs = f.geometry.coordinates.map(c => [c[1], c[0]]);
-    L.polyline(latlngs, { color, weight: 3 })
+    lodPolyline(latlngs, p.lod, { color, weight: 3 })
       .bindPopup(popupHtml(p)).addTo(group);
     const times = p.times_s;
     if (Array.isArray(times) && times.length === latlngs.length &&
@@ -137,7 +148,8 @@ _AIRSPACE_CSS = """  .airspace-note { background: rgba(255,255,255,.85);
 
 def flights_to_html(
     tracks: list[Track], title: str, *, tile_style: str = DEFAULT_TILE_STYLE,
-    redact: str = "none", airspace_json: dict | None = None
+    redact: str = "none", airspace_json: dict | None = None,
+    compact: bool = False,
 ) -> str:
     """Return a complete self-contained HTML flight map.
 
@@ -147,13 +159,32 @@ def flights_to_html(
     ``airspace_json`` (#413): the overlay dict from
     :func:`~.airspace.overlay.zones_to_overlay_json`; None renders the map
     exactly as before.
+
+    ``compact`` embeds the per-point arrays encoded by
+    :func:`~.flightmap_compact.compact_flights`, decoded in the page.
     """
-    geojson = flights_to_geojson(tracks, redact=redact)
-    # Escape "<" to "\\u003c" (a JSON Unicode escape) so JSON.parse round-trips
-    # it while no literal "</script>" can break out of the data block.
-    data = json.dumps(geojson).replace("<", "\\u003c")
+    return "".join(_flights_page(
+        map(with_levels, flight_features(tracks)), title, redact=redact,
+        tile_style=tile_style, airspace_json=airspace_json, compact=compact,
+    ))
+
+
+def _flights_page(
+    features: Iterable[dict], title: str, *, redact: str, tile_style: str,
+    airspace_json: dict | None, compact: bool, split: bool = False,
+) -> Iterator[str]:
+    """Render the map around *features*; *split* adds the ``--split-data`` loader."""
+    header: dict = {"type": "FeatureCollection", "redacted": redact}
+    if compact:
+        header["compact"] = COMPACT_MEMBER
+        features = map(compact_feature, features)
+    data = collection_chunks(
+        header, features, separators=(",", ":") if compact else None
+    )
     airspace_block = airspace_css = airspace_js = ""
     if airspace_json is not None:
+        # Escape "<" to "\\u003c" (a JSON Unicode escape) so JSON.parse
+        # round-trips it while no literal "</script>" can break out.
         adata = json.dumps(airspace_json).replace("<", "\\u003c")
         airspace_block = (
             '\n<script type="application/json" id="airspace-data">\n'
@@ -161,19 +192,25 @@ def flights_to_html(
         )
         airspace_css = _AIRSPACE_CSS
         airspace_js = AIRSPACE_OVERLAY_JS
-    return stamp(_TEMPLATE.format(
+    page = stamp(_TEMPLATE.format(
         title=escape(title),
         leaflet=_LEAFLET_VERSION,
         css_sri=_LEAFLET_CSS_SRI,
         js_sri=_LEAFLET_JS_SRI,
-        data=data,
+        data=DATA_SLOT,
         airspace_block=airspace_block,
         airspace_css=airspace_css,
-        app_js=_APP_JS.replace("__TILE_LAYER__", tile_layer_js(tile_style))
+        app_js=_APP_JS.replace(
+            "__COMPACT_JS__", EXPAND_JS + "expandFlights(data);\n" if compact else ""
+        )
+        .replace("__LOD_JS__", LOD_JS)
+        .replace("__SPLIT_JS__", SPLIT_DATA_JS + "\n" if split else "")
+        .replace("__TILE_LAYER__", tile_layer_js(tile_style))
         .replace("__SHARED_JS__", FLIGHT_POPUP_JS)
         .replace("__AIRSPACE_JS__", airspace_js)
         .replace("__PLAYBACK_JS__", PLAYBACK_JS),
     ))
+    return page_chunks(page, data)
 
 
 def write_flights_html(
@@ -184,13 +221,27 @@ def write_flights_html(
     tile_style: str = DEFAULT_TILE_STYLE,
     redact: str = "none",
     airspace_json: dict | None = None,
+    compact: bool = False,
+    split_data: bool = False,
 ) -> Path:
-    """Write *tracks* as an HTML map to *output_path* and return it."""
-    output_path.write_text(
-        flights_to_html(
-            tracks, title, tile_style=tile_style, redact=redact, airspace_json=airspace_json
-        ),
-        encoding="utf-8",
-    )
+    """Write *tracks* as an HTML map to *output_path* and return it.
+
+    The page is streamed to disk one flight at a time and replaces any
+    previous map only once complete (see :mod:`.html_stream`).
+    ``split_data`` writes each flight's track to its own file beside the map
+    (see :mod:`.flightmap_split`); otherwise any such files left by an
+    earlier run are removed.
+    """
+    features: Iterable[dict] = map(with_levels, flight_features(tracks))
+    written: set[str] = set()
+    if split_data:
+        features = split_features(
+            features, output_path, compact=compact, written=written
+        )
+    write_chunks(output_path, _flights_page(
+        features, title, redact=redact, tile_style=tile_style,
+        airspace_json=airspace_json, compact=compact, split=split_data,
+    ))
+    clear_split_data(output_path, keep=written)
     logger.info("HTML flight map created: %s", output_path)
     return output_path
@@ -1,7 +1,7 @@
 """JS helpers shared by the 2D and 3D flightmap HTML writers.
 
-One source of truth for the popup renderer and track palette so the two
-templates cannot drift apart. :data:`FLIGHT_POPUP_JS` is plain browser JS
+One source of truth for the popup renderer, track palette and
+level-of-detail pick so the templates cannot drift apart. :data:`FLIGHT_POPUP_JS` is plain browser JS
 embedded by string concatenation — it must stay dependency-free and must
 not reference Leaflet or MapLibre.
 
@@ -10,6 +10,14 @@ not reference Leaflet or MapLibre.
 templates — :mod:`.flightmap_html` and :mod:`.map_html` — never the 3D one.
 It is self-contained: it reads only ``runs``, ``map``, ``esc``,
 ``fmtDuration``, and the DOM ids it creates itself.
+
+:data:`SPLIT_DATA_JS` is the ``--split-data`` loader for the same two
+templates (see :mod:`.flightmap_split`). It reads ``map``, ``popupHtml``,
+``lodPolyline`` and, for compact sidecars, ``expandFlights``.
+
+:data:`LOD_JS` draws the Leaflet polylines from the :mod:`.flightmap_lod`
+levels; it reads ``map`` and ``lodLevel``. The 3D template swaps its
+MapLibre sources itself with the same ``lodLevel``.
 """
 
 from __future__ import annotations
@@ -46,6 +54,14 @@ function popupHtml(p) {
   }
   html += '</div>';
   return html;
+}
+
+// Level of detail (flightmap_lod.py): the coarsest level whose error stays
+// within tolM metres, or -1 for the full track. Levels run coarse to fine.
+function lodLevel(lod, tolM) {
+  if (!lod) return -1;
+  for (let k = 0; k < lod.length; k++) if (lod[k].tol_m <= tolM) return k;
+  return -1;
 }"""
 
 # Flight playback control (issues #267, #327) — extracted verbatim from the
@@ -59,13 +75,14 @@ PLAYBACK_JS = """// Flight playback (issues #267, #327): a hand-rolled requestAn
 // #267 shared-clock compare mode (every flight from its own takeoff). The
 // control is inert until Play is pressed; the default map costs nothing extra.
 // Each flight's dot lives in that flight's layer group, so the layer control
-// hides it together with the track.
-const maxT = Math.max(0, ...runs.map(r => r.times[r.times.length - 1]));
+// hides it together with the track. A --split-data run arrives without
+// latlngs/times (only its end time) and is fetched when first rendered.
+const runEnd = r => r.times ? r.times[r.times.length - 1] : r.end;
+const maxT = Math.max(0, ...runs.map(runEnd));
 if (runs.length && maxT > 0) {
   let sel = 0;   // index into runs, or 'all' for the #267 compare mode
   const selRuns = () => sel === 'all' ? runs : [runs[sel]];
-  const selMax = () => sel === 'all'
-    ? maxT : runs[sel].times[runs[sel].times.length - 1];
+  const selMax = () => sel === 'all' ? maxT : runEnd(runs[sel]);
 
   const ctl = L.control({ position: 'bottomleft' });
   ctl.onAdd = () => {
@@ -112,6 +129,10 @@ if (runs.length && maxT > 0) {
     const active = selRuns();
     for (const run of runs) {
       if (active.includes(run)) {
+        if (!run.times) {
+          run.load().then(() => { if (!pb.playing) render(); });
+          continue;
+        }
         const pos = positionAt(run, pb.t);
         if (!run.marker) {
           run.marker = L.circleMarker(pos, { radius: 7, color: '#fff', weight: 2,
@@ -165,3 +186,117 @@ if (runs.length && maxT > 0) {
     });
   }
 }"""
+
+
+# --split-data loader for the two Leaflet templates. Each flight's track and
+# per-point arrays sit in their own JSON file beside the map
+# (flightmap_split.py); the inline index has only its summary, bbox, start
+# and end time. A flight is fetched when its bbox is in view and big enough
+# on screen to be more than its start dot, or when playback first needs it.
+SPLIT_DATA_JS = """// --split-data: flights whose tracks are fetched on demand.
+const SPLIT_MIN_PX = 8;       // smaller on screen than this: the dot says it all
+const SPLIT_PARALLEL = 4;
+const splitFlights = [];
+let splitActive = 0, splitFailed = false;
+function splitNote() {
+  if (splitFailed) return;
+  splitFailed = true;
+  const ctl = L.control({ position: 'topright' });
+  ctl.onAdd = () => {
+    const div = L.DomUtil.create('div', 'split-note');
+    div.style.cssText = 'background:#fff;padding:4px 8px;border-radius:4px;' +
+      'font:12px/1.4 sans-serif;max-width:260px';
+    div.textContent = 'Flight tracks load from the folder beside this map, ' +
+      'which browsers block for maps opened straight from disk. Open it ' +
+      'with \u2018dji-embed serve\u2019 to see them.';
+    return div;
+  };
+  ctl.addTo(map);
+}
+function splitFlight(f, color, group, name) {
+  const p = f.properties, b = f.bbox;
+  const sf = { bounds: L.latLngBounds([b[1], b[0]], [b[3], b[2]]), group,
+               promise: null, run: null };
+  const start = [f.geometry.coordinates[1], f.geometry.coordinates[0]];
+  sf.load = () => {
+    if (sf.promise) return sf.promise;
+    splitActive++;
+    let latlngs = [start], times = [0];
+    sf.promise = fetch(p.data)
+      .then(r => { if (!r.ok) throw new Error(r.statusText); return r.json(); })
+      .then(fc => {
+        const full = (fc.compact ? expandFlights(fc) : fc).features[0];
+        const lls = full.geometry.coordinates.map(c => [c[1], c[0]]);
+        lodPolyline(lls, full.properties.lod, { color, weight: 3 })
+          .bindPopup(popupHtml(full.properties)).addTo(group);
+        const t = full.properties.times_s;
+        if (Array.isArray(t) && t.length === lls.length) {
+          latlngs = lls;
+          times = t;
+        }
+      })
+      .catch(splitNote)
+      .finally(() => {
+        // A run that cannot play rests on its start dot instead of
+        // asking for its file again.
+        if (sf.run) { sf.run.latlngs = latlngs; sf.run.times = times; }
+        splitActive--;
+        splitLoadVisible();
+      });
+    return sf.promise;
+  };
+  if (p.end_s > 0) {
+    sf.run = { latlngs: null, times: null, end: p.end_s, load: sf.load,
+               color, group, name, cursor: 0, marker: null };
+  }
+  splitFlights.push(sf);
+  return sf.run;
+}
+function splitLoadVisible() {
+  if (splitFailed) return;
+  const view = map.getBounds();
+  for (const sf of splitFlights) {
+    if (splitActive >= SPLIT_PARALLEL) return;
+    if (sf.promise || !map.hasLayer(sf.group) ||
+        !view.intersects(sf.bounds)) continue;
+    const ne = map.latLngToContainerPoint(sf.bounds.getNorthEast());
+    const sw = map.latLngToContainerPoint(sf.bounds.getSouthWest());
+    if (ne.distanceTo(sw) >= SPLIT_MIN_PX) sf.load();
+  }
+}
+map.on('moveend overlayadd', splitLoadVisible);
+"""
+
+
+# Level-of-detail polylines for the two Leaflet templates (flightmap_lod.py).
+# Re-projecting every fix of every flight on each zoom is what made archive
+# maps lag; a track is drawn from the coarsest level within a pixel of it.
+LOD_JS = """// Level-of-detail tracks: a polyline shows the coarsest level that stays
+// within a screen pixel of the full track; playback keeps the full latlngs.
+const lodLines = [];
+function lodMetresPerPixel() {
+  const z = map.getZoom();
+  if (z === undefined) return Infinity;      // no view yet: start coarse
+  return 40075016.686 * Math.cos(map.getCenter().lat * Math.PI / 180)
+       / (256 * Math.pow(2, z));
+}
+function lodShow(e, mPerPx) {
+  const k = lodLevel(e.lod, mPerPx);
+  if (k === e.level) return;
+  e.level = k;
+  const lv = e.lod[k];
+  if (lv && !lv.latlngs) lv.latlngs = lv.idx.map(i => e.full[i]);
+  e.line.setLatLngs(lv ? lv.latlngs : e.full);
+}
+function lodPolyline(latlngs, lod, options) {
+  if (!Array.isArray(lod) || !lod.length) return L.polyline(latlngs, options);
+  const e = { line: L.polyline([], options), full: latlngs, lod, level: null };
+  lodShow(e, lodMetresPerPixel());
+  lodLines.push(e);
+  return e.line;
+}
+map.on('zoomend', () => {
+  const mPerPx = lodMetresPerPixel();
+  lodLines.forEach(e => lodShow(e, mPerPx));
+});
+"""
@@ -0,0 +1,87 @@
+"""Levels of detail for the tracks the HTML maps draw.
+
+A map of an archive draws every flight as a polyline, and at about one fix
+per second a thousand flights is over a million vertices for Leaflet or
+MapLibre to re-project on every pan and zoom — though at archive zoom a few
+dozen vertices per flight are indistinguishable from the full track.
+:func:`add_levels` gives each ``LineString`` with more points than that a
+``lod`` property: coarse-to-fine levels, each ``{"tol_m": t, "idx": [...]}``
+with the indices into the feature's coordinates that keep the track within
+``t`` metres of the full one, horizontally and in altitude (Douglas–Peucker,
+one pass per track via :func:`.geometry.simplify_ranks`):
+
+- an overview of at most :data:`OVERVIEW_POINTS` vertices;
+- a medium level at a :data:`LEVEL_STEP`-th of the overview's tolerance.
+
+The pages pick the coarsest level whose tolerance is under a screen pixel
+at the current zoom and fall back to the full coordinates beyond; playback,
+the 3D ghost view and every per-point property keep the full arrays. A
+level that would not drop at least half the vertices of the next finer one
+is left out. GeoJSON files are never given levels: only the HTML embedding
+changes.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .geometry import simplify_ranks
+
+# Vertex budget of the overview level.
+OVERVIEW_POINTS = 40
+# Tolerance ratio between consecutive levels; 8x is three zoom levels.
+LEVEL_STEP = 8
+# Below this a level is not worth its indices: the full track is ~1 fix/s.
+MIN_TOLERANCE_M = 1.0
+
+
+def track_levels(coordinates: list[list[float]]) -> list[dict[str, Any]]:
+    """The ``lod`` levels for one track's ``[lon, lat, ...]`` coordinates."""
+    n = len(coordinates)
+    if n <= 2 * OVERVIEW_POINTS:
+        return []
+    ranks = simplify_ranks(
+        [c[1] for c in coordinates],
+        [c[0] for c in coordinates],
+        [c[2] if len(c) > 2 else 0.0 for c in coordinates],
+        floor_m=MIN_TOLERANCE_M,
+    )
+    # The overview keeps the rows ranked above its tolerance: the budget's
+    # worth of them, or fewer when the track is simpler than that.
+    overview = max(sorted(ranks, reverse=True)[OVERVIEW_POINTS], MIN_TOLERANCE_M)
+    medium = overview / LEVEL_STEP
+    tolerances = [overview] + ([medium] if medium >= MIN_TOLERANCE_M else [])
+    # Fine to coarse, so each level is measured against the next finer one
+    # that is kept (or the full track).
+    levels: list[dict[str, Any]] = []
+    finer = n
+    for tol in reversed(tolerances):
+        idx = [i for i, r in enumerate(ranks) if r > tol]
+        if 2 * len(idx) <= finer:
+            levels.append({"tol_m": round(tol, 2), "idx": idx})
+            finer = len(idx)
+    return levels[::-1]
+
+
+def add_levels(geojson: dict[str, Any]) -> dict[str, Any]:
+    """A copy of *geojson* with :func:`track_levels` on every ``LineString``."""
+    return {
+        **geojson,
+        "features": [with_levels(f) for f in geojson.get("features", [])],
+    }
+
+
+def with_levels(feature: dict[str, Any]) -> dict[str, Any]:
+    """*feature* with its ``lod`` levels, when it is a track that gets any."""
+    geometry = feature.get("geometry") or {}
+    levels = (
+        track_levels(geometry["coordinates"])
+        if geometry.get("type") == "LineString"
+        else []
+    )
+    if not levels:
+        return feature
+    return {
+        **feature,
+        "properties": {**(feature.get("properties") or {}), "lod": levels},
+    }
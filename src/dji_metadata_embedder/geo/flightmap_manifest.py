@@ -0,0 +1,252 @@
+"""Manifest that lets ``flightmap --incremental`` rebuild only what changed.
+
+An archive that grows by a few flights a day used to be re-parsed, re-joined
+and re-rendered in full on every run. :class:`FlightManifest` is written
+beside the output (``.<output stem>.manifest.json``) and records:
+
+- each source SRT's identity (size and mtime) and what scanning it produced:
+  the boundary fixes and clocks :func:`.flightmap.join_split_flights` needs,
+  or why it was skipped;
+- each flight's post-join, post-decimation track;
+- a digest of the output options and the identity of every output written.
+
+On a rerun :func:`.flightmap.scan_flights` parses only new or changed files,
+re-joins only the directories they sit in (joining never crosses a
+directory) and takes every other flight from the manifest. The CLI leaves
+the outputs alone when no flight changed and they are still the ones it
+wrote. A manifest from another scan setup (root, ``--recursive``,
+``--join-gap``, ``--tz-offset``, ``--simplify`` or parser version) is
+ignored.
+
+The manifest holds exact coordinates, so ``--incremental`` is refused with
+``--redact``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import posixpath
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from .. import __version__
+from ..srt_tokenizer import PARSER_VERSION
+from ..utilities import _EPOCH, _ONE_US
+from ..utils.journal import _stat_identity
+from .track import Track, TrackPoint
+
+logger = logging.getLogger(__name__)
+
+# Bump when the manifest layout or the thinned track for unchanged inputs
+# changes, so older manifests are rebuilt from scratch.
+MANIFEST_VERSION = 2
+
+
+def manifest_path(output: Path) -> Path:
+    """The manifest beside *output*: ``flightmap.html`` -> ``.flightmap.manifest.json``."""
+    return output.with_name(f".{output.stem}.manifest.json")
+
+
+def _digest(payload: dict[str, Any]) -> str:
+    text = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def scan_key(
+    root: Path,
+    recursive: bool,
+    join_gap: float,
+    tz_offset: timedelta | None,
+    simplify: float | None = None,
+) -> str:
+    """Digest of everything besides the files themselves that shapes a scan."""
+    return _digest(
+        {
+            "manifest": MANIFEST_VERSION,
+            "package": __version__,
+            "parser": PARSER_VERSION,
+            "root": str(Path(root).resolve()),
+            "recursive": recursive,
+            "join_gap": join_gap,
+            "tz_offset": None if tz_offset is None else tz_offset // _ONE_US,
+            "simplify": simplify,
+        }
+    )
+
+
+def options_digest(options: dict[str, Any]) -> str:
+    """Digest of the options that shape the written outputs."""
+    return _digest({"package": __version__, **options})
+
+
+def _us(dt: datetime | None) -> int | None:
+    return None if dt is None else (dt - _EPOCH) // _ONE_US
+
+
+def _dt(us: int | None) -> datetime | None:
+    return None if us is None else _EPOCH + timedelta(microseconds=us)
+
+
+def _offset(us: int | None) -> timedelta | None:
+    return None if us is None else timedelta(microseconds=us)
+
+
+def encode_track(track: Track) -> dict[str, Any]:
+    """JSON form of a scanned flight (before media links and flight logs)."""
+    return {
+        "name": track.name,
+        "segments": track.segments,
+        "utc_source": track.utc_source,
+        "local_offset": (
+            None if track.local_offset is None else track.local_offset // _ONE_US
+        ),
+        "points": [
+            [
+                p.lat, p.lon, p.alt, p.timestamp, _us(p.utc), p.rel_alt,
+                p.focal_len, p.gimbal_yaw, p.gimbal_pitch, p.segment,
+            ]
+            for p in track.points
+        ],
+    }
+
+
+def decode_track(data: dict[str, Any]) -> Track:
+    """Inverse of :func:`encode_track`."""
+    points = [
+        TrackPoint(
+            lat=lat, lon=lon, alt=alt, timestamp=timestamp, utc=_dt(utc),
+            rel_alt=rel_alt, focal_len=focal_len, gimbal_yaw=gimbal_yaw,
+            gimbal_pitch=gimbal_pitch, segment=segment,
+        )
+        for (
+            lat, lon, alt, timestamp, utc, rel_alt, focal_len, gimbal_yaw,
+            gimbal_pitch, segment,
+        ) in data["points"]
+    ]
+    return Track(
+        name=data["name"],
+        points=points,
+        segments=data["segments"],
+        utc_source=data["utc_source"],
+        local_offset=_offset(data["local_offset"]),
+    )
+
+
+class FlightManifest:
+    """The previous run's manifest (if usable) and the one this run builds.
+
+    ``previous_*`` come from disk; :func:`.flightmap.scan_flights` fills
+    ``files`` and ``flights`` and sets ``changed`` and ``parsed``. Files are
+    named by their path below the scan root, suffix included, and a flight
+    by its chain of such names.
+    """
+
+    def __init__(self, path: Path, scan: str) -> None:
+        self.path = Path(path)
+        self.scan = scan
+        self.previous_files: dict[str, dict[str, Any]] = {}
+        self.previous_flights: dict[str, dict[str, Any]] = {}
+        self.previous_options: str | None = None
+        self.previous_outputs: dict[str, Any] = {}
+        self.files: dict[str, dict[str, Any]] = {}
+        self.flights: dict[str, dict[str, Any]] = {}
+        self.changed = True
+        self.parsed = 0
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable manifest %s: %s", self.path, e)
+            return
+        if not isinstance(data, dict) or data.get("scan") != self.scan:
+            return
+        self.previous_files = data.get("files") or {}
+        self.previous_flights = {
+            f["segments"][0]: f for f in data.get("flights") or []
+        }
+        self.previous_options = data.get("options")
+        self.previous_outputs = data.get("outputs") or {}
+
+    # -- scan side ----------------------------------------------------------
+
+    def unchanged(
+        self, name: str, identity: dict[str, int] | None
+    ) -> dict[str, Any] | None:
+        """The previous record for *name* if the file still has *identity*."""
+        record = self.previous_files.get(name)
+        if identity is None or record is None or record.get("id") != identity:
+            return None
+        return record
+
+    def record_file(self, name: str, record: dict[str, Any]) -> None:
+        self.files[name] = record
+
+    def chains_in(self, directory: str) -> list[list[str]]:
+        """The previous run's flights in *directory*, as segment name lists."""
+        return [
+            f["segments"]
+            for first, f in self.previous_flights.items()
+            if posixpath.dirname(first) == directory
+        ]
+
+    def reuse_flight(self, segments: list[str]) -> Track | None:
+        """The previous run's track for exactly this chain of files, if any;
+        it is carried into this run's manifest as it was."""
+        stored = self.previous_flights.get(segments[0])
+        if stored is None or stored["segments"] != segments:
+            return None
+        self.flights[segments[0]] = stored
+        return decode_track(stored["track"])
+
+    def record_flight(self, segments: list[str], track: Track) -> None:
+        self.flights[segments[0]] = {
+            "segments": segments,
+            "track": encode_track(track),
+        }
+
+    # -- output side --------------------------------------------------------
+
+    def outputs_current(self, options: str, outputs: list[Path]) -> bool:
+        """Whether *outputs* are still what the previous run wrote for *options*.
+
+        Only meaningful after a scan that left ``changed`` false.
+        """
+        return (
+            not self.changed
+            and self.previous_options == options
+            and set(self.previous_outputs) == {o.name for o in outputs}
+            and all(
+                _stat_identity(o) == self.previous_outputs[o.name] for o in outputs
+            )
+        )
+
+    def save(self, options: str, outputs: list[Path]) -> None:
+        """Write the manifest for this run; failure only costs a full rebuild."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "scan": self.scan,
+            "options": options,
+            "outputs": {o.name: _stat_identity(o) for o in outputs},
+            "files": self.files,
+            "flights": [self.flights[k] for k in sorted(self.flights)],
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp.write_text(
+                json.dumps(data, separators=(",", ":")), encoding="utf-8"
+            )
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Cannot write manifest %s: %s", self.path, e)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,132 @@
+"""Per-flight data files for archive-scale HTML maps (``--split-data``).
+
+Even a compact inline payload has to be read and parsed before a map of
+thousands of flights can draw anything. With ``--split-data`` the flat HTML
+maps embed only an index: each flight as a ``Point`` at its first fix with
+its summary properties, a GeoJSON ``bbox`` and two extra members —
+``data``, the relative href of its own file, and ``end_s``, the last
+``times_s`` value that sizes the playback slider. The full feature
+(coordinates and every per-point array) goes to ``<map stem>-data/NNNNN.json``
+beside the map, and :data:`.flightmap_js.SPLIT_DATA_JS` fetches it when the
+flight comes into view or is picked for playback. Browsers refuse those
+fetches on maps opened from disk, so such a map is meant to be opened
+through ``dji-embed serve``.
+
+The files are written from the same collection as the inline map, so
+``--redact`` coarsens them identically. Files a previous run left in the
+data folder are removed, so a redacted rerun cannot leave exact tracks
+behind.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections.abc import Collection, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from .flightmap_compact import PROPERTY_SCALES, compact_flights
+
+logger = logging.getLogger(__name__)
+
+_SIDECAR_RE = re.compile(r"^\d{5,}\.json$")
+
+
+def data_dir(output_path: Path) -> Path:
+    """The sidecar folder for the map at *output_path*: ``map.html`` -> ``map-data``."""
+    return output_path.with_name(f"{output_path.stem}-data")
+
+
+def _bbox(coords: list[list[float]]) -> list[float]:
+    lons = [c[0] for c in coords]
+    lats = [c[1] for c in coords]
+    return [min(lons), min(lats), max(lons), max(lats)]
+
+
+def clear_split_data(output_path: Path, keep: Collection[str] = ()) -> None:
+    """Remove the sidecars a previous ``--split-data`` run left for *output_path*.
+
+    Only files named like ours are touched; the folder goes too once empty.
+    """
+    directory = data_dir(output_path)
+    if not directory.is_dir():
+        return
+    for path in directory.iterdir():
+        if _SIDECAR_RE.match(path.name) and path.name not in keep:
+            path.unlink()
+    try:
+        directory.rmdir()
+    except OSError:
+        pass  # not empty: kept files, or files that are not ours
+
+
+def write_split_data(
+    geojson: dict[str, Any], output_path: Path, *, compact: bool = False
+) -> dict[str, Any]:
+    """Write each flight of *geojson* to its own file; return the index collection.
+
+    Every ``LineString`` feature is replaced in the index as described in
+    the module docstring; other features (single-fix flights, photos) stay
+    inline. With *compact* the files are encoded with
+    :func:`.flightmap_compact.compact_flights`.
+    """
+    written: set[str] = set()
+    features = list(
+        split_features(
+            geojson.get("features", []), output_path, compact=compact, written=written
+        )
+    )
+    clear_split_data(output_path, keep=written)
+    return {**geojson, "features": features}
+
+
+def split_features(
+    features: Iterable[dict[str, Any]],
+    output_path: Path,
+    *,
+    compact: bool = False,
+    written: set[str],
+) -> Iterator[dict[str, Any]]:
+    """Yield the index feature of each of *features*, writing its file first.
+
+    The streaming form of :func:`write_split_data`: each file name goes into
+    *written*, and once the features are exhausted the caller removes older
+    files with ``clear_split_data(output_path, keep=written)``.
+    """
+    directory = data_dir(output_path)
+    href_base = quote(directory.name)
+    for n, feature in enumerate(features):
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") != "LineString":
+            yield feature
+            continue
+        name = f"{n:05d}.json"
+        sidecar: dict[str, Any] = {"type": "FeatureCollection", "features": [feature]}
+        if compact:
+            sidecar = compact_flights(sidecar)
+        if not written:
+            directory.mkdir(exist_ok=True)
+        (directory / name).write_text(
+            json.dumps(sidecar, separators=(",", ":")), encoding="utf-8"
+        )
+        written.add(name)
+        properties = {
+            k: v
+            for k, v in (feature.get("properties") or {}).items()
+            if k not in PROPERTY_SCALES and k not in ("media", "lod")
+        }
+        times = feature["properties"].get("times_s")
+        properties["data"] = f"{href_base}/{name}"
+        if times:
+            properties["end_s"] = times[-1]
+        coords = geometry["coordinates"]
+        yield {
+            "type": "Feature",
+            "bbox": _bbox(coords),
+            "geometry": {"type": "Point", "coordinates": coords[0]},
+            "properties": properties,
+        }
+    logger.debug("Wrote %d flight data files to %s", len(written), directory)
@@ -0,0 +1,414 @@
+"""Static tile pyramid for whole-archive flight maps (``flightmap -f tiles``).
+
+Past some tens of thousands of flights no single page can embed, or even
+index, every track. ``-f tiles`` cuts the tracks into a z/x/y pyramid of
+small GeoJSON files (Web Mercator, 256 px tiles, zooms :data:`MIN_ZOOM` to
+:data:`MAX_ZOOM`) beside a viewer page that fetches the tiles in view, much
+as a slippy map fetches its basemap:
+
+- ``flightmap-tiles.html`` — the viewer, with the pyramid's bounds and
+  zoom range embedded;
+- ``flightmap-tiles/{z}/{x}/{y}.json`` — a ``FeatureCollection`` per tile,
+  one ``MultiLineString`` per flight that crosses it (the runs of its
+  track that touch the tile) carrying the flight's popup summary and ``i``,
+  its palette index. A single-fix flight is a ``Point``.
+
+Each zoom draws a track with the Douglas–Peucker subset that stays within
+half a pixel of it there (:func:`.geometry.simplify_ranks`, one pass per
+track); :data:`MAX_ZOOM` tiles carry every point and the viewer overzooms
+them. Tiles are GeoJSON rather than Mapbox Vector Tiles: the package has no
+protobuf dependency and the viewer is Leaflet. Browsers refuse the tile
+fetches on a page opened from disk, so the viewer is meant to be opened
+through ``dji-embed serve``.
+
+Tracks stream through :class:`_TileSink` one at a time: tile fragments are
+buffered up to :data:`BUFFER_BYTES` and then appended to per-tile part files
+on disk, which are assembled into the final tiles at the end, so the
+build's memory does not grow with the archive. Tiles left by a previous
+run are removed first, so a ``--redact`` rebuild cannot leave exact tracks
+behind.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+from collections.abc import Iterable
+from html import escape
+from pathlib import Path
+from typing import Any
+
+from .flightmap import _flight_properties
+from .flightmap_js import FLIGHT_POPUP_JS
+from .geometry import simplify_ranks
+from .provenance import stamp
+from .tiles import DEFAULT_TILE_STYLE, tile_layer_js
+from .track import Track
+
+logger = logging.getLogger(__name__)
+
+MIN_ZOOM = 2
+MAX_ZOOM = 14
+# Tile fragments held in memory before they are appended to part files.
+BUFFER_BYTES = 32 * 1024 * 1024
+# Extra margin, in tiles, when deciding which tiles a segment touches, so
+# a line drawn along a tile edge is in both tiles.
+_EDGE = 4 / 256
+_MERCATOR_MAX_LAT = 85.05112878
+_TILE_RE = re.compile(r"^\d+\.json(\.part)?$")
+
+# Pinned Leaflet release + Subresource Integrity hashes (same pins as
+# flightmap_html.py).
+_LEAFLET_VERSION = "1.9.4"
+_LEAFLET_CSS_SRI = "sha256-p4NxAoJBhIIN+hmNHrzRCf9tD/miZyoHS5obTRR9BMY="
+_LEAFLET_JS_SRI = "sha256-20nQCchB9co0qIjJZRGuk2/Z9VM+kNiyxNV1lvTlZBo="
+
+
+def tiles_dir(output_path: Path) -> Path:
+    """The tile folder for the viewer at *output_path*: ``x.html`` -> ``x/``."""
+    return output_path.with_name(output_path.stem)
+
+
+def _mercator(lat: float, lon: float) -> tuple[float, float]:
+    """Web Mercator position in whole-world units (0..1 both ways)."""
+    lat = max(-_MERCATOR_MAX_LAT, min(_MERCATOR_MAX_LAT, lat))
+    r = math.radians(lat)
+    return (lon + 180.0) / 360.0, (1.0 - math.asinh(math.tan(r)) / math.pi) / 2.0
+
+
+def _metres_per_pixel(lat: float, zoom: int) -> float:
+    return 40075016.686 * math.cos(math.radians(lat)) / (256 * 2**zoom)
+
+
+def _tile_runs(
+    xy: list[tuple[float, float]], idx: list[int], zoom: int
+) -> dict[tuple[int, int], list[list[int]]]:
+    """Tile -> runs of row indices whose segments touch it, at *zoom*."""
+    n = 2**zoom
+    touched: dict[tuple[int, int], list[int]] = {}
+    for k in range(len(idx) - 1):
+        (ax, ay), (bx, by) = xy[idx[k]], xy[idx[k + 1]]
+        x0 = max(0, int(min(ax, bx) * n - _EDGE))
+        x1 = min(n - 1, int(max(ax, bx) * n + _EDGE))
+        y0 = max(0, int(min(ay, by) * n - _EDGE))
+        y1 = min(n - 1, int(max(ay, by) * n + _EDGE))
+        for tx in range(x0, x1 + 1):
+            for ty in range(y0, y1 + 1):
+                touched.setdefault((tx, ty), []).append(k)
+    runs: dict[tuple[int, int], list[list[int]]] = {}
+    for tile, segments in touched.items():
+        tile_runs: list[list[int]] = []
+        for k in segments:
+            if tile_runs and tile_runs[-1][-1] == idx[k]:
+                tile_runs[-1].append(idx[k + 1])
+            else:
+                tile_runs.append([idx[k], idx[k + 1]])
+        runs[tile] = tile_runs
+    return runs
+
+
+def track_tiles(
+    track: Track, index: int, min_zoom: int = MIN_ZOOM, max_zoom: int = MAX_ZOOM
+) -> Iterable[tuple[tuple[int, int, int], dict[str, Any]]]:
+    """Yield ``((z, x, y), feature)`` for every tile *track* appears in."""
+    points = track.points
+    properties = {**_flight_properties(track), "i": index}
+    xy = [_mercator(p.lat, p.lon) for p in points]
+    coords = [[round(p.lon, 6), round(p.lat, 6)] for p in points]
+    if len(points) < 2:
+        for z in range(min_zoom, max_zoom + 1):
+            n = 2**z
+            x, y = xy[0]
+            tile = (z, min(n - 1, int(x * n)), min(n - 1, int(y * n)))
+            yield tile, {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": coords[0]},
+                "properties": properties,
+            }
+        return
+    lat0 = points[0].lat
+    floor = _metres_per_pixel(lat0, max_zoom - 1) / 2
+    ranks = simplify_ranks(
+        [p.lat for p in points], [p.lon for p in points], [0.0] * len(points),
+        floor_m=floor,
+    )
+    for z in range(min_zoom, max_zoom + 1):
+        if z == max_zoom:
+            idx = list(range(len(points)))
+        else:
+            tol = _metres_per_pixel(lat0, z) / 2
+            idx = [i for i, r in enumerate(ranks) if r > tol]
+        for (x, y), runs in _tile_runs(xy, idx, z).items():
+            yield (z, x, y), {
+                "type": "Feature",
+                "geometry": {
+                    "type": "MultiLineString",
+                    "coordinates": [[coords[i] for i in run] for run in runs],
+                },
+                "properties": properties,
+            }
+
+
+class _TileSink:
+    """Collects tile features, spilling them to part files past a budget."""
+
+    def __init__(self, root: Path, budget: int = BUFFER_BYTES) -> None:
+        self.root = root
+        self.budget = budget
+        self.buffered: dict[tuple[int, int, int], list[str]] = {}
+        self.size = 0
+        self.tiles: set[tuple[int, int, int]] = set()
+
+    def _part(self, tile: tuple[int, int, int]) -> Path:
+        z, x, y = tile
+        return self.root / str(z) / str(x) / f"{y}.json.part"
+
+    def add(self, tile: tuple[int, int, int], feature: dict[str, Any]) -> None:
+        text = json.dumps(feature, separators=(",", ":"))
+        self.buffered.setdefault(tile, []).append(text)
+        self.size += len(text)
+        if self.size > self.budget:
+            self.flush()
+
+    def flush(self) -> None:
+        for tile, texts in self.buffered.items():
+            part = self._part(tile)
+            if tile not in self.tiles:
+                part.parent.mkdir(parents=True, exist_ok=True)
+                self.tiles.add(tile)
+            with part.open("a", encoding="utf-8") as f:
+                f.write("".join(t + "\n" for t in texts))
+        self.buffered.clear()
+        self.size = 0
+
+    def finish(self) -> int:
+        """Turn every part file into its tile; return the tile count."""
+        self.flush()
+        for tile in self.tiles:
+            part = self._part(tile)
+            features = part.read_text(encoding="utf-8").splitlines()
+            part.with_suffix("").write_text(
+                '{"type":"FeatureCollection","features":['
+                + ",".join(features)
+                + "]}",
+                encoding="utf-8",
+            )
+            part.unlink()
+        return len(self.tiles)
+
+
+def clear_tiles(output_path: Path) -> None:
+    """Remove the tiles a previous run wrote for the viewer at *output_path*.
+
+    Only ``{z}/{x}/{y}.json`` files are touched; folders go once empty.
+    """
+    root = tiles_dir(output_path)
+    if not root.is_dir():
+        return
+    for z_dir in root.iterdir():
+        if not (z_dir.is_dir() and z_dir.name.isdigit()):
+            continue
+        for x_dir in z_dir.iterdir():
+            if not (x_dir.is_dir() and x_dir.name.isdigit()):
+                continue
+            for path in x_dir.iterdir():
+                if _TILE_RE.match(path.name):
+                    path.unlink()
+            _rmdir(x_dir)
+        _rmdir(z_dir)
+    _rmdir(root)
+
+
+def _rmdir(path: Path) -> None:
+    try:
+        path.rmdir()
+    except OSError:
+        pass  # not empty: files that are not ours
+
+
+def write_flight_tiles(
+    tracks: Iterable[Track],
+    output_path: Path,
+    title: str,
+    *,
+    tile_style: str = DEFAULT_TILE_STYLE,
+    redact: str = "none",
+    min_zoom: int = MIN_ZOOM,
+    max_zoom: int = MAX_ZOOM,
+) -> int:
+    """Write the tile pyramid of *tracks* and its viewer at *output_path*.
+
+    *tracks* is consumed once, one track at a time. Returns the number of
+    tiles written.
+    """
+    clear_tiles(output_path)
+    root = tiles_dir(output_path)
+    sink = _TileSink(root, BUFFER_BYTES)
+    flights = 0
+    west = south = math.inf
+    east = north = -math.inf
+    try:
+        for index, track in enumerate(tracks):
+            flights += 1
+            for p in track.points:
+                west, east = min(west, p.lon), max(east, p.lon)
+                south, north = min(south, p.lat), max(north, p.lat)
+            for tile, feature in track_tiles(track, index, min_zoom, max_zoom):
+                sink.add(tile, feature)
+        count = sink.finish()
+    except BaseException:
+        # Never leave a half-built pyramid (or stray part files) behind.
+        clear_tiles(output_path)
+        raise
+    meta = {
+        "tiles": f"{root.name}/{{z}}/{{x}}/{{y}}.json",
+        "minzoom": min_zoom,
+        "maxzoom": max_zoom,
+        "bounds": [west, south, east, north] if flights else None,
+        "flights": flights,
+        "redacted": redact,
+    }
+    output_path.write_text(
+        tiles_viewer_html(meta, title, tile_style=tile_style), encoding="utf-8"
+    )
+    logger.info(
+        "Flight tile pyramid created: %s (%d tiles in %s)", output_path, count, root
+    )
+    return count
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8" />
+<meta name="viewport" content="width=device-width, initial-scale=1.0" />
+<title>Flight map — {title}</title>
+<!-- Leaflet + OpenStreetMap tiles load from the network; the flight tiles
+     load from the folder beside this file, so open it through a server
+     (dji-embed serve). -->
+<link rel="stylesheet"
+      href="https://unpkg.com/leaflet@{leaflet}/dist/leaflet.css"
+      integrity="{css_sri}" crossorigin="" />
+<style>
+  html, body {{ height: 100%; margin: 0; }}
+  #map {{ height: 100%; }}
+  .flight-popup {{ font: 13px/1.5 sans-serif; }}
+  .tiles-note {{ background: #fff; padding: 4px 8px; border-radius: 4px;
+                font: 12px/1.4 sans-serif; max-width: 260px; }}
+</style>
+</head>
+<body>
+<div id="map"></div>
+<script type="application/json" id="tile-meta">
+{meta}
+</script>
+<script src="https://unpkg.com/leaflet@{leaflet}/dist/leaflet.js"
+        integrity="{js_sri}" crossorigin=""></script>
+<script>
+{app_js}
+</script>
+</body>
+</html>
+"""
+
+_APP_JS = """const meta = JSON.parse(document.getElementById('tile-meta').textContent);
+const map = L.map('map', { minZoom: meta.minzoom });
+__TILE_LAYER__
+
+__SHARED_JS__
+
+// Tile pyramid (flightmap_tiles.py): fetch the z/x/y tiles in view at the
+// current zoom (clamped to the pyramid's range; past maxzoom the deepest
+// tiles are overzoomed) and drop the rest.
+const tileLayers = new Map();   // 'z/x/y' -> { layer, abort }
+let tilesFailed = false;
+function tileNote() {
+  if (tilesFailed) return;
+  tilesFailed = true;
+  const ctl = L.control({ position: 'topright' });
+  ctl.onAdd = () => {
+    const div = L.DomUtil.create('div', 'tiles-note');
+    div.textContent = 'Flight tiles load from the folder beside this map, ' +
+      'which browsers block for maps opened straight from disk. Open it ' +
+      'with \\u2018dji-embed serve\\u2019 to see them.';
+    return div;
+  };
+  ctl.addTo(map);
+}
+function tileXY(lat, lng, n) {
+  const r = Math.max(-85.0511, Math.min(85.0511, lat)) * Math.PI / 180;
+  return [
+    Math.floor((lng + 180) / 360 * n),
+    Math.floor((1 - Math.asinh(Math.tan(r)) / Math.PI) / 2 * n),
+  ];
+}
+function tileLayer(fc) {
+  return L.geoJSON(fc, {
+    style: f => ({ color: PALETTE[f.properties.i % PALETTE.length], weight: 3 }),
+    pointToLayer: (f, ll) => L.circleMarker(ll, { radius: 6, fillOpacity: 0.9 }),
+    onEachFeature: (f, layer) => layer.bindPopup(popupHtml(f.properties)),
+  });
+}
+function showTiles() {
+  const z = Math.max(meta.minzoom, Math.min(meta.maxzoom, Math.floor(map.getZoom())));
+  const n = Math.pow(2, z), b = map.getBounds();
+  const clamp = v => Math.max(0, Math.min(n - 1, v));
+  // The view, cut to the flights' extent: no requests for empty ocean.
+  const [w, s, e, nn] = meta.bounds;
+  const [x0, y0] = tileXY(Math.min(b.getNorth(), nn), Math.max(b.getWest(), w), n)
+    .map(clamp);
+  const [x1, y1] = tileXY(Math.max(b.getSouth(), s), Math.min(b.getEast(), e), n)
+    .map(clamp);
+  const want = new Set();
+  for (let x = x0; x <= x1; x++) {
+    for (let y = y0; y <= y1; y++) want.add(`${z}/${x}/${y}`);
+  }
+  tileLayers.forEach((t, key) => {
+    if (want.has(key)) return;
+    if (t.layer) map.removeLayer(t.layer); else t.abort.abort();
+    tileLayers.delete(key);
+  });
+  want.forEach(key => {
+    if (tileLayers.has(key) || tilesFailed) return;
+    const [tz, tx, ty] = key.split('/');
+    const t = { layer: null, abort: new AbortController() };
+    tileLayers.set(key, t);
+    const url = meta.tiles.replace('{z}', tz).replace('{x}', tx).replace('{y}', ty);
+    fetch(url, { signal: t.abort.signal })
+      .then(r => {
+        if (r.status === 404) return null;      // nothing flown there
+        if (!r.ok) throw new Error(r.statusText);
+        return r.json();
+      })
+      .then(fc => {
+        if (!fc || tileLayers.get(key) !== t) return;
+        t.layer = tileLayer(fc).addTo(map);
+      })
+      .catch(e => { if (e.name !== 'AbortError') tileNote(); });
+  });
+}
+if (meta.bounds) {
+  map.on('moveend', showTiles);
+  const [w, s, e, n] = meta.bounds;
+  map.fitBounds(L.latLngBounds([s, w], [n, e]).pad(0.1), { maxZoom: 17 });
+} else {
+  map.setView([0, 0], meta.minzoom);
+}
+"""
+
+
+def tiles_viewer_html(
+    meta: dict[str, Any], title: str, *, tile_style: str = DEFAULT_TILE_STYLE
+) -> str:
+    """The viewer page for a pyramid described by *meta* (see the template)."""
+    return stamp(_TEMPLATE.format(
+        title=escape(title),
+        leaflet=_LEAFLET_VERSION,
+        css_sri=_LEAFLET_CSS_SRI,
+        js_sri=_LEAFLET_JS_SRI,
+        meta=json.dumps(meta).replace("<", "\\u003c"),
+        app_js=_APP_JS.replace("__TILE_LAYER__", tile_layer_js(tile_style))
+        .replace("__SHARED_JS__", FLIGHT_POPUP_JS),
+    ))
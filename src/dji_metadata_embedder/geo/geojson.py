@@ -12,8 +12,9 @@ import logging
 from pathlib import Path
 
 from .footprint import Footprint, build_footprints, lens_for
+from .geometry import simplify_points
 from .track import Track, build_track
-from ..utilities import Home, parse_home, redact_home
+from ..utilities import Home, read_home, redact_home
 from ..mp4_telemetry import is_video
 
 logger = logging.getLogger(__name__)
@@ -115,19 +116,25 @@ def convert_to_geojson(
     footprint_interval: float = 2.0,
     model: str | None = None,
     extract_home: bool = False,
+    simplify: float | None = None,
 ) -> Path:
     """Convert a DJI SRT file to GeoJSON. Defaults output to ``<srt>.geojson``.
 
     When ``footprint`` is set and ``redact == "none"``, per-interval camera
     ground-footprint polygons are added. Footprints are suppressed under any
-    redaction (a precise polygon would re-sharpen a fuzzed centre)."""
+    redaction (a precise polygon would re-sharpen a fuzzed centre).
+    ``simplify`` (metres) thins the track with
+    :func:`.geometry.simplify_points`; footprints still sample the full
+    track."""
     srt_path = Path(srt_file)
     output_path = Path(output_file) if output_file else srt_path.with_suffix(".geojson")
     track = build_track(srt_path, redact=redact)
     footprints = None
     if footprint and redact == "none":
         footprints = build_footprints(track, lens=lens_for(model), interval=footprint_interval)
+    if simplify is not None:
+        track.points = simplify_points(track.points, simplify)
     home = None
     if extract_home and not is_video(srt_path):
-        home = redact_home(parse_home(srt_path.read_text(encoding="utf-8")), redact)
+        home = redact_home(read_home(srt_path), redact)
     return write_geojson(track, output_path, footprints, home=home)
@@ -1,4 +1,5 @@
-"""Shared great-circle and time-downsampling helpers for the geo exporters.
+"""Shared great-circle, downsampling and simplification helpers for the geo
+exporters.
 
 Extracted from ``cot.py`` so the CoT and footprint paths share one
 implementation of bearing/distance/downsampling.
@@ -7,6 +8,7 @@ implementation of bearing/distance/downsampling.
 from __future__ import annotations
 
 import math
+from collections.abc import Sequence
 from datetime import datetime
 
 from .track import TrackPoint
@@ -111,3 +113,149 @@ def downsample_by_time(points: list[TrackPoint], interval: float) -> list[TrackP
     if len(points) > 1:
         kept.append(points[-1])
     return kept
+
+
+def simplify_indices(
+    lat: Sequence[float],
+    lon: Sequence[float],
+    alt: Sequence[float],
+    tolerance_m: float,
+    alt_tolerance_m: float | None = None,
+) -> list[int]:
+    """Indices of the rows Douglas–Peucker keeps within an error bound.
+
+    Works on a local flat-earth projection (metres east/north of the first
+    row), which is exact to well under a metre across a single flight. A row
+    is dropped only when it lies within ``tolerance_m`` horizontally of the
+    chord between the rows kept around it, and within ``alt_tolerance_m``
+    (default: ``tolerance_m``) of the chord's altitude at that point. The
+    distance is to the chord *segment*, so a drone that doubles back keeps
+    its turning point. First and last rows are always kept.
+    """
+    if tolerance_m <= 0 or (alt_tolerance_m is not None and alt_tolerance_m <= 0):
+        raise ValueError("simplify tolerances must be positive")
+    n = len(lat)
+    if n <= 2:
+        return list(range(n))
+    inv_h = 1.0 / tolerance_m
+    inv_v = 1.0 / (tolerance_m if alt_tolerance_m is None else alt_tolerance_m)
+    lat0, lon0 = lat[0], lon[0]
+    kx = M_PER_DEG_LAT * math.cos(math.radians(lat0))
+    xs = [(x - lon0) * kx for x in lon]
+    ys = [(y - lat0) * M_PER_DEG_LAT for y in lat]
+    keep = bytearray(n)
+    keep[0] = keep[-1] = 1
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        ax, ay, az = xs[a], ys[a], alt[a]
+        dx, dy, dz = xs[b] - ax, ys[b] - ay, alt[b] - az
+        seg2 = dx * dx + dy * dy
+        worst, split = 1.0, -1
+        for i in range(a + 1, b):
+            px, py = xs[i] - ax, ys[i] - ay
+            if seg2 > 1e-6:
+                t = min(max((px * dx + py * dy) / seg2, 0.0), 1.0)
+            else:
+                # Chord ends coincide (hover): measure from the start, and
+                # interpolate altitude by position in the run.
+                t = (i - a) / (b - a)
+            ex, ey = px - t * dx, py - t * dy
+            err = max(
+                math.sqrt(ex * ex + ey * ey) * inv_h,
+                abs(alt[i] - az - t * dz) * inv_v,
+            )
+            if err > worst:
+                worst, split = err, i
+        if split >= 0:
+            keep[split] = 1
+            stack.append((a, split))
+            stack.append((split, b))
+    return [i for i in range(n) if keep[i]]
+
+
+def simplify_points(
+    points: list[TrackPoint],
+    tolerance_m: float,
+    alt_tolerance_m: float | None = None,
+) -> list[TrackPoint]:
+    """:func:`simplify_indices` over *points*, each recording segment on its own.
+
+    The first and last point of every segment (see :attr:`TrackPoint.segment`)
+    are kept, so a joined flight's file boundaries survive.
+    """
+    kept: list[TrackPoint] = []
+    start = 0
+    for end in range(1, len(points) + 1):
+        if end < len(points) and points[end].segment == points[start].segment:
+            continue
+        run = points[start:end]
+        rows = simplify_indices(
+            [p.lat for p in run],
+            [p.lon for p in run],
+            [p.alt for p in run],
+            tolerance_m,
+            alt_tolerance_m,
+        )
+        kept.extend(run[i] for i in rows)
+        start = end
+    return kept
+
+
+def simplify_ranks(
+    lat: Sequence[float],
+    lon: Sequence[float],
+    alt: Sequence[float],
+    floor_m: float = 0.0,
+) -> list[float]:
+    """Per-row Douglas–Peucker significance, in metres.
+
+    Row ``i`` survives :func:`simplify_indices` at tolerance ``t`` exactly
+    when ``ranks[i] > t``, so one pass serves any number of tolerances. Each
+    rank is capped by the rank of the row that split its span, which keeps
+    the levels nested. Spans whose worst row is within ``floor_m`` are not
+    split further; their rows rank 0. First and last rows rank ``inf``.
+    """
+    n = len(lat)
+    ranks = [0.0] * n
+    if n == 0:
+        return ranks
+    ranks[0] = ranks[-1] = math.inf
+    lat0, lon0 = lat[0], lon[0]
+    kx = M_PER_DEG_LAT * math.cos(math.radians(lat0))
+    xs = [(x - lon0) * kx for x in lon]
+    ys = [(y - lat0) * M_PER_DEG_LAT for y in lat]
+    stack = [(0, n - 1, math.inf)]
+    while stack:
+        a, b, cap = stack.pop()
+        if b - a < 2:
+            continue
+        ax, ay, az = xs[a], ys[a], alt[a]
+        dx, dy, dz = xs[b] - ax, ys[b] - ay, alt[b] - az
+        seg2 = dx * dx + dy * dy
+        worst, split = -1.0, -1
+        # The hot loop of every tile/level build: plain comparisons instead
+        # of min()/max() calls, and squared distances until the end.
+        for i in range(a + 1, b):
+            px, py = xs[i] - ax, ys[i] - ay
+            if seg2 > 1e-6:
+                t = (px * dx + py * dy) / seg2
+                t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+            else:
+                t = (i - a) / (b - a)   # as in simplify_indices
+            ex, ey = px - t * dx, py - t * dy
+            err = ex * ex + ey * ey
+            ez = alt[i] - az - t * dz
+            if ez * ez > err:
+                err = ez * ez
+            if err > worst:
+                worst, split = err, i
+        rank = min(math.sqrt(worst), cap)
+        if rank <= floor_m:
+            continue
+        ranks[split] = rank
+        stack.append((a, split, rank))
+        stack.append((split, b, rank))
+    return ranks
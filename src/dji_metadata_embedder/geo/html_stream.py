@@ -0,0 +1,81 @@
+"""Streaming output for the HTML maps' embedded GeoJSON.
+
+The map writers used to build the whole page as one string: the collection
+dict, its ``json.dumps``, the ``<``-escaped copy, the formatted template
+and the file text — several full copies of what, for an archive, is tens
+of megabytes. They now render the template once with :data:`DATA_SLOT`
+where the data goes and write the page in pieces:
+
+- the template head (everything before the slot);
+- the collection, encoded feature by feature by :func:`collection_chunks`
+  as the caller's generator builds each one, ``<`` escaped on the way;
+- the template tail.
+
+:func:`write_chunks` writes through a ``.tmp`` sibling and renames it into
+place, so an interrupted build leaves the previous map intact. The
+``*_to_html`` string functions join the same chunks, so both paths emit
+identical pages.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+# Stands in for the data block when the template is formatted; a NUL never
+# occurs in a template, a title (escaped) or any of the embedded scripts.
+DATA_SLOT = "\x00data\x00"
+
+
+def _escape(text: str) -> str:
+    # "<" as "\\u003c" (a JSON Unicode escape): JSON.parse round-trips it
+    # while no literal "</script>" can break out of the data block.
+    return text.replace("<", "\\u003c")
+
+
+def collection_chunks(
+    header: dict[str, Any],
+    features: Iterable[dict[str, Any]],
+    *,
+    separators: tuple[str, str] | None = None,
+) -> Iterator[str]:
+    """Encode a ``FeatureCollection`` of *header* members plus *features*.
+
+    The output matches ``json.dumps({**header, "features": [...]})`` with
+    the same *separators*, with ``<`` escaped; *features* is consumed one
+    at a time.
+    """
+    item_sep, key_sep = separators or (", ", ": ")
+    head = json.dumps(header, separators=(item_sep, key_sep))[:-1]
+    yield _escape(head + (item_sep if header else "") + f'"features"{key_sep}[')
+    for n, feature in enumerate(features):
+        text = json.dumps(feature, separators=(item_sep, key_sep))
+        yield _escape(item_sep + text if n else text)
+    yield "]}"
+
+
+def page_chunks(page: str, data: Iterable[str]) -> Iterator[str]:
+    """*page* with the chunks of *data* in place of its :data:`DATA_SLOT`."""
+    head, tail = page.split(DATA_SLOT)
+    yield head
+    yield from data
+    yield tail
+
+
+def write_chunks(output_path: Path, chunks: Iterable[str]) -> None:
+    """Write *chunks* to *output_path* atomically (temp file + rename)."""
+    tmp = output_path.with_name(output_path.name + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, output_path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
@@ -15,6 +15,7 @@ from html import escape
 from pathlib import Path
 
 from .geojson import track_to_geojson
+from .geometry import simplify_points
 from .provenance import attribution_credit, stamp
 from .track import Track, build_track
 
@@ -152,9 +153,19 @@ def write_html(track: Track, output_path: Path) -> Path:
 
 
 def convert_to_html(
-    srt_file: Path | str, output_file: Path | str | None = None, redact: str = "none"
+    srt_file: Path | str,
+    output_file: Path | str | None = None,
+    redact: str = "none",
+    *,
+    simplify: float | None = None,
 ) -> Path:
-    """Convert a DJI SRT file to a standalone HTML map. Defaults to ``<srt>.html``."""
+    """Convert a DJI SRT file to a standalone HTML map. Defaults to ``<srt>.html``.
+
+    ``simplify`` (metres) thins the track with :func:`.geometry.simplify_points`.
+    """
     srt_path = Path(srt_file)
     output_path = Path(output_file) if output_file else srt_path.with_suffix(".html")
-    return write_html(build_track(srt_path, redact=redact), output_path)
+    track = build_track(srt_path, redact=redact)
+    if simplify is not None:
+        track.points = simplify_points(track.points, simplify)
+    return write_html(track, output_path)
@@ -7,6 +7,7 @@ from pathlib import Path
 from xml.sax.saxutils import escape
 
 from .footprint import Footprint
+from .geometry import simplify_points
 from .track import Track, build_track
 
 logger = logging.getLogger(__name__)
@@ -72,11 +73,13 @@ def convert_to_kml(
     footprint: bool = False,
     footprint_interval: float = 2.0,
     model: str | None = None,
+    simplify: float | None = None,
 ) -> Path:
     """Convert a DJI SRT file to KML. Defaults output to ``<srt>.kml``.
 
     With ``footprint`` and ``redact == "none"``, a folder of per-interval camera
-    footprint polygons is added."""
+    footprint polygons is added. ``simplify`` (metres) thins the path with
+    :func:`.geometry.simplify_points`."""
     from .footprint import build_footprints, lens_for
 
     srt_path = Path(srt_file)
@@ -85,4 +88,6 @@ def convert_to_kml(
     footprints = None
     if footprint and redact == "none":
         footprints = build_footprints(track, lens=lens_for(model), interval=footprint_interval)
+    if simplify is not None:
+        track.points = simplify_points(track.points, simplify)
     return write_kml(track, output_path, footprints)
@@ -11,14 +11,17 @@ over this same collection, never a data-model migration.
 
 from __future__ import annotations
 
-import json
 import logging
+from collections.abc import Iterable, Iterator
 from html import escape
 from pathlib import Path
 
-from .flightmap import flights_to_geojson
-from .flightmap_js import FLIGHT_POPUP_JS, PLAYBACK_JS
-from .photomap import PhotoPoint, photos_to_geojson
+from .flightmap import flight_features
+from .flightmap_js import FLIGHT_POPUP_JS, LOD_JS, PLAYBACK_JS, SPLIT_DATA_JS
+from .flightmap_lod import with_levels
+from .flightmap_split import clear_split_data, split_features
+from .html_stream import DATA_SLOT, collection_chunks, page_chunks, write_chunks
+from .photomap import PhotoPoint, photo_features
 from .photomap_js import (
     CLUSTER_CSS_SRI,
     CLUSTER_DEFAULT_CSS_SRI,
@@ -61,20 +64,29 @@ def mixed_to_geojson(
     ``link_base`` and the top-level ``redacted`` member behave exactly as
     in the source exporters.
     """
-    photo_fc = photos_to_geojson(points, include_thumbnails=True, link_base=link_base)
-    for feature in photo_fc["features"]:
-        props = feature["properties"]
-        props["type"] = "pano" if props.get("pano") else "photo"
-    flight_fc = flights_to_geojson(tracks, redact=redact)
-    for feature in flight_fc["features"]:
-        feature["properties"]["type"] = "track"
     return {
         "type": "FeatureCollection",
         "redacted": redact,
-        "features": photo_fc["features"] + flight_fc["features"],
+        "features": list(mixed_features(points, tracks, link_base=link_base)),
     }
 
 
+def mixed_features(
+    points: Iterable[PhotoPoint],
+    tracks: Iterable[Track],
+    *,
+    link_base: str | None = None,
+) -> Iterator[dict]:
+    """Yield the :func:`mixed_to_geojson` features in turn, photos first."""
+    for feature in photo_features(points, include_thumbnails=True, link_base=link_base):
+        props = feature["properties"]
+        props["type"] = "pano" if props.get("pano") else "photo"
+        yield feature
+    for feature in flight_features(tracks):
+        feature["properties"]["type"] = "track"
+        yield feature
+
+
 _TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -149,7 +161,8 @@ __PHOTO_LAYER__
 
 // Flight tracks: one coloured polyline per flight with the flightmap
 // summary popup and a start dot; a single-fix clip degrades to the dot.
-const overlays = {};
+__LOD_JS__
+__SPLIT_JS__const overlays = {};
 const allLatLngs = [];
 const runs = [];   // playback (#267): flights with usable per-point times
 byType('track').forEach((f, i) => {
@@ -157,9 +170,14 @@ byType('track').forEach((f, i) => {
   const p = f.properties || {};
   const group = L.layerGroup();
   let latlngs;
-  if (f.geometry.type === 'LineString') {
+  if (p.data) {                                        // --split-data index
+    const c = f.geometry.coordinates, b = f.bbox;
+    latlngs = [[c[1], c[0]], [b[1], b[0]], [b[3], b[2]]];   // start, bbox
+    const run = splitFlight(f, color, group, p.name || `flight ${i + 1}`);
+    if (run) runs.push(run);
+  } else if (f.geometry.type === 'LineString') {
     latlngs = f.geometry.coordinates.map(c => [c[1], c[0]]);
-    L.polyline(latlngs, { color, weight: 3 })
+    lodPolyline(latlngs, p.lod, { color, weight: 3 })
       .bindPopup(popupHtml(p)).addTo(group);
     const times = p.times_s;
     if (Array.isArray(times) && times.length === latlngs.length &&
@@ -237,12 +255,20 @@ def mixed_to_html(
     links exactly as in :func:`.photomap_html.photos_to_html`; ``redact`` is
     the badge for coordinates the *scanners* already coarsened.
     """
-    geojson = mixed_to_geojson(points, tracks, link_base=link_base, redact=redact)
-    # Escape "<" to "\\u003c" (a JSON Unicode escape) so JSON.parse round-trips
-    # it while no literal "</script>" can break out of the data block.
-    data = json.dumps(geojson).replace("<", "\\u003c")
-    pano_enabled = link_base is not None and any(p.is_pano for p in points)
-    return stamp(_TEMPLATE.format(
+    return "".join(_mixed_page(
+        map(with_levels, mixed_features(points, tracks, link_base=link_base)),
+        title, redact=redact,
+        pano_enabled=link_base is not None and any(p.is_pano for p in points),
+        tile_style=tile_style,
+    ))
+
+
+def _mixed_page(
+    features: Iterable[dict], title: str, *, redact: str, pano_enabled: bool,
+    tile_style: str, split: bool = False,
+) -> Iterator[str]:
+    """Render the map around *features*; *split* adds the ``--split-data`` loader."""
+    page = stamp(_TEMPLATE.format(
         title=escape(title),
         leaflet=_LEAFLET_VERSION,
         leaflet_css_sri=_LEAFLET_CSS_SRI,
@@ -252,7 +278,7 @@ def mixed_to_html(
         cluster_default_css_sri=CLUSTER_DEFAULT_CSS_SRI,
         cluster_js_sri=CLUSTER_JS_SRI,
         photo_css=PHOTO_CSS,
-        data=data,
+        data=DATA_SLOT,
         pano_head=PANO_HEAD if pano_enabled else "",
         pano_overlay=PANO_OVERLAY if pano_enabled else "",
         pano_scripts=PANO_SCRIPT if pano_enabled else "",
@@ -261,9 +287,14 @@ def mixed_to_html(
             .replace("__HOVER_CONTROL__", HOVER_CONTROL_JS)
             .replace("__SHARED_JS__", FLIGHT_POPUP_JS)
             .replace("__PLAYBACK_JS__", PLAYBACK_JS)
+            .replace("__LOD_JS__", LOD_JS)
+            .replace("__SPLIT_JS__", SPLIT_DATA_JS + "\n" if split else "")
             + (PANO_JS if pano_enabled else "")
         ).replace("__TILE_LAYER__", tile_layer_js(tile_style)),
     ))
+    return page_chunks(page, collection_chunks(
+        {"type": "FeatureCollection", "redacted": redact}, features
+    ))
 
 
 def write_mixed_html(
@@ -275,14 +306,25 @@ def write_mixed_html(
     link_base: str | None = None,
     redact: str = "none",
     tile_style: str = DEFAULT_TILE_STYLE,
+    split_data: bool = False,
 ) -> Path:
-    """Write the combined map to *output_path* and return it."""
-    output_path.write_text(
-        mixed_to_html(
-            points, tracks, title,
-            link_base=link_base, redact=redact, tile_style=tile_style,
-        ),
-        encoding="utf-8",
+    """Write the combined map to *output_path* and return it.
+
+    Streamed to disk and swapped into place once complete, as for
+    :func:`.flightmap_html.write_flights_html`. ``split_data``: as there;
+    the photos stay inline.
+    """
+    features: Iterable[dict] = map(
+        with_levels, mixed_features(points, tracks, link_base=link_base)
     )
+    written: set[str] = set()
+    if split_data:
+        features = split_features(features, output_path, written=written)
+    write_chunks(output_path, _mixed_page(
+        features, title, redact=redact,
+        pano_enabled=link_base is not None and any(p.is_pano for p in points),
+        tile_style=tile_style, split=split_data,
+    ))
+    clear_split_data(output_path, keep=written)
     logger.info("HTML combined map created: %s", output_path)
     return output_path
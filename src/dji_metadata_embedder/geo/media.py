@@ -12,6 +12,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from ..utils.inventory import DirectoryInventory
 from .links import link_href
 from .track import Track
 
@@ -20,25 +21,36 @@ from .track import Track
 _VIDEO_SUFFIXES = (".MP4", ".mp4", ".MOV", ".mov")
 
 
-def _find_video(root: Path, name: str) -> str | None:
+def _find_video(
+    root: Path, name: str, listings: dict[Path, DirectoryInventory | None]
+) -> str | None:
     """Relative POSIX path of the video for segment *name*, or ``None``.
 
-    Scans the real directory entries rather than probing guessed filenames.
-    Probing (``(root / f"{name}{suffix}").is_file()``) is wrong on a
-    case-insensitive filesystem (Windows, default macOS): a real
+    Looks the stem up in the real directory entries rather than probing
+    guessed filenames. Probing (``(root / f"{name}{suffix}").is_file()``) is
+    wrong on a case-insensitive filesystem (Windows, default macOS): a real
     ``flight.mov`` also answers ``is_file()`` for the guessed ``flight.MOV``,
     so the href would carry a case the directory entry does not actually
     have -- working locally, and 404ing the moment the folder is served from
     a case-sensitive host (#380 whole-branch review M1).
+
+    *listings* memoizes one :class:`DirectoryInventory` per folder, so a
+    folder of many segments is listed once, not once per segment.
     """
     target = root / name
     parent, stem = target.parent, target.name
-    if not parent.is_dir():
+    if parent not in listings:
+        try:
+            listings[parent] = DirectoryInventory.scan(parent)
+        except OSError:
+            listings[parent] = None
+    inventory = listings[parent]
+    if inventory is None:
         return None
     rank = {suffix.lower(): i for i, suffix in enumerate(_VIDEO_SUFFIXES)}
     best: tuple[int, Path] | None = None
-    for entry in parent.iterdir():
-        if entry.is_file() and entry.stem == stem:
+    for entry in inventory.with_stem(stem):
+        if entry.stem == stem:
             r = rank.get(entry.suffix.lower())
             if r is not None and (best is None or r < best[0]):
                 best = (r, entry)
@@ -55,10 +67,11 @@ def resolve_media(
     track with no resolvable video at all gets ``None``, so nothing downstream
     offers a crossfade it cannot deliver.
     """
+    listings: dict[Path, DirectoryInventory | None] = {}
     for track in tracks:
         names = track.segments or [track.name]
         hrefs: list[str | None] = []
         for name in names:
-            found = _find_video(root, name)
+            found = _find_video(root, name, listings)
             hrefs.append(link_href(found, base or "") if found else None)
         track.media = hrefs if any(hrefs) else None
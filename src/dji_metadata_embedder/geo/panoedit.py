@@ -29,7 +29,7 @@ from pathlib import Path
 
 import click
 
-from ..utils.exiftool import exiftool_exe, exiftool_version
+from ..utils.exiftool import call_exiftool, exiftool_version
 from .photomap import _maybe_float, _pano_view
 from .serve import _MapServer, _RangeHandler, _shutdown_on_stdin_eof
 
@@ -188,7 +188,7 @@ def _scan_timeout(directory: Path, recursive: bool) -> float:
 
 
 def _run_scan(directory: Path, recursive: bool) -> list[dict]:
-    args = [exiftool_exe(), "-json", "-n"]
+    args = ["-json", "-n"]
     if recursive:
         args.append("-r")
     args += _SCAN_TAGS + _SIZE_TAGS
@@ -197,10 +197,7 @@ def _run_scan(directory: Path, recursive: bool) -> list[dict]:
     args.append(str(directory))
     timeout = _scan_timeout(directory, recursive)
     try:
-        proc = subprocess.run(
-            args, capture_output=True, text=True,
-            encoding="utf-8", errors="replace", timeout=timeout,
-        )
+        proc = call_exiftool(args, timeout=timeout)
     except FileNotFoundError:
         raise PanoEditError(_EXIFTOOL_INSTALL_HINT) from None
     except subprocess.TimeoutExpired:
@@ -281,9 +278,8 @@ def write_initial_view(
     reaches the page as a request that never returns and a Save button
     that stays dead until the app is restarted (#475).
     """
-    exe = exiftool_exe()
     write_args = [
-        exe, "-n",
+        "-n",
         *([] if backup else ["-overwrite_original"]),
         f"-XMP-GPano:InitialViewHeadingDegrees={heading}",
         f"-XMP-GPano:InitialViewPitchDegrees={pitch}",
@@ -292,10 +288,7 @@ def write_initial_view(
     ]
     started = time.monotonic()
     try:
-        proc = subprocess.run(
-            write_args, capture_output=True, text=True,
-            encoding="utf-8", errors="replace", timeout=_WRITE_TIMEOUT,
-        )
+        proc = call_exiftool(write_args, timeout=_WRITE_TIMEOUT)
     except FileNotFoundError:
         raise PanoEditError(_EXIFTOOL_INSTALL_HINT) from None
     except subprocess.TimeoutExpired:
@@ -320,12 +313,9 @@ def write_initial_view(
             f"ExifTool could not write {path.name}: "
             f"{stderr or 'no error output'}"
         )
-    read_args = [exe, "-json", "-n", *_SCAN_TAGS[1:], str(path)]
+    read_args = ["-json", "-n", *_SCAN_TAGS[1:], str(path)]
     try:
-        proc = subprocess.run(
-            read_args, capture_output=True, text=True,
-            encoding="utf-8", errors="replace", timeout=_WRITE_TIMEOUT,
-        )
+        proc = call_exiftool(read_args, timeout=_WRITE_TIMEOUT)
     except subprocess.TimeoutExpired:
         raise PanoEditError(
             f"The tags were written to {path.name}, but reading them back "
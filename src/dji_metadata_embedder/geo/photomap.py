@@ -8,19 +8,25 @@ GeoJSON and KML here, the clustered HTML map in :mod:`.photomap_html`.
 from __future__ import annotations
 
 import base64
+import functools
 import io
 import json
 import logging
 import os
 import re
 import struct
-import subprocess
-from dataclasses import dataclass, replace
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
 from xml.sax.saxutils import escape
 
 from ..utilities import is_gps_fix, redact_coords
-from ..utils.exiftool import exiftool_exe
+from ..utils.cache import TelemetryCache, active_cache
+from ..utils.exiftool import (  # noqa: F401 (call_exiftool, exiftool_exe re-exported)
+    call_exiftool,
+    exiftool_exe,
+    exiftool_version,
+)
 from .links import link_href
 
 logger = logging.getLogger(__name__)
@@ -73,6 +79,14 @@ _SCAN_TAGS = [
 ]
 _PHOTO_EXTS = ("jpg", "jpeg", "dng")
 
+# Cache-key version of one photo's scan result (see _scan_cached). Bump when
+# the entry mapping or the thumbnail pipeline changes what a photo yields.
+_PHOTO_CACHE_VERSION = "photo-1"
+
+# Photos per ExifTool call when only the cache misses are scanned: keeps
+# the file list well under Windows' 32K command-line limit.
+_SCAN_BATCH = 200
+
 # Ingestion-enforced invariant: thumbnail_b64 only ever holds base64 text, so
 # writers may embed it in CDATA/data URIs without further escaping.
 _BASE64_RE = re.compile(r"[A-Za-z0-9+/=\s]+")
@@ -400,17 +414,28 @@ def _run_exiftool_scan(directory: Path, recursive: bool) -> list[dict]:
     "no photos", not an error. A non-zero exit with no JSON at all is a real
     failure (unreadable directory, broken install) and raises.
     """
-    args = [exiftool_exe(), "-json", "-n", "-b"]
+    args = ["-json", "-n", "-b"]
     if recursive:
         args.append("-r")
     args += _SCAN_TAGS
     for ext in _PHOTO_EXTS:
         args += ["-ext", ext]
     args.append(str(directory))
+    return _exiftool_json(args, str(directory))
+
+
+def _run_exiftool_files(files: list[Path]) -> list[dict]:
+    """:func:`_run_exiftool_scan` for an explicit list of photo files."""
+    data: list[dict] = []
+    for start in range(0, len(files), _SCAN_BATCH):
+        batch = [str(f) for f in files[start:start + _SCAN_BATCH]]
+        data += _exiftool_json(["-json", "-n", "-b", *_SCAN_TAGS, *batch], batch[0])
+    return data
+
+
+def _exiftool_json(args: list[str], target: str) -> list[dict]:
     try:
-        proc = subprocess.run(
-            args, capture_output=True, text=True, encoding="utf-8", errors="replace"
-        )
+        proc = call_exiftool(args)
     except FileNotFoundError:
         raise PhotomapError(_EXIFTOOL_INSTALL_HINT) from None
     out = proc.stdout.strip()
@@ -418,7 +443,7 @@ def _run_exiftool_scan(directory: Path, recursive: bool) -> list[dict]:
         if proc.returncode != 0:
             stderr = proc.stderr.strip()[-300:]
             raise PhotomapError(
-                f"ExifTool scan of {directory} failed (exit {proc.returncode}): "
+                f"ExifTool scan of {target} failed (exit {proc.returncode}): "
                 f"{stderr or 'no error output'}"
             )
         return []
@@ -448,14 +473,136 @@ def folder_has_photos(directory: Path | str) -> bool:
 def scan_photos(
     directory: Path | str, recursive: bool = False
 ) -> tuple[list[PhotoPoint], list[str]]:
-    """Scan *directory* for photos and return ``(gps_points, skipped_names)``."""
+    """Scan *directory* for photos and return ``(gps_points, skipped_names)``.
+
+    When a telemetry cache is active (``--cache``), each photo's result —
+    its point with the embed-ready thumbnail, or that it has no GPS — is
+    served from the cache while the file is unchanged; see :func:`_scan_cached`.
+    """
     directory = Path(directory)
-    return points_from_exiftool_json(
-        _run_exiftool_scan(directory, recursive),
-        root=directory if recursive else None,
+    root = directory if recursive else None
+    cache = active_cache()
+    if cache is not None:
+        return _scan_cached(cache, directory, recursive, root)
+    return points_from_exiftool_json(_run_exiftool_scan(directory, recursive), root=root)
+
+
+def _photo_files(directory: Path, recursive: bool) -> list[Path]:
+    """The files ExifTool's ``-ext`` scan of *directory* would read.
+
+    Like ``exiftool -r``, a recursive walk skips folders whose name starts
+    with a dot.
+    """
+    suffixes = {f".{ext}" for ext in _PHOTO_EXTS}
+    files: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        files += [
+            Path(dirpath, name)
+            for name in sorted(filenames)
+            if os.path.splitext(name)[1].lower() in suffixes
+        ]
+        if not recursive:
+            break
+    return files
+
+
+def _source_key(source: str) -> str:
+    # ExifTool echoes the argument's separators; compare on one spelling.
+    return os.path.normpath(source).replace("\\", "/")
+
+
+@functools.lru_cache(maxsize=None)
+def _exiftool_version_of(exe: str) -> str:
+    return exiftool_version(exe) or "unknown"
+
+
+def _photo_cache_version() -> str:
+    """Cache-key version of a photo's scan result.
+
+    Includes the ExifTool release, which decides what the tags decode to, and
+    whether Pillow is present, which decides whether a large DNG preview is
+    stored downscaled or raw.
+    """
+    pil = "pil" if _pil_image() is not None else "raw"
+    return (
+        f"{_PHOTO_CACHE_VERSION}/{pil}/exiftool-{_exiftool_version_of(exiftool_exe())}"
     )
 
 
+def _dump_photo(point: PhotoPoint | None) -> bytes:
+    """Serialize one photo's result for the cache; ``None`` = no GPS fix.
+
+    The display name is left out: it depends on the scan root, not the file.
+    """
+    if point is None:
+        return b'{"skip":true}'
+    fields = asdict(point)
+    del fields["name"]
+    return json.dumps({"point": fields}, separators=(",", ":")).encode("utf-8")
+
+
+def _load_photo(data: bytes, name: str) -> PhotoPoint | None:
+    entry = json.loads(data)
+    if entry.get("skip"):
+        return None
+    return PhotoPoint(name=name, **entry["point"])
+
+
+def _scan_cached(
+    cache: TelemetryCache, directory: Path, recursive: bool, root: Path | None
+) -> tuple[list[PhotoPoint], list[str]]:
+    """:func:`scan_photos` through *cache*: only the misses reach ExifTool.
+
+    A cached photo costs a ``stat`` and a small file read instead of its
+    share of the scan — for DNGs, a ~400 KB PreviewImage read out with
+    ``-b`` and re-encoded by Pillow. When nothing hits (a first run) the
+    whole directory is scanned in one call as without the cache; otherwise
+    the missed files are passed to ExifTool by name. A result is stored only
+    when its file kept the identity it had before the scan.
+    """
+    version = _photo_cache_version()
+    points: list[PhotoPoint] = []
+    skipped: list[str] = []
+    missed: dict[str, tuple[Path, str | None]] = {}
+    for path in _photo_files(directory, recursive):
+        name = _display_name(str(path), root)
+        key = cache.key("photo", path, version)
+        cached = cache.get(key) if key is not None else None
+        if cached is not None:
+            try:
+                point = _load_photo(cached, name)
+            except (ValueError, KeyError, TypeError, AttributeError) as exc:
+                logger.debug("Discarding corrupt cache entry for %s: %s", path, exc)
+            else:
+                cache.merge_counts(1, 0)
+                if point is None:
+                    skipped.append(name)
+                else:
+                    points.append(point)
+                continue
+        cache.merge_counts(0, 1)
+        missed[_source_key(str(path))] = (path, key)
+    if missed:
+        if not points and not skipped:   # nothing hit: one directory scan
+            scanned = _run_exiftool_scan(directory, recursive)
+        else:
+            scanned = _run_exiftool_files([path for path, _key in missed.values()])
+        for entry in scanned:
+            new_points, new_skipped = points_from_exiftool_json([entry], root=root)
+            points += new_points
+            skipped += new_skipped
+            miss = missed.get(_source_key(str(entry.get("SourceFile", ""))))
+            if miss is None:
+                continue
+            path, key = miss
+            if key is not None and cache.key("photo", path, version) == key:
+                cache.put(key, _dump_photo(new_points[0] if new_points else None))
+    points.sort(key=lambda p: p.name)
+    skipped.sort()
+    return points, skipped
+
+
 def redact_photo_points(points: list[PhotoPoint], mode: str) -> list[PhotoPoint]:
     """Return *points* with coordinates coarsened per *mode*.
 
@@ -491,7 +638,23 @@ def photos_to_geojson(
     ``hfov``, #309) and the ``credit`` line (#310) ride along the same way —
     photo metadata, not viewer plumbing.
     """
-    features: list[dict] = []
+    return {
+        "type": "FeatureCollection",
+        "features": list(
+            photo_features(
+                points, include_thumbnails=include_thumbnails, link_base=link_base
+            )
+        ),
+    }
+
+
+def photo_features(
+    points: Iterable[PhotoPoint],
+    *,
+    include_thumbnails: bool = False,
+    link_base: str | None = None,
+) -> Iterator[dict]:
+    """Yield the :func:`photos_to_geojson` feature of each photo in turn."""
     for p in points:
         props: dict = {"name": p.name}
         if p.is_pano:
@@ -526,14 +689,11 @@ def photos_to_geojson(
             dims = _thumb_dimensions(p.thumbnail_b64)
             if dims is not None:
                 props["tw"], props["th"] = dims
-        features.append(
-            {
-                "type": "Feature",
-                "geometry": {"type": "Point", "coordinates": coords},
-                "properties": props,
-            }
-        )
-    return {"type": "FeatureCollection", "features": features}
+        yield {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": coords},
+            "properties": props,
+        }
 
 
 def write_photos_geojson(points: list[PhotoPoint], output_path: Path) -> Path:
@@ -12,12 +12,13 @@ pattern) for an in-page 360° viewer.
 
 from __future__ import annotations
 
-import json
 import logging
+from collections.abc import Iterable, Iterator
 from html import escape
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
-from .photomap import PhotoPoint, photos_to_geojson
+from .html_stream import DATA_SLOT, collection_chunks, page_chunks, write_chunks
+from .photomap import PhotoPoint, photo_features
 from .photomap_js import (
     CLUSTER_CSS_SRI,
     CLUSTER_DEFAULT_CSS_SRI,
@@ -31,6 +32,7 @@ from .photomap_js import (
     PHOTO_CSS,
     PHOTO_LAYER_JS,
 )
+from .photomap_thumbs import clear_thumbs, thumb_features
 from .provenance import stamp
 from .tiles import DEFAULT_TILE_STYLE, tile_layer_js
 
@@ -82,21 +84,21 @@ def parse_popup_fields(spec: str) -> frozenset[str]:
     return fields
 
 
-def _apply_popup_fields(geojson: dict, fields: frozenset[str]) -> None:
-    """Strip excluded popup fields from *geojson* in place.
+def _strip_popup_fields(feature: dict, fields: frozenset[str]) -> dict:
+    """Strip excluded popup fields from *feature* in place and return it.
 
     "altitude" also covers the coordinate's third element, so an excluded
     altitude is absent from the HTML file entirely.
     """
-    drop = [prop for field, prop in _FIELD_TO_PROP.items() if field not in fields]
-    for feature in geojson["features"]:
-        props = feature["properties"]
-        for prop in drop:
+    props = feature["properties"]
+    for field, prop in _FIELD_TO_PROP.items():
+        if field not in fields:
             props.pop(prop, None)
-        if "altitude" not in fields:
-            coords = feature["geometry"]["coordinates"]
-            if len(coords) == 3:
-                feature["geometry"]["coordinates"] = coords[:2]
+    if "altitude" not in fields:
+        coords = feature["geometry"]["coordinates"]
+        if len(coords) == 3:
+            feature["geometry"]["coordinates"] = coords[:2]
+    return feature
 
 
 _TEMPLATE = """<!DOCTYPE html>
@@ -200,16 +202,36 @@ def photos_to_html(
     ``tile_style`` (issue #311): a :data:`~.tiles.TILE_STYLES` key selecting
     the basemap drawn under the markers.
     """
-    geojson = photos_to_geojson(
-        points, include_thumbnails=True, link_base=link_base
-    )
-    if popup_fields is not None:
-        _apply_popup_fields(geojson, popup_fields)
-    # Escape "<" to "\\u003c" (a JSON Unicode escape) so JSON.parse round-trips
-    # it while no literal "</script>" can break out of the data block.
-    data = json.dumps(geojson).replace("<", "\\u003c")
+    return "".join(_photos_page(
+        points, _html_features(points, link_base, popup_fields), title,
+        link_base=link_base, tile_style=tile_style,
+    ))
+
+
+def _html_features(
+    points: list[PhotoPoint],
+    link_base: str | None,
+    popup_fields: frozenset[str] | None,
+) -> Iterator[dict]:
+    """The map's photo features, thumbnails embedded, popup fields applied."""
+    for feature in photo_features(points, include_thumbnails=True, link_base=link_base):
+        yield (
+            feature if popup_fields is None
+            else _strip_popup_fields(feature, popup_fields)
+        )
+
+
+def _photos_page(
+    points: list[PhotoPoint],
+    features: Iterable[dict],
+    title: str,
+    *,
+    link_base: str | None,
+    tile_style: str,
+) -> Iterator[str]:
+    """The page around *features* in chunks (see :mod:`.html_stream`)."""
     pano_enabled = link_base is not None and any(p.is_pano for p in points)
-    return stamp(_TEMPLATE.format(
+    page = stamp(_TEMPLATE.format(
         title=escape(title),
         leaflet=_LEAFLET_VERSION,
         leaflet_css_sri=_LEAFLET_CSS_SRI,
@@ -219,7 +241,7 @@ def photos_to_html(
         cluster_default_css_sri=CLUSTER_DEFAULT_CSS_SRI,
         cluster_js_sri=CLUSTER_JS_SRI,
         photo_css=PHOTO_CSS,
-        data=data,
+        data=DATA_SLOT,
         pano_head=PANO_HEAD if pano_enabled else "",
         pano_overlay=PANO_OVERLAY if pano_enabled else "",
         pano_scripts=PANO_SCRIPT if pano_enabled else "",
@@ -229,6 +251,9 @@ def photos_to_html(
             + (PANO_JS if pano_enabled else "")
         ).replace("__TILE_LAYER__", tile_layer_js(tile_style)),
     ))
+    return page_chunks(
+        page, collection_chunks({"type": "FeatureCollection"}, features)
+    )
 
 
 def write_photos_html(
@@ -239,14 +264,23 @@ def write_photos_html(
     link_base: str | None = None,
     popup_fields: frozenset[str] | None = None,
     tile_style: str = DEFAULT_TILE_STYLE,
+    thumb_dir: PurePosixPath | None = None,
 ) -> Path:
-    """Write *points* as an HTML map to *output_path* and return it."""
-    output_path.write_text(
-        photos_to_html(
-            points, title, link_base=link_base, popup_fields=popup_fields,
-            tile_style=tile_style,
-        ),
-        encoding="utf-8",
-    )
+    """Write *points* as an HTML map to *output_path* and return it.
+
+    Streamed to disk and swapped into place once complete (see
+    :mod:`.html_stream`). ``thumb_dir`` (from :func:`.photomap_thumbs.parse_thumb_dir`)
+    writes the thumbnails to files in that folder beside the map instead
+    of embedding them (see :mod:`.photomap_thumbs`).
+    """
+    features: Iterable[dict] = _html_features(points, link_base, popup_fields)
+    written: set[str] = set()
+    if thumb_dir is not None:
+        features = thumb_features(features, output_path, thumb_dir, written=written)
+    write_chunks(output_path, _photos_page(
+        points, features, title, link_base=link_base, tile_style=tile_style,
+    ))
+    if thumb_dir is not None:
+        clear_thumbs(output_path.parent.joinpath(*thumb_dir.parts), keep=written)
     logger.info("HTML photo map created: %s", output_path)
     return output_path
@@ -219,7 +219,12 @@ function imgDims(p) {
 function buildPopup(f) {
   const p = f.properties || {};
   let inner = '';
-  if (p.thumb) {
+  // --thumb-dir (photomap_thumbs.py): the thumbnail is a file beside the map
+  // (turl), fetched the first time a popup or tooltip shows it; otherwise
+  // it is embedded as base64.
+  const thumbSrc = p.thumb ? `data:image/jpeg;base64,${esc(p.thumb)}`
+    : p.turl ? esc(p.turl) : '';
+  if (thumbSrc) {
     // Honest thumbnails (#441): a square opening-view crop and the full
     // 2:1 strip look nothing alike — the title says which one this is.
     // When the thumbnail is a link into the 360° viewer, the title also
@@ -228,7 +233,7 @@ function buildPopup(f) {
     let kind = p.vthumb ? 'Opening view of the panorama'
       : (p.pano ? 'Full 360° panorama' : '');
     if (kind && p.link) kind += ' - click to open the 360° viewer';
-    inner += `<img src="data:image/jpeg;base64,${esc(p.thumb)}" alt=""` +
+    inner += `<img src="${thumbSrc}" alt=""` +
       imgDims(p) + (kind ? ` title="${kind}"` : '') + `>`;
   }
   // Every text line is presence-guarded: --popup-fields (issue #296) strips
@@ -272,6 +277,8 @@ function buildTooltip(f) {
   let html = '<div class="photo-tooltip">';
   if (p.thumb) {
     html += `<img src="data:image/jpeg;base64,${esc(p.thumb)}" alt=""${imgDims(p)}>`;
+  } else if (p.turl) {
+    html += `<img src="${esc(p.turl)}" alt=""${imgDims(p)}>`;
   }
   html += `${esc(p.name || '')}</div>`;
   return html;
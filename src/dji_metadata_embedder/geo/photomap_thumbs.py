@@ -0,0 +1,106 @@
+"""Thumbnail files beside the photo map (``photomap --thumb-dir``).
+
+By default every popup thumbnail is embedded in the map's JSON as base64:
+15–40 KB per photo, a third more than the JPEG itself, all of it parsed
+before the first pin appears. With ``--thumb-dir DIR`` each thumbnail is
+written once to ``DIR/<hash>.jpg`` beside the map instead, named by a hash
+of its bytes, and the feature carries ``turl`` — the file's relative href —
+in place of ``thumb``. Identical previews (bracketed shots, repeats of one
+frame) share one file. The popup and tooltip HTML is only built when they
+open, so a thumbnail is fetched the first time its pin is opened or hovered.
+
+``<img>`` loads resolve for maps opened from disk as well as through
+``--serve``, as long as DIR moves with the map; it is therefore always a
+folder inside the map's own. Files a previous run wrote there and this run
+did not are removed; other files in DIR are left alone.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import os
+import re
+from collections.abc import Collection, Iterable, Iterator
+from pathlib import Path, PurePosixPath
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+# 80 bits of SHA-256: collisions are out of reach for any photo archive.
+_NAME_HEX = 20
+_THUMB_RE = re.compile(rf"^[0-9a-f]{{{_NAME_HEX}}}\.jpg$")
+
+
+def parse_thumb_dir(spec: str) -> PurePosixPath:
+    """Validate a ``--thumb-dir`` value: a relative folder inside the map's.
+
+    Raises ``ValueError`` for absolute paths and ones that climb out with
+    ``..`` — the map refers to the files by relative href.
+    """
+    path = PurePosixPath(spec.replace("\\", "/"))
+    if not spec.strip() or path.is_absolute() or ":" in spec or ".." in path.parts:
+        raise ValueError(
+            f"{spec!r} is not a folder inside the map's folder "
+            "(use a relative path such as 'thumbs')"
+        )
+    return path
+
+
+def clear_thumbs(directory: Path, keep: Collection[str] = ()) -> None:
+    """Remove thumbnail files in *directory* not named in *keep*.
+
+    Only files named like ours are touched; the folder goes too once empty.
+    """
+    if not directory.is_dir():
+        return
+    for path in directory.iterdir():
+        if _THUMB_RE.match(path.name) and path.name not in keep:
+            path.unlink()
+    try:
+        directory.rmdir()
+    except OSError:
+        pass  # not empty: kept files, or files that are not ours
+
+
+def thumb_features(
+    features: Iterable[dict],
+    output_path: Path,
+    thumb_dir: PurePosixPath,
+    *,
+    written: set[str],
+) -> Iterator[dict]:
+    """Yield *features* with each ``thumb`` moved to a file under *thumb_dir*.
+
+    *thumb_dir* is relative to the map at *output_path*. Each file name goes
+    into *written*; once the features are exhausted the caller removes older
+    files with ``clear_thumbs(directory, keep=written)``.
+    """
+    directory = output_path.parent.joinpath(*thumb_dir.parts)
+    href_base = quote(thumb_dir.as_posix())
+    for feature in features:
+        props = feature["properties"]
+        thumb = props.get("thumb")
+        if thumb is not None:
+            try:
+                data = base64.b64decode(thumb)
+            except ValueError:   # binascii.Error: bad padding; stays inline
+                yield feature
+                continue
+            del props["thumb"]
+            name = hashlib.sha256(data).hexdigest()[:_NAME_HEX] + ".jpg"
+            if name not in written:
+                path = directory / name
+                # Content-addressed: a file of this name already holds
+                # exactly these bytes, so a rerun rewrites nothing. New ones
+                # are renamed into place, so a name never holds a partial file.
+                if not path.exists():
+                    directory.mkdir(parents=True, exist_ok=True)
+                    tmp = path.with_name(name + ".tmp")
+                    tmp.write_bytes(data)
+                    os.replace(tmp, path)
+                written.add(name)
+            props["turl"] = f"{href_base}/{name}"
+        yield feature
+    logger.debug("Wrote %d thumbnail files to %s", len(written), directory)
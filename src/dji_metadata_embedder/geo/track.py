@@ -7,16 +7,27 @@ exact coordinates.
 
 from __future__ import annotations
 
-import re
+from array import array
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from ..utilities import TelemetrySample, load_samples, redact_coords, resolve_utc_offset
+from ..srt_tokenizer import cue_to_seconds
+from ..utilities import (
+    _EPOCH,
+    _NO_DATETIME,
+    _ONE_US,
+    TelemetryFrame,
+    TelemetrySample,
+    _none_if_nan,
+    load_frame,
+    redact_coords,
+    resolve_utc_offset,
+)
 from ..mp4_telemetry import is_video
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackPoint:
     """One GPS-fixed sample: WGS84 lat/lon, absolute altitude (m), raw cue time,
     best-effort UTC datetime, and optional footprint inputs (AGL via rel_alt,
@@ -80,11 +91,7 @@ def _cue_seconds(cue: str) -> float | None:
     clock offset fall back to 0.0 themselves — a degraded clock is clamped
     downstream, but a fabricated media timecode is not recoverable.
     """
-    m = re.match(r"(\d{2}):(\d{2}):(\d{2}),(\d{3})", cue)
-    if not m:
-        return None
-    h, mnt, s, ms = (int(g) for g in m.groups())
-    return h * 3600 + mnt * 60 + s + ms / 1000.0
+    return cue_to_seconds(cue)
 
 
 def build_track(
@@ -101,7 +108,7 @@ def build_track(
     ``"fuzz"`` coarsens to ~100 m, ``"none"`` keeps coordinates.
     """
     path = Path(srt_file)
-    samples = load_samples(path)
+    samples = load_frame(path)
     if is_video(path):
         return build_track_from_samples(
             path.stem, samples, redact, assume_utc=True, tz_offset=tz_offset
@@ -114,9 +121,78 @@ def build_track(
     )
 
 
+def _resolve_offset(
+    frame: TelemetryFrame,
+    *,
+    assume_utc: bool,
+    tz_offset: timedelta | None,
+    mtime_utc: datetime | None,
+) -> tuple[timedelta | None, str]:
+    """The local->UTC offset for *frame* and the ``utc_source`` label."""
+    if assume_utc:
+        return timedelta(0), "telemetry"
+    assert mtime_utc is not None, "mtime_utc is required when assume_utc is False"
+    span = frame.dated_span()
+    offset = resolve_utc_offset(list(span) if span else [], tz_offset, mtime_utc)
+    return offset, "telemetry" if span else "mtime"
+
+
+def _utc_column(
+    frame: TelemetryFrame,
+    offset: timedelta | None,
+    mtime_utc: datetime | None,
+) -> array:
+    """Each row's UTC as microseconds since 1970 (``_NO_DATETIME`` if unknown).
+
+    A row's own datetime shifted by *offset* wins; otherwise a monotonic UTC
+    is synthesised from its cue relative to the first row, anchored at
+    *mtime_utc*.
+    """
+    utc = array("q")
+    if not len(frame):
+        return utc
+    off_us = offset // _ONE_US if offset is not None else None
+    mtime_us = (mtime_utc - _EPOCH) // _ONE_US if mtime_utc is not None else None
+    base_cue = frame.cue_s[0]
+    base_cue = 0.0 if base_cue != base_cue else base_cue
+    for dt_us, cue_s in zip(frame.dt_us, frame.cue_s):
+        if dt_us != _NO_DATETIME and off_us is not None:
+            utc.append(dt_us - off_us)
+        elif mtime_us is not None:
+            cue_s = 0.0 if cue_s != cue_s else cue_s
+            utc.append(mtime_us + timedelta(seconds=cue_s - base_cue) // _ONE_US)
+        else:
+            utc.append(_NO_DATETIME)
+    return utc
+
+
+def _track_point(
+    frame: TelemetryFrame,
+    i: int,
+    lat: float,
+    lon: float,
+    us: int,
+    segment: int = 0,
+) -> TrackPoint:
+    """Materialise row *i* of *frame* as a :class:`TrackPoint` at *lat*/*lon*
+    with UTC *us* (a :func:`_utc_column` value)."""
+    return TrackPoint(
+        lat=lat,
+        lon=lon,
+        alt=frame.alt[i],
+        timestamp=frame.cue(i),
+        utc=None if us == _NO_DATETIME else _EPOCH + timedelta(microseconds=us),
+        rel_alt=_none_if_nan(frame.rel_alt[i]),
+        focal_len=_none_if_nan(frame.focal_len[i]),
+        gimbal_yaw=_none_if_nan(frame.gimbal_yaw[i]),
+        gimbal_pitch=_none_if_nan(frame.gimbal_pitch[i]),
+        segment=segment,
+    )
+
+
 def build_track_from_samples(
     name: str,
-    samples: list[TelemetrySample],
+    samples: list[TelemetrySample] | TelemetryFrame,
     redact: str = "none",
     *,
     assume_utc: bool = False,
@@ -128,49 +204,30 @@ def build_track_from_samples(
     ``assume_utc`` (video): each ``sample.dt`` is already UTC -> zero offset.
     Otherwise (SRT): resolve the local->UTC offset from ``tz_offset``/``mtime_utc``
     and synthesise a monotonic UTC from the cue when a sample has no datetime.
+    *samples* may be a :class:`TelemetryFrame`, whose columns are read
+    directly.
     """
-    if assume_utc:
-        offset: timedelta | None = timedelta(0)
-        abs_times: list[datetime] = []
-    else:
-        abs_times = [s.dt for s in samples if s.dt is not None]
-        assert mtime_utc is not None, "mtime_utc is required when assume_utc is False"
-        offset = resolve_utc_offset(abs_times, tz_offset, mtime_utc)
-    utc_source = "telemetry"
-    if not assume_utc and not abs_times:
-        utc_source = "mtime"
-    base_cue = (_cue_seconds(samples[0].cue) or 0.0) if samples else 0.0
-
-    coords = redact_coords([(s.lat, s.lon) for s in samples], redact)
+    frame = (
+        samples
+        if isinstance(samples, TelemetryFrame)
+        else TelemetryFrame.from_samples(samples)
+    )
+    offset, utc_source = _resolve_offset(
+        frame, assume_utc=assume_utc, tz_offset=tz_offset, mtime_utc=mtime_utc
+    )
+    coords = redact_coords(list(zip(frame.lat, frame.lon)), redact)
     if redact == "drop":
         return Track(name=name, points=[], local_offset=None)
-    if len(coords) != len(samples):
+    if len(coords) != len(frame):
         raise ValueError(
-            f"redact_coords returned {len(coords)} coords for {len(samples)} "
+            f"redact_coords returned {len(coords)} coords for {len(frame)} "
             f"points (mode={redact!r}); cannot preserve alt/timestamp alignment"
         )
-    points: list[TrackPoint] = []
-    for c, s in zip(coords, samples):
-        if s.dt is not None and offset is not None:
-            utc = s.dt - offset
-        elif mtime_utc is not None:
-            utc = mtime_utc + timedelta(
-                seconds=(_cue_seconds(s.cue) or 0.0) - base_cue)
-        else:
-            utc = None
-        points.append(
-            TrackPoint(
-                lat=c[0],
-                lon=c[1],
-                alt=s.alt,
-                timestamp=s.cue,
-                utc=utc,
-                rel_alt=s.rel_alt,
-                focal_len=s.focal_len,
-                gimbal_yaw=s.gimbal_yaw,
-                gimbal_pitch=s.gimbal_pitch,
-            )
-        )
+    utc_us = _utc_column(frame, offset, mtime_utc)
+    points = [
+        _track_point(frame, i, lat, lon, utc_us[i])
+        for i, (lat, lon) in enumerate(coords)
+    ]
     # Video telemetry is already UTC, so its local offset is only known
     # when the user stated one; SRT keeps the resolved (explicit or
     # auto-detected) offset, or None when nothing carried a datetime.
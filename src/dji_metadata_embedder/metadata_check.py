@@ -9,13 +9,15 @@ from __future__ import annotations
 
 import argparse
 import json
-import subprocess
 from pathlib import Path
 from typing import Dict, Optional
 import logging
 
 from rich.progress import Progress
 from .utilities import setup_logging
+from .utils.exiftool import call_exiftool
+from .utils.inventory import DirectoryInventory
+from .utils.media_probe import DJI_DATA_TAGS, probe_media
 
 CHECK = "\u2705"  # green check mark
 CROSS = "\u274c"  # red cross
@@ -26,31 +28,19 @@ logger = logging.getLogger(__name__)
 
 def run_ffprobe(path: Path) -> Optional[Dict]:
     """Return ffprobe JSON output for the media file or ``None`` on failure."""
-    cmd = [
-        "ffprobe",
-        "-v",
-        "quiet",
-        "-print_format",
-        "json",
-        "-show_format",
-        "-show_streams",
-        str(path),
-    ]
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return json.loads(result.stdout)
-    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
-        return None
+    probe = probe_media(path)
+    return probe.as_dict() if probe is not None else None
 
 
 def run_exiftool(path: Path) -> Optional[Dict]:
     """Return exiftool JSON output for the file or ``None`` on failure."""
-    cmd = ["exiftool", "-j", str(path)]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = call_exiftool(["-j", str(path)])
+        if result.returncode != 0:
+            return None
         data = json.loads(result.stdout)
         return data[0] if isinstance(data, list) and data else None
-    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError):
+    except (FileNotFoundError, json.JSONDecodeError):
         return None
 
 
@@ -72,7 +62,7 @@ def check_file(path: Path) -> Dict[str, bool]:
     # itself. Reported so users know the file carries more than the sidecar
     # SRT — and that a default (MP4) embed will not carry it over (#478).
     embedded_telemetry = any(
-        s.get("codec_tag_string") in ("djmd", "dbgi")
+        s.get("codec_tag_string") in DJI_DATA_TAGS
         for s in ffprobe_data.get("streams", [])
         if s.get("codec_type") == "data"
     )
@@ -93,30 +83,17 @@ def check_metadata(path: str | Path) -> Dict[str, bool]:
     return check_file(file_path)
 
 
-_MEDIA_GLOBS = (
-    "*.mp4",
-    "*.MP4",
-    "*.mov",
-    "*.MOV",
-    "*.jpg",
-    "*.JPG",
-    "*.jpeg",
-    "*.JPEG",
-    "*.dng",
-    "*.DNG",
-)
+_MEDIA_SUFFIXES = (".mp4", ".mov", ".jpg", ".jpeg", ".dng")
 
 
 def media_files_in(directory: Path) -> list[Path]:
     """Top-level media files a directory-shaped ``check`` argument means.
 
-    Deduplicated via a set — a case-insensitive filesystem (Windows,
-    macOS) matches ``*.mp4`` and ``*.MP4`` with the same file — and
-    sorted for a deterministic report order.
+    Suffixes match in any case, from one listing of the folder, sorted
+    for a deterministic report order. Raises ``OSError`` when the folder
+    cannot be listed.
     """
-    return sorted(
-        {f for pattern in _MEDIA_GLOBS for f in directory.glob(pattern)}
-    )
+    return DirectoryInventory.scan(directory).files(_MEDIA_SUFFIXES)
 
 
 def main() -> None:
@@ -7,6 +7,7 @@ model, so the convert exporters and verify-sun work on sidecar-less footage.
 
 from __future__ import annotations
 
+import functools
 import json
 import re
 import subprocess
@@ -14,7 +15,12 @@ from datetime import datetime
 from pathlib import Path
 
 from .utilities import TelemetrySample, is_gps_fix
-from .utils.exiftool import decode_floor, exiftool_exe, exiftool_version
+from .utils.exiftool import (
+    call_exiftool,
+    decode_floor,
+    exiftool_exe,
+    exiftool_version,
+)
 
 # Back-compat alias: this private name predates the shared resolver in
 # utils/exiftool.py. Kept so any external importer of the old symbol still works.
@@ -27,6 +33,21 @@ class Mp4TelemetryError(RuntimeError):
 
 VIDEO_SUFFIXES = {".mp4", ".mov"}
 
+# Bump when the ExifTool JSON -> TelemetrySample mapping changes; part of the
+# telemetry cache key together with the ExifTool release (see extractor_version).
+EXTRACTOR_VERSION = "1"
+
+
+@functools.lru_cache(maxsize=None)
+def _exiftool_version_of(exe: str) -> str:
+    return exiftool_version(exe) or "unknown"
+
+
+def extractor_version() -> str:
+    """Cache-key version of :func:`extract_samples`: the mapping version plus
+    the resolved ExifTool release, since an upgrade can decode more models."""
+    return f"{EXTRACTOR_VERSION}/exiftool-{_exiftool_version_of(exiftool_exe())}"
+
 
 def is_video(path: Path) -> bool:
     """True when ``path`` is a video we can probe for embedded telemetry."""
@@ -133,9 +154,7 @@ _EXIFTOOL_INSTALL_HINT = (
 
 def _run(args: list[str]) -> subprocess.CompletedProcess[str]:
     try:
-        return subprocess.run(
-            [exiftool_exe(), *args], capture_output=True, text=True
-        )
+        return call_exiftool(args)
     except FileNotFoundError:
         raise Mp4TelemetryError(_EXIFTOOL_INSTALL_HINT) from None
 
@@ -10,6 +10,7 @@ from __future__ import annotations
 import json
 import os
 import sys
+import threading
 from typing import Any, TextIO
 
 _V = 1
@@ -28,6 +29,16 @@ class NullProgress:
     def advance(self, current: int, total: int, item: str | None = None) -> None:
         pass
 
+    def item_progress(
+        self,
+        item: str,
+        fraction: float | None = None,
+        bytes: int | None = None,
+        bytes_per_s: float | None = None,
+        eta_s: float | None = None,
+    ) -> None:
+        pass
+
     def warning(self, message: str, item: str | None = None) -> None:
         pass
 
@@ -44,12 +55,18 @@ class JsonlProgress(NullProgress):
     def __init__(self, stream: TextIO | None = None) -> None:
         self._stream = stream if stream is not None else sys.stdout
         self._broken = False
+        # item_progress arrives from worker threads; one line per write.
+        self._lock = threading.Lock()
 
     @property
     def active(self) -> bool:
         return True
 
     def _emit(self, event: str, **fields: Any) -> None:
+        with self._lock:
+            self._emit_locked(event, **fields)
+
+    def _emit_locked(self, event: str, **fields: Any) -> None:
         if self._broken:
             return
         payload: dict[str, Any] = {"v": _V, "event": event}
@@ -86,6 +103,23 @@ class JsonlProgress(NullProgress):
     def advance(self, current: int, total: int, item: str | None = None) -> None:
         self._emit("progress", current=current, total=total, item=item)
 
+    def item_progress(
+        self,
+        item: str,
+        fraction: float | None = None,
+        bytes: int | None = None,
+        bytes_per_s: float | None = None,
+        eta_s: float | None = None,
+    ) -> None:
+        self._emit(
+            "item_progress",
+            item=item,
+            fraction=None if fraction is None else round(fraction, 4),
+            bytes=bytes,
+            bytes_per_s=None if bytes_per_s is None else round(bytes_per_s),
+            eta_s=None if eta_s is None else round(eta_s, 1),
+        )
+
     def warning(self, message: str, item: str | None = None) -> None:
         self._emit("warning", message=message, item=item)
 
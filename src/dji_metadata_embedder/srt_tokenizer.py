@@ -0,0 +1,808 @@
+"""Single-pass tokenizer for DJI SRT telemetry sidecars.
+
+Every SRT consumer — the embedder, the GPX/CSV converters, the track loader
+and the validator — reads the same blocks for different fields. They used to
+each split the file and run their own ``re.search`` loop; this module walks
+the blocks once and extracts every known field into one :class:`SrtRecord`
+per block, so each consumer only picks the fields it needs.
+
+The field patterns are the ones documented in docs/SRT_FORMATS.md: bracketed
+``[key: value]`` pairs (Mini/Air/Avata/Neo/Mavic), the ``GPS(lat,lon,alt)``
+compact form (legacy, M300 with a unit suffix, P4 RTK with a space before the
+parenthesis), and the P4 RTK free-standing camera tokens (``F/5.6, SS 400,
+ISO 100, EV 0``). Values are stored as the file wrote them where consumers
+report them verbatim (camera settings, the CSV altitude pair) and as floats
+where they are computed with.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Bump whenever a change here alters what any consumer parses out of an
+# existing file: it is part of the telemetry cache key (utils/cache.py), so
+# stale parse results are never served after an upgrade.
+PARSER_VERSION = "1"
+
+# Characters per read when streaming an SRT file; a DJI block is ~300.
+_READ_CHUNK = 64 * 1024
+
+_NUM = r"[+-]?\d+\.?\d*"
+
+# Timing line: "00:00:01,000 --> 00:00:02,000". The bare start stamp is the
+# fallback for timing lines that are not a well-formed range.
+_CUE_RANGE_RE = re.compile(
+    r"(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})"
+)
+_CUE_RE = re.compile(r"(\d{2}:\d{2}:\d{2},\d{3})")
+_CUE_CLOCK_RE = re.compile(r"(\d{2}):(\d{2}):(\d{2}),(\d{3})")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# DJI SRT blocks carry an absolute wall-clock datetime on their own line, with
+# the milliseconds separated by either a comma (older firmware) or a dot
+# (newer firmware): "2024-01-15 14:30:22,123" / "2026-05-27 13:14:22.911".
+_ABS_DATETIME_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})\s+(\d{2}):(\d{2}):(\d{2})[.,](\d{3})"
+)
+
+# Two documented SRT variants (docs/SRT_FORMATS.md):
+#   HOME(39.906206,116.391400) D=5.2m H=1.5m            -> no space, no altitude
+#   HOME (-58.847509, -34.232707, -57.98m), D 698.70m,  -> space, altitude with trailing m
+_HOME_RE = re.compile(
+    r"HOME\s*\(\s*([+-]?\d+\.?\d*)\s*,\s*([+-]?\d+\.?\d*)"
+    r"(?:\s*,\s*([+-]?\d+\.?\d*)\s*m?)?\s*\)"
+)
+
+_LAT_RE = re.compile(rf"\[latitude:\s*({_NUM})\]")
+_LON_RE = re.compile(rf"\[longitude:\s*({_NUM})\]")
+_ALT_PAIR_RE = re.compile(rf"\[rel_alt:\s*({_NUM})\s*abs_alt:\s*({_NUM})\]")
+_LAT_LON_RE = re.compile(
+    rf"\[latitude:\s*({_NUM})\]\s*\[longitude:\s*({_NUM})\]"
+)
+_REL_ALT_RE = re.compile(rf"rel_alt:\s*({_NUM})")
+# The closing bracket is required: a block cut mid-write ends inside the
+# altitude tokens, and its absence is how a truncated block is recognised.
+_ABS_ALT_RE = re.compile(rf"abs_alt:\s*({_NUM})\]")
+# Tolerates an altitude unit suffix (M300 ``0.0M``) and an optional space
+# before ``(`` used by the P4 RTK compact format.
+_GPS_RE = re.compile(
+    rf"GPS\s*\(({_NUM}),\s*({_NUM}),\s*({_NUM})[A-Za-z]*\)"
+)
+_GPS_OPEN_RE = re.compile(r"GPS\s*\(")
+# Legacy-with-unit (M300 lineage) pins an altitude unit suffix inside the GPS
+# tuple, e.g. ``GPS(lat,lon,0.0M)``.
+_GPS_UNIT_RE = re.compile(r"GPS\s*\([^)]*[A-Za-z]\)")
+# Avata 2 parenthesised ``BAROMETER(91.2)`` and Matrice 300 colon form
+# ``BAROMETER:0.3M`` (optional trailing unit).
+_BARO_RE = re.compile(rf"BAROMETER[(:]\s*({_NUM})[A-Za-z]*\)?")
+# Older firmware labels the frame counter ``SrtCnt``; newer firmware (Neo,
+# Mini 5 Pro, Avata 360) uses ``FrameCnt``.
+_COUNTER_RE = re.compile(r"(?:Srt|Frame)Cnt\s*:\s*(\d+)")
+_DIFF_TIME_RE = re.compile(r"DiffTime\s*:\s*([^\s]+)")
+_GIMBAL_RE = re.compile(rf"gb_yaw:\s*({_NUM})\s*gb_pitch:\s*({_NUM})")
+_GB_YAW_RE = re.compile(rf"gb_yaw:\s*({_NUM})")
+_GB_PITCH_RE = re.compile(rf"gb_pitch:\s*({_NUM})")
+
+_ISO_RE = re.compile(r"\[iso\s*:\s*(\d+)\]")
+_SHUTTER_RE = re.compile(r"\[shutter\s*:\s*([^\]]+)\]")
+# Aperture is reported two ways: legacy models use an f-number*100 integer
+# (``[fnum : 170]`` → f/1.7) while current models emit a literal decimal
+# (``[fnum: 1.9]``). Both are captured and stored verbatim.
+_FNUM_RE = re.compile(rf"\[fnum\s*:\s*({_NUM})\]")
+_EV_RE = re.compile(r"\[ev\s*:\s*([^\]]+)\]")
+_CT_RE = re.compile(r"\[ct\s*:\s*([^\]]+)\]")
+_COLOR_MD_RE = re.compile(r"\[color_md\s*:\s*([^\]]+)\]")
+_FOCAL_LEN_RE = re.compile(r"\[focal_len\s*:\s*([^\]]+)\]")
+
+# The bracket families write the exposure fields in this order; a block
+# that does not falls back to the per-field patterns above.
+_CAMERA_RUN_RE = re.compile(
+    r"\[iso\s*:\s*(\d+)\]\s*\[shutter\s*:\s*([^\]]+)\]\s*"
+    rf"\[fnum\s*:\s*({_NUM})\]\s*\[ev\s*:\s*([^\]]+)\]\s*"
+    r"\[ct\s*:\s*([^\]]+)\]\s*\[color_md\s*:\s*([^\]]+)\]"
+)
+
+# P4 RTK compact single-line family: free-standing tokens used when the
+# bracket form is absent.
+_P4_FNUM_RE = re.compile(r"(?<![A-Za-z])F/(\d+\.?\d*)")
+_P4_SHUTTER_RE = re.compile(r"(?<![A-Za-z])SS\s+(\d+(?:\.\d+)?)")
+_P4_ISO_RE = re.compile(r"(?<![A-Za-z])ISO\s+(\d+)")
+_P4_EV_RE = re.compile(rf"(?<![A-Za-z])EV\s+({_NUM})")
+
+
+def parse_datetime_match(m: re.Match[str]) -> datetime:
+    """Build the naive wall-clock datetime from an ``_ABS_DATETIME_RE`` match."""
+    year, month, day, hour, minute, second, millis = map(int, m.groups())
+    return datetime(year, month, day, hour, minute, second, millis * 1000)
+
+
+def cue_to_seconds(cue: str) -> float | None:
+    """Seconds for an ``HH:MM:SS,mmm`` cue, ``None`` when *cue* is not one."""
+    m = _CUE_CLOCK_RE.match(cue)
+    if not m:
+        return None
+    h, mnt, s, ms = (int(g) for g in m.groups())
+    return h * 3600 + mnt * 60 + s + ms / 1000.0
+
+
+def format_cue(seconds: float) -> str:
+    """Inverse of :func:`cue_to_seconds` for the seconds it returns."""
+    total_ms = round(seconds * 1000)
+    total_s, ms = divmod(total_ms, 1000)
+    h, rem = divmod(total_s, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+@dataclass(slots=True)
+class SrtRecord:
+    """Every known field of one SRT block, extracted in a single pass.
+
+    ``index`` is the 1-based position of the block in the file and
+    ``line_count`` its number of lines; only blocks with three or more lines
+    (sequence number, timing line, telemetry) are :attr:`complete` and carry
+    telemetry fields — shorter ones are yielded with just their timing so
+    the validator can report them.
+
+    ``cue`` is the start stamp of the timing line and ``cue_end`` its end
+    stamp when the line is a well-formed ``start --> end`` range. ``text`` is
+    the telemetry (lines three onward joined by spaces, HTML tags stripped);
+    ``html`` records whether it was wrapped in ``<font>``.
+
+    ``lat``/``lon`` come from the bracket form only and ``gps`` from the
+    ``GPS(lat, lon, alt)`` compact form, so consumers decide which syntaxes
+    they accept. ``rel_alt``/``abs_alt`` are read independently; ``alt_pair``
+    is the raw ``[rel_alt: … abs_alt: …]`` pair as written. Camera values are
+    raw strings, with the P4 RTK free-standing tokens filling in when the
+    bracket form is absent. ``home`` is ``(lat, lon, alt-or-None)``.
+    """
+
+    index: int
+    line_count: int
+    cue: str | None = None
+    cue_end: str | None = None
+    text: str = ""
+    html: bool = False
+    lat: float | None = None
+    lon: float | None = None
+    gps: tuple[float, float, float] | None = None
+    rel_alt: float | None = None
+    abs_alt: float | None = None
+    alt_pair: tuple[str, str] | None = None
+    barometer: float | None = None
+    frame_count: int | None = None
+    diff_time: str | None = None
+    dt: datetime | None = None
+    gimbal_yaw: float | None = None
+    gimbal_pitch: float | None = None
+    iso: str | None = None
+    shutter: str | None = None
+    fnum: str | None = None
+    ev: str | None = None
+    ct: str | None = None
+    color_md: str | None = None
+    focal_len: str | None = None
+    home: tuple[float, float, float | None] | None = None
+
+    @property
+    def complete(self) -> bool:
+        """True for blocks with a telemetry line (three or more lines)."""
+        return self.line_count >= 3
+
+    @property
+    def camera(self) -> dict[str, str]:
+        """Camera settings present in the block, keyed as the JSON sidecar
+        and the CSV columns name them."""
+        return {
+            key: value
+            for key, value in (
+                ("iso", self.iso),
+                ("shutter", self.shutter),
+                ("fnum", self.fnum),
+                ("ev", self.ev),
+                ("ct", self.ct),
+                ("color_md", self.color_md),
+                ("focal_len", self.focal_len),
+            )
+            if value is not None
+        }
+
+    @property
+    def family(self) -> str | None:
+        """The docs/SRT_FORMATS.md family this block's syntax belongs to.
+
+        ``mini3_4pro`` / ``html_extended`` for the bracket form (plain or
+        ``<font>``-wrapped), ``p4rtk_compact`` / ``legacy_unit`` /
+        ``legacy_gps`` for the ``GPS(...)`` forms, ``None`` when the block
+        carries neither.
+        """
+        text = self.text
+        if "[latitude:" in text and "[longitude:" in text:
+            return "html_extended" if self.html else "mini3_4pro"
+        if "GPS" not in text or not _GPS_OPEN_RE.search(text):
+            return None
+        # P4 RTK compact single-line family uses ``GPS (...)`` (with space)
+        # plus free-standing ``F/N`` aperture tokens.
+        if " F/" in text or text.lstrip().startswith("F/"):
+            return "p4rtk_compact"
+        if _GPS_UNIT_RE.search(text):
+            return "legacy_unit"
+        return "legacy_gps"
+
+
+def _group(m: re.Match[str] | None) -> str | None:
+    return m[1] if m else None
+
+
+def _float(m: re.Match[str] | None) -> float | None:
+    return float(m[1]) if m else None
+
+
+def _split_block(block: str) -> tuple[int, str | None, str | None, str, bool]:
+    """``(line_count, cue, cue_end, text, html)`` of one block.
+
+    ``text`` is empty for blocks without a telemetry line.
+    """
+    lines = block.strip().split("\n")
+    if len(lines) < 2:
+        return len(lines), None, None, "", False
+    m = _CUE_RANGE_RE.search(lines[1])
+    if m:
+        cue, cue_end = m[1], m[2]
+    else:
+        cue, cue_end = _group(_CUE_RE.search(lines[1])), None
+    if len(lines) < 3:
+        return 2, cue, cue_end, "", False
+
+    text = " ".join(lines[2:])
+    html = "<font" in text
+    if html:
+        text = _TAG_RE.sub("", text)
+    return len(lines), cue, cue_end, text, html
+
+
+def _tokenize_block(index: int, block: str) -> SrtRecord:
+    line_count, cue, cue_end, text, html = _split_block(block)
+    if line_count < 3:
+        return SrtRecord(index, line_count, cue, cue_end)
+    return _tokenize_text(index, line_count, cue, cue_end, text, html)
+
+
+def _tokenize_text(
+    index: int,
+    line_count: int,
+    cue: str | None,
+    cue_end: str | None,
+    text: str,
+    html: bool,
+) -> SrtRecord:
+    """Every syntax, with fallbacks: the reference the fast paths must match."""
+    lat = lon = gps = rel_alt = abs_alt = alt_pair = barometer = None
+    frame_count = diff_time = dt = gimbal_yaw = gimbal_pitch = home = None
+    iso = shutter = fnum = ev = ct = color_md = focal_len = None
+
+    # Fields that travel together in every bracket family are read with one
+    # search, falling back to the per-field patterns when the run is broken.
+    m = _LAT_LON_RE.search(text)
+    if m:
+        lat, lon = float(m[1]), float(m[2])
+    elif "[latitude:" in text:
+        lat = _float(_LAT_RE.search(text))
+        lon = _float(_LON_RE.search(text))
+    m = _ALT_PAIR_RE.search(text)
+    if m:
+        alt_pair = (m[1], m[2])
+        rel_alt, abs_alt = float(m[1]), float(m[2])
+    else:
+        rel_alt = _float(_REL_ALT_RE.search(text))
+        abs_alt = _float(_ABS_ALT_RE.search(text))
+    m = _GIMBAL_RE.search(text)
+    if m:
+        gimbal_yaw, gimbal_pitch = float(m[1]), float(m[2])
+    else:
+        gimbal_yaw = _float(_GB_YAW_RE.search(text))
+        gimbal_pitch = _float(_GB_PITCH_RE.search(text))
+    m = _CAMERA_RUN_RE.search(text)
+    if m:
+        iso, shutter, fnum, ev, ct, color_md = m.groups()
+    else:
+        iso = _group(_ISO_RE.search(text))
+        shutter = _group(_SHUTTER_RE.search(text))
+        fnum = _group(_FNUM_RE.search(text))
+        ev = _group(_EV_RE.search(text))
+        ct = _group(_CT_RE.search(text))
+        color_md = _group(_COLOR_MD_RE.search(text))
+    focal_len = _group(_FOCAL_LEN_RE.search(text))
+
+    m = _GPS_RE.search(text)
+    if m:
+        gps = (float(m[1]), float(m[2]), float(m[3]))
+    barometer = _float(_BARO_RE.search(text))
+    m = _COUNTER_RE.search(text)
+    if m:
+        frame_count = int(m[1])
+    diff_time = _group(_DIFF_TIME_RE.search(text))
+    m = _HOME_RE.search(text)
+    if m:
+        home = (float(m[1]), float(m[2]), _float_or_none(m[3]))
+    m = _search_datetime(text)
+    if m:
+        dt = parse_datetime_match(m)
+
+    # P4 RTK compact single-line family: free-standing tokens fill in for
+    # the bracket form. Their patterns have no literal prefix, so they are
+    # gated on a substring check.
+    if fnum is None and "F/" in text:
+        fnum = _group(_P4_FNUM_RE.search(text))
+    if shutter is None and "SS" in text:
+        shutter = _group(_P4_SHUTTER_RE.search(text))
+    if iso is None and "ISO" in text:
+        iso = _group(_P4_ISO_RE.search(text))
+    if ev is None and "EV" in text:
+        ev = _group(_P4_EV_RE.search(text))
+
+    return SrtRecord(
+        index,
+        line_count,
+        cue,
+        cue_end,
+        text,
+        html,
+        lat,
+        lon,
+        gps,
+        rel_alt,
+        abs_alt,
+        alt_pair,
+        barometer,
+        frame_count,
+        diff_time,
+        dt,
+        gimbal_yaw,
+        gimbal_pitch,
+        iso,
+        shutter,
+        fnum,
+        ev,
+        ct,
+        color_md,
+        focal_len,
+        home,
+    )
+
+
+# Family fast paths. Once a file's family is known, each block goes through
+# a parser for that family alone, skipping the patterns (and fallbacks) of
+# syntaxes it does not use. A fast path returns the record the full
+# tokenizer would, or ``None`` when the block holds anything it cannot vouch
+# for; the block is then tokenized in full and the family detected again.
+
+# Bracket token syntax per field, with the value(s) in named groups. Values
+# use the full tokenizer's patterns, minus brackets (tokens never nest).
+_BRACKET_FIELDS = {
+    "lat": rf"\[latitude:\s*(?P<lat>{_NUM})\]",
+    "lon": rf"\[longitude:\s*(?P<lon>{_NUM})\]",
+    "rel_alt": rf"\[rel_alt:\s*(?P<rel_alt>{_NUM})\s*abs_alt:\s*(?P<abs_alt>{_NUM})\]",
+    "gb_yaw": (
+        rf"\[gb_yaw:\s*(?P<gb_yaw>{_NUM})\s*gb_pitch:\s*(?P<gb_pitch>{_NUM})[^\[\]]*\]"
+    ),
+    "iso": r"\[iso\s*:\s*(?P<iso>\d+)\]",
+    "shutter": r"\[shutter\s*:\s*(?P<shutter>[^\[\]]+)\]",
+    "fnum": rf"\[fnum\s*:\s*(?P<fnum>{_NUM})\]",
+    "ev": r"\[ev\s*:\s*(?P<ev>[^\[\]]+)\]",
+    "ct": r"\[ct\s*:\s*(?P<ct>[^\[\]]+)\]",
+    "color_md": r"\[color_md\s*:\s*(?P<color_md>[^\[\]]+)\]",
+    "focal_len": r"\[focal_len\s*:\s*(?P<focal_len>[^\[\]]+)\]",
+}
+_GAP = r"[^\[\]]*"
+
+# Classifies the tokens of a detection block: ``lastgroup`` names the field
+# (the last group of a two-value token), or is ``"other"``.
+_BRACKET_TOKEN_RE = re.compile(
+    "|".join([*_BRACKET_FIELDS.values(), r"\[(?P<other>[^\[\]]*)\]"])
+)
+# How a known field's token opens; an other token must not open like one.
+_KNOWN_OPENING = (
+    r"(?:latitude|longitude|rel_alt|gb_yaw):"
+    r"|(?:iso|shutter|fnum|ev|ct|color_md|focal_len)\s*:"
+)
+_KNOWN_OPENING_RE = re.compile(_KNOWN_OPENING)
+_KNOWN_TOKEN_RE = re.compile(rf"\[(?:{_KNOWN_OPENING})")
+
+# Markers of fields the bracket layouts do not read. A bracket block
+# carrying one goes to the full tokenizer; extend this when a new field is
+# added there that can appear next to the bracket form.
+_BRACKET_FOREIGN = ("GPS", "HOME", "BAROMETER")
+
+# The P4 RTK free-standing camera tokens, as (field, marker) pairs: the full
+# tokenizer reads a token when its bracket form is absent and the marker is
+# in the text.
+_P4_MARKERS = (("fnum", "F/"), ("shutter", "SS"), ("iso", "ISO"), ("ev", "EV"))
+
+
+class _BracketLayout:
+    """``mini3_4pro`` / ``html_extended`` fast path for one token order.
+
+    Each model writes its bracket tokens in a fixed order, so the order seen
+    in the detection block becomes a single compiled pattern: the known
+    fields as named groups, other tokens by their literal key (``[vsync:``),
+    free text (the counter/DiffTime/datetime header, separators) in between.
+    One ``match`` then reads a block up to its last known field; the rest
+    only has to be free of known fields. Header fields are cheap searches
+    and use the full tokenizer's patterns directly.
+    """
+
+    def __init__(self, slots: list[tuple[str | None, str]]) -> None:
+        """*slots* are ``(field, token pattern)`` in order; ``field`` is
+        ``None`` for other tokens."""
+        self.keys = {key for key, _ in slots if key is not None}
+        last = max(i for i, (key, _) in enumerate(slots) if key is not None)
+        self.pattern = re.compile(
+            _GAP + _GAP.join(token for _, token in slots[: last + 1])
+        )
+        # Markers of syntax the layout does not read but the full tokenizer
+        # would pick up anywhere in the text: other families' fields and
+        # the unbracketed spellings of fields absent from this layout.
+        markers = list(_BRACKET_FOREIGN)
+        markers += [marker for key, marker in _P4_MARKERS if key not in self.keys]
+        if "rel_alt" not in self.keys:
+            markers += ["rel_alt", "abs_alt"]
+        if "gb_yaw" not in self.keys:
+            markers.append("gb_")
+        self.markers = tuple(markers)
+
+    @classmethod
+    def learn(cls, rec: SrtRecord) -> "_BracketLayout | None":
+        """The layout of *rec*'s block, or ``None`` if it cannot be trusted."""
+        slots: list[tuple[str | None, str]] = []
+        for m in _BRACKET_TOKEN_RE.finditer(rec.text):
+            key = m.lastgroup
+            if key == "other":
+                # An other token is matched by its key: up to its colon, or
+                # all of it. A malformed known field cannot be one (no block
+                # with the field well-formed would match).
+                other = m["other"]
+                if _KNOWN_OPENING_RE.match(other):
+                    return None
+                colon = other.find(":")
+                prefix = re.escape(other[: colon + 1] if colon != -1 else other)
+                slots.append((None, rf"\[(?!{_KNOWN_OPENING}){prefix}[^\[\]]*\]"))
+                continue
+            if key is None:
+                return None
+            if key == "abs_alt":
+                key = "rel_alt"
+            elif key == "gb_pitch":
+                key = "gb_yaw"
+            if any(key == seen for seen, _ in slots):
+                return None
+            slots.append((key, _BRACKET_FIELDS[key]))
+        keys = {key for key, _ in slots}
+        if ("lat" in keys) != ("lon" in keys) or keys <= {None}:
+            return None
+        layout = cls(slots)
+        # The layout must reproduce the block it was learned from.
+        again = layout(
+            rec.index, rec.line_count, rec.cue, rec.cue_end, rec.text, rec.html
+        )
+        if again != rec:
+            return None
+        return layout
+
+    def __call__(
+        self,
+        index: int,
+        line_count: int,
+        cue: str | None,
+        cue_end: str | None,
+        text: str,
+        html: bool,
+    ) -> SrtRecord | None:
+        m = self.pattern.match(text)
+        if m is None or _KNOWN_TOKEN_RE.search(text, m.end()):
+            return None
+        for marker in self.markers:
+            if marker in text:
+                return None
+        if "gb_yaw" in self.keys and text.count("gb_yaw") != 1:
+            return None
+        f = m.groupdict()
+        get = f.get
+        lat, lon = get("lat"), get("lon")
+        rel_alt, abs_alt = get("rel_alt"), get("abs_alt")
+        yaw, pitch = get("gb_yaw"), get("gb_pitch")
+        counter = _COUNTER_RE.search(text)
+        dt = _search_datetime(text)
+        return SrtRecord(
+            index,
+            line_count,
+            cue,
+            cue_end,
+            text,
+            html,
+            float(lat) if lat is not None else None,
+            float(lon) if lon is not None else None,
+            None,
+            float(rel_alt) if rel_alt is not None else None,
+            float(abs_alt) if abs_alt is not None else None,
+            (rel_alt, abs_alt)
+            if rel_alt is not None and abs_alt is not None
+            else None,
+            None,
+            int(counter[1]) if counter else None,
+            _group(_DIFF_TIME_RE.search(text)),
+            parse_datetime_match(dt) if dt else None,
+            float(yaw) if yaw is not None else None,
+            float(pitch) if pitch is not None else None,
+            get("iso"),
+            get("shutter"),
+            get("fnum"),
+            get("ev"),
+            get("ct"),
+            get("color_md"),
+            get("focal_len"),
+        )
+
+
+def _parse_gps(
+    index: int,
+    line_count: int,
+    cue: str | None,
+    cue_end: str | None,
+    text: str,
+    html: bool,
+) -> SrtRecord | None:
+    """``legacy_gps`` / ``legacy_unit`` / ``p4rtk_compact``: the ``GPS(...)``
+    forms, which carry no bracket tokens, so none of their patterns run."""
+    if "[" in text or "]" in text or "rel_alt" in text or "gb_" in text:
+        return None
+    m = _GPS_RE.search(text)
+    if m is None:
+        return None
+    gps = (float(m[1]), float(m[2]), float(m[3]))
+    home = None
+    if "HOME" in text:
+        h = _HOME_RE.search(text)
+        if h:
+            home = (float(h[1]), float(h[2]), _float_or_none(h[3]))
+    m = _COUNTER_RE.search(text) if "Cnt" in text else None
+    dt = _search_datetime(text)
+    return SrtRecord(
+        index,
+        line_count,
+        cue,
+        cue_end,
+        text,
+        html,
+        gps=gps,
+        barometer=_float(_BARO_RE.search(text)) if "BAROMETER" in text else None,
+        frame_count=int(m[1]) if m else None,
+        diff_time=_group(_DIFF_TIME_RE.search(text)) if "DiffTime" in text else None,
+        dt=parse_datetime_match(dt) if dt else None,
+        iso=_group(_P4_ISO_RE.search(text)) if "ISO" in text else None,
+        shutter=_group(_P4_SHUTTER_RE.search(text)) if "SS" in text else None,
+        fnum=_group(_P4_FNUM_RE.search(text)) if "F/" in text else None,
+        ev=_group(_P4_EV_RE.search(text)) if "EV" in text else None,
+        home=home,
+    )
+
+
+_GPS_FAMILIES = ("legacy_gps", "legacy_unit", "p4rtk_compact")
+
+
+def _fast_path(rec: SrtRecord) -> Callable[..., SrtRecord | None] | None:
+    """The fast path for the family *rec* was detected as, if any."""
+    family = rec.family
+    if family in _GPS_FAMILIES:
+        return _parse_gps
+    # When the exposure fields form the usual run, the full tokenizer reads
+    # the block with one search per field group, which is already as quick
+    # as the layout pattern (Neo 2, Avata 360); those files stay on it.
+    if family is None or _CAMERA_RUN_RE.search(rec.text):
+        return None
+    return _BracketLayout.learn(rec)
+
+
+@dataclass
+class SrtParseStats:
+    """Diagnostics from tokenizing one or more SRT files.
+
+    ``family`` is the family detected last; ``detections`` counts how often
+    the family changed (a mixed or damaged file re-detects). ``blocks`` and
+    ``seconds`` are per parser: a family name for blocks its fast path
+    handled, ``"full"`` for those that went through the full tokenizer
+    (detection, fast-path misses and short blocks).
+    """
+
+    family: str | None = None
+    detections: int = 0
+    blocks: dict[str, int] = field(default_factory=dict)
+    seconds: dict[str, float] = field(default_factory=dict)
+
+    def add(self, parser: str, seconds: float) -> None:
+        self.blocks[parser] = self.blocks.get(parser, 0) + 1
+        self.seconds[parser] = self.seconds.get(parser, 0.0) + seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "family": self.family,
+            "detections": self.detections,
+            "parsers": {
+                name: {
+                    "blocks": count,
+                    "seconds": round(self.seconds[name], 6),
+                    "blocks_per_s": (
+                        round(count / self.seconds[name])
+                        if self.seconds[name] > 0
+                        else None
+                    ),
+                }
+                for name, count in self.blocks.items()
+            },
+        }
+
+
+def _tokenize_blocks(
+    blocks: Iterable[str], stats: SrtParseStats | None = None
+) -> Iterator[SrtRecord]:
+    """Tokenize *blocks*, dispatching to the detected family's fast path.
+
+    Blocks go through the full tokenizer until one yields a family; from
+    then on that family's fast path handles them, and a block it turns down
+    is tokenized in full and detects the family (and, for the bracket
+    families, the token order) again. A family without a fast path for the
+    file stays on the full tokenizer until the family changes.
+    """
+    family: str | None = None
+    fast = None
+    started = 0.0
+    for index, block in enumerate(blocks, start=1):
+        if stats is not None:
+            started = time.perf_counter()
+        line_count, cue, cue_end, text, html = _split_block(block)
+        parser: str | None = "full"
+        rec: SrtRecord | None
+        if line_count < 3:
+            rec = SrtRecord(index, line_count, cue, cue_end)
+        else:
+            rec = fast(index, line_count, cue, cue_end, text, html) if fast else None
+            if rec is not None:
+                parser = family
+            else:
+                rec = _tokenize_text(index, line_count, cue, cue_end, text, html)
+                detected = rec.family
+                if detected == family:
+                    if fast is not None:
+                        # A one-off block (no layout of its own) keeps the
+                        # current fast path; a new token order replaces it.
+                        fast = _fast_path(rec) or fast
+                else:
+                    fast = _fast_path(rec)
+                    family = detected
+                    if stats is not None and detected is not None:
+                        stats.detections += 1
+                        stats.family = detected
+        if stats is not None:
+            stats.add(parser or "full", time.perf_counter() - started)
+        yield rec
+
+
+def _search_datetime(text: str) -> re.Match[str] | None:
+    """``_ABS_DATETIME_RE.search(text)``, anchored on each ``-`` in turn.
+
+    The pattern starts with a digit class, which the regex engine has to try
+    at every offset; the date separator is a cheap ``str.find`` away and the
+    leftmost match always has one four characters in.
+    """
+    i = text.find("-", 4)
+    while i != -1:
+        m = _ABS_DATETIME_RE.match(text, i - 4)
+        if m:
+            return m
+        i = text.find("-", i + 1)
+    return None
+
+
+def _float_or_none(value: str | None) -> float | None:
+    return float(value) if value is not None else None
+
+
+def iter_srt_blocks(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield the blank-line-separated blocks of text arriving in *chunks*.
+
+    Same blocks as ``"".join(chunks).strip().split("\n\n")`` -- including
+    the single empty block of an all-whitespace input -- without holding more
+    than one block (plus a read-ahead chunk) at a time. The last block needs
+    no trailing blank line, and a truncated one is yielded as it stands for
+    the tokenizer to mark incomplete. Chunks must already use ``\n`` line
+    endings, as text-mode reads do.
+    """
+    buf = ""
+    started = False  # a block with content has been seen (leading strip done)
+    held: list[str] = []  # blocks that are only emitted if content follows
+    for chunk in chunks:
+        buf += chunk
+        if not started:
+            buf = buf.lstrip()
+            if not buf:
+                continue
+            started = True
+        start = 0
+        while True:
+            end = buf.find("\n\n", start)
+            if end == -1:
+                break
+            block = buf[start:end]
+            start = end + 2
+            # Whitespace-only blocks may turn out to be the file's trailing
+            # whitespace, which ``strip`` would drop; hold them (and the
+            # block before, whose own trailing whitespace would go too)
+            # until a block with content follows.
+            if block.strip() and held:
+                yield from held
+                held.clear()
+            held.append(block)
+        buf = buf[start:]
+    if buf.strip():
+        yield from held
+        yield buf.rstrip()
+    elif held:
+        yield held[0].rstrip()
+    elif not started:
+        yield ""
+
+
+def _read_chunks(srt_path: Path, size: int = _READ_CHUNK) -> Iterator[str]:
+    # Text mode with universal newlines, so CRLF files read like LF ones.
+    with open(srt_path, encoding="utf-8") as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+def iter_srt_records(
+    content: str, stats: SrtParseStats | None = None
+) -> Iterator[SrtRecord]:
+    """Yield one :class:`SrtRecord` per blank-line-separated block of *content*.
+
+    Pass *stats* to collect the detected family and per-parser throughput.
+    """
+    return _tokenize_blocks(content.strip().split("\n\n"), stats)
+
+
+def read_srt_records(
+    srt_path: Path, stats: SrtParseStats | None = None
+) -> Iterator[SrtRecord]:
+    """Yield the :class:`SrtRecord` stream of the SRT file at *srt_path*.
+
+    The file is read in chunks and tokenized block by block, so memory stays
+    flat however long the flight; the records match :func:`iter_srt_records`
+    on the whole text. Raises ``OSError`` when the file cannot be opened and
+    ``UnicodeDecodeError`` (while iterating) when it is not UTF-8.
+    """
+    return _tokenize_blocks(iter_srt_blocks(_read_chunks(Path(srt_path))), stats)
+
+
+def read_srt_cues(srt_path: Path) -> Iterator[tuple[str, str, str]]:
+    """Yield ``(cue, cue_end, text)`` for each timed block of the SRT at *srt_path*.
+
+    Unlike :attr:`SrtRecord.text`, which joins a block's lines with spaces
+    for the field parsers, *text* is the cue as a subtitle track shows it:
+    the lines after the timing line joined with ``\\n``, markup tags
+    removed — what ffmpeg's SRT to mov_text conversion keeps. Blocks
+    without a ``start --> end`` line or any text are skipped. Raises like
+    :func:`read_srt_records`.
+    """
+    for block in iter_srt_blocks(_read_chunks(Path(srt_path))):
+        lines = block.strip().split("\n")
+        if len(lines) < 3:
+            continue
+        m = _CUE_RANGE_RE.search(lines[1])
+        if m:
+            yield m[1], m[2], _TAG_RE.sub("", "\n".join(lines[2:]))
@@ -6,20 +6,22 @@ directories of SRT files can be processed in batch. A small CLI wrapper is
 provided for convenience.
 """
 
+import json
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from typing import Any
-import re
 import logging
 
 from rich.progress import Progress
 from .utilities import TelemetrySample, is_gps_fix, setup_logging
-from .utilities import _parse_srt_datetime, resolve_utc_offset
-from .utilities import parse_home, redact_home
+from .utilities import resolve_utc_offset
+from .utilities import read_home, redact_home
 # Re-exported for backwards compatibility — cli.py and tests/test_timezone.py
 # import these from here:
 from .utilities import parse_utc_offset, estimate_utc_offset  # noqa: F401
 from .geo.solar import sun_position
+from .srt_tokenizer import PARSER_VERSION, read_srt_records
+from .utils.cache import active_cache
 
 logger = logging.getLogger(__name__)
 
@@ -27,47 +29,37 @@ logger = logging.getLogger(__name__)
 _VERY_LOW_SUN_DEG = 5
 
 
-def _parse_gps_points(content: str) -> list[dict[str, Any]]:
-    """Parse SRT text into GPS points: lat, lon, ele, cue time, abs datetime.
+def _parse_gps_points(srt_path: Path) -> list[dict[str, Any]]:
+    """Parse an SRT file into GPS points: lat, lon, ele, cue time, abs datetime.
 
     Shared by :func:`extract_telemetry_to_gpx` and :func:`summarize_sun` so the
     GPS/datetime extraction lives in one place.
     """
     gps_points: list[dict[str, Any]] = []
-    for block in content.strip().split("\n\n"):
-        lines = block.strip().split("\n")
-        if len(lines) < 3:
+    for rec in read_srt_records(srt_path):
+        if not rec.complete or rec.lat is None or rec.lon is None:
             continue
-        timestamp_match = re.search(r"(\d{2}:\d{2}:\d{2},\d{3})", lines[1])
-        telemetry_line = " ".join(lines[2:])
-        if "<font" in telemetry_line:
-            telemetry_line = re.sub(r"<[^>]+>", "", telemetry_line)
-        lat_match = re.search(r"\[latitude:\s*([+-]?\d+\.?\d*)\]", telemetry_line)
-        lon_match = re.search(r"\[longitude:\s*([+-]?\d+\.?\d*)\]", telemetry_line)
-        alt_match = re.search(r"abs_alt:\s*([+-]?\d+\.?\d*)\]", telemetry_line)
-        if lat_match and lon_match:
-            lat, lon = float(lat_match.group(1)), float(lon_match.group(1))
-            # Frames recorded before GPS lock carry the (0, 0) sentinel and
-            # must not become Null Island trackpoints (#256). The video path
-            # already filters these in load_samples.
-            if not is_gps_fix(lat, lon):
-                continue
-            gps_points.append(
-                {
-                    "lat": lat,
-                    "lon": lon,
-                    "ele": float(alt_match.group(1)) if alt_match else 0,
-                    "time": timestamp_match.group(1) if timestamp_match else None,
-                    "datetime": _parse_srt_datetime(telemetry_line),
-                }
-            )
+        # Frames recorded before GPS lock carry the (0, 0) sentinel and
+        # must not become Null Island trackpoints (#256). The video path
+        # already filters these in load_samples.
+        if not is_gps_fix(rec.lat, rec.lon):
+            continue
+        gps_points.append(
+            {
+                "lat": rec.lat,
+                "lon": rec.lon,
+                "ele": rec.abs_alt if rec.abs_alt is not None else 0,
+                "time": rec.cue,
+                "datetime": rec.dt,
+            }
+        )
     return gps_points
 
 
 def load_gps_points(path: Path) -> tuple[list[dict[str, Any]], bool]:
     """Return GPS points (``_parse_gps_points`` shape) and whether they are UTC.
 
-    SRT: parse the text (datetimes are local wall-clock) -> ``is_utc=False``.
+    SRT: parse the file (datetimes are local wall-clock) -> ``is_utc=False``.
     Video: read via ``load_samples`` (ExifTool ``GPSDateTime`` is absolute UTC)
     -> ``is_utc=True``, so callers apply a zero local->UTC offset.
     """
@@ -80,7 +72,45 @@ def load_gps_points(path: Path) -> tuple[list[dict[str, Any]], bool]:
             for s in load_samples(path)
         ]
         return points, True
-    return _parse_gps_points(path.read_text(encoding="utf-8")), False
+
+    def build() -> list[dict[str, Any]]:
+        return _parse_gps_points(path)
+
+    cache = active_cache()
+    if cache is None:
+        return build(), False
+    points = cache.fetch(
+        "gps", path, PARSER_VERSION, build, _dump_gps_points, _load_gps_points
+    )
+    return points, False
+
+
+def _dump_gps_points(points: list[dict[str, Any]]) -> bytes:
+    """Serialize ``_parse_gps_points`` output for the telemetry cache."""
+    rows = [
+        [
+            p["lat"],
+            p["lon"],
+            p["ele"],
+            p["time"],
+            p["datetime"].isoformat() if p["datetime"] is not None else None,
+        ]
+        for p in points
+    ]
+    return json.dumps(rows, separators=(",", ":")).encode("utf-8")
+
+
+def _load_gps_points(data: bytes) -> list[dict[str, Any]]:
+    return [
+        {
+            "lat": lat,
+            "lon": lon,
+            "ele": ele,
+            "time": time,
+            "datetime": datetime.fromisoformat(dt) if dt is not None else None,
+        }
+        for lat, lon, ele, time, dt in json.loads(data)
+    ]
 
 
 def extract_telemetry_to_gpx(
@@ -154,7 +184,7 @@ def extract_telemetry_to_gpx(
 
     home_wpt = ""
     if extract_home:
-        home = redact_home(parse_home(srt_path.read_text(encoding="utf-8")), redact)
+        home = redact_home(read_home(srt_path), redact)
         if home is not None:
             ele = f"        <ele>{home.alt}</ele>\n" if home.alt is not None else ""
             home_wpt = (
@@ -387,7 +417,7 @@ def extract_telemetry_to_csv(
     home_cols: list[str] = []
     home = None
     if extract_home:
-        home = redact_home(parse_home(srt_path.read_text(encoding="utf-8")), redact)
+        home = redact_home(read_home(srt_path), redact)
         home_cols = ["home_lat", "home_lon", "home_alt"]
     columns = list(_CSV_COLUMNS) + home_cols
 
@@ -395,86 +425,43 @@ def extract_telemetry_to_csv(
     # Per-row solar inputs, index-aligned with ``rows``: (abs_dt, lat, lon).
     solar_inputs: list[tuple[datetime | None, float | None, float | None]] = []
 
-    with open(srt_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    blocks = content.strip().split("\n\n")
-
-    for block in blocks:
-        lines = block.strip().split("\n")
-        if len(lines) >= 3:
-            timestamp_line = lines[1]
-            timestamp_match = re.search(r"(\d{2}:\d{2}:\d{2},\d{3})", timestamp_line)
-
-            telemetry_line = " ".join(lines[2:])
-            if "<font" in telemetry_line:
-                telemetry_line = re.sub(r"<[^>]+>", "", telemetry_line)
-
-            row = {c: "" for c in columns}
-            if home is not None:
-                row["home_lat"] = f"{home.lat}"
-                row["home_lon"] = f"{home.lon}"
-                row["home_alt"] = "" if home.alt is None else f"{home.alt}"
-            row["timestamp"] = timestamp_match.group(1) if timestamp_match else ""
-
-            # GPS coordinates
-            lat_match = re.search(r"\[latitude:\s*([+-]?\d+\.?\d*)\]", telemetry_line)
-            lon_match = re.search(r"\[longitude:\s*([+-]?\d+\.?\d*)\]", telemetry_line)
-            lat_val: float | None = None
-            lon_val: float | None = None
-            if lat_match and lon_match:
-                lat_val = float(lat_match.group(1))
-                lon_val = float(lon_match.group(1))
-                # Track redaction (#248): fuzz -> 3 decimals (~100 m, same
-                # policy as redact_coords); drop -> blank GPS cells. Fuzzing
-                # lat_val/lon_val here also feeds the fuzzed position into
-                # the solar pass below.
-                if redact == "fuzz":
-                    lat_val, lon_val = round(lat_val, 3), round(lon_val, 3)
-                if redact == "drop":
-                    lat_val = None
-                    lon_val = None
-                else:
-                    row["latitude"] = f"{lat_val}"
-                    row["longitude"] = f"{lon_val}"
-
-            # Altitude
-            alt_match = re.search(
-                r"\[rel_alt:\s*([+-]?\d+\.?\d*)\s*abs_alt:\s*([+-]?\d+\.?\d*)\]",
-                telemetry_line,
-            )
-            if alt_match:
-                row["rel_altitude"] = alt_match.group(1)
-                row["abs_altitude"] = alt_match.group(2)
-
-            # Camera settings
-            iso_match = re.search(r"\[iso\s*:\s*(\d+)\]", telemetry_line)
-            shutter_match = re.search(r"\[shutter\s*:\s*([^\]]+)\]", telemetry_line)
-            fnum_match = re.search(r"\[fnum\s*:\s*(\d+)\]", telemetry_line)
-            ev_match = re.search(r"\[ev\s*:\s*([^\]]+)\]", telemetry_line)
-            ct_match = re.search(r"\[ct\s*:\s*([^\]]+)\]", telemetry_line)
-            color_md_match = re.search(r"\[color_md\s*:\s*([^\]]+)\]", telemetry_line)
-            focal_len_match = re.search(r"\[focal_len\s*:\s*([^\]]+)\]", telemetry_line)
-
-            if iso_match:
-                row["iso"] = iso_match.group(1)
-            if shutter_match:
-                row["shutter"] = shutter_match.group(1)
-            if fnum_match:
-                row["fnum"] = fnum_match.group(1)
-            if ev_match:
-                row["ev"] = ev_match.group(1)
-            if ct_match:
-                row["ct"] = ct_match.group(1)
-            if color_md_match:
-                row["color_md"] = color_md_match.group(1)
-            if focal_len_match:
-                row["focal_len"] = focal_len_match.group(1)
-
-            rows.append(row)
-            solar_inputs.append(
-                (_parse_srt_datetime(telemetry_line), lat_val, lon_val)
-            )
+    for rec in read_srt_records(srt_path):
+        if not rec.complete:
+            continue
+        row = {c: "" for c in columns}
+        if home is not None:
+            row["home_lat"] = f"{home.lat}"
+            row["home_lon"] = f"{home.lon}"
+            row["home_alt"] = "" if home.alt is None else f"{home.alt}"
+        row["timestamp"] = rec.cue or ""
+
+        # GPS coordinates
+        lat_val: float | None = None
+        lon_val: float | None = None
+        if rec.lat is not None and rec.lon is not None:
+            lat_val, lon_val = rec.lat, rec.lon
+            # Track redaction (#248): fuzz -> 3 decimals (~100 m, same
+            # policy as redact_coords); drop -> blank GPS cells. Fuzzing
+            # lat_val/lon_val here also feeds the fuzzed position into
+            # the solar pass below.
+            if redact == "fuzz":
+                lat_val, lon_val = round(lat_val, 3), round(lon_val, 3)
+            if redact == "drop":
+                lat_val = None
+                lon_val = None
+            else:
+                row["latitude"] = f"{lat_val}"
+                row["longitude"] = f"{lon_val}"
+
+        # Altitude, verbatim as the SRT wrote it
+        if rec.alt_pair is not None:
+            row["rel_altitude"], row["abs_altitude"] = rec.alt_pair
+
+        # Camera settings
+        row.update(rec.camera)
+
+        rows.append(row)
+        solar_inputs.append((rec.dt, lat_val, lon_val))
 
     # Resolve the single local->UTC offset, then fill UTC + solar columns.
     abs_times = [dt for dt, _, _ in solar_inputs if dt is not None]
@@ -1,6 +1,10 @@
+import json
 import logging
 import logging.handlers
 import re
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -10,6 +14,16 @@ import subprocess
 from rich.console import Console
 from rich.logging import RichHandler
 
+from .srt_tokenizer import (
+    PARSER_VERSION,
+    _ABS_DATETIME_RE,
+    _HOME_RE,
+    cue_to_seconds,
+    format_cue,
+    parse_datetime_match,
+    read_srt_records,
+)
+
 
 logger = logging.getLogger(__name__)
 
@@ -21,21 +35,11 @@ _QUARTER_HOUR = 15 * 60
 # +/-14h is proof the file mtime is not the recording time (#259).
 _MAX_PLAUSIBLE_OFFSET = timedelta(hours=14)
 
-# DJI SRT blocks carry an absolute wall-clock datetime on their own line, with
-# the milliseconds separated by either a comma (older firmware) or a dot
-# (newer firmware): "2024-01-15 14:30:22,123" / "2026-05-27 13:14:22.911".
-_ABS_DATETIME_RE = re.compile(
-    r"(\d{4})-(\d{2})-(\d{2})\s+(\d{2}):(\d{2}):(\d{2})[.,](\d{3})"
-)
-
 
 def _parse_srt_datetime(text: str) -> datetime | None:
     """Return the absolute wall-clock datetime in *text*, or None if absent."""
     m = _ABS_DATETIME_RE.search(text)
-    if not m:
-        return None
-    year, month, day, hour, minute, second, millis = (int(g) for g in m.groups())
-    return datetime(year, month, day, hour, minute, second, millis * 1000)
+    return parse_datetime_match(m) if m else None
 
 
 def parse_utc_offset(value: str | None) -> timedelta | None:
@@ -124,7 +128,7 @@ def resolve_utc_offset(
     return estimate_utc_offset(abs_datetimes[0], abs_datetimes[-1], file_mtime_utc)
 
 
-@dataclass
+@dataclass(slots=True)
 class TelemetrySample:
     """One GPS-fixed SRT block: position, raw cue time, absolute datetime, and
     optional footprint inputs (relative altitude, 35mm-equivalent focal length,
@@ -141,6 +145,198 @@ class TelemetrySample:
     gimbal_pitch: float | None = None
 
 
+
+# ``TelemetryFrame.dt_us`` value for a row without an absolute datetime.
+_NO_DATETIME = -(2**63)
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+_NAN = float("nan")
+
+
+def _nan_if_none(value: float | None) -> float:
+    return _NAN if value is None else value
+
+
+def _none_if_nan(value: float) -> float | None:
+    return None if value != value else value
+
+
+class TelemetryFrame:
+    """Struct-of-arrays counterpart of ``list[TelemetrySample]``.
+
+    DJI writes one block per video frame, so an archive scan parses millions
+    of samples; as dataclass instances each costs around a kilobyte once its
+    boxed floats, cue string and datetime are counted. Here every field is a
+    typed :class:`array.array` column: ``lat``/``lon``/``alt`` and the
+    optional ``rel_alt``/``focal_len``/``gimbal_yaw``/``gimbal_pitch``
+    (``nan`` where the block had no value), ``cue_s`` (the cue in seconds,
+    ``nan`` when unparseable) and ``dt_us`` (the naive datetime as
+    microseconds since 1970, ``_NO_DATETIME`` when absent). Cue strings are
+    rebuilt from ``cue_s``; only cues that do not round-trip are kept.
+
+    Indexing and iteration yield :class:`TelemetrySample` row views built on
+    demand, so code written against sample lists keeps working; hot loops
+    read the columns directly.
+    """
+
+    __slots__ = (
+        "lat",
+        "lon",
+        "alt",
+        "rel_alt",
+        "focal_len",
+        "gimbal_yaw",
+        "gimbal_pitch",
+        "cue_s",
+        "dt_us",
+        "_raw_cues",
+    )
+
+    def __init__(self) -> None:
+        self.lat = array("d")
+        self.lon = array("d")
+        self.alt = array("d")
+        self.rel_alt = array("d")
+        self.focal_len = array("d")
+        self.gimbal_yaw = array("d")
+        self.gimbal_pitch = array("d")
+        self.cue_s = array("d")
+        self.dt_us = array("q")
+        self._raw_cues: dict[int, str] = {}
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[TelemetrySample]) -> "TelemetryFrame":
+        frame = cls()
+        for s in samples:
+            frame.append(
+                s.lat,
+                s.lon,
+                s.alt,
+                s.cue,
+                s.dt,
+                s.rel_alt,
+                s.focal_len,
+                s.gimbal_yaw,
+                s.gimbal_pitch,
+            )
+        return frame
+
+    def append(
+        self,
+        lat: float,
+        lon: float,
+        alt: float,
+        cue: str,
+        dt: datetime | None = None,
+        rel_alt: float | None = None,
+        focal_len: float | None = None,
+        gimbal_yaw: float | None = None,
+        gimbal_pitch: float | None = None,
+    ) -> None:
+        """Add one row; arguments mirror :class:`TelemetrySample`."""
+        cue_s = cue_to_seconds(cue)
+        if cue_s is None:
+            self._raw_cues[len(self.lat)] = cue
+            cue_s = _NAN
+        elif format_cue(cue_s) != cue:
+            self._raw_cues[len(self.lat)] = cue
+        self.lat.append(lat)
+        self.lon.append(lon)
+        self.alt.append(alt)
+        self.rel_alt.append(_nan_if_none(rel_alt))
+        self.focal_len.append(_nan_if_none(focal_len))
+        self.gimbal_yaw.append(_nan_if_none(gimbal_yaw))
+        self.gimbal_pitch.append(_nan_if_none(gimbal_pitch))
+        self.cue_s.append(cue_s)
+        self.dt_us.append(
+            _NO_DATETIME if dt is None else (dt - _EPOCH) // _ONE_US
+        )
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def cue(self, i: int) -> str:
+        """Row *i*'s cue string exactly as it was appended."""
+        i = range(len(self.lat))[i]
+        raw = self._raw_cues.get(i)
+        return raw if raw is not None else format_cue(self.cue_s[i])
+
+    def dt(self, i: int) -> datetime | None:
+        """Row *i*'s absolute datetime, ``None`` when the block had none."""
+        us = self.dt_us[i]
+        return None if us == _NO_DATETIME else _EPOCH + timedelta(microseconds=us)
+
+    def dated_span(self) -> tuple[datetime, datetime] | None:
+        """First and last absolute datetimes among the rows that carry one."""
+        dt_us = self.dt_us
+        first = next((i for i, us in enumerate(dt_us) if us != _NO_DATETIME), None)
+        if first is None:
+            return None
+        last = next(i for i in range(len(dt_us) - 1, -1, -1) if dt_us[i] != _NO_DATETIME)
+        return self.dt(first), self.dt(last)  # type: ignore[return-value]
+
+    def __getitem__(self, i: int) -> TelemetrySample:
+        i = range(len(self.lat))[i]
+        return TelemetrySample(
+            self.lat[i],
+            self.lon[i],
+            self.alt[i],
+            self.cue(i),
+            self.dt(i),
+            rel_alt=_none_if_nan(self.rel_alt[i]),
+            focal_len=_none_if_nan(self.focal_len[i]),
+            gimbal_yaw=_none_if_nan(self.gimbal_yaw[i]),
+            gimbal_pitch=_none_if_nan(self.gimbal_pitch[i]),
+        )
+
+    def __iter__(self) -> Iterator[TelemetrySample]:
+        for i in range(len(self.lat)):
+            yield self[i]
+
+    _MAGIC = b"DJTF1\n"
+    _COLUMNS = __slots__[:-1]
+
+    def to_bytes(self) -> bytes:
+        """Serialize for the telemetry cache: a small JSON header (row count,
+        byte order, non-round-tripping cues) followed by the raw columns."""
+        header = json.dumps(
+            {
+                "n": len(self.lat),
+                "byteorder": sys.byteorder,
+                "raw_cues": {str(i): c for i, c in self._raw_cues.items()},
+            }
+        ).encode("utf-8")
+        parts = [self._MAGIC, len(header).to_bytes(4, "little"), header]
+        parts.extend(getattr(self, name).tobytes() for name in self._COLUMNS)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TelemetryFrame":
+        """Inverse of :meth:`to_bytes`; ``ValueError`` when *data* is not one."""
+        magic = cls._MAGIC
+        if not data.startswith(magic):
+            raise ValueError("not a serialized TelemetryFrame")
+        pos = len(magic) + 4
+        hlen = int.from_bytes(data[len(magic) : pos], "little")
+        header = json.loads(data[pos : pos + hlen])
+        pos += hlen
+        n = header["n"]
+        frame = cls()
+        for name in cls._COLUMNS:
+            column = getattr(frame, name)
+            end = pos + n * column.itemsize
+            column.frombytes(data[pos:end])
+            pos = end
+            if len(column) != n:
+                raise ValueError("truncated TelemetryFrame")
+            if header["byteorder"] != sys.byteorder:
+                column.byteswap()
+        if pos != len(data):
+            raise ValueError("trailing bytes after TelemetryFrame")
+        frame._raw_cues = {int(i): c for i, c in header["raw_cues"].items()}
+        return frame
+
+
 def iso6709(lat: float, lon: float, alt: float = 0.0) -> str:
     """Return an ISO 6709 location string for QuickTime metadata."""
     return f"{lat:+08.4f}{lon:+09.4f}{alt:+07.1f}/"
@@ -168,103 +364,109 @@ def _normalize_focal_len(raw: str) -> float | None:
     try:
         value = float(raw)
     except ValueError:
-        return None
+        # Bracket values are captured up to ``]``; keep the leading number
+        # of anything with a trailing unit.
+        m = re.match(r"\s*([+-]?\d+\.?\d*)", raw)
+        if not m:
+            return None
+        value = float(m.group(1))
     return value / 10.0 if value >= 100.0 else value
 
 
-def parse_telemetry_samples(srt_path: Path) -> List[TelemetrySample]:
-    """Parse an SRT file into :class:`TelemetrySample` records.
+def parse_telemetry_frame(srt_path: Path) -> "TelemetryFrame":
+    """Parse an SRT file straight into a columnar :class:`TelemetryFrame`.
 
     Same GPS extraction as the legacy 4-tuple parser (bracket format, ``GPS(...)``
     compact form, M300 altitude unit suffix, ``(0,0)`` no-fix filtering) plus the
-    block's absolute wall-clock datetime when present.
+    block's absolute wall-clock datetime when present. No per-block objects
+    outlive the tokenizer, which keeps archive-scale scans small.
     """
-    content = srt_path.read_text(encoding="utf-8")
-    blocks = content.strip().split("\n\n")
-    samples: List[TelemetrySample] = []
-    for block in blocks:
-        lines = block.strip().split("\n")
-        if len(lines) < 3:
+    frame = TelemetryFrame()
+    append = frame.append
+    for rec in read_srt_records(srt_path):
+        if not rec.complete:
             continue
-        ts_line = lines[1]
-        ts_match = re.search(r"(\d{2}:\d{2}:\d{2},\d{3})", ts_line)
-        timestamp = ts_match.group(1) if ts_match else ""
-        tele_line = " ".join(lines[2:])
-        if "<font" in tele_line:
-            tele_line = re.sub(r"<[^>]+>", "", tele_line)
-        dt = _parse_srt_datetime(tele_line)
-        rel_match = re.search(r"rel_alt:\s*([+-]?\d+\.?\d*)", tele_line)
-        focal_match = re.search(r"\[focal_len\s*:\s*([+-]?\d+\.?\d*)", tele_line)
-        gb_yaw_match = re.search(r"gb_yaw:\s*([+-]?\d+\.?\d*)", tele_line)
-        gb_pitch_match = re.search(r"gb_pitch:\s*([+-]?\d+\.?\d*)", tele_line)
-        rel_alt = float(rel_match.group(1)) if rel_match else None
-        focal_len = _normalize_focal_len(focal_match.group(1)) if focal_match else None
-        gimbal_yaw = float(gb_yaw_match.group(1)) if gb_yaw_match else None
-        gimbal_pitch = float(gb_pitch_match.group(1)) if gb_pitch_match else None
-        lat_match = re.search(r"\[latitude:\s*([+-]?\d+\.?\d*)\]", tele_line)
-        lon_match = re.search(r"\[longitude:\s*([+-]?\d+\.?\d*)\]", tele_line)
-        alt_match = re.search(r"abs_alt:\s*([+-]?\d+\.?\d*)\]", tele_line)
-        if lat_match and lon_match and alt_match is None:
-            # Every documented bracket format carries abs_alt right after the
-            # coordinates, so its absence means the block was cut mid-write
-            # (drone powered off while flushing the final block). Drop the
-            # sample rather than fabricate alt=0.0. The GPS(...) compact form
-            # (no abs_alt token at all) takes the branch below instead.
+        if rec.lat is not None and rec.lon is not None:
+            if rec.abs_alt is None:
+                # Every documented bracket format carries abs_alt right after
+                # the coordinates, so its absence means the block was cut
+                # mid-write (drone powered off while flushing the final
+                # block). Drop the sample rather than fabricate alt=0.0. The
+                # GPS(...) compact form (no abs_alt token at all) takes the
+                # branch below instead.
+                continue
+            lat, lon, alt = rec.lat, rec.lon, rec.abs_alt
+        elif rec.gps is not None:
+            lat, lon, alt = rec.gps
+        else:
             continue
-        if not (lat_match and lon_match):
-            # Tolerate optional altitude unit suffix (M300 ``0.0M``) and an
-            # optional space before ``(`` used by the P4 RTK compact format.
-            gps = re.search(
-                r"GPS\s*\(([+-]?\d+\.?\d*),\s*([+-]?\d+\.?\d*),\s*([+-]?\d+\.?\d*)[A-Za-z]*\)",
-                tele_line,
-            )
-            if gps:
-                lat_match, lon_match = gps, gps
-                alt_match = gps
-        if lat_match and lon_match:
-            lat = float(lat_match.group(1))
-            lon = float(
-                lon_match.group(2)
-                if len(lon_match.groups()) > 1
-                else lon_match.group(1)
-            )
-            alt = float(
-                alt_match.group(3)
-                if alt_match and len(alt_match.groups()) > 1
-                else (alt_match.group(1) if alt_match else 0.0)
-            )
-            # Skip pre-GPS-lock ``(0, 0)`` no-fix frames so exported tracks do
-            # not include Null Island points.
-            if is_gps_fix(lat, lon):
-                samples.append(
-                    TelemetrySample(
-                        lat,
-                        lon,
-                        alt,
-                        timestamp,
-                        dt,
-                        rel_alt=rel_alt,
-                        focal_len=focal_len,
-                        gimbal_yaw=gimbal_yaw,
-                        gimbal_pitch=gimbal_pitch,
-                    )
-                )
-    return samples
+        # Skip pre-GPS-lock ``(0, 0)`` no-fix frames so exported tracks do
+        # not include Null Island points.
+        if not is_gps_fix(lat, lon):
+            continue
+        append(
+            lat,
+            lon,
+            alt,
+            rec.cue or "",
+            rec.dt,
+            rec.rel_alt,
+            _normalize_focal_len(rec.focal_len) if rec.focal_len is not None else None,
+            rec.gimbal_yaw,
+            rec.gimbal_pitch,
+        )
+    return frame
+
+
+def parse_telemetry_samples(srt_path: Path) -> List[TelemetrySample]:
+    """Parse an SRT file into :class:`TelemetrySample` records.
+
+    Row-object view of :func:`parse_telemetry_frame`.
+    """
+    return list(parse_telemetry_frame(srt_path))
 
 
 def load_samples(path: Path) -> List[TelemetrySample]:
     """Load telemetry samples from a DJI ``.SRT`` or a video (MP4/MOV) source.
 
     SRT files are parsed directly; videos are read via the ExifTool-backed
-    :mod:`dji_metadata_embedder.mp4_telemetry` extractor. Imported lazily to
-    avoid a module-load cycle (``mp4_telemetry`` imports from this module).
+    :mod:`dji_metadata_embedder.mp4_telemetry` extractor. Row view of
+    :func:`load_frame`, so it shares the telemetry cache.
     """
-    from .mp4_telemetry import extract_samples, is_video
+    return list(load_frame(path))
+
+
+def load_frame(path: Path) -> "TelemetryFrame":
+    """Columnar :func:`load_samples`: SRTs parse straight into columns; video
+    samples (one per second, so few) are packed after extraction.
+
+    When a telemetry cache is active (``--cache``), the frame is served from
+    it while the source file is unchanged. ``mp4_telemetry`` is imported
+    lazily to avoid a module-load cycle (it imports from this module).
+    """
+    from .mp4_telemetry import extract_samples, extractor_version, is_video
+    from .utils.cache import active_cache
 
     path = Path(path)
     if is_video(path):
-        return extract_samples(path)
-    return parse_telemetry_samples(path)
+        kind = "mp4"
+
+        def build() -> TelemetryFrame:
+            return TelemetryFrame.from_samples(extract_samples(path))
+
+    else:
+        kind = "srt"
+
+        def build() -> TelemetryFrame:
+            return parse_telemetry_frame(path)
+
+    cache = active_cache()
+    if cache is None:
+        return build()
+    version = extractor_version() if kind == "mp4" else PARSER_VERSION
+    return cache.fetch(
+        kind, path, version, build, TelemetryFrame.to_bytes, TelemetryFrame.from_bytes
+    )
 
 
 def parse_telemetry_points(srt_path: Path) -> List[Tuple[float, float, float, str]]:
@@ -299,15 +501,6 @@ class Home:
     alt: float | None = None
 
 
-# Two documented SRT variants (docs/SRT_FORMATS.md):
-#   HOME(39.906206,116.391400) D=5.2m H=1.5m            -> no space, no altitude
-#   HOME (-58.847509, -34.232707, -57.98m), D 698.70m,  -> space, altitude with trailing m
-_HOME_RE = re.compile(
-    r"HOME\s*\(\s*([+-]?\d+\.?\d*)\s*,\s*([+-]?\d+\.?\d*)"
-    r"(?:\s*,\s*([+-]?\d+\.?\d*)\s*m?)?\s*\)"
-)
-
-
 def parse_home(text: str) -> "Home | None":
     """Return the first HOME point in SRT *text*, or ``None``.
 
@@ -321,6 +514,19 @@ def parse_home(text: str) -> "Home | None":
     return Home(lat=float(m.group(1)), lon=float(m.group(2)), alt=alt)
 
 
+def read_home(srt_path: Path) -> "Home | None":
+    """Return the first HOME point in the SRT file at *srt_path*, or ``None``.
+
+    Streaming counterpart of :func:`parse_home`: HOME appears from the first
+    block on, so a file that has one is rarely read past its opening blocks.
+    """
+    for rec in read_srt_records(srt_path):
+        if rec.home is not None:
+            lat, lon, alt = rec.home
+            return Home(lat=lat, lon=lon, alt=alt)
+    return None
+
+
 def redact_home(home: "Home | None", mode: str) -> "Home | None":
     """Apply GPS redaction to a HOME point: ``drop`` -> ``None``; ``fuzz`` ->
     coordinates rounded to 3 decimals (~100 m); ``none`` -> unchanged."""
@@ -0,0 +1,278 @@
+"""Minimal ISO base media file format (MP4/MOV) structure reader.
+
+The questions the embedder, ``check`` and ``validate`` ask about a clip —
+how long is it, which tracks does it carry (is there a DJI ``djmd``/``dbgi``
+data track), where and when was it recorded — are all answered by a handful
+of small boxes inside ``moov``: ``mvhd`` (timescale, duration, creation
+time), each ``trak``'s ``hdlr`` (track kind) and ``stsd`` (codec fourcc),
+and ``udta``/``meta`` (``©xyz`` ISO 6709 location). This module seeks from
+box header to box header to find ``moov`` (which may sit after a multi-GB
+``mdat``), reads only that box, and walks it. Sample data is never read.
+
+Anything it does not understand raises :class:`BmffError`, and the caller
+(:func:`~dji_metadata_embedder.utils.media_probe.probe_media`) falls back to
+ffprobe.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO
+
+# Suffixes worth trying natively. DJI's .osv/.lrf are plain ISO BMFF.
+BMFF_SUFFIXES = frozenset({".mp4", ".mov", ".m4a", ".m4v", ".3gp", ".osv", ".lrf"})
+
+# Boxes a well-formed file may start with; anything else is not ISO BMFF.
+_FIRST_BOXES = frozenset(
+    {b"ftyp", b"styp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pdin", b"uuid"}
+)
+
+# A moov larger than this is not a structure we should slurp into memory
+# (multi-hour clips stay far below it); let ffprobe deal with it.
+_MAX_MOOV = 256 * 1024 * 1024
+
+# QuickTime/MP4 timestamps count seconds from 1904-01-01 UTC.
+_MAC_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+
+# hdlr handler_type -> ffprobe codec_type.
+_HANDLER_KINDS = {
+    "vide": "video",
+    "soun": "audio",
+    "sbtl": "subtitle",
+    "subt": "subtitle",
+    "text": "subtitle",
+    "clcp": "subtitle",
+}
+
+_LOCATION_KEY = b"com.apple.quicktime.location.ISO6709"
+
+
+class BmffError(ValueError):
+    """Raised when a file is not ISO BMFF or its ``moov`` cannot be parsed."""
+
+
+@dataclass(frozen=True, slots=True)
+class BmffTrack:
+    """One ``trak``: its handler fourcc and first sample-description fourcc."""
+
+    handler: str
+    codec_tag: str | None
+
+    @property
+    def kind(self) -> str:
+        """ffprobe-style ``codec_type`` (``video``/``audio``/``subtitle``/``data``)."""
+        return _HANDLER_KINDS.get(self.handler, "data")
+
+
+@dataclass(frozen=True, slots=True)
+class MovieInfo:
+    """What :func:`read_movie_info` found in ``moov``."""
+
+    duration: float | None
+    creation_time: datetime | None
+    location: str | None
+    tracks: tuple[BmffTrack, ...]
+
+
+def _fourcc(raw: bytes) -> str:
+    return raw.decode("latin-1")
+
+
+def _iter_boxes(buf: bytes, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """Yield ``(type, payload_start, box_end)`` for the boxes in ``buf[start:end]``."""
+    pos = start
+    while pos + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", buf, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                raise BmffError("truncated 64-bit box header")
+            (size,) = struct.unpack_from(">Q", buf, pos + 8)
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            raise BmffError(f"box {kind!r} overruns its parent")
+        yield kind, pos + header, pos + size
+        pos += size
+
+
+def _find(buf: bytes, start: int, end: int, kind: bytes) -> tuple[int, int] | None:
+    for k, s, e in _iter_boxes(buf, start, end):
+        if k == kind:
+            return s, e
+    return None
+
+
+def _top_level_boxes(f: BinaryIO, file_size: int) -> Iterator[tuple[bytes, int, int, bool]]:
+    """Yield ``(type, offset, size, open_ended)`` for each top-level box of *f*.
+
+    ``open_ended`` marks a size-0 box, which runs to the end of the file.
+    """
+    pos = 0
+    first = True
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        head = f.read(16)
+        if len(head) < 8:
+            break
+        size, kind = struct.unpack_from(">I4s", head)
+        if first and kind not in _FIRST_BOXES:
+            raise BmffError("not an ISO BMFF file")
+        first = False
+        header = 8
+        open_ended = size == 0
+        if size == 1:
+            if len(head) < 16:
+                raise BmffError("truncated 64-bit box header")
+            (size,) = struct.unpack_from(">Q", head, 8)
+            header = 16
+        elif open_ended:
+            size = file_size - pos
+        if size < header:
+            raise BmffError(f"invalid size for top-level box {kind!r}")
+        yield kind, pos, size, open_ended
+        pos += size
+
+
+def _read_moov(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        file_size = f.tell()
+        for kind, pos, size, _open_ended in _top_level_boxes(f, file_size):
+            if kind == b"moov":
+                if size > _MAX_MOOV or pos + size > file_size:
+                    raise BmffError("moov too large or truncated")
+                f.seek(pos)
+                return f.read(size)
+    raise BmffError("no moov box")
+
+
+def _mvhd(buf: bytes, start: int, end: int) -> tuple[float | None, datetime | None]:
+    version = buf[start]
+    if version == 1:
+        if start + 32 > end:
+            raise BmffError("truncated mvhd")
+        created, _mod, timescale, duration = struct.unpack_from(">QQIQ", buf, start + 4)
+    else:
+        if start + 20 > end:
+            raise BmffError("truncated mvhd")
+        created, _mod, timescale, duration = struct.unpack_from(">IIII", buf, start + 4)
+    seconds = duration / timescale if timescale and duration else None
+    # An all-ones duration means "unknown" (fragmented files).
+    if duration in (0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+        seconds = None
+    when = _MAC_EPOCH + timedelta(seconds=created) if created else None
+    return seconds, when
+
+
+def _track(buf: bytes, start: int, end: int) -> BmffTrack:
+    mdia = _find(buf, start, end, b"mdia")
+    if mdia is None:
+        raise BmffError("trak without mdia")
+    hdlr = _find(buf, *mdia, b"hdlr")
+    if hdlr is None or hdlr[0] + 12 > hdlr[1]:
+        raise BmffError("mdia without hdlr")
+    handler = _fourcc(buf[hdlr[0] + 8 : hdlr[0] + 12])
+    codec_tag = None
+    minf = _find(buf, *mdia, b"minf")
+    stbl = _find(buf, *minf, b"stbl") if minf else None
+    stsd = _find(buf, *stbl, b"stsd") if stbl else None
+    if stsd is not None and stsd[0] + 16 <= stsd[1]:
+        (count,) = struct.unpack_from(">I", buf, stsd[0] + 4)
+        if count:
+            codec_tag = _fourcc(buf[stsd[0] + 12 : stsd[0] + 16])
+    return BmffTrack(handler=handler, codec_tag=codec_tag)
+
+
+def _udta_string(buf: bytes, start: int, end: int) -> str | None:
+    """QuickTime international text: uint16 length, uint16 language, text."""
+    if start + 4 > end:
+        return None
+    (length,) = struct.unpack_from(">H", buf, start)
+    text = buf[start + 4 : min(start + 4 + length, end)]
+    return text.decode("utf-8", "replace").strip("\x00") or None
+
+
+def _ilst_data(buf: bytes, start: int, end: int) -> str | None:
+    data = _find(buf, start, end, b"data")
+    if data is None or data[0] + 8 > data[1]:
+        return None
+    return buf[data[0] + 8 : data[1]].decode("utf-8", "replace").strip("\x00") or None
+
+
+def _meta_location(buf: bytes, start: int, end: int) -> str | None:
+    """Location from a ``meta`` box: ``ilst/©xyz`` or the QuickTime
+    ``keys``-indexed ``com.apple.quicktime.location.ISO6709`` item."""
+    # ISO ``meta`` is a full box (4 zero bytes of version/flags before the
+    # children); QuickTime's is a plain container, whose first child header
+    # never has a zero size.
+    if buf[start : start + 4] == b"\x00\x00\x00\x00":
+        start += 4
+    keys_box = _find(buf, start, end, b"keys")
+    ilst = _find(buf, start, end, b"ilst")
+    if ilst is None:
+        return None
+    location_index = None
+    if keys_box is not None and keys_box[0] + 8 <= keys_box[1]:
+        (count,) = struct.unpack_from(">I", buf, keys_box[0] + 4)
+        pos = keys_box[0] + 8
+        for index in range(1, count + 1):
+            if pos + 8 > keys_box[1]:
+                break
+            (size,) = struct.unpack_from(">I", buf, pos)
+            if size < 8:
+                break
+            if buf[pos + 8 : pos + size] == _LOCATION_KEY:
+                location_index = index
+                break
+            pos += size
+    for kind, s, e in _iter_boxes(buf, *ilst):
+        if kind == b"\xa9xyz" or (
+            location_index is not None
+            and int.from_bytes(kind, "big") == location_index
+        ):
+            value = _ilst_data(buf, s, e)
+            if value:
+                return value
+    return None
+
+
+def read_movie_info(path: Path) -> MovieInfo:
+    """Read duration, creation time, location and tracks from *path*'s ``moov``.
+
+    Raises :class:`BmffError` when *path* is not ISO BMFF or its ``moov`` is
+    malformed, and ``OSError`` when it cannot be read.
+    """
+    moov = _read_moov(Path(path))
+    start = 16 if struct.unpack_from(">I", moov)[0] == 1 else 8
+    end = len(moov)
+    duration = creation_time = location = None
+    tracks: list[BmffTrack] = []
+    saw_mvhd = False
+    for kind, s, e in _iter_boxes(moov, start, end):
+        if kind == b"mvhd":
+            duration, creation_time = _mvhd(moov, s, e)
+            saw_mvhd = True
+        elif kind == b"trak":
+            tracks.append(_track(moov, s, e))
+        elif kind == b"udta":
+            for ukind, us, ue in _iter_boxes(moov, s, e):
+                if ukind == b"\xa9xyz" and location is None:
+                    location = _udta_string(moov, us, ue)
+                elif ukind == b"meta" and location is None:
+                    location = _meta_location(moov, us, ue)
+        elif kind == b"meta" and location is None:
+            location = _meta_location(moov, s, e)
+    if not saw_mvhd:
+        raise BmffError("moov without mvhd")
+    return MovieInfo(
+        duration=duration,
+        creation_time=creation_time,
+        location=location,
+        tracks=tuple(tracks),
+    )
@@ -0,0 +1,314 @@
+"""Opt-in persistent cache for parsed telemetry.
+
+Re-running ``flightmap``/``map`` over an unchanged archive re-tokenizes every
+SRT (and re-runs ExifTool over every MP4) even though nothing moved. With
+``--cache`` the parsed result of each source is stored in the per-user cache
+dir and reused while the source's identity is unchanged.
+
+An entry is keyed by a hash of ``(kind, resolved path, size, mtime_ns,
+version)``: editing, replacing or touching a file changes its key, and
+bumping the parser version (``srt_tokenizer.PARSER_VERSION``) or upgrading
+ExifTool orphans every older entry. Orphans are never read again and age out
+through the size-bounded eviction, which drops least-recently-used entries
+(a hit refreshes the entry's mtime) once the cache exceeds its budget.
+
+The cache is activated for a block with :func:`use_cache`; loaders such as
+:func:`~dji_metadata_embedder.utilities.load_frame` consult
+:func:`active_cache` and behave exactly as before when none is active.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import platform
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, TypedDict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CACHE_DIR_ENV = "DJIEMBED_CACHE_DIR"
+CACHE_MAX_MB_ENV = "DJIEMBED_CACHE_MAX_MB"
+
+# Default size budget. A parsed 20-minute clip is ~2 MB of columns, so this
+# holds a few hundred clips before the least recently used entries go.
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# After an insert pushes the cache over budget, evict down to this fraction so
+# the next few inserts do not each trigger another eviction pass.
+_EVICT_TO = 0.9
+
+_TMP_SUFFIX = ".tmp"
+
+
+def cache_dir() -> Path:
+    """Per-user directory for cached parse results.
+
+    ``DJIEMBED_CACHE_DIR`` overrides; otherwise the platform's cache location
+    (``%LOCALAPPDATA%``, ``~/Library/Caches``, ``$XDG_CACHE_HOME``), mirroring
+    :func:`~dji_metadata_embedder.utils.provision.tools_dir`.
+    """
+    env = os.environ.get(CACHE_DIR_ENV)
+    if env:
+        return Path(env)
+    system = platform.system()
+    if system == "Windows":
+        base = Path(os.environ.get("LOCALAPPDATA", str(Path.home() / "AppData" / "Local")))
+    elif system == "Darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", str(Path.home() / ".cache")))
+    return base / "dji-embed" / "telemetry"
+
+
+def cache_max_bytes() -> int:
+    """Size budget: ``DJIEMBED_CACHE_MAX_MB`` when a valid number, else the default."""
+    env = os.environ.get(CACHE_MAX_MB_ENV)
+    if env:
+        try:
+            return max(0, int(float(env) * 1024 * 1024))
+        except ValueError:
+            logger.warning("Ignoring invalid %s=%r", CACHE_MAX_MB_ENV, env)
+    return DEFAULT_MAX_BYTES
+
+
+class CacheStats(TypedDict):
+    """:meth:`TelemetryCache.stats`, as ``cache stats --format json`` prints it."""
+
+    path: str
+    entries: int
+    bytes: int
+    max_bytes: int
+
+
+class TelemetryCache:
+    """Content-keyed, size-bounded store of serialized parse results.
+
+    Thread-safe for the counters and eviction bookkeeping; entry files are
+    written to a temp name and ``os.replace``-d into place, so a concurrent
+    reader (or another process) never sees a partial entry. Unreadable or
+    corrupt entries count as misses and are rebuilt.
+    """
+
+    def __init__(self, root: Path | None = None, max_bytes: int | None = None):
+        self.root = Path(root) if root is not None else cache_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else cache_max_bytes()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size: int | None = None  # lazily scanned running total
+
+    # -- keys and entries ---------------------------------------------------
+
+    @staticmethod
+    def key(kind: str, path: Path, version: str) -> str | None:
+        """Entry key for *path*'s current identity, ``None`` if it cannot be stat-ed."""
+        try:
+            resolved = Path(path).resolve()
+            st = resolved.stat()
+        except OSError:
+            return None
+        ident = f"{kind}\0{resolved}\0{st.st_size}\0{st.st_mtime_ns}\0{version}"
+        return hashlib.sha256(ident.encode("utf-8", "surrogateescape")).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str) -> bytes | None:
+        """The stored bytes for *key*, refreshing its LRU position; ``None`` on miss."""
+        entry = self._entry(key)
+        try:
+            data = entry.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store *data* under *key* atomically, then evict if over budget."""
+        entry = self._entry(key)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}{_TMP_SUFFIX}")
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, entry)
+        except OSError as exc:
+            # A read-only or full cache dir must never fail the command.
+            logger.debug("Could not write cache entry %s: %s", entry, exc)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            over = self._size > self.max_bytes
+        if over:
+            self.prune(int(self.max_bytes * _EVICT_TO))
+
+    def fetch(
+        self,
+        kind: str,
+        path: Path,
+        version: str,
+        build: Callable[[], T],
+        dump: Callable[[T], bytes],
+        load: Callable[[bytes], T],
+    ) -> T:
+        """Return the cached result for *path*, or ``build()`` it and store it.
+
+        A result is only stored when *path* still has the identity it had
+        before ``build()`` ran, so a file rewritten mid-parse is not cached
+        under its old key.
+        """
+        key = self.key(kind, path, version)
+        if key is not None:
+            data = self.get(key)
+            if data is not None:
+                try:
+                    value = load(data)
+                except (ValueError, KeyError, TypeError, EOFError) as exc:
+                    logger.debug("Discarding corrupt cache entry for %s: %s", path, exc)
+                else:
+                    with self._lock:
+                        self.hits += 1
+                    return value
+        with self._lock:
+            self.misses += 1
+        value = build()
+        if key is not None and self.key(kind, path, version) == key:
+            self.put(key, dump(value))
+        return value
+
+    def merge_counts(self, hits: int, misses: int) -> None:
+        """Add hits and misses counted by another process's view of this cache."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    # -- maintenance --------------------------------------------------------
+
+    def _entries(self) -> Iterator[os.DirEntry[str]]:
+        try:
+            shards = list(os.scandir(self.root))
+        except OSError:
+            return
+        for shard in shards:
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            try:
+                with os.scandir(shard.path) as it:
+                    yield from (e for e in it if e.is_file(follow_symlinks=False))
+            except OSError:
+                continue
+
+    def _scan_size(self) -> int:
+        total = 0
+        for e in self._entries():
+            try:
+                total += e.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def stats(self) -> CacheStats:
+        """Entry count, total bytes, budget and location of the cache."""
+        entries = 0
+        total = 0
+        for e in self._entries():
+            if e.name.endswith(_TMP_SUFFIX):
+                continue
+            try:
+                total += e.stat().st_size
+            except OSError:
+                continue
+            entries += 1
+        return {
+            "path": str(self.root),
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+        }
+
+    def prune(self, max_bytes: int | None = None, older_than_s: float | None = None) -> int:
+        """Evict entries, oldest use first; return how many were removed.
+
+        Drops everything unused for *older_than_s* seconds (when given), then
+        least recently used entries until the total is at most *max_bytes*
+        (default: the cache's budget). Stray temp files from an interrupted
+        write are always removed.
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        cutoff = None if older_than_s is None else time.time() - older_than_s
+        found: list[tuple[float, int, str]] = []
+        removed = 0
+        for e in self._entries():
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            if e.name.endswith(_TMP_SUFFIX):
+                # Another writer's in-flight temp file, unless it is old
+                # enough to be left over from an interrupted run.
+                if st.st_mtime < time.time() - 3600:
+                    removed += _unlink(e.path)
+                continue
+            if cutoff is not None and st.st_mtime < cutoff:
+                removed += _unlink(e.path)
+                continue
+            found.append((st.st_mtime, st.st_size, e.path))
+        total = sum(size for _m, size, _p in found)
+        found.sort()
+        for _mtime, size, path in found:
+            if total <= budget:
+                break
+            if _unlink(path):
+                removed += 1
+                total -= size
+        with self._lock:
+            self._size = total
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry; return how many were removed."""
+        return self.prune(max_bytes=0)
+
+
+def _unlink(path: str) -> int:
+    try:
+        os.unlink(path)
+    except OSError:
+        return 0
+    return 1
+
+
+_active: TelemetryCache | None = None
+
+
+def active_cache() -> TelemetryCache | None:
+    """The cache loaders should consult, or ``None`` when caching is off."""
+    return _active
+
+
+@contextmanager
+def use_cache(cache: TelemetryCache | None) -> Iterator[TelemetryCache | None]:
+    """Make *cache* the active cache for the block (``None`` leaves it off)."""
+    global _active
+    previous = _active
+    _active = cache
+    try:
+        yield cache
+    finally:
+        _active = previous
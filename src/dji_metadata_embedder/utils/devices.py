@@ -0,0 +1,150 @@
+"""Per-device concurrency caps for the embed mux stage.
+
+``--jobs N`` runs N ffmpeg muxes at once. That suits an SSD, but against
+a spinning disk or an SD card reader the parallel streams make the head
+(or the card controller) seek between files, and the total throughput
+drops below what one mux achieves. :class:`DeviceSlots` groups muxes by
+the ``st_dev`` of every file they read or write and admits at most a
+device's cap at a time. A card reader can then run one mux while a fast
+NVMe output directory still takes N.
+
+Caps come from ``--device-jobs`` when given. Otherwise
+:func:`auto_device_cap` times a quick sequential read of a source clip on
+each device: a slow device gets 1, anything else the full ``--jobs``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# A quick read of this much of a clip tells a card reader from an SSD;
+# files smaller than _MIN_PROBE_BYTES time the syscall, not the device.
+_PROBE_BYTES = 16 * 1024 * 1024
+_MIN_PROBE_BYTES = 1024 * 1024
+
+# Below this sequential read rate (MB/s) a device gets one mux at a time:
+# SD cards and USB 2 readers; SATA/NVMe SSDs are far above it. Hard disks
+# read one stream at up to ~250 MB/s, so rotational devices use the higher
+# bar.
+SLOW_MBPS = 80.0
+ROTATIONAL_SLOW_MBPS = 300.0
+
+
+def device_id(path: Path) -> int | None:
+    """``st_dev`` of *path*, or of its nearest existing ancestor."""
+    for candidate in (Path(path), *Path(path).parents):
+        try:
+            return os.stat(candidate).st_dev
+        except OSError:
+            continue
+    return None
+
+
+def is_rotational(dev: int) -> bool | None:
+    """Whether the kernel reports *dev* as a spinning disk (Linux only)."""
+    if not hasattr(os, "major"):
+        return None
+    base = Path(f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}")
+    # Whole disks have queue/ themselves; partitions inherit their disk's.
+    for flag in (base / "queue" / "rotational", base / ".." / "queue" / "rotational"):
+        try:
+            return flag.read_text().strip() == "1"
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def read_throughput(sample: Path) -> float | None:
+    """Sequential read rate of *sample* in MB/s, or ``None`` if unreadable.
+
+    Reads up to 16 MiB from the middle of the file, after asking the OS to
+    drop it from the page cache so the number reflects the device. Files
+    under 1 MiB are too small to judge by and give ``None``.
+    """
+    try:
+        fd = os.open(sample, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError:
+        return None
+    try:
+        size = os.fstat(fd).st_size
+        length = min(size, _PROBE_BYTES)
+        if length < _MIN_PROBE_BYTES:
+            return None
+        offset = (size - length) // 2
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+        os.lseek(fd, offset, os.SEEK_SET)
+        started = time.perf_counter()
+        remaining = length
+        while remaining > 0:
+            chunk = os.read(fd, min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        elapsed = time.perf_counter() - started
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    read = length - remaining
+    if read <= 0 or elapsed <= 0:
+        return None
+    return read / elapsed / 1e6
+
+
+def auto_device_cap(dev: int, sample: Path | None, jobs: int) -> int:
+    """Default concurrent muxes for *dev*: 1 when it reads slowly, else *jobs*.
+
+    *sample* is a file on *dev* to time a read from (a source clip). A disk
+    the kernel flags as rotational is held to a higher bar, since a hard
+    disk streams one file quickly yet thrashes on several; virtual disks
+    often carry the flag too, so it is never enough on its own. Without a
+    usable sample (the output device, tiny files) there is no evidence and
+    the device gets *jobs*.
+    """
+    rate = read_throughput(sample) if sample is not None else None
+    rotational = is_rotational(dev)
+    logger.debug("device %s: %s MB/s, rotational=%s", dev, rate, rotational)
+    if rate is None:
+        return jobs
+    if rate < (ROTATIONAL_SLOW_MBPS if rotational else SLOW_MBPS):
+        return 1
+    return jobs
+
+
+class DeviceSlots:
+    """Admit at most ``caps[dev]`` concurrent holders per device.
+
+    Devices without a cap are unlimited. :meth:`hold` acquires every
+    device a job touches in ascending order, so jobs needing two devices
+    cannot deadlock each other.
+    """
+
+    def __init__(self, caps: dict[int, int]) -> None:
+        self.caps = dict(caps)
+        self._slots = {
+            dev: threading.BoundedSemaphore(max(1, cap)) for dev, cap in caps.items()
+        }
+
+    @contextmanager
+    def hold(self, paths: Iterable[Path]) -> Iterator[None]:
+        devices = sorted(
+            {dev for dev in map(device_id, paths) if dev in self._slots}
+        )
+        with ExitStack() as stack:
+            for dev in devices:
+                slot = self._slots[dev]
+                slot.acquire()
+                stack.callback(slot.release)
+            yield
@@ -1,20 +1,36 @@
-"""Shared ExifTool executable resolver.
+"""Shared ExifTool executable resolver and runner.
 
 A single place to resolve the ExifTool binary so every call site (MP4 timed
 metadata, the photomap scan, and any future consumer) agrees on the same
 semantics: ``DJIEMBED_EXIFTOOL_PATH`` when it points at a real file, else the
 copy provisioned by ``dji-embed doctor --install exiftool``, else ``exiftool``
 on ``PATH``.
+
+Every consumer runs ExifTool through :func:`call_exiftool`. By default that
+spawns one process per call, exactly like ``subprocess.run``. Inside
+:func:`pooled_exiftool` (or :func:`use_exiftool_pool`) the calls go to an
+:class:`ExifToolPool` of long-lived ``-stay_open True -@ -`` workers instead,
+so a batch over hundreds of clips or photos pays the Perl interpreter's
+start-up once per worker rather than once per file.
 """
 
 from __future__ import annotations
 
+import logging
 import os
+import platform
+import re
 import subprocess
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import IO, Iterator, Sequence
 
 from .provision import provisioned_exiftool
 
+logger = logging.getLogger(__name__)
+
 
 def exiftool_exe() -> str:
     """Resolve the ExifTool executable (env override → provisioned → PATH)."""
@@ -40,17 +56,296 @@ def exiftool_source() -> str:
 def exiftool_version(exe: str | None = None) -> str | None:
     """``-ver`` output of the resolved (or given) ExifTool, or ``None``."""
     try:
-        proc = subprocess.run(
-            [exe or exiftool_exe(), "-ver"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        if exe is None:
+            proc = call_exiftool(["-ver"], timeout=30)
+        else:
+            proc = subprocess.run(
+                [exe, "-ver"],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
     except (OSError, subprocess.SubprocessError):
         return None
     return proc.stdout.strip() or None
 
 
+# Seconds a worker gets to exit after ``-stay_open False`` before it is killed.
+_SHUTDOWN_TIMEOUT = 5.0
+
+
+class _Worker:
+    """One ``exiftool -stay_open True -@ -`` process.
+
+    Requests are written to its stdin as an argument file, one argument per
+    line, and terminated by ``-execute<id>``; ExifTool answers with the
+    command's stdout followed by ``{ready<id>}``. ``-echo4`` adds a matching
+    ``=<status>=post<id>`` marker on stderr (``${status}`` is the command's
+    exit status), so both streams are framed and a late message from one
+    request can never be attributed to the next.
+    """
+
+    def __init__(self, exe: str) -> None:
+        self.exe = exe
+        args = [exe, "-stay_open", "True", "-@", "-"]
+        if platform.system() == "Windows":
+            # Arguments arrive as UTF-8 text; tell ExifTool the file names
+            # among them are UTF-8 too, not the ANSI code page.
+            args += ["-common_args", "-charset", "filename=utf8"]
+        self.proc = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self._cond = threading.Condition()
+        self._out = bytearray()
+        self._err = bytearray()
+        self._open_streams = 2
+        self._seq = 0
+        for stream, buf in ((self.proc.stdout, self._out), (self.proc.stderr, self._err)):
+            threading.Thread(
+                target=self._pump, args=(stream, buf), daemon=True
+            ).start()
+
+    def _pump(self, stream: IO[bytes], buf: bytearray) -> None:
+        while True:
+            try:
+                chunk = stream.read1(65536)  # type: ignore[attr-defined]
+            except (OSError, ValueError):
+                chunk = b""
+            with self._cond:
+                if not chunk:
+                    self._open_streams -= 1
+                    self._cond.notify_all()
+                    return
+                buf += chunk
+                self._cond.notify_all()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def execute(
+        self, args: Sequence[str], timeout: float | None
+    ) -> subprocess.CompletedProcess[str]:
+        self._seq += 1
+        tag = str(self._seq)
+        ready = re.compile(rb"\{ready" + tag.encode() + rb"\}\r?\n")
+        post = re.compile(rb"=([^=\n]*)=post" + tag.encode() + rb"\r?\n")
+        request = "\n".join(
+            [*args, "-echo4", f"=${{status}}=post{tag}", f"-execute{tag}", ""]
+        )
+        cmd = [self.exe, *args]
+        try:
+            assert self.proc.stdin is not None
+            self.proc.stdin.write(request.encode("utf-8"))
+            self.proc.stdin.flush()
+        except OSError:
+            # The worker died between requests; report it like a crashed
+            # one-shot run so the caller's error handling applies.
+            self.kill()
+            return subprocess.CompletedProcess(cmd, 1, "", "ExifTool worker exited")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                done = ready.search(self._out)
+                match = post.search(self._err)
+                if (done and match) or self._open_streams < 2:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            exited = self._open_streams < 2
+            stdout = _decode(self._out[: done.start()] if done else self._out)
+            stderr = _decode(self._err[: match.start()] if match else self._err)
+            del self._out[:]
+            del self._err[:]
+        if not (done and match):
+            # Without a deadline the wait above only ends on a reply or exit.
+            if not exited and timeout is not None:
+                self.kill()
+                raise subprocess.TimeoutExpired(cmd, timeout, stdout, stderr)
+            # Crashed mid-request: whatever it printed, and its status.
+            return subprocess.CompletedProcess(
+                cmd, self.proc.wait() or 1, stdout, stderr
+            )
+        status = match.group(1)
+        if status.isdigit():
+            code = int(status)
+        else:
+            # ExifTool older than 12.10 echoes ${status} verbatim.
+            code = 1 if stderr.strip() else 0
+        return subprocess.CompletedProcess(cmd, code, stdout, stderr)
+
+    def close(self) -> None:
+        if self.alive:
+            try:
+                assert self.proc.stdin is not None
+                self.proc.stdin.write(b"-stay_open\nFalse\n")
+                self.proc.stdin.close()
+                self.proc.wait(timeout=_SHUTDOWN_TIMEOUT)
+            except (OSError, subprocess.TimeoutExpired):
+                self.kill()
+        else:
+            self.kill()
+
+    def kill(self) -> None:
+        try:
+            self.proc.kill()
+        except OSError:
+            pass
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout, self.proc.stderr):
+            try:
+                if stream is not None:
+                    stream.close()
+            except OSError:
+                pass
+
+
+def _decode(raw: bytes | bytearray) -> str:
+    return bytes(raw).decode("utf-8", "replace")
+
+
+class ExifToolPool:
+    """Up to *size* persistent ExifTool workers shared by concurrent callers.
+
+    Workers start lazily on first use, so a pool that is never asked for
+    anything costs nothing. A request that exceeds its timeout kills its
+    worker (a wedged ExifTool cannot be interrupted mid-command) and raises
+    ``subprocess.TimeoutExpired``; the next request starts a fresh worker.
+    A missing executable raises ``FileNotFoundError`` from the spawn, as a
+    one-shot run would.
+    """
+
+    def __init__(self, size: int = 1, exe: str | None = None) -> None:
+        self.size = max(1, size)
+        self._exe = exe
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle: list[_Worker] = []
+        self._workers: set[_Worker] = set()
+        self._closed = False
+
+    def _acquire(self) -> _Worker:
+        self._slots.acquire()
+        try:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("ExifToolPool is closed")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive:
+                        return worker
+                    self._workers.discard(worker)
+                    worker.kill()
+            worker = _Worker(self._exe or exiftool_exe())
+            with self._lock:
+                self._workers.add(worker)
+            logger.debug("Started ExifTool worker (pid %s)", worker.proc.pid)
+            return worker
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, worker: _Worker) -> None:
+        with self._lock:
+            if worker.alive and not self._closed:
+                self._idle.append(worker)
+            else:
+                self._workers.discard(worker)
+        self._slots.release()
+
+    def run(
+        self, args: Sequence[str], timeout: float | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        """Run one ExifTool command (arguments without the executable)."""
+        args = [str(a) for a in args]
+        if any("\n" in a or "\r" in a for a in args):
+            # The argument file is line-based; such an argument cannot be
+            # framed, so this one request runs as its own process.
+            return _run_once(args, timeout, self._exe)
+        worker = self._acquire()
+        try:
+            return worker.execute(args, timeout)
+        finally:
+            self._release(worker)
+
+    def close(self) -> None:
+        """Ask every worker to exit (``-stay_open False``); kill stragglers."""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+            self._idle.clear()
+        for worker in workers:
+            worker.close()
+
+    def __enter__(self) -> ExifToolPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+_active_pool: ExifToolPool | None = None
+
+
+def active_pool() -> ExifToolPool | None:
+    """The pool :func:`call_exiftool` routes to, or ``None`` (one-shot runs)."""
+    return _active_pool
+
+
+@contextmanager
+def use_exiftool_pool(pool: ExifToolPool | None) -> Iterator[ExifToolPool | None]:
+    """Make *pool* the active pool for the block (``None`` leaves it off)."""
+    global _active_pool
+    previous = _active_pool
+    _active_pool = pool
+    try:
+        yield pool
+    finally:
+        _active_pool = previous
+
+
+@contextmanager
+def pooled_exiftool(size: int = 1) -> Iterator[ExifToolPool]:
+    """Run the block's ExifTool calls on a fresh pool, shut down on exit."""
+    with ExifToolPool(size) as pool, use_exiftool_pool(pool):
+        yield pool
+
+
+def _run_once(
+    args: Sequence[str], timeout: float | None, exe: str | None = None
+) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [exe or exiftool_exe(), *args],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        timeout=timeout,
+    )
+
+
+def call_exiftool(
+    args: Sequence[str], timeout: float | None = None
+) -> subprocess.CompletedProcess[str]:
+    """Run ExifTool with *args* (no executable) and capture its output.
+
+    Behaves like ``subprocess.run(..., capture_output=True, text=True)``:
+    ``FileNotFoundError`` when ExifTool is missing, ``TimeoutExpired`` past
+    *timeout*, otherwise a ``CompletedProcess`` with the exit status. Uses
+    the active :class:`ExifToolPool` when there is one.
+    """
+    pool = _active_pool
+    if pool is not None:
+        return pool.run(args, timeout)
+    return _run_once(args, timeout)
+
+
 # Minimum ExifTool release that decodes DJI djmd/dbgi timed metadata at all.
 EXIFTOOL_BASELINE = "13.05"
 
@@ -0,0 +1,152 @@
+"""Run ffmpeg with live progress instead of waiting for it to exit.
+
+A remux of a 4 GB clip read over a USB card reader takes minutes, and a
+plain ``subprocess.run(..., capture_output=True)`` learns nothing until
+ffmpeg exits. :func:`run_ffmpeg` adds ``-progress pipe:1 -nostats``, so
+ffmpeg writes a ``key=value`` block to stdout about twice a second (ending
+in ``progress=continue`` or ``progress=end``). A reader thread parses each
+block as it arrives into a :class:`FfmpegProgress`, which gives the output
+time and bytes written plus the fraction, throughput and ETA derived from
+them. stderr goes to an unbuffered temporary file rather than memory, and
+only its tail is kept for the error message.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# How much of ffmpeg's stderr to keep for the error message.
+_STDERR_TAIL = 16 * 1024
+
+
+@dataclass(frozen=True)
+class FfmpegProgress:
+    """One ``-progress`` block: how far the output has got, and how fast."""
+
+    out_time: float  # seconds of media written
+    total_size: int  # bytes written to the output so far
+    elapsed: float  # wall seconds since ffmpeg started
+    duration: float | None  # source duration, when known
+    done: bool = False  # the final (progress=end) block
+
+    @property
+    def fraction(self) -> float | None:
+        """0..1 share of the source written, ``None`` without a duration."""
+        if self.done:
+            return 1.0
+        if not self.duration or self.duration <= 0:
+            return None
+        return min(1.0, max(0.0, self.out_time / self.duration))
+
+    @property
+    def bytes_per_s(self) -> float | None:
+        """Average output throughput so far."""
+        if self.elapsed <= 0:
+            return None
+        return self.total_size / self.elapsed
+
+    @property
+    def eta_s(self) -> float | None:
+        """Seconds left at the average rate so far, ``None`` until known."""
+        fraction = self.fraction
+        if fraction is None or fraction <= 0:
+            return None
+        return self.elapsed * (1.0 - fraction) / fraction
+
+
+def _parse_out_time(block: dict[str, str]) -> float:
+    # out_time_us is the precise field; out_time_ms is (despite its name)
+    # also microseconds in every ffmpeg release; out_time is HH:MM:SS.ffffff.
+    for key in ("out_time_us", "out_time_ms"):
+        raw = block.get(key, "")
+        if raw.lstrip("-").isdigit():
+            return max(0.0, int(raw) / 1_000_000)
+    raw = block.get("out_time", "")
+    try:
+        h, m, s = raw.split(":")
+        return max(0.0, int(h) * 3600 + int(m) * 60 + float(s))
+    except ValueError:
+        return 0.0
+
+
+def _pump(
+    fd: int,
+    started: float,
+    duration: float | None,
+    on_progress: Callable[[FfmpegProgress], None] | None,
+) -> None:
+    block: dict[str, str] = {}
+    with os.fdopen(fd, "r", encoding="utf-8", errors="replace") as stream:
+        for line in stream:
+            key, sep, value = line.strip().partition("=")
+            if not sep:
+                continue
+            block[key] = value
+            if key != "progress":
+                continue
+            if on_progress is not None:
+                size = block.get("total_size", "")
+                update = FfmpegProgress(
+                    out_time=_parse_out_time(block),
+                    total_size=int(size) if size.isdigit() else 0,
+                    elapsed=time.monotonic() - started,
+                    duration=duration,
+                    done=value == "end",
+                )
+                try:
+                    on_progress(update)
+                except Exception:  # a display problem must not stop the mux
+                    logger.debug("progress callback failed", exc_info=True)
+            block = {}
+
+
+def run_ffmpeg(
+    cmd: Sequence[str],
+    *,
+    duration: float | None = None,
+    on_progress: Callable[[FfmpegProgress], None] | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """Run the ffmpeg command *cmd*, reporting progress as it goes.
+
+    *cmd* is a complete ffmpeg invocation (executable first, output last);
+    the progress options are inserted after the executable. *duration* (the
+    source's, in seconds) turns output time into a fraction and an ETA.
+    Returns a ``CompletedProcess`` whose ``stderr`` is the tail of ffmpeg's
+    stderr; raises ``OSError`` when ffmpeg cannot be started. Without
+    *on_progress* nobody is listening, so *cmd* runs unchanged with its
+    output captured.
+    """
+    if on_progress is None:
+        return subprocess.run(list(cmd), capture_output=True, text=True)
+    full = [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+    read_fd, write_fd = os.pipe()
+    started = time.monotonic()
+    reader = threading.Thread(
+        target=_pump,
+        args=(read_fd, started, duration, on_progress),
+        daemon=True,
+    )
+    reader.start()
+    with tempfile.TemporaryFile() as err:
+        try:
+            result = subprocess.run(
+                full, stdin=subprocess.DEVNULL, stdout=write_fd, stderr=err
+            )
+        finally:
+            # ffmpeg's copy closed when it exited; closing ours ends the
+            # reader's stream.
+            os.close(write_fd)
+            reader.join()
+        err.seek(0, os.SEEK_END)
+        err.seek(max(0, err.tell() - _STDERR_TAIL))
+        tail = err.read().decode("utf-8", "replace")
+    return subprocess.CompletedProcess(full, result.returncode, "", tail)
@@ -0,0 +1,103 @@
+"""One-pass directory listing for companion-file lookups.
+
+Pairing a clip with its ``.SRT``, ``.m4a`` audio sidecar or ``.DAT`` log used
+to cost a ``stat`` (or a directory re-listing) per candidate name per clip,
+and video discovery globbed every extension in both cases. On a local disk
+that is noise; on a network share or an MTP-mounted card every one of those
+is a round trip, and re-listing the folder per clip is quadratic on a
+2,000-file card dump.
+
+:class:`DirectoryInventory` lists a directory once with :func:`os.scandir`
+and indexes the regular files by case-folded stem and suffix, so each later
+question is a dictionary lookup. Lookups prefer the exact spelling asked for
+and fall back to a case-insensitive match, and always return the name as it
+is actually written in the directory — cameras write ``.MP4``/``.SRT`` while
+other tools rewrite names lower-case, and an href or log line should carry
+the real spelling.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+
+class DirectoryInventory:
+    """The regular files directly inside *directory*, indexed for lookups.
+
+    Build one with :meth:`scan`. The listing is a snapshot: files created
+    afterwards are not seen, which is what a run pairing existing sources
+    wants.
+    """
+
+    def __init__(self, directory: Path, names: Iterable[str] = ()) -> None:
+        self.directory = Path(directory)
+        self._names: set[str] = set()
+        self._by_stem: dict[str, list[str]] = {}
+        self._by_suffix: dict[str, list[str]] = {}
+        for name in sorted(names):
+            stem, suffix = os.path.splitext(name)
+            self._names.add(name)
+            self._by_stem.setdefault(stem.casefold(), []).append(name)
+            self._by_suffix.setdefault(suffix.casefold(), []).append(name)
+
+    @classmethod
+    def scan(cls, directory: Path | str) -> DirectoryInventory:
+        """List *directory* once; raises ``OSError`` when it cannot be read."""
+        directory = Path(directory)
+        names = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    # DirEntry.is_file uses the type scandir already
+                    # returned; only symlinks cost a stat.
+                    if entry.is_file():
+                        names.append(entry.name)
+                except OSError:
+                    continue
+        return cls(directory, names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def files(self, suffixes: Iterable[str]) -> list[Path]:
+        """Files whose suffix is one of *suffixes* (any case), sorted."""
+        names: set[str] = set()
+        for suffix in suffixes:
+            names.update(self._by_suffix.get(suffix.casefold(), ()))
+        return sorted(self.directory / name for name in names)
+
+    def with_stem(self, stem: str) -> list[Path]:
+        """Every file whose stem equals *stem* case-insensitively, sorted."""
+        return [self.directory / n for n in self._by_stem.get(stem.casefold(), ())]
+
+    def companion(self, stem: str, suffixes: Sequence[str]) -> Path | None:
+        """The file named *stem* plus the first of *suffixes* that exists.
+
+        Exact spellings are tried in *suffixes* order first (``.srt`` before
+        ``.SRT`` when asked that way); then any file with the same stem and
+        suffix ignoring case, ranked by *suffixes* order.
+        """
+        for suffix in suffixes:
+            if stem + suffix in self._names:
+                return self.directory / (stem + suffix)
+        rank = {s.casefold(): i for i, s in reversed(list(enumerate(suffixes)))}
+        best: tuple[int, str] | None = None
+        for name in self._by_stem.get(stem.casefold(), ()):
+            r = rank.get(os.path.splitext(name)[1].casefold())
+            if r is not None and (best is None or (r, name) < best):
+                best = (r, name)
+        return self.directory / best[1] if best else None
+
+    def stem_prefixed(self, prefix: str, suffix: str) -> list[Path]:
+        """Files with *suffix* whose stem starts with *prefix*, ignoring case."""
+        folded = prefix.casefold()
+        return [
+            self.directory / name
+            for name in self._by_suffix.get(suffix.casefold(), ())
+            if os.path.splitext(name)[0].casefold().startswith(folded)
+        ]
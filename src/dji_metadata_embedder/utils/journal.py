@@ -0,0 +1,209 @@
+"""Completion journal that lets an interrupted ``embed`` run resume.
+
+Every clip ``embed`` finishes is a full ffmpeg remux, so a run over a
+300-clip folder that dies at clip 250 used to redo all 250 on the rerun.
+:class:`EmbedJournal` records each finished, validated output in
+``<output dir>/.dji-embed-journal.jsonl``. The record holds the identity of
+the source clip and of every companion that fed it (SRT, audio sidecar,
+DAT log), a digest of the options that shape the output, and the
+output's own size and mtime. A rerun skips a clip only when all of them
+still match, so an edited SRT, a re-copied card or a different
+``--redact`` redoes exactly the clips it affects.
+
+A file's identity is its size, mtime and a hash of its first and last
+64 KiB. The hash catches a same-size, mtime-preserving replacement, such as
+a card copied again with ``cp -p``, without reading the whole clip.
+
+The journal is append-only JSON Lines. A crash mid-append leaves at most
+one torn last line, which is ignored, and later records for a clip
+supersede earlier ones. It is compacted on open once it carries more
+superseded lines than live ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_NAME = ".dji-embed-journal.jsonl"
+
+# Bump when the embed pipeline's output for unchanged inputs and options
+# changes, so a rerun redoes outputs written by the older pipeline.
+OUTPUT_VERSION = "1"
+
+_EDGE_BYTES = 64 * 1024
+
+
+def file_identity(path: Path) -> dict[str, Any] | None:
+    """``{size, mtime_ns, edges}`` for *path*, or ``None`` if unreadable.
+
+    ``edges`` hashes the first and last 64 KiB (the whole file when it is
+    smaller than 128 KiB).
+    """
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            digest = hashlib.sha256()
+            digest.update(f.read(_EDGE_BYTES))
+            if st.st_size > 2 * _EDGE_BYTES:
+                f.seek(st.st_size - _EDGE_BYTES)
+                digest.update(f.read(_EDGE_BYTES))
+            else:
+                digest.update(f.read())
+    except OSError:
+        return None
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "edges": digest.hexdigest()[:32],
+    }
+
+
+def _stat_identity(path: Path) -> dict[str, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def input_identities(
+    inputs: Mapping[str, Path | None]
+) -> dict[str, dict[str, Any] | None]:
+    """:func:`file_identity` of every named input (``None`` stays ``None``)."""
+    return {
+        role: (file_identity(path) if path is not None else None)
+        for role, path in inputs.items()
+    }
+
+
+def options_digest(options: Mapping[str, Any]) -> str:
+    """Stable digest of the output-shaping options (plus OUTPUT_VERSION)."""
+    payload = json.dumps(
+        {"output_version": OUTPUT_VERSION, **options},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+class EmbedJournal:
+    """The completion journal of one output directory.
+
+    Thread-safe: concurrent ``embed --jobs`` workers record through one
+    instance.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.path = Path(directory) / JOURNAL_NAME
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._torn = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning("Cannot read embed journal %s: %s", self.path, e)
+            return
+        lines = text.splitlines()
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line of an interrupted append
+            if isinstance(entry, dict) and isinstance(entry.get("source"), str):
+                self._entries[entry["source"]] = entry
+        # Terminate a torn last line so the next record starts a line.
+        self._torn = bool(text) and not text.endswith("\n")
+        if len(lines) > 2 * len(self._entries) + 16:
+            self._compact()
+
+    def _compact(self) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(entry, sort_keys=True) + "\n")
+            os.replace(tmp, self.path)
+            self._torn = False
+        except OSError as e:
+            logger.debug("Could not compact %s: %s", self.path, e)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_current(
+        self,
+        source: Path,
+        output: Path,
+        identities: Mapping[str, Any],
+        options: str,
+    ) -> bool:
+        """Whether *output* is the recorded result of these exact inputs.
+
+        *identities* is :func:`input_identities` of every file that fed the
+        output (``video``, ``srt``, ``audio``, ``dat``), taken now.
+        """
+        with self._lock:
+            entry = self._entries.get(source.name)
+        return (
+            entry is not None
+            and entry.get("validated") is True
+            and entry.get("options") == options
+            and entry.get("output") == output.name
+            and entry.get("inputs") == dict(identities)
+            and _stat_identity(output) == entry.get("output_id")
+        )
+
+    def record(
+        self,
+        source: Path,
+        output: Path,
+        identities: Mapping[str, Any],
+        options: str,
+        *,
+        validated: bool = True,
+    ) -> None:
+        """Append the completion record for *source*.
+
+        *identities* are the inputs as they were when the clip was embedded
+        (for an in-place embed, ``video`` must be the embedded file's, since
+        that is what the source looks like from now on).
+        """
+        entry = {
+            "source": source.name,
+            "output": output.name,
+            "output_id": _stat_identity(output),
+            "inputs": dict(identities),
+            "options": options,
+            "validated": validated,
+            "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        line = json.dumps(entry, sort_keys=True) + "\n"
+        with self._lock:
+            self._entries[source.name] = entry
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n" + line if self._torn else line)
+                    self._torn = False
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                # Losing the journal only costs a redo on the next run.
+                logger.warning("Cannot update embed journal %s: %s", self.path, e)
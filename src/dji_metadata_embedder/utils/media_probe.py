@@ -0,0 +1,205 @@
+"""One memoized probe per media file.
+
+The embed pipeline used to ask ffprobe one question per spawn: the data-stream
+tags of the source, the durations of the source and its audio sidecar, then
+the durations of the output and (again) the source to validate the mux. Each
+spawn re-parses the whole container. :func:`probe_media` answers all of them
+from one probe and remembers it for as long as the file's identity (size,
+mtime, inode) is unchanged, so every later question about the same file in
+the run is a dictionary lookup.
+
+MP4-family files are first read natively (:mod:`.bmff` walks the ``moov``
+box headers, no subprocess); ffprobe's ``-show_format -show_streams`` JSON
+is the fallback for other containers and for anything the native reader
+cannot parse.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .bmff import BMFF_SUFFIXES, BmffError, read_movie_info
+
+logger = logging.getLogger(__name__)
+
+# DJI's proprietary per-frame telemetry/debug data streams (issue #478).
+DJI_DATA_TAGS = ("djmd", "dbgi")
+
+# Probes remembered per process. A run touches each file a handful of times
+# in close succession, so a small LRU bound is plenty.
+_MEMO_SIZE = 256
+
+_PROBE_TIMEOUT = 30
+
+
+@dataclass(frozen=True)
+class MediaProbe:
+    """ffprobe-shaped ``format`` and ``streams`` sections for one file.
+
+    ``source`` says who answered: ``"ffprobe"``, or ``"native"`` when the
+    BMFF reader did — then ``format`` carries only ``duration`` and the
+    ``location``/``creation_time`` tags, and each stream only its
+    ``codec_type`` and ``codec_tag_string``.
+    """
+
+    path: Path
+    format: dict[str, Any] = field(default_factory=dict)
+    streams: list[dict[str, Any]] = field(default_factory=list)
+    source: str = "ffprobe"
+
+    @property
+    def duration(self) -> float | None:
+        """Container duration in seconds, ``None`` when ffprobe reported none."""
+        raw = self.format.get("duration")
+        if raw is None or raw in ("", "N/A"):
+            return None
+        try:
+            return float(raw)
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def format_tags(self) -> dict[str, str]:
+        """Container-level metadata tags (``location``, ``creation_time``, ...)."""
+        tags = self.format.get("tags")
+        return tags if isinstance(tags, dict) else {}
+
+    def data_stream_tags(self) -> list[str]:
+        """DJI data-stream codec tags (``djmd``/``dbgi``), in stream order."""
+        return [
+            s["codec_tag_string"]
+            for s in self.streams
+            if s.get("codec_type", "data") == "data"
+            and s.get("codec_tag_string") in DJI_DATA_TAGS
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """The ffprobe JSON shape (``{"format": ..., "streams": [...]}``)."""
+        return {"format": self.format, "streams": self.streams}
+
+
+_memo: OrderedDict[tuple, MediaProbe | None] = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _identity(path: Path) -> tuple | None:
+    try:
+        resolved = path.resolve()
+        st = resolved.stat()
+    except OSError:
+        return None
+    return (str(resolved), st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def _native_probe(path: Path) -> MediaProbe | None:
+    """Probe an MP4-family file without a subprocess; ``None`` to fall back."""
+    if path.suffix.lower() not in BMFF_SUFFIXES:
+        return None
+    try:
+        info = read_movie_info(path)
+    except (OSError, BmffError) as exc:
+        logger.debug("Native probe of %s failed (%s); using ffprobe", path.name, exc)
+        return None
+    if info.duration is None:
+        # Fragmented or still-being-written files keep their duration in
+        # the fragments; ffprobe computes it from those.
+        return None
+    tags: dict[str, str] = {}
+    if info.creation_time is not None:
+        tags["creation_time"] = info.creation_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    if info.location is not None:
+        tags["location"] = info.location
+    fmt: dict[str, Any] = {"duration": f"{info.duration:.6f}"}
+    if tags:
+        fmt["tags"] = tags
+    streams = [
+        {
+            "index": i,
+            "codec_type": t.kind,
+            "codec_tag_string": t.codec_tag or "[0][0][0][0]",
+        }
+        for i, t in enumerate(info.tracks)
+    ]
+    return MediaProbe(path=path, format=fmt, streams=streams, source="native")
+
+
+def _run_ffprobe(path: Path) -> MediaProbe | None:
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_format", "-show_streams",
+                "-of", "json",
+                str(path),
+            ],
+            capture_output=True, text=True, timeout=_PROBE_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        payload = json.loads(result.stdout or "{}")
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    fmt = payload.get("format")
+    streams = payload.get("streams")
+    return MediaProbe(
+        path=path,
+        format=fmt if isinstance(fmt, dict) else {},
+        streams=[s for s in streams if isinstance(s, dict)]
+        if isinstance(streams, list)
+        else [],
+    )
+
+
+def probe_media(path: Path) -> MediaProbe | None:
+    """Probe *path* once per identity; ``None`` when it cannot be probed.
+
+    Native BMFF read first, ffprobe otherwise. ``None`` covers a missing
+    ffprobe, a timeout, an unreadable file and unparseable output alike —
+    every caller treats probing as best-effort. A file that cannot be
+    stat-ed is probed without memoizing.
+    """
+    path = Path(path)
+    key = _identity(path)
+    if key is not None:
+        with _memo_lock:
+            if key in _memo:
+                _memo.move_to_end(key)
+                return _memo[key]
+    probe = _native_probe(path)
+    if probe is None:
+        probe = _run_ffprobe(path)
+    if key is not None:
+        with _memo_lock:
+            _memo[key] = probe
+            _memo.move_to_end(key)
+            while len(_memo) > _MEMO_SIZE:
+                _memo.popitem(last=False)
+    logger.debug(
+        "probe %s: %s", path.name, probe.source if probe else "unreadable"
+    )
+    return probe
+
+
+def clear_probe_cache() -> None:
+    """Forget every memoized probe."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def media_duration(path: Path) -> float | None:
+    """Container duration of *path* in seconds, or ``None`` if unreadable."""
+    probe = probe_media(path)
+    return probe.duration if probe is not None else None
+
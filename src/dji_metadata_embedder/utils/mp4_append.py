@@ -0,0 +1,531 @@
+"""Append a telemetry subtitle track to an MP4 in place, without a remux.
+
+``embed --overwrite`` used to have ffmpeg copy the whole clip into a
+``.tmp`` sibling and rename it over the original. That costs twice the disk
+space and a full read plus write of a multi-GB file, all to add a few
+hundred KB of subtitle text and two metadata atoms. Nothing in the existing
+``mdat`` changes, so :func:`append_subtitle_track` leaves it alone. It
+appends the subtitle samples as a new ``mdat`` at the end of the file,
+followed by a rebuilt ``moov`` that adds a ``tx3g`` (mov_text) track and
+sets ``udta/©xyz`` and the ``mvhd`` creation time. Then it renames the old
+``moov`` to ``free``.
+
+Every step leaves a playable file. Until the rename the old ``moov`` comes
+first, and demuxers use the first ``moov`` they meet, so the appended bytes
+are inert trailing data. The rename itself is a four-byte write.
+:meth:`AppendedTrack.rollback` undoes the whole append byte for byte.
+
+Re-embedding a file this module already appended to (``--overwrite
+--force``) reuses the space instead of growing the file again. When the
+file ends in exactly that earlier append — our samples' ``mdat``, then the
+live ``moov`` — the ``free`` box holding the moov before it is renamed
+back to ``moov`` for the duration, the tail is overwritten with the new
+samples and moov, and the ``free`` rename is redone. A file that only ends
+in something else (another tool rewrote it since) is appended to as usual.
+
+Only plain (non-fragmented) ISO BMFF whose top-level boxes exactly tile
+the file is handled. Anything else raises :class:`~.bmff.BmffError` before
+a byte is written, and the caller remuxes with ffmpeg as before.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO
+
+from .bmff import (
+    _MAC_EPOCH,
+    _MAX_MOOV,
+    BMFF_SUFFIXES,
+    BmffError,
+    _find,
+    _iter_boxes,
+    _top_level_boxes,
+)
+
+# The subtitle track's media timescale: SRT cues are millisecond-precise.
+_TIMESCALE = 1000
+
+# Handler types of text tracks, and the title the embedder gives its own.
+_TEXT_HANDLERS = (b"sbtl", b"text", b"subt")
+TRACK_TITLE = "Telemetry Data"
+
+_IDENTITY_MATRIX = struct.pack(
+    ">9I", 0x00010000, 0, 0, 0, 0x00010000, 0, 0, 0, 0x40000000
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AppendedTrack:
+    """What :func:`append_subtitle_track` wrote, so it can be undone."""
+
+    path: Path
+    moov_offset: int  # where the old (now ``free``) moov starts
+    original_size: int  # file size before the append
+    samples: int  # subtitle samples written, gap fillers included
+    # The earlier append's samples and moov, when the new ones replaced
+    # them at the end of the file instead of following them.
+    reclaimed: bytes = b""
+
+    def rollback(self) -> None:
+        """Restore the file to exactly its pre-append bytes."""
+        with open(self.path, "r+b") as f:
+            _restore(f, self.moov_offset, self.original_size, self.reclaimed)
+
+
+def _sync(f: BinaryIO) -> None:
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _restore(f: BinaryIO, moov_offset: int, original_size: int, reclaimed: bytes) -> None:
+    # Old moov back first: from then on the file is valid again, whether or
+    # not the rest happens.
+    f.seek(moov_offset + 4)
+    f.write(b"moov")
+    _sync(f)
+    f.truncate(original_size - len(reclaimed))
+    if reclaimed:
+        # The earlier append's tail, live moov included, then the moov
+        # before it back to free space.
+        f.seek(original_size - len(reclaimed))
+        f.write(reclaimed)
+        _sync(f)
+        f.seek(moov_offset + 4)
+        f.write(b"free")
+        _sync(f)
+
+
+def _box(kind: bytes, *payload: bytes) -> bytes:
+    body = b"".join(payload)
+    return struct.pack(">I4s", 8 + len(body), kind) + body
+
+
+def _full_box(kind: bytes, version: int, flags: int, *payload: bytes) -> bytes:
+    return _box(kind, struct.pack(">I", (version << 24) | flags), *payload)
+
+
+def _language(code: str) -> int:
+    """ISO 639-2/T code packed into mdhd's three 5-bit letters."""
+    a, b, c = (ord(ch) - 0x60 for ch in code.lower())
+    return (a << 10) | (b << 5) | c
+
+
+def _locate_moov(f: BinaryIO) -> tuple[int, bytes, int, list[tuple[bytes, int, int]]]:
+    """``(offset, moov bytes, file size, top-level boxes)`` of an appendable file.
+
+    The boxes are ``(type, offset, size)`` in file order.
+    """
+    f.seek(0, 2)
+    file_size = f.tell()
+    moov_at = None
+    end = 0
+    boxes = []
+    for kind, pos, size, open_ended in _top_level_boxes(f, file_size):
+        boxes.append((kind, pos, size))
+        if open_ended:
+            # Appending after a box that runs to EOF would land inside it.
+            raise BmffError(f"open-ended top-level box {kind!r}")
+        if kind == b"moof":
+            raise BmffError("fragmented file")
+        if kind == b"moov":
+            if moov_at is not None:
+                raise BmffError("more than one moov")
+            moov_at = (pos, size)
+        end = pos + size
+    if moov_at is None:
+        raise BmffError("no moov box")
+    if end != file_size:
+        raise BmffError("trailing bytes after the last box")
+    pos, size = moov_at
+    if size > _MAX_MOOV:
+        raise BmffError("moov too large")
+    f.seek(pos)
+    return pos, f.read(size), file_size, boxes
+
+
+def _children_of(buf: bytes, start: int, end: int) -> list[tuple[bytes, int, int, int]]:
+    """``(type, box_start, payload_start, box_end)`` for the boxes in ``buf[start:end]``."""
+    children = []
+    box_start = start
+    for kind, s, e in _iter_boxes(buf, start, end):
+        children.append((kind, box_start, s, e))
+        box_start = e
+    return children
+
+
+def _children(moov: bytes) -> list[tuple[bytes, int, int, int]]:
+    start = 16 if struct.unpack_from(">I", moov)[0] == 1 else 8
+    return _children_of(moov, start, len(moov))
+
+
+def _track_id(buf: bytes, start: int, end: int) -> int:
+    tkhd = _find(buf, start, end, b"tkhd")
+    if tkhd is None:
+        return 0
+    at = tkhd[0] + (20 if buf[tkhd[0]] == 1 else 12)
+    return struct.unpack_from(">I", buf, at)[0] if at + 4 <= tkhd[1] else 0
+
+
+def _is_titled_text_track(buf: bytes, start: int, end: int, title: str) -> bool:
+    mdia = _find(buf, start, end, b"mdia")
+    hdlr = _find(buf, *mdia, b"hdlr") if mdia else None
+    if hdlr is None or buf[hdlr[0] + 8 : hdlr[0] + 12] not in _TEXT_HANDLERS:
+        return False
+    name = buf[hdlr[0] + 24 : hdlr[1]].rstrip(b"\0")
+    wanted = title.encode("utf-8")
+    # QuickTime writes the name as a Pascal string, MP4 as a C string.
+    return name == wanted or name[1:] == wanted
+
+
+def _titled_track_chunk(moov: bytes, title: str) -> tuple[int, int] | None:
+    """``(offset, size)`` of the single chunk of *moov*'s text track *title*."""
+    for kind, _b, s, e in _children(moov):
+        if kind != b"trak" or not _is_titled_text_track(moov, s, e, title):
+            continue
+        mdia = _find(moov, s, e, b"mdia")
+        minf = _find(moov, *mdia, b"minf") if mdia else None
+        stbl = _find(moov, *minf, b"stbl") if minf else None
+        if stbl is None:
+            return None
+        stsz = _find(moov, *stbl, b"stsz")
+        stco = _find(moov, *stbl, b"stco")
+        co64 = _find(moov, *stbl, b"co64")
+        if stsz is None or (stco is None and co64 is None):
+            return None
+        sample_size, count = struct.unpack_from(">II", moov, stsz[0] + 4)
+        if sample_size:
+            size = sample_size * count
+        else:
+            size = sum(struct.unpack_from(f">{count}I", moov, stsz[0] + 12))
+        if stco is not None:
+            chunks, offset = struct.unpack_from(">II", moov, stco[0] + 4)
+        elif co64 is not None:
+            chunks, offset = struct.unpack_from(">IQ", moov, co64[0] + 4)
+        return (offset, size) if chunks == 1 else None
+    return None
+
+
+def _previous_append(
+    f: BinaryIO, boxes: list[tuple[bytes, int, int]], moov: bytes, title: str
+) -> tuple[int, int] | None:
+    """``(free offset, tail offset)`` when the file ends in an earlier append.
+
+    That is: the live moov is the last box, right after an ``mdat`` holding
+    exactly its *title* track's samples, and a ``free`` box before them
+    holds a moov to keep the file playable while the tail is rewritten.
+    """
+    if len(boxes) < 3 or boxes[-1][0] != b"moov" or boxes[-2][0] != b"mdat":
+        return None
+    _kind, mdat_at, mdat_size = boxes[-2]
+    try:
+        chunk = _titled_track_chunk(moov, title)
+    except (BmffError, struct.error):
+        return None
+    if chunk != (mdat_at + 8, mdat_size - 8):
+        return None
+    for kind, pos, size in reversed(boxes[:-2]):
+        if kind != b"free" or size > _MAX_MOOV:
+            continue
+        f.seek(pos)
+        old = f.read(size)
+        try:
+            if any(k == b"mvhd" for k, *_ in _children(old)):
+                return pos, mdat_at
+        except (BmffError, struct.error):
+            continue
+    return None
+
+
+def _samples(
+    cues: Iterable[tuple[float, float, str]], limit_ms: int
+) -> tuple[list[bytes], list[int]]:
+    """tx3g samples and their durations (ms) for *cues*, gaps filled.
+
+    A text track's samples tile its timeline, so the time between cues is
+    an empty sample. Overlapping cues are clipped to the previous end and
+    everything is clipped to the movie's duration.
+    """
+    samples: list[bytes] = []
+    durations: list[int] = []
+    t = 0
+    for start, end, text in sorted(cues):
+        s = max(t, min(round(start * 1000), limit_ms))
+        e = min(round(end * 1000), limit_ms)
+        if e <= s:
+            continue
+        if s > t:
+            samples.append(b"\0\0")
+            durations.append(s - t)
+        data = text.encode("utf-8")[:0xFFFF].decode("utf-8", "ignore").encode("utf-8")
+        samples.append(struct.pack(">H", len(data)) + data)
+        durations.append(e - s)
+        t = e
+    return samples, durations
+
+
+def _tx3g_entry() -> bytes:
+    """mov_text sample description: bottom-centred white 18pt Serif."""
+    return _box(
+        b"tx3g",
+        b"\0" * 6,
+        struct.pack(">H", 1),  # data_reference_index
+        struct.pack(">I", 0),  # displayFlags
+        struct.pack(">bb", 1, -1),  # horizontal centre, vertical bottom
+        b"\0\0\0\0",  # background RGBA
+        b"\0" * 8,  # default text box
+        struct.pack(">HHHBB", 0, 0, 1, 0, 18),  # style: font 1, plain, 18pt
+        b"\xff\xff\xff\xff",  # text RGBA
+        _box(b"ftab", struct.pack(">HHB", 1, 1, 5), b"Serif"),
+    )
+
+
+def _text_trak(
+    track_id: int,
+    movie_timescale: int,
+    when: int,
+    samples: list[bytes],
+    durations: list[int],
+    data_offset: int,
+    title: str,
+    language: str,
+) -> bytes:
+    media_ms = sum(durations)
+    movie_units = media_ms * movie_timescale // _TIMESCALE
+    wide = max(when, movie_units, media_ms) > 0xFFFFFFFF
+    if wide:
+        tkhd_times = struct.pack(">QQIIQ", when, when, track_id, 0, movie_units)
+        mdhd_times = struct.pack(">QQIQ", when, when, _TIMESCALE, media_ms)
+    else:
+        tkhd_times = struct.pack(">IIIII", when, when, track_id, 0, movie_units)
+        mdhd_times = struct.pack(">IIII", when, when, _TIMESCALE, media_ms)
+    tkhd = _full_box(
+        b"tkhd", int(wide), 0x3,  # enabled, in movie
+        tkhd_times,
+        b"\0" * 8,  # reserved
+        struct.pack(">hhhH", 0, 0, 0, 0),  # layer, alternate group, volume
+        _IDENTITY_MATRIX,
+        struct.pack(">II", 0, 0),  # width, height
+    )
+    mdhd = _full_box(
+        b"mdhd", int(wide), 0, mdhd_times, struct.pack(">HH", _language(language), 0)
+    )
+    hdlr = _full_box(
+        b"hdlr", 0, 0,
+        b"\0" * 4, b"sbtl", b"\0" * 12, title.encode("utf-8") + b"\0",
+    )
+    runs: list[list[int]] = []
+    for d in durations:
+        if runs and runs[-1][1] == d:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, d])
+    stts = _full_box(
+        b"stts", 0, 0,
+        struct.pack(">I", len(runs)),
+        *(struct.pack(">II", n, d) for n, d in runs),
+    )
+    # One chunk holding every sample, at data_offset.
+    stsc = _full_box(b"stsc", 0, 0, struct.pack(">IIII", 1, 1, len(samples), 1))
+    stsz = _full_box(
+        b"stsz", 0, 0,
+        struct.pack(">II", 0, len(samples)),
+        *(struct.pack(">I", len(s)) for s in samples),
+    )
+    if data_offset + sum(map(len, samples)) > 0xFFFFFFFF:
+        chunk = _full_box(b"co64", 0, 0, struct.pack(">IQ", 1, data_offset))
+    else:
+        chunk = _full_box(b"stco", 0, 0, struct.pack(">II", 1, data_offset))
+    stsd = _full_box(b"stsd", 0, 0, struct.pack(">I", 1), _tx3g_entry())
+    dinf = _box(
+        b"dinf",
+        _full_box(b"dref", 0, 0, struct.pack(">I", 1), _full_box(b"url ", 0, 1)),
+    )
+    minf = _box(
+        b"minf",
+        _full_box(b"nmhd", 0, 0),
+        dinf,
+        _box(b"stbl", stsd, stts, stsc, stsz, chunk),
+    )
+    return _box(b"trak", tkhd, _box(b"mdia", mdhd, hdlr, minf))
+
+
+def _patched_mvhd(box: bytes, payload: int, when: int | None, next_id: int) -> bytes:
+    out = bytearray(box)
+    v1 = out[payload] == 1
+    if when is not None:
+        if v1:
+            struct.pack_into(">QQ", out, payload + 4, when, when)
+        else:
+            struct.pack_into(">II", out, payload + 4, when, when)
+    struct.pack_into(">I", out, payload + (108 if v1 else 96), next_id)
+    return bytes(out)
+
+
+def _xyz(location: str) -> bytes:
+    text = location.encode("utf-8")
+    return _box(b"\xa9xyz", struct.pack(">HH", len(text), _language("eng")), text)
+
+
+def _rebuild_moov(
+    moov: bytes,
+    cues: Iterable[tuple[float, float, str]],
+    data_offset: int,
+    location: str | None,
+    creation_time: datetime | None,
+    title: str,
+    language: str,
+) -> tuple[bytes, bytes, int]:
+    """New moov bytes, the sample payload, and the sample count."""
+    children = _children(moov)
+    if any(kind == b"mvex" for kind, *_ in children):
+        raise BmffError("fragmented file")
+    mvhd = next((c for c in children if c[0] == b"mvhd"), None)
+    if mvhd is None:
+        raise BmffError("moov without mvhd")
+    _kind, _box_start, p, e = mvhd
+    if moov[p] == 1:
+        timescale, duration = struct.unpack_from(">IQ", moov, p + 20)
+        id_at = p + 108
+    else:
+        timescale, duration = struct.unpack_from(">II", moov, p + 12)
+        id_at = p + 96
+    if id_at + 4 > e:
+        raise BmffError("truncated mvhd")
+    if not timescale or duration in (0, 0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+        raise BmffError("movie duration unknown")
+    (next_id,) = struct.unpack_from(">I", moov, id_at)
+
+    samples, durations = _samples(cues, duration * _TIMESCALE // timescale)
+    if not samples:
+        raise BmffError("no subtitle cues within the movie")
+    when = None
+    if creation_time is not None:
+        when = max(0, int((creation_time - _MAC_EPOCH).total_seconds()))
+    # A replaced track's ID is reused, so re-embedding rebuilds the same moov.
+    replaced = [
+        _track_id(moov, s, e)
+        for kind, _b, s, e in children
+        if kind == b"trak" and _is_titled_text_track(moov, s, e, title)
+    ]
+    track_id = replaced[0] if replaced and replaced[0] else max(
+        [next_id, 1]
+        + [_track_id(moov, s, e) + 1 for kind, _b, s, e in children if kind == b"trak"]
+    )
+    trak = _text_trak(
+        track_id, timescale, when or 0, samples, durations, data_offset, title, language
+    )
+
+    parts: list[bytes] = []
+    insert_at = 0
+    have_udta = False
+    for kind, b, s, e in children:
+        if kind == b"mvhd":
+            parts.append(
+                _patched_mvhd(moov[b:e], s - b, when, max(next_id, track_id + 1))
+            )
+        elif kind == b"trak":
+            if _is_titled_text_track(moov, s, e, title):
+                continue  # an earlier embed's track; this one replaces it
+            parts.append(moov[b:e])
+        elif kind == b"udta" and location is not None:
+            kept = [
+                moov[cb:ce]
+                for ck, cb, _cs, ce in _children_of(moov, s, e)
+                if ck != b"\xa9xyz"
+            ]
+            parts.append(_box(b"udta", _xyz(location), *kept))
+            have_udta = True
+        else:
+            parts.append(moov[b:e])
+        if kind in (b"mvhd", b"trak"):
+            insert_at = len(parts)
+    parts.insert(insert_at, trak)
+    if location is not None and not have_udta:
+        parts.append(_box(b"udta", _xyz(location)))
+    return _box(b"moov", *parts), b"".join(samples), len(samples)
+
+
+def can_append_in_place(path: Path) -> bool:
+    """Whether :func:`append_subtitle_track` can handle *path* (reads only)."""
+    path = Path(path)
+    if path.suffix.lower() not in BMFF_SUFFIXES:
+        return False
+    try:
+        with open(path, "rb") as f:
+            _pos, moov, _size, _boxes = _locate_moov(f)
+        children = _children(moov)
+    except (OSError, BmffError, struct.error):
+        return False
+    return any(k == b"mvhd" for k, *_ in children) and not any(
+        k == b"mvex" for k, *_ in children
+    )
+
+
+def append_subtitle_track(
+    path: Path,
+    cues: Iterable[tuple[float, float, str]],
+    *,
+    location: str | None = None,
+    creation_time: datetime | None = None,
+    title: str = TRACK_TITLE,
+    language: str = "eng",
+) -> AppendedTrack:
+    """Add *cues* as a mov_text track to the MP4 at *path*, in place.
+
+    *cues* are ``(start_s, end_s, text)``. *location* (ISO 6709, e.g.
+    ``+59.302335+018.203059/``) replaces ``udta/©xyz``; *creation_time*
+    (aware, or naive UTC) sets the ``mvhd`` creation and modification
+    times. A text track titled *title* from an earlier append is replaced,
+    not duplicated, and when the file still ends in that append its space
+    is reused.
+
+    Raises :class:`BmffError` (file unchanged) when *path* is not an
+    appendable MP4, and ``OSError`` on I/O failure, after restoring the
+    original bytes.
+    """
+    path = Path(path)
+    if creation_time is not None and creation_time.tzinfo is None:
+        creation_time = creation_time.replace(tzinfo=timezone.utc)
+    with open(path, "r+b") as f:
+        moov_offset, moov, file_size, boxes = _locate_moov(f)
+        previous = _previous_append(f, boxes, moov, title)
+        if previous is None:
+            free_offset, tail_at = moov_offset, file_size
+        else:
+            free_offset, tail_at = previous
+        try:
+            new_moov, payload, count = _rebuild_moov(
+                moov, cues, tail_at + 8, location, creation_time, title, language
+            )
+        except struct.error as e:
+            raise BmffError(f"malformed moov: {e}") from e
+        reclaimed = b""
+        if previous is not None:
+            f.seek(tail_at)
+            reclaimed = f.read(file_size - tail_at)
+        appended = AppendedTrack(path, free_offset, file_size, count, reclaimed)
+        try:
+            if previous is not None:
+                # The moov before the earlier append plays the file while
+                # its tail is rewritten.
+                f.seek(free_offset + 4)
+                f.write(b"moov")
+                _sync(f)
+                f.truncate(tail_at)
+            f.seek(tail_at)
+            f.write(_box(b"mdat", payload))
+            f.write(new_moov)
+            _sync(f)
+            f.seek(free_offset + 4)
+            f.write(b"free")
+            _sync(f)
+        except BaseException:
+            _restore(f, free_offset, file_size, reclaimed)
+            raise
+    return appended
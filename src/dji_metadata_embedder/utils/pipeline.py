@@ -0,0 +1,193 @@
+"""Staged pipeline with bounded queues and per-stage timings.
+
+Embedding a clip is three different kinds of work: probing and parsing
+(CPU, small reads), the ffmpeg mux (one big sequential read and write) and
+validation plus the JSON summary (small reads and writes). Run back to back
+per clip, the disk idles while the SRT parses and the CPU idles while
+ffmpeg streams. :func:`run_pipeline` gives each stage its own worker
+threads joined by bounded queues, so clip *n+1* parses while clip *n*
+muxes and clip *n-1* validates.
+
+Bounded queues provide the back-pressure: a stage that is ahead blocks on
+a full queue instead of piling up work (and, for the mux stage, temporary
+output files). :class:`StageStats` records, per stage, the time spent
+working, waiting for input and blocked on a full downstream queue. The
+bottleneck is the stage whose workers are busy while the others wait.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+_POLL = 0.1  # seconds between abort checks while blocked on a queue
+
+_STOP = object()
+
+
+class _Aborted(Exception):
+    """Another stage failed; unwind this worker quietly."""
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One pipeline stage: *fn* maps each item to the next stage's input.
+
+    *capacity* bounds the queue in front of the stage. *discard*, when
+    given, is called with each input the stage will not get to because the
+    pipeline stopped early — still queued, or finished upstream while it
+    was stopping — so whatever the item holds (a temp file) is released.
+    It must not raise.
+    """
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    capacity: int = 1
+    discard: Callable[[Any], None] | None = None
+
+
+@dataclass
+class StageStats:
+    """Where one stage's workers spent their time (seconds, summed)."""
+
+    name: str
+    workers: int
+    items: int = 0
+    busy_s: float = 0.0
+    wait_s: float = 0.0  # waiting for input
+    blocked_s: float = 0.0  # waiting for room downstream
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "busy_s": round(self.busy_s, 3),
+            "wait_s": round(self.wait_s, 3),
+            "blocked_s": round(self.blocked_s, 3),
+        }
+
+
+def _discard(stage: Stage, value: Any) -> None:
+    if stage.discard is not None:
+        stage.discard(value)
+
+
+def run_pipeline(
+    items: Sequence[Any], stages: Sequence[Stage]
+) -> tuple[list[Any], list[StageStats]]:
+    """Push *items* through *stages*; return the outputs in input order.
+
+    Items enter in order and a single-worker stage handles them in order.
+    The first exception raised by any stage stops the pipeline and is
+    re-raised here once every worker has finished its current item; items
+    that then go unhandled are passed to their stage's ``discard``.
+    """
+    queues: list[queue.Queue[Any]] = [
+        queue.Queue(maxsize=max(1, s.capacity)) for s in stages
+    ]
+    stats = [StageStats(s.name, s.workers) for s in stages]
+    stats_lock = threading.Lock()
+    results: list[Any] = [None] * len(items)
+    errors: list[BaseException] = []
+    abort = threading.Event()
+
+    def put(q: queue.Queue, value: Any) -> None:
+        while True:
+            if abort.is_set():
+                raise _Aborted
+            try:
+                q.put(value, timeout=_POLL)
+                return
+            except queue.Full:
+                continue
+
+    def get(q: queue.Queue) -> Any:
+        while True:
+            if abort.is_set():
+                raise _Aborted
+            try:
+                return q.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+
+    def worker(i: int) -> None:
+        stage, st = stages[i], stats[i]
+        last = i + 1 == len(stages)
+        try:
+            while True:
+                t0 = time.monotonic()
+                got = get(queues[i])
+                t1 = time.monotonic()
+                if got is _STOP:
+                    with stats_lock:
+                        st.wait_s += t1 - t0
+                    return
+                index, value = got
+                out = stage.fn(value)
+                t2 = time.monotonic()
+                if last:
+                    results[index] = out
+                else:
+                    try:
+                        put(queues[i + 1], (index, out))
+                    except _Aborted:
+                        _discard(stages[i + 1], out)
+                        raise
+                t3 = time.monotonic()
+                with stats_lock:
+                    st.items += 1
+                    st.wait_s += t1 - t0
+                    st.busy_s += t2 - t1
+                    st.blocked_s += t3 - t2
+        except _Aborted:
+            return
+        except BaseException as e:
+            with stats_lock:
+                errors.append(e)
+            abort.set()
+
+    threads = [
+        [
+            threading.Thread(target=worker, args=(i,), name=f"{s.name}-{n}", daemon=True)
+            for n in range(max(1, s.workers))
+        ]
+        for i, s in enumerate(stages)
+    ]
+    for group in threads:
+        for t in group:
+            t.start()
+    try:
+        for index, item in enumerate(items):
+            put(queues[0], (index, item))
+        for i, group in enumerate(threads):
+            for _ in group:
+                put(queues[i], _STOP)
+            for t in group:
+                t.join()
+    except _Aborted:
+        pass  # a worker failed; its error is raised below
+    except BaseException:
+        abort.set()
+        raise
+    finally:
+        for group in threads:
+            for t in group:
+                t.join()
+        # After an abort, items can be left between stages; with every
+        # worker gone, nothing else will take them.
+        for stage, q in zip(stages, queues):
+            while True:
+                try:
+                    got = q.get_nowait()
+                except queue.Empty:
+                    break
+                if got is not _STOP:
+                    _discard(stage, got[1])
+    if errors:
+        raise errors[0]
+    return results, stats
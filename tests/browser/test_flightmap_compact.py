@@ -0,0 +1,31 @@
+"""Compact flight payload (flightmap --compact) decoded in headless Chromium.
+
+The page must hand its renderers the same GeoJSON a plain map embeds, so
+playback and the 3D ghost/crossfade need no compact-aware code.
+"""
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dji_metadata_embedder.geo.flightmap import flights_to_geojson  # noqa: E402
+from dji_metadata_embedder.geo.flightmap_html import flights_to_html  # noqa: E402
+
+from tests.test_geo_flightmap_compact import TRACKS  # noqa: E402
+
+pytestmark = pytest.mark.browser
+
+
+def test_compact_page_sees_the_plain_geojson(serve_map, page):
+    serve_map(flights_to_html(TRACKS, "compact e2e", compact=True))
+    data = page.evaluate("() => data")
+    plain = flights_to_geojson(TRACKS)
+    assert "compact" not in data
+    for got, want in zip(data["features"], plain["features"]):
+        assert got["properties"] == want["properties"]
+        coords = got["geometry"]["coordinates"]
+        if want["geometry"]["type"] == "LineString":
+            assert len(coords) == len(want["geometry"]["coordinates"])
+            assert abs(coords[-1][0] - want["geometry"]["coordinates"][-1][0]) < 1e-6
+    # Playback picked the decoded times up like a plain map's.
+    assert page.evaluate("() => runs.length") == 1
@@ -0,0 +1,28 @@
+"""Track levels of detail (geo/flightmap_lod.py) swapped by zoom in headless Chromium.
+
+Probes read Leaflet's own polyline state, never pixels: zoomed out the
+track must be drawn from a level, zoomed in from the full latlngs, while
+playback keeps every fix throughout.
+"""
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dji_metadata_embedder.geo.flightmap_html import flights_to_html  # noqa: E402
+
+from tests.test_geo_flightmap_lod import _survey  # noqa: E402
+
+pytestmark = pytest.mark.browser
+
+_DRAWN = "() => lodLines[0].line.getLatLngs().length"
+
+
+def test_polyline_swaps_levels_by_zoom(serve_map, page):
+    serve_map(flights_to_html([_survey()], "lod e2e"))
+    page.wait_for_function("() => lodLines.length === 1")
+    page.evaluate("() => map.setZoom(8, { animate: false })")
+    assert page.evaluate(_DRAWN) == page.evaluate("() => lodLines[0].lod[0].idx.length")
+    page.evaluate("() => map.setZoom(19, { animate: false })")
+    assert page.evaluate(_DRAWN) == 1200
+    assert page.evaluate("() => runs[0].latlngs.length") == 1200
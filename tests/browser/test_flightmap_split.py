@@ -0,0 +1,44 @@
+"""Per-flight data files (flightmap --split-data) fetched in headless Chromium.
+
+The page embeds only the flight index; tracks in view must arrive from the
+``<stem>-data/`` folder, and playback must fetch a flight it has not loaded.
+"""
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dji_metadata_embedder.geo.flightmap_html import write_flights_html  # noqa: E402
+from dji_metadata_embedder.geo.flightmap_split import data_dir  # noqa: E402
+
+from tests.test_geo_flightmap_compact import _flight  # noqa: E402
+
+pytestmark = pytest.mark.browser
+
+
+def _split_page(tmp_path, stem, compact=False):
+    out = tmp_path / f"{stem}.html"
+    tracks = [_flight("A", 34.0), _flight("B", 34.01)]
+    write_flights_html(tracks, out, "split e2e", compact=compact, split_data=True)
+    files = {
+        f"{data_dir(out).name}/{p.name}": p.read_bytes()
+        for p in data_dir(out).iterdir()
+    }
+    return out.read_text(encoding="utf-8"), files
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_flights_in_view_are_fetched(serve_map, page, tmp_path, compact):
+    html, files = _split_page(tmp_path, f"split-view-{int(compact)}", compact)
+    serve_map(html, extra_files=files)
+    page.wait_for_function("() => runs.every(r => r.times && r.times.length > 1)")
+    assert page.evaluate("() => runs.map(r => r.times.length)") == [50, 50]
+    assert page.locator(".split-note").count() == 0
+
+
+def test_playback_shows_a_fetched_flight(serve_map, page, tmp_path):
+    html, files = _split_page(tmp_path, "split-play")
+    serve_map(html, extra_files=files)
+    page.select_option("#pb-flight", "1")
+    page.wait_for_function("() => runs[1].times && runs[1].marker")
+    assert page.evaluate("() => runs[1].times[runs[1].times.length - 1]") == 49.0
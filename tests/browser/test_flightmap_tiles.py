@@ -0,0 +1,41 @@
+"""Track tile pyramid viewer (flightmap -f tiles) in headless Chromium.
+
+The viewer must fetch the z/x/y tiles in view from the folder beside it,
+treat a missing tile as empty, and swap tiles as the zoom changes.
+"""
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from dji_metadata_embedder.geo.flightmap_tiles import (  # noqa: E402
+    tiles_dir,
+    write_flight_tiles,
+)
+
+from tests.test_geo_flightmap_compact import _flight  # noqa: E402
+
+pytestmark = pytest.mark.browser
+
+
+def test_tiles_in_view_are_fetched_and_swapped(serve_map, page, tmp_path):
+    out = tmp_path / "tiles-e2e.html"
+    write_flight_tiles([_flight("A", 34.0), _flight("B", 34.01)], out, "tiles e2e")
+    root = tiles_dir(out)
+    files = {
+        f"{root.name}/{p.relative_to(root).as_posix()}": p.read_bytes()
+        for p in root.rglob("*.json")
+    }
+    serve_map(out.read_text(encoding="utf-8"), extra_files=files)
+    page.wait_for_function("() => [...tileLayers.values()].some(t => t.layer)")
+    zoom = page.evaluate("() => Math.floor(map.getZoom())")
+    assert all(
+        key.startswith(f"{min(zoom, 14)}/")
+        for key in page.evaluate("() => [...tileLayers.keys()]")
+    )
+    page.evaluate("() => map.setZoom(3, { animate: false })")
+    page.wait_for_function(
+        "() => [...tileLayers.keys()].every(k => k.startsWith('3/'))"
+        " && [...tileLayers.values()].some(t => t.layer)"
+    )
+    assert page.locator(".tiles-note").count() == 0
@@ -66,3 +66,23 @@ def test_popup_thumbnail_stays_inside_the_popup_box(serve_map, page):
     )
     assert boxes["img"]["right"] <= boxes["box"]["right"] + 1
     assert boxes["img"]["width"] > 100  # the image really rendered wide
+
+
+def test_thumb_dir_thumbnail_loads_when_the_popup_opens(serve_map, page, tmp_path):
+    from pathlib import PurePosixPath
+
+    from dji_metadata_embedder.geo.photomap_html import write_photos_html
+
+    out = tmp_path / "thumbs-e2e.html"
+    write_photos_html(POINTS, out, "thumb dir e2e", thumb_dir=PurePosixPath("thumbs"))
+    files = {f"thumbs/{p.name}": p.read_bytes() for p in (tmp_path / "thumbs").iterdir()}
+    requested = []
+    page.on("request", lambda r: requested.append(r.url))
+    serve_map(out.read_text(encoding="utf-8"), extra_files=files)
+    assert not any("/thumbs/" in url for url in requested)   # nothing up front
+    page.locator(PIN).first.click()
+    page.wait_for_function(
+        "() => { const i = document.querySelector('.leaflet-popup-content img');"
+        " return i && i.complete && i.naturalWidth === 240; }"
+    )
+    assert page.locator(POPUP_IMG).get_attribute("src").startswith("thumbs/")
@@ -137,7 +137,7 @@ def _make_run_capture(captured: list, durations: dict | None = None):
         if cmd and "ffprobe" in str(cmd[0]).lower():
             name = Path(cmd[-1]).name
             value = durations.get(name, 10.0)
-            return type("R", (), {"returncode": 0, "stdout": f"{value}\n", "stderr": ""})()
+            return type("R", (), {"returncode": 0, "stdout": f'{{"format": {{"duration": "{value}"}}}}', "stderr": ""})()
         return ok
 
     return fake_run
@@ -0,0 +1,154 @@
+"""Native ISO-BMFF structure reader (utils/bmff.py) and its probe fallback."""
+
+import struct
+import subprocess
+from datetime import datetime, timezone
+
+import pytest
+
+from dji_metadata_embedder.embedder import _dji_data_stream_tags, _ffprobe_duration
+from dji_metadata_embedder.metadata_check import check_file
+from dji_metadata_embedder.utils.bmff import BmffError, read_movie_info
+from dji_metadata_embedder.utils.media_probe import probe_media
+
+# 2024-01-01T12:00:00Z in seconds since 1904-01-01.
+CREATED = int(
+    (datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+     - datetime(1904, 1, 1, tzinfo=timezone.utc)).total_seconds()
+)
+
+
+def box(kind: bytes, payload: bytes = b"") -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def mvhd(duration: int, timescale: int = 1000, version: int = 0) -> bytes:
+    if version == 1:
+        body = struct.pack(">QQIQ", CREATED, CREATED, timescale, duration)
+    else:
+        body = struct.pack(">IIII", CREATED, CREATED, timescale, duration)
+    return box(b"mvhd", bytes([version, 0, 0, 0]) + body + b"\0" * 80)
+
+
+def trak(handler: bytes, codec: bytes) -> bytes:
+    hdlr = box(b"hdlr", b"\0" * 8 + handler + b"\0" * 13)
+    stsd = box(b"stsd", b"\0" * 4 + struct.pack(">I", 1) + box(codec, b"\0" * 8))
+    return box(b"trak", box(b"mdia", hdlr + box(b"minf", box(b"stbl", stsd))))
+
+
+def udta_xyz(value: str) -> bytes:
+    text = value.encode()
+    return box(b"udta", box(b"\xa9xyz", struct.pack(">HH", len(text), 0x15C7) + text))
+
+
+def movie(*children: bytes, mdat_first: bool = True) -> bytes:
+    ftyp = box(b"ftyp", b"isom\0\0\2\0isomiso2mp41")
+    mdat = box(b"mdat", b"\0" * 4096)
+    moov = box(b"moov", b"".join(children))
+    return ftyp + (mdat + moov if mdat_first else moov + mdat)
+
+
+DJI_CLIP = movie(
+    mvhd(12_500),
+    trak(b"vide", b"hvc1"),
+    trak(b"soun", b"mp4a"),
+    trak(b"meta", b"djmd"),
+    trak(b"meta", b"dbgi"),
+    udta_xyz("+53.3651+006.4607+005.4/"),
+)
+
+
+def _no_subprocess(monkeypatch):
+    def fail(*a, **k):
+        raise AssertionError(f"unexpected subprocess: {a}")
+
+    monkeypatch.setattr(subprocess, "run", fail)
+
+
+def test_reads_duration_tracks_location_and_creation_time(tmp_path):
+    clip = tmp_path / "DJI_0001.MP4"
+    clip.write_bytes(DJI_CLIP)
+    info = read_movie_info(clip)
+    assert info.duration == 12.5
+    assert info.creation_time == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    assert info.location == "+53.3651+006.4607+005.4/"
+    assert [(t.kind, t.codec_tag) for t in info.tracks] == [
+        ("video", "hvc1"),
+        ("audio", "mp4a"),
+        ("data", "djmd"),
+        ("data", "dbgi"),
+    ]
+
+
+def test_version1_mvhd_and_moov_before_mdat(tmp_path):
+    clip = tmp_path / "clip.mov"
+    clip.write_bytes(movie(mvhd(90_000 * 3, 90_000, version=1), mdat_first=False))
+    info = read_movie_info(clip)
+    assert info.duration == 3.0 and info.tracks == ()
+
+
+def test_quicktime_keys_location(tmp_path):
+    key = b"com.apple.quicktime.location.ISO6709"
+    keys = box(b"keys", b"\0" * 4 + struct.pack(">I", 1) + box(b"mdta", key))
+    item = box(struct.pack(">I", 1), box(b"data", b"\0\0\0\1\0\0\0\0+10.0000+020.0000/"))
+    meta = box(b"meta", box(b"hdlr", b"\0" * 8 + b"mdta" + b"\0" * 13) + keys + box(b"ilst", item))
+    clip = tmp_path / "clip.mov"
+    clip.write_bytes(movie(mvhd(1000), meta))
+    assert read_movie_info(clip).location == "+10.0000+020.0000/"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"fake mp4 content here", b"x", movie(trak(b"vide", b"avc1"))],
+)
+def test_non_bmff_or_malformed_raises(tmp_path, data):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(data)
+    with pytest.raises(BmffError):
+        read_movie_info(clip)
+
+
+def test_probe_answers_natively_without_ffprobe(tmp_path, monkeypatch):
+    clip = tmp_path / "DJI_0001.MP4"
+    clip.write_bytes(DJI_CLIP)
+    _no_subprocess(monkeypatch)
+    probe = probe_media(clip)
+    assert probe is not None and probe.source == "native"
+    assert _ffprobe_duration(clip) == 12.5
+    assert _dji_data_stream_tags(clip) == ["djmd", "dbgi"]
+    assert probe.format_tags == {
+        "creation_time": "2024-01-01T12:00:00.000000Z",
+        "location": "+53.3651+006.4607+005.4/",
+    }
+
+
+def test_check_file_reads_structure_natively(tmp_path, monkeypatch):
+    from dji_metadata_embedder import metadata_check
+
+    clip = tmp_path / "DJI_0001.MP4"
+    clip.write_bytes(DJI_CLIP)
+    monkeypatch.setattr(metadata_check, "run_exiftool", lambda p: None)
+    _no_subprocess(monkeypatch)
+    assert check_file(clip) == {
+        "gps": True,
+        "altitude": False,
+        "creation_time": True,
+        "embedded_telemetry": True,
+    }
+
+
+def test_unknown_duration_falls_back_to_ffprobe(tmp_path, monkeypatch):
+    clip = tmp_path / "frag.mp4"
+    clip.write_bytes(movie(mvhd(0)))
+    calls = []
+
+    def run(cmd, *a, **k):
+        calls.append(cmd)
+        return type(
+            "R", (), {"returncode": 0, "stdout": '{"format": {"duration": "4.0"}}', "stderr": ""}
+        )()
+
+    monkeypatch.setattr(subprocess, "run", run)
+    probe = probe_media(clip)
+    assert probe.source == "ffprobe" and probe.duration == 4.0
+    assert len(calls) == 1
@@ -0,0 +1,132 @@
+"""Opt-in persistent telemetry cache (utils/cache.py, ``--cache``)."""
+
+import json
+import os
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.telemetry_converter import load_gps_points
+from dji_metadata_embedder.utilities import TelemetryFrame, load_frame, parse_telemetry_frame
+from dji_metadata_embedder.utils.cache import TelemetryCache, use_cache
+
+SAMPLES = Path(__file__).resolve().parents[1] / "samples"
+
+FLIGHT = (
+    "1\n00:00:00,000 --> 00:00:01,000\n"
+    '<font size="28">2024-05-01 10:00:00.000\n'
+    "[latitude: 10.0] [longitude: 20.0] [rel_alt: 1.000 abs_alt: 5.0]</font>\n\n"
+    "2\n00:00:01,000 --> 00:00:02,000\n"
+    '<font size="28">2024-05-01 10:00:01.000\n'
+    "[latitude: 10.001] [longitude: 20.001] [rel_alt: 1.000 abs_alt: 6.0]</font>\n"
+)
+
+
+def _bump_mtime(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_frame_bytes_round_trip():
+    for srt in sorted(SAMPLES.rglob("*.SRT")):
+        frame = parse_telemetry_frame(srt)
+        again = TelemetryFrame.from_bytes(frame.to_bytes())
+        assert list(again) == list(frame), srt
+
+
+def test_hit_after_miss_and_invalidation(tmp_path):
+    srt = tmp_path / "DJI_0001.SRT"
+    srt.write_text(FLIGHT, encoding="utf-8")
+    cache = TelemetryCache(tmp_path / "cache")
+    with use_cache(cache):
+        first = list(load_frame(srt))
+        second = list(load_frame(srt))
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert first == second and len(first) == 2
+
+        _bump_mtime(srt)
+        load_frame(srt)
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        srt.write_text(FLIGHT.split("\n\n")[0] + "\n", encoding="utf-8")
+        assert len(load_frame(srt)) == 1
+        assert cache.misses == 3
+
+
+def test_no_active_cache_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.setenv("DJIEMBED_CACHE_DIR", str(tmp_path / "cache"))
+    srt = tmp_path / "DJI_0001.SRT"
+    srt.write_text(FLIGHT, encoding="utf-8")
+    load_frame(srt)
+    assert not (tmp_path / "cache").exists()
+
+
+def test_gps_points_namespace_round_trips(tmp_path):
+    srt = tmp_path / "DJI_0001.SRT"
+    srt.write_text(FLIGHT, encoding="utf-8")
+    expected = load_gps_points(srt)
+    cache = TelemetryCache(tmp_path / "cache")
+    with use_cache(cache):
+        assert load_gps_points(srt) == expected
+        assert load_gps_points(srt) == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    srt = tmp_path / "DJI_0001.SRT"
+    srt.write_text(FLIGHT, encoding="utf-8")
+    cache = TelemetryCache(tmp_path / "cache")
+    with use_cache(cache):
+        load_frame(srt)
+    for entry in (tmp_path / "cache").rglob("*"):
+        if entry.is_file():
+            entry.write_bytes(b"garbage")
+    with use_cache(cache):
+        assert len(load_frame(srt)) == 2
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_eviction_keeps_most_recently_used(tmp_path):
+    cache = TelemetryCache(tmp_path / "cache", max_bytes=2500)
+    cache.put("aa" + "0" * 62, b"x" * 1000)
+    cache.put("bb" + "0" * 62, b"x" * 1000)
+    old = tmp_path / "cache" / "aa" / ("aa" + "0" * 62)
+    os.utime(old, (1, 1))
+    cache.put("cc" + "0" * 62, b"x" * 1000)
+    assert cache.get("aa" + "0" * 62) is None
+    assert cache.get("bb" + "0" * 62) is not None
+    assert cache.get("cc" + "0" * 62) is not None
+    assert cache.stats()["bytes"] <= 2500
+
+
+def test_flightmap_cache_counters_and_cli(tmp_path, monkeypatch):
+    monkeypatch.setenv("DJIEMBED_CACHE_DIR", str(tmp_path / "cache"))
+    src = tmp_path / "flights"
+    src.mkdir()
+    (src / "DJI_0001.SRT").write_text(FLIGHT, encoding="utf-8")
+    (src / "DJI_0002.SRT").write_text(FLIGHT.replace("10.0", "11.0"), encoding="utf-8")
+    runner = CliRunner()
+
+    def summary() -> dict:
+        res = runner.invoke(
+            main, ["flightmap", str(src), "--cache", "--progress", "jsonl"]
+        )
+        assert res.exit_code == 0, res.output
+        return json.loads(res.stdout.splitlines()[-1])["summary"]
+
+    assert summary()["cache_misses"] == 2
+    html = (src / "flightmap.html").read_bytes()
+    again = summary()
+    assert (again["cache_hits"], again["cache_misses"]) == (2, 0)
+    assert (src / "flightmap.html").read_bytes() == html
+
+    res = runner.invoke(main, ["cache", "stats", "--format", "json"])
+    assert res.exit_code == 0, res.output
+    assert json.loads(res.output)["entries"] == 2
+
+    res = runner.invoke(main, ["cache", "clear"])
+    assert res.exit_code == 0 and "Removed 2 entries" in res.output
+    assert json.loads(
+        runner.invoke(main, ["cache", "stats", "--format", "json"]).output
+    )["entries"] == 0
@@ -39,6 +39,37 @@ def test_convert_html_cli(tmp_path):
     assert "leaflet@1.9.4" in text
 
 
+def test_convert_simplify_thins_the_track(tmp_path):
+    full, thin = tmp_path / "full.geojson", tmp_path / "thin.geojson"
+    runner = CliRunner()
+    for out, extra in ((full, []), (thin, ["--simplify", "5"])):
+        result = runner.invoke(
+            main, ["convert", "geojson", str(CLIP), "-o", str(out), *extra]
+        )
+        assert result.exit_code == 0, result.output
+
+    def coords(path):
+        features = json.loads(path.read_text())["features"]
+        return next(
+            f["geometry"]["coordinates"]
+            for f in features
+            if f["geometry"]["type"] == "LineString"
+        )
+
+    assert 2 <= len(coords(thin)) < len(coords(full))
+    assert coords(thin)[0] == coords(full)[0]
+    assert coords(thin)[-1] == coords(full)[-1]
+
+
+def test_convert_simplify_rejects_point_formats(tmp_path):
+    result = CliRunner().invoke(
+        main, ["convert", "gpx", str(CLIP), "-o", str(tmp_path / "c.gpx"),
+               "--simplify", "5"]
+    )
+    assert result.exit_code != 0
+    assert "--simplify" in result.output
+
+
 def test_convert_html_redact_drop_still_valid(tmp_path):
     out = tmp_path / "clip.html"
     runner = CliRunner()
@@ -427,3 +427,18 @@ def test_flightmap_flight_log_bad_export_fails_loudly(tmp_path):
     ])
     assert res.exit_code != 0
     assert "gimbal" in res.output.lower()
+
+
+def test_flightmap_jobs_parses_in_worker_processes(tmp_path):
+    _folder(tmp_path, {
+        "DJI_0001.SRT": FLIGHT_A, "DJI_0002.SRT": FLIGHT_B, "movie.srt": NOT_TELEMETRY,
+    })
+    res = CliRunner().invoke(
+        main, ["flightmap", str(tmp_path), "-f", "geojson", "--jobs", "2"]
+    )
+    assert res.exit_code == 0, res.output
+    assert "Mapped 2 of 3 flights" in res.output
+    data = json.loads((tmp_path / "flightmap.geojson").read_text(encoding="utf-8"))
+    assert [f["properties"]["name"] for f in data["features"]] == [
+        "DJI_0001", "DJI_0002",
+    ]
@@ -53,7 +53,7 @@ def _make_run_capture(captured: list):
             return ok
         if cmd and "ffprobe" in str(cmd[0]).lower():
             return type(
-                "R", (), {"returncode": 0, "stdout": "10.0\n", "stderr": ""}
+                "R", (), {"returncode": 0, "stdout": '{"format": {"duration": "10.0"}}', "stderr": ""}
             )()
         return ok
 
@@ -0,0 +1,143 @@
+"""Per-device mux caps (utils/devices.py) and embed --device-jobs."""
+
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from dji_metadata_embedder import cli as cli_mod
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.embedder import DJIMetadataEmbedder
+from dji_metadata_embedder.utils import devices
+from dji_metadata_embedder.utils.devices import DeviceSlots, auto_device_cap
+
+SRT = "1\n00:00:00,000 --> 00:00:01,000\nGPS(1,2,3)"
+
+
+def test_slots_cap_each_device_separately(monkeypatch):
+    # Paths under /card/ live on device 1, everything else on device 2.
+    monkeypatch.setattr(
+        devices, "device_id", lambda p: 1 if str(p).startswith("/card/") else 2
+    )
+    slots = DeviceSlots({1: 1, 2: 3})
+    active = {1: 0, 2: 0}
+    peak = {1: 0, 2: 0}
+    lock = threading.Lock()
+
+    def job(path):
+        with slots.hold([Path(path)]):
+            dev = devices.device_id(path)
+            with lock:
+                active[dev] += 1
+                peak[dev] = max(peak[dev], active[dev])
+            time.sleep(0.02)
+            with lock:
+                active[dev] -= 1
+
+    threads = [
+        threading.Thread(target=job, args=(p,))
+        for p in ["/card/a", "/card/b", "/card/c", "/ssd/a", "/ssd/b", "/ssd/c"]
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == {1: 1, 2: 3}
+
+
+def test_auto_cap_follows_read_probe(monkeypatch, tmp_path):
+    sample = tmp_path / "clip.mp4"
+    monkeypatch.setattr(devices, "is_rotational", lambda dev: False)
+    monkeypatch.setattr(devices, "read_throughput", lambda p: 25.0)
+    assert auto_device_cap(7, sample, 4) == 1
+    monkeypatch.setattr(devices, "read_throughput", lambda p: 900.0)
+    assert auto_device_cap(7, sample, 4) == 4
+    # A rotational disk must stream much faster to get parallel muxes...
+    monkeypatch.setattr(devices, "is_rotational", lambda dev: True)
+    monkeypatch.setattr(devices, "read_throughput", lambda p: 180.0)
+    assert auto_device_cap(7, sample, 4) == 1
+    # ...but the flag alone (common on virtual disks) is not evidence.
+    assert auto_device_cap(7, None, 4) == 4
+
+
+def test_read_throughput_skips_tiny_files(tmp_path):
+    tiny = tmp_path / "tiny.mp4"
+    tiny.write_bytes(b"x" * 1000)
+    assert devices.read_throughput(tiny) is None
+    big = tmp_path / "big.mp4"
+    big.write_bytes(b"x" * (2 * 1024 * 1024))
+    assert devices.read_throughput(big) > 0
+
+
+class _FakeProgress:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add_task(self, *args, **kwargs):
+        return 0
+
+    def update(self, task, description=None):
+        pass
+
+    def advance(self, task):
+        pass
+
+
+def test_device_jobs_caps_concurrent_muxes(tmp_path, monkeypatch):
+    for i in range(1, 7):
+        (tmp_path / f"DJI_{i:04d}.MP4").write_bytes(b"fake")
+        (tmp_path / f"DJI_{i:04d}.SRT").write_text(SRT, encoding="utf-8")
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def run(cmd, *args, **kwargs):
+        if "ffmpeg" in str(cmd[0]).lower():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            Path(cmd[-1]).write_bytes(b"embedded")
+            with lock:
+                active[0] -= 1
+            return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
+        out = '{"format": {"duration": "10.0"}}'
+        return type("R", (), {"returncode": 0, "stdout": out, "stderr": ""})()
+
+    monkeypatch.setattr(subprocess, "run", run)
+    monkeypatch.setattr("dji_metadata_embedder.embedder.Progress", _FakeProgress)
+    result = DJIMetadataEmbedder(str(tmp_path), jobs=4, device_jobs=2).process_directory()
+    assert result["processed"] == 6
+    # Source and output share tmp_path's device.
+    assert peak[0] == 2
+
+
+def test_cli_passes_device_jobs(tmp_path, monkeypatch):
+    seen = {}
+
+    def fake_process(self, use_exiftool=False, on_progress=None):
+        seen["device_jobs"] = self.device_jobs
+        return {
+            "processed": 0,
+            "total_files": 0,
+            "warnings": [],
+            "errors": [],
+            "output_directory": str(tmp_path),
+        }
+
+    monkeypatch.setattr(cli_mod, "check_dependencies", lambda: (True, []))
+    monkeypatch.setattr(cli_mod.DJIMetadataEmbedder, "process_directory", fake_process)
+    res = CliRunner().invoke(
+        main, ["embed", str(tmp_path), "--jobs", "4", "--device-jobs", "1", "-q"]
+    )
+    assert res.exit_code == 0, res.output
+    assert seen["device_jobs"] == 1
+    res = CliRunner().invoke(main, ["embed", str(tmp_path), "-q"])
+    assert seen["device_jobs"] is None
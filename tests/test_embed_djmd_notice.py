@@ -44,10 +44,12 @@ def _fake_progress_class():
 
 
 def _fake_run(data_streams: list[dict]):
-    """subprocess.run replacement: ffmpeg writes its output, the data-stream
-    ffprobe query answers with *data_streams*, other ffprobe calls answer a
-    duration (so output validation passes)."""
-    streams_json = json.dumps({"streams": data_streams})
+    """subprocess.run replacement: ffmpeg writes its output; the (single,
+    format+streams) ffprobe query answers with *data_streams* and a duration
+    (so output validation passes)."""
+    probe_json = json.dumps(
+        {"format": {"duration": "10.0"}, "streams": data_streams}
+    )
 
     def run(cmd, *args, **kwargs):
         ok = type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
@@ -56,11 +58,9 @@ def _fake_run(data_streams: list[dict]):
             Path(cmd[-1]).write_bytes(b"embedded content")
             return ok
         if "ffprobe" in prog:
-            if "-select_streams" in cmd:
-                return type(
-                    "R", (), {"returncode": 0, "stdout": streams_json, "stderr": ""}
-                )()
-            return type("R", (), {"returncode": 0, "stdout": "10.0\n", "stderr": ""})()
+            return type(
+                "R", (), {"returncode": 0, "stdout": probe_json, "stderr": ""}
+            )()
         return ok
 
     return run
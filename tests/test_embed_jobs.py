@@ -0,0 +1,122 @@
+"""embed --jobs: concurrent per-clip pipelines with sequential-looking results."""
+
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from dji_metadata_embedder import cli as cli_mod
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.embedder import DJIMetadataEmbedder
+
+SRT = "1\n00:00:00,000 --> 00:00:01,000\nGPS(1,2,3)"
+
+
+class _FakeProgress:
+    """Progress stand-in (conftest stubs rich's Progress without advance)."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add_task(self, *args, **kwargs):
+        return 0
+
+    def update(self, task, description=None):
+        pass
+
+    def advance(self, task):
+        pass
+
+
+def _fake_run(active: list[int], peak: list[int]):
+    """ffmpeg writes its output after a clip-dependent delay (later clips
+    finish first); ffprobe answers a matching duration."""
+    lock = threading.Lock()
+
+    def run(cmd, *args, **kwargs):
+        prog = str(cmd[0]).lower()
+        if "ffmpeg" in prog:
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            out = Path(cmd[-1])
+            time.sleep(0.05 * (10 - int(out.name[4:8]) % 10) / 10)
+            out.write_bytes(b"embedded " + out.name.encode())
+            with lock:
+                active[0] -= 1
+            return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
+        return type("R", (), {"returncode": 0, "stdout": '{"format": {"duration": "10.0"}}', "stderr": ""})()
+
+    return run
+
+
+def _prep(root: Path) -> None:
+    root.mkdir()
+    for i in range(1, 9):
+        (root / f"DJI_{i:04d}.MP4").write_bytes(b"fake")
+        if i % 3:  # every third clip has no SRT
+            (root / f"DJI_{i:04d}.SRT").write_text(SRT, encoding="utf-8")
+
+
+def _run(root: Path, monkeypatch, jobs: int):
+    active, peak = [0], [0]
+    monkeypatch.setattr(subprocess, "run", _fake_run(active, peak))
+    monkeypatch.setattr("dji_metadata_embedder.embedder.Progress", _FakeProgress)
+    calls: list[tuple] = []
+    embedder = DJIMetadataEmbedder(str(root), jobs=jobs)
+    result = embedder.process_directory(on_progress=lambda *a: calls.append(a))
+    return result, calls, peak[0]
+
+
+def test_parallel_matches_sequential(tmp_path, monkeypatch):
+    _prep(tmp_path / "seq")
+    _prep(tmp_path / "par")
+    seq, seq_calls, seq_peak = _run(tmp_path / "seq", monkeypatch, jobs=1)
+    par, par_calls, par_peak = _run(tmp_path / "par", monkeypatch, jobs=4)
+
+    assert seq_peak == 1 and par_peak > 1
+    assert par["processed"] == seq["processed"] == 6
+    assert par["warnings"] == seq["warnings"]
+    assert par["warnings"] == [
+        f"No SRT file found for: DJI_{i:04d}.MP4" for i in (3, 6)
+    ]
+    assert [c[0] for c in par_calls] == list(range(1, 9))
+    assert {c[2] for c in par_calls} == {c[2] for c in seq_calls}
+    assert all(c[1] == 8 for c in par_calls)
+
+    for name in ("seq", "par"):
+        out = tmp_path / name / "processed"
+        assert sorted(p.name for p in out.glob("*_metadata.MP4")) == [
+            f"DJI_{i:04d}_metadata.MP4" for i in (1, 2, 4, 5, 7, 8)
+        ]
+        assert not list(out.glob("*.tmp*"))
+
+
+def test_cli_passes_jobs(tmp_path, monkeypatch):
+    seen = {}
+
+    def fake_process(self, use_exiftool=False, on_progress=None):
+        seen["jobs"] = self.jobs
+        return {
+            "processed": 0,
+            "total_files": 0,
+            "warnings": [],
+            "errors": [],
+            "output_directory": str(tmp_path),
+        }
+
+    monkeypatch.setattr(cli_mod, "check_dependencies", lambda: (True, []))
+    monkeypatch.setattr(cli_mod.DJIMetadataEmbedder, "process_directory", fake_process)
+    res = CliRunner().invoke(main, ["embed", str(tmp_path), "--jobs", "3", "-q"])
+    assert res.exit_code == 0, res.output
+    assert seen["jobs"] == 3
+    res = CliRunner().invoke(main, ["embed", str(tmp_path), "--jobs", "0"])
+    assert res.exit_code != 0
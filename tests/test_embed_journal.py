@@ -0,0 +1,152 @@
+"""embed resume: the completion journal skips clips whose output is current."""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from dji_metadata_embedder import cli as cli_mod
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.embedder import DJIMetadataEmbedder
+from dji_metadata_embedder.utils.journal import JOURNAL_NAME, EmbedJournal
+
+SRT = "1\n00:00:00,000 --> 00:00:01,000\nGPS(1,2,3)"
+
+
+class _FakeProgress:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add_task(self, *args, **kwargs):
+        return 0
+
+    def update(self, task, description=None):
+        pass
+
+    def advance(self, task):
+        pass
+
+
+def _prep(root: Path, n: int = 3) -> None:
+    for i in range(1, n + 1):
+        (root / f"DJI_{i:04d}.MP4").write_bytes(b"video %d" % i)
+        (root / f"DJI_{i:04d}.SRT").write_text(SRT, encoding="utf-8")
+
+
+def _fake_ffmpeg(monkeypatch) -> list[str]:
+    muxed: list[str] = []
+
+    def run(cmd, *args, **kwargs):
+        if "ffmpeg" in str(cmd[0]).lower():
+            out = Path(cmd[-1])
+            muxed.append(out.name)
+            out.write_bytes(b"embedded " + out.name.encode())
+            return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
+        out = '{"format": {"duration": "10.0"}}'
+        return type("R", (), {"returncode": 0, "stdout": out, "stderr": ""})()
+
+    monkeypatch.setattr(subprocess, "run", run)
+    monkeypatch.setattr("dji_metadata_embedder.embedder.Progress", _FakeProgress)
+    return muxed
+
+
+def test_rerun_skips_current_outputs_and_redoes_changed(tmp_path, monkeypatch):
+    _prep(tmp_path)
+    muxed = _fake_ffmpeg(monkeypatch)
+    first = DJIMetadataEmbedder(str(tmp_path)).process_directory()
+    assert (first["processed"], first["up_to_date"]) == (3, 0)
+    assert len(muxed) == 3
+
+    muxed.clear()
+    again = DJIMetadataEmbedder(str(tmp_path)).process_directory()
+    assert (again["processed"], again["up_to_date"]) == (0, 3)
+    assert muxed == []
+
+    # An edited SRT, a deleted output and a new option each force a redo.
+    srt = tmp_path / "DJI_0002.SRT"
+    srt.write_text(SRT.replace("GPS(1,2,3)", "GPS(4,5,6)"), encoding="utf-8")
+    (tmp_path / "processed" / "DJI_0003_metadata.MP4").unlink()
+    third = DJIMetadataEmbedder(str(tmp_path)).process_directory()
+    assert (third["processed"], third["up_to_date"]) == (2, 1)
+    assert sorted(muxed) == [
+        "DJI_0002_metadata.tmp.MP4",
+        "DJI_0003_metadata.tmp.MP4",
+    ]
+
+    muxed.clear()
+    redacted = DJIMetadataEmbedder(str(tmp_path), redact="fuzz").process_directory()
+    assert redacted["processed"] == 3 and len(muxed) == 3
+
+
+def test_force_reembeds_everything(tmp_path, monkeypatch):
+    _prep(tmp_path)
+    muxed = _fake_ffmpeg(monkeypatch)
+    DJIMetadataEmbedder(str(tmp_path)).process_directory()
+    muxed.clear()
+    forced = DJIMetadataEmbedder(str(tmp_path), force=True).process_directory()
+    assert (forced["processed"], forced["up_to_date"]) == (3, 0)
+    assert len(muxed) == 3
+
+
+def test_same_size_replacement_is_not_current(tmp_path, monkeypatch):
+    _prep(tmp_path, n=1)
+    muxed = _fake_ffmpeg(monkeypatch)
+    DJIMetadataEmbedder(str(tmp_path)).process_directory()
+    clip = tmp_path / "DJI_0001.MP4"
+    st = clip.stat()
+    clip.write_bytes(b"VIDEO 1")  # same size, different bytes ...
+    os.utime(clip, ns=(st.st_atime_ns, st.st_mtime_ns))  # ... same mtime
+    muxed.clear()
+    result = DJIMetadataEmbedder(str(tmp_path)).process_directory()
+    assert result["processed"] == 1 and len(muxed) == 1
+
+
+def test_overwrite_rerun_does_not_embed_twice(tmp_path, monkeypatch):
+    _prep(tmp_path, n=2)
+    muxed = _fake_ffmpeg(monkeypatch)
+    DJIMetadataEmbedder(str(tmp_path), overwrite=True).process_directory()
+    assert (tmp_path / JOURNAL_NAME).exists()
+    muxed.clear()
+    again = DJIMetadataEmbedder(str(tmp_path), overwrite=True).process_directory()
+    assert again["up_to_date"] == 2 and muxed == []
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    journal = tmp_path / JOURNAL_NAME
+    source, output = tmp_path / "a.MP4", tmp_path / "a_metadata.MP4"
+    output.write_bytes(b"out")
+    EmbedJournal(tmp_path).record(source, output, {"video": None}, "opts")
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"source": "b.MP4", "outp')  # killed mid-append
+    reopened = EmbedJournal(tmp_path)
+    assert len(reopened) == 1
+    assert reopened.is_current(source, output, {"video": None}, "opts")
+    reopened.record(tmp_path / "c.MP4", output, {"video": None}, "opts")
+    assert len(EmbedJournal(tmp_path)) == 2
+
+
+def test_cli_force_and_jsonl_up_to_date(tmp_path, monkeypatch):
+    _prep(tmp_path, n=2)
+    _fake_ffmpeg(monkeypatch)
+    monkeypatch.setattr(cli_mod, "check_dependencies", lambda: (True, []))
+
+    def summary(*extra):
+        res = CliRunner().invoke(
+            main, ["embed", str(tmp_path), "--progress", "jsonl", *extra]
+        )
+        assert res.exit_code == 0, res.output
+        return json.loads(res.stdout.strip().splitlines()[-1])["summary"]
+
+    assert summary()["processed"] == 2
+    again = summary()
+    assert (again["processed"], again["up_to_date"]) == (0, 2)
+    forced = summary("--force")
+    assert (forced["processed"], forced["up_to_date"]) == (2, 0)
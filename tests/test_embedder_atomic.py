@@ -36,7 +36,7 @@ class TestValidateEmbeddedOutput:
                 value = durations[target]
                 if value is None:
                     return type("R", (), {"returncode": 1, "stdout": "", "stderr": "error"})()
-                return type("R", (), {"returncode": 0, "stdout": f"{value}\n", "stderr": ""})()
+                return type("R", (), {"returncode": 0, "stdout": f'{{"format": {{"duration": "{value}"}}}}', "stderr": ""})()
             return type("R", (), {"returncode": 1, "stdout": "", "stderr": "unknown"})()
         return runner
 
@@ -169,7 +169,7 @@ class TestProcessDirectoryAtomicWrite:
             if cmd and "ffprobe" in str(cmd[0]).lower():
                 # ffprobe duration query — return matching durations so the
                 # validator's truncation check passes.
-                return type("R", (), {"returncode": 0, "stdout": "10.0\n", "stderr": ""})()
+                return type("R", (), {"returncode": 0, "stdout": '{"format": {"duration": "10.0"}}', "stderr": ""})()
             return ok
 
         monkeypatch.setattr(subprocess, "run", fake_run)
@@ -217,7 +217,7 @@ class TestProcessDirectoryAtomicWrite:
                 Path(cmd[-1]).write_bytes(b"embedded content")
                 return ok
             if cmd and "ffprobe" in str(cmd[0]).lower():
-                return type("R", (), {"returncode": 0, "stdout": "10.0\n", "stderr": ""})()
+                return type("R", (), {"returncode": 0, "stdout": '{"format": {"duration": "10.0"}}', "stderr": ""})()
             return ok
 
         monkeypatch.setattr(subprocess, "run", fake_run)
@@ -263,7 +263,7 @@ class TestProcessDirectoryAtomicWrite:
                 target = Path(cmd[-1]).name
                 if _TEMP_SUFFIX in target:
                     return type("R", (), {"returncode": 1, "stdout": "", "stderr": "moov not found"})()
-                return type("R", (), {"returncode": 0, "stdout": "10.0\n", "stderr": ""})()
+                return type("R", (), {"returncode": 0, "stdout": '{"format": {"duration": "10.0"}}', "stderr": ""})()
             return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
 
         monkeypatch.setattr(subprocess, "run", fake_run)
@@ -295,7 +295,7 @@ class TestProcessDirectoryAtomicWrite:
                 out_path.write_bytes(b"embedded in place")
                 return ok
             if cmd and "ffprobe" in str(cmd[0]).lower():
-                return type("R", (), {"returncode": 0, "stdout": "10.0\n", "stderr": ""})()
+                return type("R", (), {"returncode": 0, "stdout": '{"format": {"duration": "10.0"}}', "stderr": ""})()
             return ok
 
         monkeypatch.setattr(subprocess, "run", fake_run)
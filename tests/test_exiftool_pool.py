@@ -0,0 +1,121 @@
+"""ExifToolPool: persistent -stay_open workers behind call_exiftool."""
+
+import json
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from dji_metadata_embedder.utils import exiftool as et
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="fake ExifTool is a shebang script"
+)
+
+# Speaks the -stay_open argument-file protocol: -execute<N> ends a request,
+# {ready<N>} ends its stdout and the -echo4 text (with ${status}) its stderr.
+FAKE = r'''
+import json, os, sys, time
+args = []
+for line in sys.stdin:
+    args.append(line.rstrip("\n"))
+    if args[-2:] == ["-stay_open", "False"]:
+        break
+    if not args[-1].startswith("-execute"):
+        continue
+    tag, cmd, args = args[-1][8:], args[:-1], []
+    i = cmd.index("-echo4")
+    echo = cmd[i + 1]
+    del cmd[i:i + 2]
+    status = 0
+    if cmd == ["-ver"]:
+        print("13.99")
+    elif cmd[0] == "sleep":
+        time.sleep(float(cmd[1]))
+    elif cmd[0] == "fail":
+        print("Error: File not found - nope.mp4", file=sys.stderr)
+        status = 1
+    else:
+        print(json.dumps([{"pid": os.getpid(), "args": cmd}]))
+    sys.stdout.write("{ready%s}\n" % tag)
+    sys.stdout.flush()
+    sys.stderr.write(echo.replace("${status}", str(status)) + "\n")
+    sys.stderr.flush()
+'''
+
+
+@pytest.fixture
+def fake_exe(tmp_path, monkeypatch):
+    exe = tmp_path / "exiftool"
+    exe.write_text(f"#!{sys.executable}\n{FAKE}")
+    exe.chmod(0o755)
+    monkeypatch.setenv("DJIEMBED_EXIFTOOL_PATH", str(exe))
+    return str(exe)
+
+
+def _pid(proc):
+    return json.loads(proc.stdout)[0]["pid"]
+
+
+def test_requests_share_one_worker(fake_exe):
+    with et.ExifToolPool() as pool:
+        first = pool.run(["-j", "a file.mp4"])
+        second = pool.run(["-j", "b.mp4"])
+        failed = pool.run(["fail"])
+    assert json.loads(first.stdout)[0]["args"] == ["-j", "a file.mp4"]
+    assert first.returncode == 0 and first.stderr == ""
+    assert _pid(first) == _pid(second)
+    assert failed.returncode == 1
+    assert failed.stdout == ""
+    assert "File not found" in failed.stderr
+
+
+def test_timeout_kills_and_respawns_worker(fake_exe):
+    with et.ExifToolPool() as pool:
+        before = _pid(pool.run(["x"]))
+        with pytest.raises(subprocess.TimeoutExpired):
+            pool.run(["sleep", "30"], timeout=0.3)
+        after = pool.run(["x"])
+    assert after.returncode == 0
+    assert _pid(after) != before
+
+
+def test_concurrent_callers_are_capped_at_size(fake_exe):
+    pids = set()
+    with et.ExifToolPool(size=2) as pool:
+
+        def work():
+            for _ in range(5):
+                pids.add(_pid(pool.run(["x"])))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        workers = list(pool._workers)
+    assert 1 <= len(pids) <= 2
+    assert all(w.proc.poll() is not None for w in workers)
+
+
+def test_call_exiftool_uses_active_pool(fake_exe, monkeypatch):
+    from dji_metadata_embedder import mp4_telemetry
+
+    def no_spawn(*a, **k):
+        raise AssertionError("one-shot ExifTool run inside a pool")
+
+    monkeypatch.setattr(subprocess, "run", no_spawn)
+    with et.pooled_exiftool() as pool:
+        assert et.active_pool() is pool
+        assert et.exiftool_version() == "13.99"
+        a = mp4_telemetry._run(["-j", "clip.mp4"])
+        b = et.call_exiftool(["-j", "other.mp4"])
+    assert et.active_pool() is None
+    assert _pid(a) == _pid(b)
+
+
+def test_missing_executable_raises_file_not_found(tmp_path):
+    with et.ExifToolPool(exe=str(tmp_path / "no-exiftool")) as pool:
+        with pytest.raises(FileNotFoundError):
+            pool.run(["-ver"])
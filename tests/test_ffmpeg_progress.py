@@ -0,0 +1,156 @@
+"""Live ffmpeg progress (utils/ffmpeg_progress.py) and its embed/JSONL wiring."""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import jsonschema
+from click.testing import CliRunner
+
+from dji_metadata_embedder import cli as cli_mod
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.embedder import DJIMetadataEmbedder
+from dji_metadata_embedder.utils.ffmpeg_progress import FfmpegProgress, run_ffmpeg
+
+SCHEMA = json.loads(
+    (Path(__file__).parent.parent / "docs" / "progress_jsonl.schema.json")
+    .read_text(encoding="utf-8")
+)
+
+BLOCKS = (
+    "frame=10\nout_time_us=2500000\ntotal_size=1000000\nprogress=continue\n"
+    "frame=20\nout_time=00:00:07.500000\ntotal_size=3000000\nprogress=continue\n"
+    "frame=30\nout_time_us=10000000\ntotal_size=4000000\nprogress=end\n"
+)
+
+
+class _FakeProgress:
+    def __init__(self, *args, **kwargs):
+        self.descriptions = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add_task(self, *args, **kwargs):
+        return 0
+
+    def update(self, task, description=None):
+        self.descriptions.append(description)
+
+    def advance(self, task):
+        pass
+
+
+def _fake_ffmpeg(monkeypatch, returncode=0, stderr=b""):
+    calls = []
+
+    def run(cmd, *args, **kwargs):
+        if "ffmpeg" in str(cmd[0]).lower():
+            calls.append(cmd)
+            if isinstance(kwargs.get("stdout"), int):
+                os.write(kwargs["stdout"], BLOCKS.encode())
+                kwargs["stderr"].write(stderr)
+            Path(cmd[-1]).write_bytes(b"embedded")
+            return type("R", (), {"returncode": returncode, "stdout": "", "stderr": ""})()
+        out = '{"format": {"duration": "10.0"}}'
+        return type("R", (), {"returncode": 0, "stdout": out, "stderr": ""})()
+
+    monkeypatch.setattr(subprocess, "run", run)
+    return calls
+
+
+def test_run_ffmpeg_parses_progress_blocks(tmp_path, monkeypatch):
+    calls = _fake_ffmpeg(monkeypatch, returncode=1, stderr=b"x" * 40_000 + b"boom")
+    updates = []
+    result = run_ffmpeg(
+        ["ffmpeg", "-i", "in.mp4", str(tmp_path / "out.mp4")],
+        duration=10.0,
+        on_progress=updates.append,
+    )
+    assert calls[0][:4] == ["ffmpeg", "-progress", "pipe:1", "-nostats"]
+    assert calls[0][-1] == str(tmp_path / "out.mp4")
+    assert [(u.out_time, u.total_size, u.done) for u in updates] == [
+        (2.5, 1_000_000, False),
+        (7.5, 3_000_000, False),
+        (10.0, 4_000_000, True),
+    ]
+    assert [u.fraction for u in updates] == [0.25, 0.75, 1.0]
+    # Only the tail of stderr is kept.
+    assert result.returncode == 1
+    assert result.stderr.endswith("boom") and len(result.stderr) < 20_000
+
+
+def test_progress_fraction_rate_and_eta():
+    p = FfmpegProgress(out_time=2.5, total_size=5_000_000, elapsed=2.0, duration=10.0)
+    assert p.fraction == 0.25
+    assert p.bytes_per_s == 2_500_000
+    assert p.eta_s == 6.0
+    unknown = FfmpegProgress(out_time=2.5, total_size=0, elapsed=0.0, duration=None)
+    assert unknown.fraction is None and unknown.eta_s is None
+    assert unknown.bytes_per_s is None
+
+
+def test_embed_reports_clip_progress(tmp_path, monkeypatch):
+    (tmp_path / "DJI_0001.MP4").write_bytes(b"video")
+    (tmp_path / "DJI_0001.SRT").write_text(
+        "1\n00:00:00,000 --> 00:00:01,000\nGPS(1,2,3)", encoding="utf-8"
+    )
+    _fake_ffmpeg(monkeypatch)
+    bars = []
+
+    def progress(*args, **kwargs):
+        bar = _FakeProgress()
+        bars.append(bar)
+        return bar
+
+    monkeypatch.setattr("dji_metadata_embedder.embedder.Progress", progress)
+    seen = []
+    result = DJIMetadataEmbedder(
+        str(tmp_path), on_clip_progress=lambda name, u: seen.append((name, u.fraction))
+    ).process_directory()
+    assert result["processed"] == 1
+    assert seen == [("DJI_0001.MP4", 0.25), ("DJI_0001.MP4", 0.75), ("DJI_0001.MP4", 1.0)]
+    assert any(
+        d and d.startswith("DJI_0001.MP4 25%") for d in bars[0].descriptions
+    )
+
+
+def test_embed_jsonl_item_progress_events(monkeypatch, tmp_path):
+    monkeypatch.setattr(cli_mod, "check_dependencies", lambda: (True, []))
+
+    def fake_process(self, use_exiftool=False, on_progress=None):
+        self.on_clip_progress(
+            "DJI_0001.MP4",
+            FfmpegProgress(out_time=5.0, total_size=2_000_000, elapsed=1.0, duration=10.0),
+        )
+        on_progress(1, 1, "DJI_0001.MP4")
+        return {
+            "processed": 1,
+            "total_files": 1,
+            "warnings": [],
+            "errors": [],
+            "output_directory": str(tmp_path / "processed"),
+        }
+
+    monkeypatch.setattr(cli_mod.DJIMetadataEmbedder, "process_directory", fake_process)
+    res = CliRunner().invoke(main, ["embed", str(tmp_path), "--progress", "jsonl"])
+    assert res.exit_code == 0, res.output
+    events = [json.loads(line) for line in res.stdout.splitlines()]
+    for e in events:
+        jsonschema.validate(e, SCHEMA)
+    live = [e for e in events if e["event"] == "item_progress"]
+    assert live == [
+        {
+            "v": 1,
+            "event": "item_progress",
+            "item": "DJI_0001.MP4",
+            "fraction": 0.5,
+            "bytes": 2_000_000,
+            "bytes_per_s": 2_000_000,
+            "eta_s": 1.0,
+        }
+    ]
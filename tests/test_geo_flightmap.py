@@ -12,6 +12,7 @@ from dji_metadata_embedder.geo.flightmap import (
     write_flights_kml,
 )
 from dji_metadata_embedder.geo.track import Track, TrackPoint
+from dji_metadata_embedder.utils.cache import TelemetryCache, use_cache
 
 
 def _bracket_srt(*coords: tuple[float, float, float]) -> str:
@@ -409,6 +410,22 @@ def test_decimation_does_not_break_split_joining(tmp_path):
     assert len(tracks[0].points) <= 8               # ~4 s at 1 Hz + endpoints
 
 
+def test_simplify_replaces_decimation_and_keeps_arrays_aligned(tmp_path):
+    # A straight level leg split in two: with simplify each segment reduces
+    # to its endpoints, and the per-point arrays follow the kept points.
+    _write(tmp_path, "DJI_0001.SRT", _hz30_srt(T0, 2.0))
+    _write(tmp_path, "DJI_0002.SRT",
+           _hz30_srt(T0 + timedelta(seconds=2), 2.0, lat0=34.0 + 60 * 1e-6))
+    tracks, _ = scan_flights(tmp_path, simplify=1.0)
+    assert tracks[0].segments == ["DJI_0001", "DJI_0002"]
+    pts = tracks[0].points
+    assert [p.segment for p in pts] == [0, 0, 1, 1]
+    assert pts[-1].lat == 34.0 + 119 * 1e-6
+    feature = flights_to_geojson(tracks)["features"][0]
+    assert len(feature["geometry"]["coordinates"]) == len(pts)
+    assert len(feature["properties"]["times_s"]) == len(pts)
+
+
 # mtime far outside any recording window (2000-01-01 UTC) so timezone
 # auto-detection is guaranteed to fail for the 2026-dated segments above.
 _BOGUS_MTIME = 946684800.0
@@ -452,6 +469,65 @@ def test_scan_flights_tz_offset_silences_detection_warnings(tmp_path, caplog):
     )
 
 
+def _scan_signature(tracks, skipped):
+    return [
+        (t.name, t.segments, t.utc_source, t.local_offset,
+         [(p.lat, p.lon, p.alt, p.utc, p.timestamp, p.segment) for p in t.points])
+        for t in tracks
+    ], skipped
+
+
+def test_parallel_scan_matches_sequential(tmp_path):
+    _write(tmp_path, "a/DJI_0001.SRT", SEG_A)
+    _write(tmp_path, "a/DJI_0002.SRT", SEG_B)
+    _write(tmp_path, "a/DJI_0003.SRT", SEG_C)
+    _write(tmp_path, "b/DJI_0001.SRT", FLIGHT_A)
+    _write(tmp_path, "b/DJI_0002.SRT", _hz30_srt(T0 + timedelta(days=1), 3.0))
+    _write(tmp_path, "b/movie.srt", NOT_TELEMETRY)
+    _write(tmp_path, "b/latin1.SRT", "").write_bytes(b"1\n\xff\xfe\n")
+    runs = {}
+    for jobs in (1, 3):
+        calls = []
+        result = scan_flights(
+            tmp_path, recursive=True, jobs=jobs,
+            on_file=lambda i, n, name: calls.append((i, n, name)),
+        )
+        runs[jobs] = (_scan_signature(*result), calls)
+    assert runs[3] == runs[1]
+    (tracks, skipped), calls = runs[3]
+    assert [t[0] for t in tracks] == ["a/DJI_0001", "b/DJI_0001", "b/DJI_0002"]
+    assert skipped == ["b/latin1", "b/movie"]
+    assert [c[0] for c in calls] == list(range(1, 8))
+
+
+def test_parallel_scan_aggregates_tz_warnings_across_workers(tmp_path, caplog):
+    for i in range(4):
+        srt = _dt_srt(T0 + timedelta(hours=2 * i),
+                      [(10.0 + i, 20.0, 5.0), (10.001 + i, 20.0, 6.0)])
+        path = _write(tmp_path, f"DJI_000{i + 1}.SRT", srt)
+        os.utime(path, (_BOGUS_MTIME, _BOGUS_MTIME))
+    with caplog.at_level(logging.WARNING):
+        tracks, _ = scan_flights(tmp_path, jobs=2)
+    assert len(tracks) == 4
+    tz_warnings = [
+        r.message for r in caplog.records
+        if "Timezone auto-detection failed" in r.message
+    ]
+    assert len(tz_warnings) == 1
+    assert "for 4 of 4 SRT files" in tz_warnings[0]
+
+
+def test_parallel_scan_counts_worker_cache_hits(tmp_path):
+    _write(tmp_path, "DJI_0001.SRT", FLIGHT_A)
+    _write(tmp_path, "DJI_0002.SRT", FLIGHT_B)
+    for expected in ((0, 2), (2, 0)):
+        cache = TelemetryCache(tmp_path / "cache")
+        with use_cache(cache):
+            tracks, _ = scan_flights(tmp_path, jobs=2)
+        assert len(tracks) == 2
+        assert (cache.hits, cache.misses) == expected
+
+
 def test_writers_create_files(tmp_path):
     tracks = _tracks()
     geo = write_flights_geojson(tracks, tmp_path / "f.geojson")
@@ -0,0 +1,106 @@
+"""Compact HTML payload (geo/flightmap_compact.py, flightmap --compact)."""
+
+import json
+import re
+from datetime import datetime, timedelta
+
+from click.testing import CliRunner
+
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.geo.flightmap import flights_to_geojson
+from dji_metadata_embedder.geo.flightmap3d_html import flights_to_3d_html
+from dji_metadata_embedder.geo.flightmap_compact import (
+    COORDINATE_SCALES,
+    PROPERTY_SCALES,
+    compact_flights,
+    decode_columns,
+    encode_columns,
+)
+from dji_metadata_embedder.geo.flightmap_html import flights_to_html
+from dji_metadata_embedder.geo.track import Track, TrackPoint
+
+from tests.test_geo_flightmap import FLIGHT_A, FLIGHT_B, _write
+
+
+def _flight(name, lat, points=50):
+    t0 = datetime(2026, 6, 15, 12, 0, 0)
+    return Track(
+        name=name,
+        points=[
+            TrackPoint(
+                lat=lat + i * 1.7e-5, lon=-84.123456 - i * 2.3e-5,
+                alt=100.0 + i * 0.37, timestamp=f"00:00:{i % 60:02d},{i * 7 % 1000:03d}",
+                utc=t0 + timedelta(seconds=i),
+                gimbal_yaw=None if i % 7 == 0 else -170.0 + i * 3.1,
+                gimbal_pitch=-90.0 + i * 0.5, rel_alt=50.0 + i * 0.2,
+                segment=i // 30,
+            )
+            for i in range(points)
+        ],
+        segments=["A/DJI_0001", "A/DJI_0002"],
+        media=["DJI_0001.MP4", "DJI_0002.MP4"],
+    )
+
+
+TRACKS = [_flight("A/DJI_0001", 34.0), _flight("B/DJI_0005", -33.9, points=1)]
+
+_DATA_RE = re.compile(
+    r'<script type="application/json" id="flight-data">(.*?)</script>', re.DOTALL
+)
+
+
+def test_columns_round_trip_with_nulls_and_large_steps():
+    rows = [(34.123456, -84.5, 120.3), (None, -84.499999, 0.0), (-12.0, 179.999999, -5.1)]
+    decoded = decode_columns(encode_columns(rows, COORDINATE_SCALES), COORDINATE_SCALES)
+    assert decoded == [list(r) for r in rows]
+    assert encode_columns([], (10,)) == ""
+
+
+def test_compact_flights_decodes_to_the_same_geojson():
+    plain = flights_to_geojson(TRACKS)
+    compact = compact_flights(plain)
+    line, point = compact["features"]
+    assert isinstance(line["geometry"]["coordinates"], str)
+    assert point == plain["features"][1]          # single fix left alone
+    props = line["properties"]
+    for key, scale in PROPERTY_SCALES.items():
+        assert key in props, key
+        assert [v for (v,) in decode_columns(props[key], (scale,))] == (
+            plain["features"][0]["properties"][key]
+        )
+    coords = decode_columns(line["geometry"]["coordinates"], COORDINATE_SCALES)
+    for got, want in zip(coords, plain["features"][0]["geometry"]["coordinates"]):
+        # Within half a step: 1e-6 degrees, 0.1 m.
+        assert abs(got[0] - want[0]) < 5.1e-7 and abs(got[1] - want[1]) < 5.1e-7
+        assert abs(got[2] - want[2]) < 0.051
+    # The plain collection is not modified.
+    assert isinstance(plain["features"][0]["geometry"]["coordinates"], list)
+
+
+def test_compact_html_is_smaller_and_decodes_in_the_page():
+    tracks = [_flight(f"DJI_{i:04d}", 34.0 + i, points=600) for i in range(5)]
+    for render in (flights_to_html, flights_to_3d_html):
+        plain, compact = render(tracks, "t"), render(tracks, "t", compact=True)
+        assert "expandFlights" not in plain
+        assert "expandFlights(data);" in compact
+        block = _DATA_RE.search(compact).group(1)
+        assert len(block) * 3 < len(_DATA_RE.search(plain).group(1))
+        data = json.loads(block)
+        assert data["compact"]["properties"] == PROPERTY_SCALES
+
+
+def test_cli_compact_changes_only_the_html(tmp_path):
+    _write(tmp_path, "DJI_0001.SRT", FLIGHT_A)
+    _write(tmp_path, "DJI_0002.SRT", FLIGHT_B)
+    res = CliRunner().invoke(
+        main, ["flightmap", str(tmp_path), "-f", "all", "--compact", "-q"]
+    )
+    assert res.exit_code == 0, res.output
+    assert "expandFlights(data);" in (tmp_path / "flightmap.html").read_text(
+        encoding="utf-8"
+    )
+    geojson = json.loads((tmp_path / "flightmap.geojson").read_text(encoding="utf-8"))
+    assert "compact" not in geojson
+    assert all(
+        isinstance(f["geometry"]["coordinates"], list) for f in geojson["features"]
+    )
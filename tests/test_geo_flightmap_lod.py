@@ -0,0 +1,112 @@
+"""Track levels of detail for the HTML maps (geo/flightmap_lod.py)."""
+
+import json
+import math
+from datetime import datetime, timedelta
+
+from dji_metadata_embedder.geo.flightmap import flights_to_geojson, write_flights_geojson
+from dji_metadata_embedder.geo.flightmap3d_html import flights_to_3d_html
+from dji_metadata_embedder.geo.flightmap_compact import compact_flights, decode_columns
+from dji_metadata_embedder.geo.flightmap_html import flights_to_html, write_flights_html
+from dji_metadata_embedder.geo.flightmap_lod import (
+    OVERVIEW_POINTS,
+    add_levels,
+    track_levels,
+)
+from dji_metadata_embedder.geo.flightmap_split import data_dir
+from dji_metadata_embedder.geo.geometry import M_PER_DEG_LAT as M_PER_DEG
+from dji_metadata_embedder.geo.map_html import mixed_to_html
+from dji_metadata_embedder.geo.track import Track, TrackPoint
+
+from tests.test_geo_flightmap_compact import _DATA_RE, _flight
+
+
+def _survey(points=1200):
+    """A winding 20-minute flight: turns, a climbing hover, a straight leg."""
+    t0 = datetime(2026, 6, 15, 12, 0, 0)
+    lat, lon, alt, heading = 46.5, 7.9, 1500.0, 0.0
+    pts = []
+    for i in range(points):
+        heading += math.sin(i / 40) * 0.08
+        step = 0.0 if 500 <= i < 560 else 4e-5
+        lat += step * math.cos(heading)
+        lon += step * math.sin(heading)
+        alt += 0.5 if 500 <= i < 560 else 0.0
+        pts.append(
+            TrackPoint(lat=lat, lon=lon, alt=alt, timestamp="", utc=t0 + timedelta(seconds=i))
+        )
+    return Track(name="survey", points=pts)
+
+
+def _chord_error(xyz, a, b, i):
+    """How far row *i* lies from the chord between rows *a* and *b*."""
+    (ax, ay, az), (bx, by, bz), (x, y, z) = xyz[a], xyz[b], xyz[i]
+    dx, dy, dz = bx - ax, by - ay, bz - az
+    px, py = x - ax, y - ay
+    seg2 = dx * dx + dy * dy
+    # A hover's chord has no direction: altitude goes by position in the run.
+    t = min(max((px * dx + py * dy) / seg2, 0.0), 1.0) if seg2 > 1e-6 else (i - a) / (b - a)
+    return max(math.hypot(px - t * dx, py - t * dy), abs(z - az - t * dz))
+
+
+def _coords(track):
+    return flights_to_geojson([track])["features"][0]["geometry"]["coordinates"]
+
+
+def test_levels_are_nested_and_within_tolerance():
+    coords = _coords(_survey())
+    levels = track_levels(coords)
+    assert len(levels) == 2
+    overview, medium = levels
+    assert len(overview["idx"]) <= OVERVIEW_POINTS
+    assert overview["tol_m"] > medium["tol_m"]
+    assert set(overview["idx"]) <= set(medium["idx"])
+    assert 2 * len(medium["idx"]) <= len(coords)
+    # Every dropped fix lies within the level's tolerance of the chord
+    # between the kept fixes around it, horizontally and in altitude.
+    kx = M_PER_DEG * math.cos(math.radians(coords[0][1]))
+    xyz = [((c[0] - coords[0][0]) * kx, (c[1] - coords[0][1]) * M_PER_DEG, c[2]) for c in coords]
+    for level in levels:
+        for a, b in zip(level["idx"], level["idx"][1:]):
+            for i in range(a + 1, b):
+                assert _chord_error(xyz, a, b, i) <= level["tol_m"] + 0.01
+
+
+def test_short_and_straight_tracks_get_no_useless_levels():
+    assert track_levels(_coords(_survey(points=60))) == []
+    # A straight line collapses to its ends at the finest tolerance already.
+    levels = track_levels(_coords(_flight("straight", 34.0, points=300)))
+    assert [len(lv["idx"]) for lv in levels] == [2]
+    assert add_levels({"type": "FeatureCollection", "features": []})["features"] == []
+
+
+def test_html_maps_embed_levels_but_geojson_files_do_not(tmp_path):
+    tracks = [_survey()]
+    for html in (
+        flights_to_html(tracks, "t"),
+        flights_to_3d_html(tracks, "t"),
+    ):
+        props = json.loads(_DATA_RE.search(html).group(1))["features"][0]["properties"]
+        assert [len(lv["idx"]) for lv in props["lod"]] == [
+            len(lv["idx"]) for lv in track_levels(_coords(tracks[0]))
+        ]
+        assert len(props["times_s"]) == 1200           # playback stays full
+    assert '"lod"' in mixed_to_html([], tracks, "t")
+    out = tmp_path / "flights.geojson"
+    write_flights_geojson(tracks, out)
+    assert "lod" not in out.read_text(encoding="utf-8")
+
+
+def test_levels_survive_compact_and_stay_out_of_the_split_index(tmp_path):
+    geojson = add_levels(flights_to_geojson([_survey()]))
+    levels = geojson["features"][0]["properties"]["lod"]
+    packed = compact_flights(geojson)["features"][0]["properties"]["lod"]
+    assert [
+        [int(row[0]) for row in decode_columns(lv["idx"], (1,))] for lv in packed
+    ] == [lv["idx"] for lv in levels]
+    out = tmp_path / "flightmap.html"
+    write_flights_html([_survey()], out, "t", split_data=True)
+    index = json.loads(_DATA_RE.search(out.read_text(encoding="utf-8")).group(1))
+    assert "lod" not in index["features"][0]["properties"]
+    sidecar = json.loads((data_dir(out) / "00000.json").read_text(encoding="utf-8"))
+    assert sidecar["features"][0]["properties"]["lod"] == levels
@@ -0,0 +1,152 @@
+"""Incremental flightmap rebuilds (geo/flightmap_manifest.py, --incremental)."""
+
+import json
+import os
+from datetime import timedelta
+
+import jsonschema
+import pytest
+from click.testing import CliRunner
+
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.geo.flightmap import scan_flights
+from dji_metadata_embedder.geo.flightmap_manifest import (
+    FlightManifest,
+    manifest_path,
+    scan_key,
+)
+
+from tests.test_geo_flightmap import (
+    FLIGHT_A,
+    FLIGHT_B,
+    NOT_TELEMETRY,
+    SEG_A,
+    SEG_B,
+    SEG_C,
+    T0,
+    _hz30_srt,
+    _scan_signature,
+    _write,
+)
+
+
+def _incremental(root, out, **kwargs):
+    manifest = FlightManifest(out, scan_key(root, True, 15.0, None))
+    result = scan_flights(root, recursive=True, manifest=manifest, **kwargs)
+    manifest.save("options", [])
+    return result, manifest
+
+
+def test_manifest_path_sits_beside_the_output(tmp_path):
+    assert manifest_path(tmp_path / "flightmap.html") == (
+        tmp_path / ".flightmap.manifest.json"
+    )
+
+
+def test_incremental_scan_matches_a_full_scan(tmp_path):
+    src, out = tmp_path / "src", tmp_path / ".m.json"
+    _write(src, "a/DJI_0001.SRT", SEG_A)
+    _write(src, "a/DJI_0002.SRT", SEG_B)
+    _write(src, "b/DJI_0001.SRT", FLIGHT_A)
+    _write(src, "b/movie.srt", NOT_TELEMETRY)
+    _write(src, "c/DJI_0001.SRT", _hz30_srt(T0 + timedelta(days=1), 3.0))
+
+    def step():
+        result, manifest = _incremental(src, out)
+        assert _scan_signature(*result) == _scan_signature(
+            *scan_flights(src, recursive=True)
+        )
+        return manifest
+
+    assert step().parsed == 5
+    again = step()
+    assert again.parsed == 0 and not again.changed
+    # A new file in b/ parses only that file; a split continuation in a/
+    # re-parses the chain it extends.
+    _write(src, "b/DJI_0002.SRT", FLIGHT_B)
+    assert step().parsed == 1
+    _write(src, "a/DJI_0003.SRT", SEG_C)
+    assert step().parsed == 3
+    os.remove(src / "a" / "DJI_0002.SRT")
+    assert step().changed
+    _write(src, "c/DJI_0001.SRT", _hz30_srt(T0 + timedelta(days=2), 2.0))
+    assert step().parsed == 1
+
+
+def test_manifest_from_another_scan_setup_is_ignored(tmp_path):
+    src, out = tmp_path / "src", tmp_path / ".m.json"
+    _write(src, "DJI_0001.SRT", FLIGHT_A)
+    _incremental(src, out)
+    other = FlightManifest(out, scan_key(src, True, 0.0, None))
+    scan_flights(src, recursive=True, join_gap=0.0, manifest=other)
+    assert other.parsed == 1
+
+
+def test_join_is_per_directory(tmp_path):
+    # b/ records a flight between a/'s two segments; a/ must still join.
+    _write(tmp_path, "a/DJI_0001.SRT", SEG_A)
+    _write(tmp_path, "a/DJI_0002.SRT", SEG_B)
+    _write(tmp_path, "b/DJI_0001.SRT", _hz30_srt(T0 + timedelta(seconds=2), 2.0))
+    tracks, _ = scan_flights(tmp_path, recursive=True)
+    assert [t.segments for t in tracks] == [["a/DJI_0001", "a/DJI_0002"], None]
+
+
+def test_files_differing_only_in_suffix_case_are_both_scanned(tmp_path):
+    src, out = tmp_path / "src", tmp_path / ".m.json"
+    _write(src, "DJI_0001.SRT", FLIGHT_A)
+    _write(src, "DJI_0001.srt", FLIGHT_B)
+    if len(os.listdir(src)) < 2:
+        pytest.skip("case-insensitive file system")
+    progress = []
+    tracks, _ = scan_flights(src, on_file=lambda *a: progress.append(a))
+    assert [t.name for t in tracks] == ["DJI_0001", "DJI_0001"]
+    assert progress == [(1, 2, "DJI_0001"), (2, 2, "DJI_0001")]
+    result, manifest = _incremental(src, out)
+    assert sorted(manifest.files) == ["DJI_0001.SRT", "DJI_0001.srt"]
+    assert _scan_signature(*result) == _scan_signature(tracks, [])
+    again, manifest = _incremental(src, out)
+    assert manifest.parsed == 0
+    assert _scan_signature(*again) == _scan_signature(tracks, [])
+
+
+def _schema():
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "docs", "progress_jsonl.schema.json"
+    )
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_cli_incremental_leaves_unchanged_outputs_alone(tmp_path):
+    _write(tmp_path, "DJI_0001.SRT", FLIGHT_A)
+    out = tmp_path / "flightmap.html"
+    args = ["flightmap", str(tmp_path), "--incremental", "--progress", "jsonl"]
+
+    def run():
+        res = CliRunner().invoke(main, args)
+        assert res.exit_code == 0, res.output
+        result = json.loads(res.output.splitlines()[-1])
+        jsonschema.validate(result, _schema())
+        return result["summary"]
+
+    first = run()
+    assert first["parsed_files"] == 1 and not first["outputs_unchanged"]
+    assert (tmp_path / ".flightmap.manifest.json").exists()
+    before = out.stat().st_mtime_ns
+    second = run()
+    assert second["parsed_files"] == 0 and second["outputs_unchanged"]
+    assert out.stat().st_mtime_ns == before
+    _write(tmp_path, "DJI_0002.SRT", FLIGHT_B)
+    third = run()
+    assert third["parsed_files"] == 1 and not third["outputs_unchanged"]
+    assert "DJI_0002" in out.read_text(encoding="utf-8")
+
+
+def test_cli_incremental_refuses_redact(tmp_path):
+    _write(tmp_path, "DJI_0001.SRT", FLIGHT_A)
+    res = CliRunner().invoke(
+        main, ["flightmap", str(tmp_path), "--incremental", "--redact", "fuzz"]
+    )
+    assert res.exit_code != 0
+    assert "--incremental" in res.output
+    assert not list(tmp_path.glob(".*.manifest.json"))
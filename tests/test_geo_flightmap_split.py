@@ -0,0 +1,103 @@
+"""Per-flight data files for the flat HTML maps (geo/flightmap_split.py, --split-data)."""
+
+import json
+
+from click.testing import CliRunner
+
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.geo.flightmap_html import write_flights_html
+from dji_metadata_embedder.geo.flightmap_split import data_dir
+
+from tests.test_geo_flightmap import FLIGHT_A, FLIGHT_B, _bracket_srt, _write
+from tests.test_geo_flightmap_compact import _DATA_RE, _flight
+
+
+def _index(html):
+    return json.loads(_DATA_RE.search(html).group(1))
+
+
+def _sidecars(out):
+    return sorted(p.name for p in data_dir(out).glob("*.json"))
+
+
+def test_split_data_writes_one_file_per_flight(tmp_path):
+    out = tmp_path / "flightmap.html"
+    tracks = [_flight("A", 0.0), _flight("B", 0.01)]
+    write_flights_html(tracks, out, "t", split_data=True)
+    assert _sidecars(out) == ["00000.json", "00001.json"]
+    index = _index(out.read_text(encoding="utf-8"))
+    for feature, name in zip(index["features"], _sidecars(out)):
+        props = feature["properties"]
+        assert feature["geometry"]["type"] == "Point" and len(feature["bbox"]) == 4
+        assert props["data"] == f"flightmap-data/{name}"
+        assert "times_s" not in props and props["end_s"] > 0
+        full = json.loads((data_dir(out) / name).read_text(encoding="utf-8"))
+        line = full["features"][0]
+        assert line["geometry"]["type"] == "LineString"
+        assert line["properties"]["times_s"][-1] == props["end_s"]
+        assert line["geometry"]["coordinates"][0] == feature["geometry"]["coordinates"]
+
+
+def test_split_data_files_follow_compact(tmp_path):
+    out = tmp_path / "flightmap.html"
+    tracks = [_flight("A", 34.0)]
+    write_flights_html(tracks, out, "t", split_data=True, compact=True)
+    html = out.read_text(encoding="utf-8")
+    assert "expandFlights" in html and "function splitFlight" in html
+    sidecar = json.loads((data_dir(out) / "00000.json").read_text(encoding="utf-8"))
+    assert isinstance(sidecar["features"][0]["geometry"]["coordinates"], str)
+
+
+
+def test_rerun_removes_stale_files(tmp_path):
+    out = tmp_path / "flightmap.html"
+    write_flights_html([_flight("A", 0.0), _flight("B", 0.01)], out, "t", split_data=True)
+    (data_dir(out) / "notes.txt").write_text("mine", encoding="utf-8")
+    write_flights_html([_flight("A", 0.0)], out, "t", split_data=True)
+    assert _sidecars(out) == ["00000.json"]
+    write_flights_html([_flight("A", 0.0)], out, "t")
+    assert _sidecars(out) == []
+    assert (data_dir(out) / "notes.txt").exists()
+    assert "function splitFlight" not in out.read_text(encoding="utf-8")
+    assert _DATA_RE.search(out.read_text(encoding="utf-8"))
+
+
+def test_cli_split_data(tmp_path):
+    _write(tmp_path, "DJI_0001.SRT", FLIGHT_A)
+    _write(tmp_path, "DJI_0002.SRT", FLIGHT_B)
+    res = CliRunner().invoke(main, ["flightmap", str(tmp_path), "--split-data"])
+    assert res.exit_code == 0, res.output
+    assert _sidecars(tmp_path / "flightmap.html") == ["00000.json", "00001.json"]
+    res = CliRunner().invoke(main, ["map", str(tmp_path), "--split-data"])
+    assert res.exit_code == 0, res.output
+    assert len(_sidecars(tmp_path / "map.html")) == 2
+    assert "map-data/00000.json" in (tmp_path / "map.html").read_text(encoding="utf-8")
+
+
+def test_cli_split_data_files_are_redacted(tmp_path):
+    srt = _bracket_srt((10.123456, 20.654321, 5.0), (10.124567, 20.655432, 6.0))
+    _write(tmp_path, "DJI_0001.SRT", srt)
+    out = tmp_path / "flightmap.html"
+
+    def track(*extra):
+        res = CliRunner().invoke(
+            main, ["flightmap", str(tmp_path), "--split-data", *extra]
+        )
+        assert res.exit_code == 0, res.output
+        sidecar = json.loads((data_dir(out) / "00000.json").read_text(encoding="utf-8"))
+        return sidecar["features"][0]["geometry"]["coordinates"]
+
+    exact = track()
+    fuzzed = track("--redact", "fuzz")
+    assert fuzzed != exact
+    assert _index(out.read_text(encoding="utf-8"))["redacted"] == "fuzz"
+
+
+def test_cli_split_data_refuses_3d(tmp_path):
+    _write(tmp_path, "DJI_0001.SRT", FLIGHT_A)
+    res = CliRunner().invoke(
+        main, ["flightmap", str(tmp_path), "--3d", "--split-data"]
+    )
+    assert res.exit_code != 0
+    assert "--split-data" in res.output
+    assert not (tmp_path / "flightmap-3d-data").exists()
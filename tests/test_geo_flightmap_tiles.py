@@ -0,0 +1,120 @@
+"""Static track tile pyramid (geo/flightmap_tiles.py, flightmap -f tiles)."""
+
+import json
+import os
+import re
+
+import jsonschema
+from click.testing import CliRunner
+
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.geo import flightmap_tiles
+from dji_metadata_embedder.geo.flightmap_tiles import (
+    MAX_ZOOM,
+    MIN_ZOOM,
+    tiles_dir,
+    track_tiles,
+    write_flight_tiles,
+)
+from dji_metadata_embedder.geo.track import Track
+
+from tests.test_geo_flightmap import FLIGHT_A, FLIGHT_B, _write
+from tests.test_geo_flightmap_compact import _flight
+from tests.test_geo_flightmap_lod import _survey
+
+_META_RE = re.compile(
+    r'<script type="application/json" id="tile-meta">\s*(.*?)\s*</script>', re.S
+)
+
+
+def _tiles(out):
+    root = tiles_dir(out)
+    return {
+        p.relative_to(root).as_posix(): json.loads(p.read_text(encoding="utf-8"))
+        for p in root.rglob("*.json")
+    }
+
+
+def test_pyramid_covers_every_zoom_with_flight_summaries(tmp_path):
+    out = tmp_path / "flightmap-tiles.html"
+    tracks = [_survey(), _flight("B", 46.6)]
+    count = write_flight_tiles(tracks, out, "t")
+    tiles = _tiles(out)
+    assert count == len(tiles)
+    assert {int(k.split("/")[0]) for k in tiles} == set(range(MIN_ZOOM, MAX_ZOOM + 1))
+    for fc in tiles.values():
+        assert fc["type"] == "FeatureCollection"
+        for f in fc["features"]:
+            assert f["geometry"]["type"] == "MultiLineString"
+            assert f["properties"]["i"] in (0, 1) and f["properties"]["name"]
+    meta = json.loads(_META_RE.search(out.read_text(encoding="utf-8")).group(1))
+    assert meta["tiles"] == "flightmap-tiles/{z}/{x}/{y}.json"
+    assert meta["flights"] == 2 and meta["minzoom"] == MIN_ZOOM
+    west, south, east, north = meta["bounds"]
+    lats = [p.lat for t in tracks for p in t.points]
+    lons = [p.lon for t in tracks for p in t.points]
+    assert [west, south, east, north] == [min(lons), min(lats), max(lons), max(lats)]
+
+
+def test_zooms_simplify_and_the_deepest_keeps_every_fix():
+    track = _survey()
+    per_zoom = {}
+    for (z, _x, _y), feature in track_tiles(track, 0):
+        per_zoom.setdefault(z, set()).update(
+            tuple(c) for run in feature["geometry"]["coordinates"] for c in run
+        )
+    counts = [len(per_zoom[z]) for z in range(MIN_ZOOM, MAX_ZOOM + 1)]
+    assert counts == sorted(counts)
+    full = {(round(p.lon, 6), round(p.lat, 6)) for p in track.points}
+    assert counts[0] < 20 and counts[-1] == len(full)
+
+
+def test_spilled_build_matches_a_buffered_one(tmp_path, monkeypatch):
+    tracks = [_survey(), _flight("B", 46.6), _flight("C", 46.7)]
+    write_flight_tiles(tracks, tmp_path / "a.html", "t")
+    monkeypatch.setattr(flightmap_tiles, "BUFFER_BYTES", 1)
+    write_flight_tiles(iter(tracks), tmp_path / "b.html", "t")
+    assert _tiles(tmp_path / "a.html") == _tiles(tmp_path / "b.html")
+    assert not list(tiles_dir(tmp_path / "b.html").rglob("*.part"))
+
+
+def test_single_fix_flight_is_a_point_tile():
+    track = Track(name="hover", points=_flight("x", 10.0, points=1).points)
+    features = list(track_tiles(track, 3))
+    assert len(features) == MAX_ZOOM - MIN_ZOOM + 1
+    assert all(f["geometry"]["type"] == "Point" for _, f in features)
+
+
+def test_rerun_removes_stale_tiles_only(tmp_path):
+    out = tmp_path / "flightmap-tiles.html"
+    write_flight_tiles([_flight("A", 10.0), _flight("B", -30.0)], out, "t")
+    (tiles_dir(out) / "README.txt").write_text("mine", encoding="utf-8")
+    write_flight_tiles([_flight("A", 10.0)], out, "t")
+    assert all(
+        f["properties"]["name"] == "A"
+        for fc in _tiles(out).values() for f in fc["features"]
+    )
+    assert (tiles_dir(out) / "README.txt").exists()
+
+
+def _schema():
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "docs", "progress_jsonl.schema.json"
+    )
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_cli_format_tiles(tmp_path):
+    _write(tmp_path, "DJI_0001.SRT", FLIGHT_A)
+    _write(tmp_path, "DJI_0002.SRT", FLIGHT_B)
+    res = CliRunner().invoke(
+        main, ["flightmap", str(tmp_path), "-f", "tiles", "--progress", "jsonl"]
+    )
+    assert res.exit_code == 0, res.output
+    result = json.loads(res.output.splitlines()[-1])
+    jsonschema.validate(result, _schema())
+    out = tmp_path / "flightmap-tiles.html"
+    assert result["summary"]["tiles"] == len(_tiles(out)) > 0
+    assert "dji-embed serve" in out.read_text(encoding="utf-8")
+    assert not (tmp_path / "flightmap.html").exists()
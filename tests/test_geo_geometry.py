@@ -6,10 +6,16 @@ from dji_metadata_embedder.geo.geometry import (
     initial_bearing_deg,
     downsample_by_time,
     point_utc,
+    simplify_indices,
+    simplify_points,
+    simplify_ranks,
 )
 from dji_metadata_embedder.geo.track import TrackPoint
 
 
+M_PER_DEG = 111320.0
+
+
 def _p(lat, lon, secs):
     base = datetime(2026, 1, 1, 0, 0, 0)
     return TrackPoint(lat=lat, lon=lon, alt=0.0, timestamp="", utc=base + timedelta(seconds=secs))
@@ -31,13 +37,75 @@ def test_downsample_keeps_first_and_last():
     assert [round((point_utc(p) - point_utc(pts[0])).total_seconds()) for p in kept] == [0, 2, 4]
 
 
+def test_simplify_collapses_straight_legs_and_hovers():
+    # 100 rows due north at 1 m spacing, 100 rows hovering, 100 rows east.
+    lat = [i / M_PER_DEG for i in range(100)] + [99 / M_PER_DEG] * 200
+    lon = [0.0] * 200 + [i / M_PER_DEG for i in range(1, 101)]
+    alt = [50.0] * 300
+    kept = simplify_indices(lat, lon, alt, 1.0)
+    assert kept[0] == 0 and kept[-1] == 299
+    assert len(kept) == 3 and 99 <= kept[1] <= 199
+
+
+def test_simplify_keeps_corners_and_climbs():
+    # An L: 50 m north then 50 m east, with a 10 m climb on the second leg.
+    lat = [i / M_PER_DEG for i in range(51)] + [50 / M_PER_DEG] * 50
+    lon = [0.0] * 51 + [i / M_PER_DEG for i in range(1, 51)]
+    alt = [0.0] * 51 + [0.0] * 25 + [10.0] * 25
+    kept = simplify_indices(lat, lon, alt, 2.0)
+    assert 50 in kept                       # the corner
+    assert {75, 76} & set(kept)             # the step in altitude
+    # Every dropped row lies within tolerance; an altitude bound tighter
+    # than the horizontal one keeps more.
+    assert len(simplify_indices(lat, lon, alt, 2.0, alt_tolerance_m=0.5)) >= len(kept)
+
+
+def test_simplify_keeps_the_turning_point_of_an_out_and_back():
+    # Flown out 30 m and straight back: the far end is on the chord's line
+    # but far from the chord segment.
+    lat = [i / M_PER_DEG for i in range(31)] + [i / M_PER_DEG for i in range(29, -1, -1)]
+    lon = [0.0] * len(lat)
+    alt = [0.0] * len(lat)
+    assert 30 in simplify_indices(lat, lon, alt, 1.0)
+
+
+def test_simplify_ranks_reproduce_simplify_indices():
+    # A wandering, climbing and hovering track: one ranking pass must keep
+    # exactly the rows a dedicated Douglas-Peucker run keeps, per tolerance.
+    lat, lon, alt = [0.0], [0.0], [20.0]
+    for i in range(1, 400):
+        heading = math.sin(i / 23) * 2.5
+        step = 0.0 if 150 <= i < 200 else 3.0
+        lat.append(lat[-1] + step * math.cos(heading) / M_PER_DEG)
+        lon.append(lon[-1] + step * math.sin(heading) / M_PER_DEG)
+        alt.append(alt[-1] + (0.4 if 150 <= i < 200 else math.sin(i / 7) * 0.3))
+    ranks = simplify_ranks(lat, lon, alt)
+    for tol in (0.3, 1.0, 4.0, 25.0):
+        assert [i for i, r in enumerate(ranks) if r > tol] == simplify_indices(
+            lat, lon, alt, tol
+        )
+    floored = simplify_ranks(lat, lon, alt, floor_m=4.0)
+    assert [i for i, r in enumerate(floored) if r > 4.0] == simplify_indices(
+        lat, lon, alt, 4.0
+    )
+
+
+def test_simplify_points_keeps_each_segment_boundary():
+    pts = [_p(i / M_PER_DEG, 0.0, i) for i in range(20)]
+    for p in pts[10:]:
+        p.segment = 1
+    kept = simplify_points(pts, 5.0)
+    assert [(round(p.lat * M_PER_DEG), p.segment) for p in kept] == [
+        (0, 0), (9, 0), (10, 1), (19, 1)
+    ]
+
+
 # Oblique view-frustum ground projection (#265). The 45-degree-pitch cases
 # have exact closed forms with the 24mm/4:3 lens (tan(HFOV/2) = 0.75,
 # tan(VFOV/2) = 0.5625): the cosines cancel, so the far edge sits at
 # 100 * (1 + 0.5625) / (1 - 0.5625) = 357.142857... m and the near edge at
 # 100 * (1 - 0.5625) / (1 + 0.5625) = 28.0 m for a 100 m AGL camera.
 
-M_PER_DEG = 111320.0
 HFOV = math.degrees(2 * math.atan(0.75))
 VFOV = math.degrees(2 * math.atan(0.5625))
 
@@ -0,0 +1,80 @@
+"""Streaming HTML map writers (geo/html_stream.py)."""
+
+import json
+
+import pytest
+
+from dji_metadata_embedder.geo.flightmap3d_html import (
+    flights_to_3d_html,
+    write_flights_3d_html,
+)
+from dji_metadata_embedder.geo.flightmap_html import flights_to_html, write_flights_html
+from dji_metadata_embedder.geo.html_stream import (
+    DATA_SLOT,
+    collection_chunks,
+    page_chunks,
+)
+from dji_metadata_embedder.geo.map_html import mixed_to_html, write_mixed_html
+from dji_metadata_embedder.geo.photomap_html import photos_to_html, write_photos_html
+from dji_metadata_embedder.geo.track import Track
+
+from tests.test_geo_flightmap_compact import _flight
+from tests.test_geo_photomap_html import POINTS
+
+
+def test_collection_chunks_match_json_dumps():
+    features = [
+        {"type": "Feature", "properties": {"name": "</script><b>"}},
+        {"type": "Feature", "properties": {"n": [1, 2.5, None]}},
+    ]
+    for header in ({"type": "FeatureCollection", "redacted": "fuzz"}, {}):
+        for separators in (None, (",", ":")):
+            expected = json.dumps(
+                {**header, "features": features}, separators=separators
+            ).replace("<", "\\u003c")
+            text = "".join(collection_chunks(header, iter(features), separators=separators))
+            assert text == expected
+            assert "</script>" not in text
+    assert "".join(collection_chunks({}, [])) == '{"features": []}'
+
+
+def test_written_maps_match_the_string_renderers(tmp_path):
+    tracks = [_flight("A", 34.0), _flight("B", 34.01)]
+    out = tmp_path / "m.html"
+    cases = [
+        (lambda: write_flights_html(tracks, out, "t", compact=True),
+         flights_to_html(tracks, "t", compact=True)),
+        (lambda: write_flights_3d_html(tracks, out, "t"), flights_to_3d_html(tracks, "t")),
+        (lambda: write_mixed_html(POINTS, tracks, out, "t"), mixed_to_html(POINTS, tracks, "t")),
+        (lambda: write_photos_html(POINTS, out, "t"), photos_to_html(POINTS, "t")),
+    ]
+    for write, html in cases:
+        write()
+        assert out.read_text(encoding="utf-8") == html
+        assert DATA_SLOT not in html
+
+
+def test_failed_write_keeps_the_previous_map(tmp_path):
+    out = tmp_path / "flightmap.html"
+    write_flights_html([_flight("A", 34.0)], out, "t")
+    before = out.read_text(encoding="utf-8")
+    broken = Track(name="empty", points=[])   # no fix to place it at
+    with pytest.raises(IndexError):
+        write_flights_html([_flight("B", 34.01), broken], out, "t")
+    assert out.read_text(encoding="utf-8") == before
+    assert [p.name for p in tmp_path.iterdir()] == ["flightmap.html"]
+
+
+def test_features_are_encoded_one_at_a_time():
+    built = []
+
+    def features():
+        for n in range(3):
+            built.append(n)
+            yield {"n": n}
+
+    chunks = collection_chunks({}, features())
+    assert next(chunks) == '{"features": ['
+    assert next(chunks) == '{"n": 0}' and built == [0]
+    assert next(chunks) == ', {"n": 1}' and built == [0, 1]
+    assert "".join(page_chunks(f"<p>{DATA_SLOT}</p>", ["[1]"])) == "<p>[1]</p>"
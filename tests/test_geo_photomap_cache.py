@@ -0,0 +1,132 @@
+"""Photo scans through the telemetry cache (geo/photomap.py, ``photomap --cache``)."""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import jsonschema
+from click.testing import CliRunner
+
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.geo import photomap as pm
+from dji_metadata_embedder.geo.photomap import scan_photos
+from dji_metadata_embedder.utils.cache import TelemetryCache, use_cache
+
+from tests.test_cache import _bump_mtime
+from tests.test_geo_flightmap_tiles import _schema
+
+
+def _fake_exiftool(monkeypatch):
+    """Answer scans from the files' names: ``gps*`` photos carry a fix.
+
+    Returns the list of file targets each call asked for (a directory
+    target is expanded, like ``-ext`` would).
+    """
+    calls = []
+    monkeypatch.setattr(pm, "_exiftool_version_of", lambda exe: "13.10")
+
+    def fake(args, timeout=None):
+        assert "-b" in args
+        targets = [a for a in args if not a.startswith("-") and a not in pm._PHOTO_EXTS]
+        if len(targets) == 1 and Path(targets[0]).is_dir():
+            targets = [str(p) for p in pm._photo_files(Path(targets[0]), "-r" in args)]
+        calls.append(sorted(Path(t).name for t in targets))
+        data = []
+        for target in targets:
+            entry = {"SourceFile": target.replace(os.sep, "/")}
+            if Path(target).name.startswith("gps"):
+                size = Path(target).stat().st_size
+                entry.update(
+                    GPSLatitude=60.0 + size / 1000, GPSLongitude=24.9,
+                    Model="FC8482", ThumbnailImage="base64:/9j/THUMB",
+                )
+            data.append(entry)
+        return subprocess.CompletedProcess(args, 0, json.dumps(data), "")
+
+    monkeypatch.setattr(pm, "call_exiftool", fake)
+    return calls
+
+
+def _photos(tmp_path):
+    root = tmp_path / "photos"
+    (root / "day2").mkdir(parents=True)
+    (root / ".trash").mkdir()
+    (root / "gps_a.jpg").write_bytes(b"a")
+    (root / "day2" / "gps_b.DNG").write_bytes(b"bb")
+    (root / "nofix.jpeg").write_bytes(b"c")
+    (root / ".trash" / "gps_old.jpg").write_bytes(b"d")
+    (root / "notes.txt").write_text("x")
+    return root
+
+
+def test_rerun_reads_only_changed_photos(tmp_path, monkeypatch):
+    root = _photos(tmp_path)
+    calls = _fake_exiftool(monkeypatch)
+    cache = TelemetryCache(tmp_path / "cache")
+    with use_cache(cache):
+        first = scan_photos(root, recursive=True)
+        assert calls == [["gps_a.jpg", "gps_b.DNG", "nofix.jpeg"]]
+        assert (cache.hits, cache.misses) == (0, 3)
+        assert scan_photos(root, recursive=True) == first
+        assert len(calls) == 1 and (cache.hits, cache.misses) == (3, 3)
+
+        (root / "day2" / "gps_b.DNG").write_bytes(b"bbb")
+        _bump_mtime(root / "day2" / "gps_b.DNG")
+        points, skipped = scan_photos(root, recursive=True)
+    assert calls[-1] == ["gps_b.DNG"]                 # only the miss, by name
+    assert (cache.hits, cache.misses) == (5, 4)
+    assert [p.name for p in points] == ["day2/gps_b.DNG", "gps_a.jpg"]
+    assert points[0].lat == 60.003 and points[1] == first[0][1]
+    assert skipped == first[1] == ["nofix.jpeg"]
+    assert points[1].thumbnail_b64 == "/9j/THUMB" and points[1].model == "FC8482"
+
+
+def test_names_follow_the_scan_root_and_corrupt_entries_rescan(tmp_path, monkeypatch):
+    root = _photos(tmp_path)
+    calls = _fake_exiftool(monkeypatch)
+    cache = TelemetryCache(tmp_path / "cache")
+    with use_cache(cache):
+        scan_photos(root, recursive=True)
+        points, _ = scan_photos(root / "day2")
+        assert [p.name for p in points] == ["gps_b.DNG"]   # basename, flat scan
+        assert len(calls) == 1
+        key = cache.key("photo", root / "gps_a.jpg", pm._photo_cache_version())
+        cache.put(key, b"{not json")
+        points, _ = scan_photos(root, recursive=True)
+    assert calls[-1] == ["gps_a.jpg"]
+    assert [p.name for p in points] == ["day2/gps_b.DNG", "gps_a.jpg"]
+
+
+def test_without_cache_the_directory_scan_is_unchanged(tmp_path, monkeypatch):
+    root = _photos(tmp_path)
+    calls = _fake_exiftool(monkeypatch)
+    scan_photos(root, recursive=True)
+    scan_photos(root, recursive=True)
+    assert len(calls) == 2
+
+
+def test_cli_photomap_cache_counters(tmp_path, monkeypatch):
+    monkeypatch.setenv("DJIEMBED_CACHE_DIR", str(tmp_path / "cache"))
+    root = _photos(tmp_path)
+    calls = _fake_exiftool(monkeypatch)
+
+    def result(*extra):
+        res = CliRunner().invoke(
+            main, ["photomap", str(root), "-r", "--progress", "jsonl", *extra]
+        )
+        assert res.exit_code == 0, res.output
+        event = json.loads(res.stdout.splitlines()[-1])
+        jsonschema.validate(event, _schema())
+        return event["summary"]
+
+    assert "cache_hits" not in result()
+    assert result("--cache") == {
+        "photos": 2, "skipped": 1, "cache_hits": 0, "cache_misses": 3,
+    }
+    html = (root / "photomap.html").read_bytes()
+    n = len(calls)
+    again = result("--cache")
+    assert (again["cache_hits"], again["cache_misses"]) == (3, 0)
+    assert len(calls) == n
+    assert (root / "photomap.html").read_bytes() == html
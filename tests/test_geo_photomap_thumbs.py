@@ -0,0 +1,98 @@
+"""Thumbnail files beside the photo map (geo/photomap_thumbs.py, --thumb-dir)."""
+
+import base64
+import hashlib
+from pathlib import PurePosixPath
+
+import pytest
+from click.testing import CliRunner
+
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.geo.photomap import PhotoPoint
+from dji_metadata_embedder.geo.photomap_html import write_photos_html
+from dji_metadata_embedder.geo.photomap_thumbs import parse_thumb_dir
+
+from tests.test_cli_photomap import CANNED, _mock_scan
+from tests.test_geo_photomap_html import _embedded_geojson
+
+JPEG_A = base64.b64encode(b"\xff\xd8\xff\xe0bracket-a\xff\xd9").decode()
+JPEG_B = base64.b64encode(b"\xff\xd8\xff\xe0other-b\xff\xd9").decode()
+
+
+def _point(name, thumb, lat=60.17):
+    return PhotoPoint(lat=lat, lon=24.95, alt=None, name=name, thumbnail_b64=thumb)
+
+
+def _thumbs(directory):
+    return sorted(p.name for p in directory.glob("*.jpg"))
+
+
+def test_thumbnails_are_written_once_and_referenced(tmp_path):
+    out = tmp_path / "photomap.html"
+    points = [
+        _point("a1.jpg", JPEG_A), _point("a2.jpg", JPEG_A), _point("b.jpg", JPEG_B),
+        _point("none.jpg", None),
+    ]
+    write_photos_html(points, out, "t", thumb_dir=PurePosixPath("thumbs"))
+    names = _thumbs(tmp_path / "thumbs")
+    assert len(names) == 2                       # the bracket shares one file
+    props = {
+        f["properties"]["name"]: f["properties"]
+        for f in _embedded_geojson(out.read_text(encoding="utf-8"))["features"]
+    }
+    assert props["a1.jpg"]["turl"] == props["a2.jpg"]["turl"]
+    assert props["b.jpg"]["turl"] != props["a1.jpg"]["turl"]
+    assert {p["turl"] for p in props.values() if "turl" in p} == {
+        f"thumbs/{n}" for n in names
+    }
+    assert all("thumb" not in p for p in props.values())
+    assert "turl" not in props["none.jpg"]
+    stored = (tmp_path / props["b.jpg"]["turl"]).read_bytes()
+    assert stored == base64.b64decode(JPEG_B)
+
+
+def test_rerun_keeps_shared_files_and_drops_stale_ones(tmp_path):
+    out = tmp_path / "photomap.html"
+    thumbs = tmp_path / "thumbs"
+    write_photos_html(
+        [_point("a.jpg", JPEG_A), _point("b.jpg", JPEG_B)], out, "t",
+        thumb_dir=PurePosixPath("thumbs"),
+    )
+    (thumbs / "cover.jpg").write_bytes(b"mine")
+    a_name = hashlib.sha256(base64.b64decode(JPEG_A)).hexdigest()[:20] + ".jpg"
+    before = (thumbs / a_name).stat().st_mtime_ns
+    write_photos_html(
+        [_point("a.jpg", JPEG_A)], out, "t", thumb_dir=PurePosixPath("thumbs")
+    )
+    assert _thumbs(thumbs) == sorted(["cover.jpg", a_name])
+    assert (thumbs / a_name).stat().st_mtime_ns == before   # not rewritten
+    assert (thumbs / "cover.jpg").read_bytes() == b"mine"
+
+
+def test_undecodable_thumbnail_stays_embedded(tmp_path):
+    out = tmp_path / "photomap.html"
+    write_photos_html(
+        [_point("odd.jpg", "/9j/THUMB2")], out, "t", thumb_dir=PurePosixPath("t")
+    )
+    props = _embedded_geojson(out.read_text(encoding="utf-8"))["features"][0]["properties"]
+    assert props["thumb"] == "/9j/THUMB2" and "turl" not in props
+    assert not (tmp_path / "t").exists()
+
+
+@pytest.mark.parametrize("spec", ["/abs/thumbs", "../up", "a/../../b", "C:\\thumbs", " "])
+def test_thumb_dir_must_stay_inside_the_map_folder(spec):
+    with pytest.raises(ValueError):
+        parse_thumb_dir(spec)
+    assert parse_thumb_dir("media\\thumbs").as_posix() == "media/thumbs"
+
+
+def test_cli_thumb_dir(monkeypatch, tmp_path):
+    data = [dict(CANNED[0], ThumbnailImage=f"base64:{JPEG_A}")]
+    _mock_scan(monkeypatch, data)
+    res = CliRunner().invoke(main, ["photomap", str(tmp_path), "--thumb-dir", "thumbs"])
+    assert res.exit_code == 0, res.output
+    html = (tmp_path / "photomap.html").read_text(encoding="utf-8")
+    assert JPEG_A not in html
+    assert len(_thumbs(tmp_path / "thumbs")) == 1
+    res = CliRunner().invoke(main, ["photomap", str(tmp_path), "--thumb-dir", "../x"])
+    assert res.exit_code != 0 and "--thumb-dir" in res.output
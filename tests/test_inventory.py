@@ -0,0 +1,98 @@
+"""DirectoryInventory: one scandir pass answers every companion lookup."""
+
+import os
+import subprocess
+from pathlib import Path
+
+from dji_metadata_embedder.embedder import DJIMetadataEmbedder
+from dji_metadata_embedder.utils.inventory import DirectoryInventory
+
+SRT = "1\n00:00:00,000 --> 00:00:01,000\nGPS(1,2,3)"
+
+
+def _touch(directory: Path, *names: str) -> None:
+    for name in names:
+        (directory / name).write_bytes(b"")
+
+
+def test_companion_prefers_exact_spelling_then_any_case(tmp_path):
+    _touch(tmp_path, "a.mp4", "a.SRT", "a.srt", "B.MP4", "b.Srt", "c.mp4")
+    (tmp_path / "c.srt").mkdir()  # a directory is never a companion
+    inv = DirectoryInventory.scan(tmp_path)
+    assert inv.companion("a", (".srt", ".SRT")) == tmp_path / "a.srt"
+    assert inv.companion("a", (".SRT", ".srt")) == tmp_path / "a.SRT"
+    # Real on-disk spelling, not the guessed one.
+    assert inv.companion("B", (".srt", ".SRT")) == tmp_path / "b.Srt"
+    assert inv.companion("c", (".srt", ".SRT")) is None
+    assert "c.srt" not in inv and len(inv) == 6
+
+
+def test_files_and_prefix_lookups(tmp_path):
+    _touch(
+        tmp_path,
+        "DJI_0001.MP4", "dji_0002.mp4", "x.Mp4", "notes.txt",
+        "DJI_0001_FLY001.DAT", "dji_0001_fly002.dat", "DJI_0002.DAT",
+    )
+    inv = DirectoryInventory.scan(tmp_path)
+    assert [p.name for p in inv.files([".mp4"])] == [
+        "DJI_0001.MP4", "dji_0002.mp4", "x.Mp4",
+    ]
+    assert [p.name for p in inv.stem_prefixed("DJI_0001", ".dat")] == [
+        "DJI_0001_FLY001.DAT", "dji_0001_fly002.dat",
+    ]
+
+
+def test_embed_lists_the_folder_once(tmp_path, monkeypatch):
+    for i in range(1, 6):
+        (tmp_path / f"DJI_{i:04d}.MP4").write_bytes(b"x")
+        (tmp_path / f"DJI_{i:04d}.SRT").write_text(SRT)
+        (tmp_path / f"DJI_{i:04d}.m4a").write_bytes(b"a")
+        (tmp_path / f"DJI_{i:04d}_FLY.DAT").write_bytes(b"")
+
+    def run(cmd, *a, **k):
+        if "ffmpeg" in str(cmd[0]).lower():
+            Path(cmd[-1]).write_bytes(b"embedded")
+            return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
+        out = '{"format": {"duration": "10.0"}}'
+        return type("R", (), {"returncode": 0, "stdout": out, "stderr": ""})()
+
+    listed: list[str] = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path="."):
+        listed.append(str(path))
+        return real_scandir(path)
+
+    class FakeProgress:
+        def __init__(self, *a, **k):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *a):
+            return False
+
+        def add_task(self, *a, **k):
+            return 0
+
+        def update(self, *a, **k):
+            pass
+
+        def advance(self, *a):
+            pass
+
+    monkeypatch.setattr(subprocess, "run", run)
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    monkeypatch.setattr(Path, "iterdir", None)  # the old per-clip re-listing
+    monkeypatch.setattr("dji_metadata_embedder.embedder.Progress", FakeProgress)
+    # DAT parsing is beside the point; the empty logs would only warn.
+    monkeypatch.setattr(
+        "dji_metadata_embedder.embedder.parse_dat_v13", lambda p: {"records": []}
+    )
+    result = DJIMetadataEmbedder(
+        str(tmp_path), audio_sidecar=True, dat_autoscan=True
+    ).process_directory()
+    assert result["processed"] == 5
+    assert result["warnings"] == []
+    assert listed == [str(tmp_path)]
@@ -0,0 +1,108 @@
+"""MediaProbe: one memoized ffprobe (format+streams JSON) per file identity."""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+from dji_metadata_embedder import metadata_check
+from dji_metadata_embedder.core.validator import get_video_duration
+from dji_metadata_embedder.embedder import (
+    DJIMetadataEmbedder,
+    _dji_data_stream_tags,
+    _ffprobe_duration,
+)
+from dji_metadata_embedder.utils.media_probe import probe_media
+
+PROBE = {
+    "format": {"duration": "12.5", "tags": {"creation_time": "2024-01-01"}},
+    "streams": [
+        {"codec_type": "video", "codec_tag_string": "avc1"},
+        {"codec_type": "data", "codec_tag_string": "djmd"},
+    ],
+}
+
+
+def _counting_run(calls: list, payload=PROBE):
+    def run(cmd, *args, **kwargs):
+        prog = str(cmd[0]).lower()
+        if "ffprobe" in prog:
+            calls.append(Path(cmd[-1]).name)
+            return type(
+                "R", (), {"returncode": 0, "stdout": json.dumps(payload), "stderr": ""}
+            )()
+        if "ffmpeg" in prog:
+            Path(cmd[-1]).write_bytes(b"embedded content")
+        return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
+
+    return run
+
+
+class _FakeProgress:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add_task(self, *args, **kwargs):
+        return 0
+
+    def update(self, task, description=None):
+        pass
+
+    def advance(self, task):
+        pass
+
+
+def test_every_query_shares_one_probe(tmp_path, monkeypatch):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"x")
+    calls: list = []
+    monkeypatch.setattr(subprocess, "run", _counting_run(calls))
+    assert _ffprobe_duration(clip) == 12.5
+    assert _dji_data_stream_tags(clip) == ["djmd"]
+    assert get_video_duration(clip) == 12.5
+    assert metadata_check.run_ffprobe(clip) == PROBE
+    assert calls == ["clip.mp4"]
+
+
+def test_changed_file_is_probed_again(tmp_path, monkeypatch):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"x")
+    calls: list = []
+    monkeypatch.setattr(subprocess, "run", _counting_run(calls))
+    probe_media(clip)
+    st = clip.stat()
+    os.utime(clip, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    probe_media(clip)
+    assert len(calls) == 2
+
+
+def test_unreadable_file_is_none(tmp_path, monkeypatch):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"x")
+    monkeypatch.setattr(
+        subprocess,
+        "run",
+        lambda *a, **k: type("R", (), {"returncode": 1, "stdout": "", "stderr": "bad"})(),
+    )
+    assert probe_media(clip) is None
+    assert get_video_duration(clip) == 0.0
+    assert _dji_data_stream_tags(clip) == []
+
+
+def test_embed_probes_source_once_per_clip(tmp_path, monkeypatch):
+    (tmp_path / "clip.mp4").write_bytes(b"x")
+    (tmp_path / "clip.srt").write_text("1\n00:00:00,000 --> 00:00:01,000\nGPS(1,2,3)")
+    (tmp_path / "clip.m4a").write_bytes(b"a")
+    calls: list = []
+    monkeypatch.setattr(subprocess, "run", _counting_run(calls))
+    monkeypatch.setattr("dji_metadata_embedder.embedder.Progress", _FakeProgress)
+    result = DJIMetadataEmbedder(str(tmp_path), audio_sidecar=True).process_directory()
+    assert result["processed"] == 1
+    # Source (data tags + audio check + validation), sidecar, output.
+    assert sorted(calls) == ["clip.m4a", "clip.mp4", "clip_metadata.tmp.mp4"]
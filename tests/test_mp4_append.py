@@ -0,0 +1,276 @@
+"""In-place subtitle/metadata append for embed --overwrite (utils/mp4_append.py)."""
+
+import shutil
+import struct
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from dji_metadata_embedder.embedder import DJIMetadataEmbedder
+from dji_metadata_embedder.utils.bmff import BmffError, _find, _iter_boxes, read_movie_info
+from dji_metadata_embedder.utils.media_probe import clear_probe_cache
+from dji_metadata_embedder.utils.mp4_append import (
+    append_subtitle_track,
+    can_append_in_place,
+)
+
+
+def box(kind: bytes, payload: bytes = b"") -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def mvhd(duration: int, timescale: int = 1000, next_id: int = 3) -> bytes:
+    body = struct.pack(">IIII", 0, 0, timescale, duration) + b"\0" * 76
+    return box(b"mvhd", b"\0" * 4 + body + struct.pack(">I", next_id))
+
+
+def trak(track_id: int, handler: bytes, codec: bytes) -> bytes:
+    tkhd = box(b"tkhd", b"\0" * 12 + struct.pack(">I", track_id) + b"\0" * 68)
+    hdlr = box(b"hdlr", b"\0" * 8 + handler + b"\0" * 13)
+    stsd = box(b"stsd", b"\0" * 4 + struct.pack(">I", 1) + box(codec, b"\0" * 8))
+    return box(b"trak", tkhd + box(b"mdia", hdlr + box(b"minf", box(b"stbl", stsd))))
+
+
+MDAT = box(b"mdat", bytes(range(256)) * 64)
+MOOV = box(b"moov", mvhd(12_000) + trak(1, b"vide", b"hvc1") + trak(2, b"meta", b"djmd"))
+CLIP = box(b"ftyp", b"isom\0\0\2\0isomiso2mp41") + MDAT + MOOV
+CUES = [(0.0, 1.0, "GPS(1,2,3)"), (2.0, 3.0, "GPS(4,5,6)"), (11.5, 14.0, "late")]
+
+
+def subtitle_samples(data: bytes) -> list[tuple[int, bytes]]:
+    """``(duration_ms, text)`` of the first text track in *data*'s live moov."""
+    moov = next(
+        (s, e) for kind, s, e in _iter_boxes(data, 0, len(data)) if kind == b"moov"
+    )
+    for kind, s, e in _iter_boxes(data, *moov):
+        if kind != b"trak":
+            continue
+        mdia = _find(data, s, e, b"mdia")
+        hdlr = _find(data, *mdia, b"hdlr")
+        if data[hdlr[0] + 8 : hdlr[0] + 12] not in (b"sbtl", b"text"):
+            continue
+        stbl = _find(data, *_find(data, *mdia, b"minf"), b"stbl")
+        stts = _find(data, *stbl, b"stts")
+        stsz = _find(data, *stbl, b"stsz")
+        stco = _find(data, *stbl, b"stco")
+        durations = []
+        (runs,) = struct.unpack_from(">I", data, stts[0] + 4)
+        for i in range(runs):
+            n, d = struct.unpack_from(">II", data, stts[0] + 8 + 8 * i)
+            durations += [d] * n
+        _, count = struct.unpack_from(">II", data, stsz[0] + 4)
+        sizes = struct.unpack_from(f">{count}I", data, stsz[0] + 12)
+        (offset,) = struct.unpack_from(">I", data, stco[0] + 8)
+        texts = []
+        for size in sizes:
+            (length,) = struct.unpack_from(">H", data, offset)
+            texts.append(data[offset + 2 : offset + 2 + length])
+            offset += size
+        return list(zip(durations, texts))
+    return []
+
+
+def test_append_adds_track_and_metadata_without_touching_mdat(tmp_path):
+    clip = tmp_path / "DJI_0001.MP4"
+    clip.write_bytes(CLIP)
+    appended = append_subtitle_track(
+        clip,
+        CUES,
+        location="+59.302335+018.203059/",
+        creation_time=datetime(2024, 1, 1, 12, 0, 0),
+    )
+    data = clip.read_bytes()
+    # Everything up to the old moov is byte-identical; it is now free space.
+    assert data[: appended.moov_offset] == CLIP[: appended.moov_offset]
+    assert data[appended.moov_offset + 4 : appended.moov_offset + 8] == b"free"
+    info = read_movie_info(clip)
+    assert info.duration == 12.0
+    assert info.location == "+59.302335+018.203059/"
+    assert info.creation_time == datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+    assert [(t.kind, t.codec_tag) for t in info.tracks] == [
+        ("video", "hvc1"),
+        ("data", "djmd"),
+        ("subtitle", "tx3g"),
+    ]
+    # Gaps become empty samples; the last cue is clipped at the movie's end.
+    assert subtitle_samples(data) == [
+        (1000, b"GPS(1,2,3)"),
+        (1000, b""),
+        (1000, b"GPS(4,5,6)"),
+        (8500, b""),
+        (500, b"late"),
+    ]
+    assert appended.samples == 5
+
+
+def test_rollback_restores_original_bytes(tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(CLIP)
+    append_subtitle_track(clip, CUES).rollback()
+    assert clip.read_bytes() == CLIP
+
+
+def test_second_append_replaces_earlier_track(tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(CLIP)
+    append_subtitle_track(clip, CUES)
+    append_subtitle_track(clip, [(0.0, 2.0, "again")])
+    kinds = [t.kind for t in read_movie_info(clip).tracks]
+    assert kinds.count("subtitle") == 1
+    assert subtitle_samples(clip.read_bytes()) == [(2000, b"again")]
+
+
+def test_reembedding_reuses_the_earlier_append(tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(CLIP)
+    append_subtitle_track(clip, CUES, location="+59.302335+018.203059/")
+    once = clip.read_bytes()
+    append_subtitle_track(clip, CUES, location="+59.302335+018.203059/")
+    assert clip.read_bytes() == once      # same tail, written over itself
+    appended = append_subtitle_track(clip, [(0.0, 2.0, "again")])
+    assert len(clip.read_bytes()) < len(once)
+    assert subtitle_samples(clip.read_bytes()) == [(2000, b"again")]
+    assert read_movie_info(clip).duration == 12.0
+    appended.rollback()
+    assert clip.read_bytes() == once
+
+
+def test_file_rewritten_since_the_append_is_appended_to(tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(CLIP)
+    append_subtitle_track(clip, CUES)
+    once = clip.read_bytes()
+    # Another tool moved the moov: the samples are no longer the tail.
+    moov_at = once.rindex(b"moov") - 4
+    clip.write_bytes(once[:moov_at] + box(b"free", b"x") + once[moov_at:])
+    append_subtitle_track(clip, [(0.0, 2.0, "again")])
+    data = clip.read_bytes()
+    assert data[:moov_at] == once[:moov_at] and len(data) > len(once)
+    assert subtitle_samples(data) == [(2000, b"again")]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        CLIP + b"junk",  # trailing bytes
+        CLIP + box(b"moof"),  # fragmented
+        CLIP[: -len(MOOV)] + b"\0\0\0\0" + MOOV[4:],  # open-ended last box
+        b"not an mp4 at all",
+    ],
+    ids=["trailing", "fragmented", "open-ended", "not-bmff"],
+)
+def test_unappendable_files_are_left_unchanged(tmp_path, data):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(data)
+    assert not can_append_in_place(clip)
+    with pytest.raises(BmffError):
+        append_subtitle_track(clip, CUES)
+    assert clip.read_bytes() == data
+
+
+class _FakeProgress:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add_task(self, *args, **kwargs):
+        return 0
+
+    def update(self, task, description=None):
+        pass
+
+    def advance(self, task):
+        pass
+
+
+def test_overwrite_embeds_in_place_without_ffmpeg(tmp_path, monkeypatch):
+    clip = tmp_path / "DJI_20240101_120000_0001_D.MP4"
+    clip.write_bytes(CLIP)
+    (tmp_path / "DJI_20240101_120000_0001_D.SRT").write_text(
+        "1\n00:00:00,000 --> 00:00:01,000\n"
+        '<font size="28">[latitude: 59.302335] [longitude: 18.203059] '
+        "[rel_alt: 1.000 abs_alt: 5.0]</font>\n",
+        encoding="utf-8",
+    )
+
+    def no_subprocess(*a, **k):
+        raise AssertionError(f"unexpected subprocess: {a}")
+
+    monkeypatch.setattr(subprocess, "run", no_subprocess)
+    monkeypatch.setattr("dji_metadata_embedder.embedder.Progress", _FakeProgress)
+    clear_probe_cache()
+    result = DJIMetadataEmbedder(str(tmp_path), overwrite=True).process_directory()
+    assert result["processed"] == 1 and result["errors"] == []
+    # The djmd track survives, so there is no data-loss warning.
+    assert not any("LOST" in w for w in result["warnings"])
+    assert not list(tmp_path.glob("*.tmp*"))
+    info = read_movie_info(clip)
+    # Same ©xyz value the ffmpeg path writes.
+    assert info.location == "+59.302335+18.203059/"
+    assert [t.kind for t in info.tracks] == ["video", "data", "subtitle"]
+    assert subtitle_samples(clip.read_bytes())[0][1].startswith(b"[latitude: 59.302335]")
+
+
+# A DJI cue spans several lines; the subtitle track keeps them as lines.
+MULTILINE_SRT = (
+    "1\n00:00:00,000 --> 00:00:01,000\n"
+    '<font size="28">FrameCnt: 1, DiffTime: 33ms\n'
+    "2024-05-01 10:00:00.000\n"
+    "[latitude: 59.302335] [longitude: 18.203059]</font>\n"
+)
+REMUX_TEXT = (
+    b"FrameCnt: 1, DiffTime: 33ms\n2024-05-01 10:00:00.000\n"
+    b"[latitude: 59.302335] [longitude: 18.203059]"
+)
+
+
+def test_in_place_cue_text_matches_the_remux(tmp_path):
+    clip = tmp_path / "DJI_0001.MP4"
+    clip.write_bytes(CLIP)
+    srt = tmp_path / "DJI_0001.SRT"
+    srt.write_text(MULTILINE_SRT, encoding="utf-8")
+    clear_probe_cache()
+    embedder = DJIMetadataEmbedder(str(tmp_path), overwrite=True)
+    assert embedder.append_metadata_in_place(clip, srt, {"first_gps": None})
+    assert subtitle_samples(clip.read_bytes())[0] == (1000, REMUX_TEXT)
+    if shutil.which("ffmpeg"):
+        # What the remux path's SRT -> mov_text conversion writes.
+        remuxed = tmp_path / "remux.mp4"
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-i", str(srt), "-c:s", "mov_text", str(remuxed)],
+            check=True,
+        )
+        texts = [t for _d, t in subtitle_samples(remuxed.read_bytes()) if t]
+        assert texts == [REMUX_TEXT]
+
+
+@pytest.fixture
+def helsinki_time(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset")
+    monkeypatch.setenv("TZ", "Europe/Helsinki")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_filename_time_is_local_like_the_remux(tmp_path, helsinki_time):
+    clip = tmp_path / "DJI_20240101_120000_0001_D.MP4"
+    clip.write_bytes(CLIP)
+    srt = tmp_path / "DJI_20240101_120000_0001_D.SRT"
+    srt.write_text(MULTILINE_SRT, encoding="utf-8")
+    clear_probe_cache()
+    embedder = DJIMetadataEmbedder(str(tmp_path), overwrite=True)
+    assert embedder.append_metadata_in_place(clip, srt, {"first_gps": None})
+    # ffmpeg reads "creation_time=2024-01-01 12:00:00" as local time: UTC+2.
+    assert read_movie_info(clip).creation_time == datetime(
+        2024, 1, 1, 10, tzinfo=timezone.utc
+    )
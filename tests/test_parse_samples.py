@@ -2,6 +2,9 @@ from datetime import datetime
 from pathlib import Path
 
 from dji_metadata_embedder.utilities import (
+    TelemetryFrame,
+    TelemetrySample,
+    parse_telemetry_frame,
     parse_telemetry_samples,
     parse_telemetry_points,
 )
@@ -77,3 +80,31 @@ def test_parse_telemetry_points_is_unchanged_wrapper():
         (34.270373, -84.176160, 302.208, "00:00:00,049"),
         (34.270373, -84.176160, 302.208, "00:00:00,066"),
     ]
+
+
+def test_frame_columns_match_samples():
+    frame = parse_telemetry_frame(CLIP)
+    samples = parse_telemetry_samples(CLIP)
+    assert list(frame) == samples
+    assert list(frame.lat) == [s.lat for s in samples]
+    assert frame.cue_s[1] == 0.016
+    assert frame[-1] == samples[-1]
+
+
+def test_frame_round_trips_missing_values_and_odd_cues():
+    rows = [
+        TelemetrySample(1.0, 2.0, 3.0, "00:00:01,500", None),
+        TelemetrySample(
+            1.5, 2.5, 3.5, "1.5s", datetime(2026, 1, 2, 3, 4, 5, 678000),
+            rel_alt=0.0, focal_len=24.0, gimbal_yaw=-90.0, gimbal_pitch=-45.0,
+        ),
+        TelemetrySample(1.0, 2.0, 3.0, "", None),
+    ]
+    frame = TelemetryFrame.from_samples(rows)
+    assert len(frame) == 3
+    assert list(frame) == rows
+    assert frame[0].rel_alt is None and frame[1].rel_alt == 0.0
+    assert frame.cue_s[0] == 1.5
+    assert frame.cue_s[1] != frame.cue_s[1]  # nan: unparseable cue
+    assert frame.dated_span() == (rows[1].dt, rows[1].dt)
+    assert TelemetryFrame().dated_span() is None
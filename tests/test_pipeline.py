@@ -0,0 +1,216 @@
+"""Staged embed pipeline (utils/pipeline.py) and its per-stage timings."""
+
+import json
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import jsonschema
+import pytest
+from click.testing import CliRunner
+
+from dji_metadata_embedder import cli as cli_mod
+from dji_metadata_embedder.cli import main
+from dji_metadata_embedder.embedder import DJIMetadataEmbedder
+from dji_metadata_embedder.utils.pipeline import Stage, run_pipeline
+
+SRT = "1\n00:00:00,000 --> 00:00:01,000\nGPS(1,2,3)"
+
+
+def test_outputs_keep_input_order_and_stats_add_up():
+    def slow_square(x):
+        time.sleep(0.01 * (5 - x % 5))
+        return x * x
+
+    results, stats = run_pipeline(
+        range(10),
+        [
+            Stage("inc", lambda x: x + 1),
+            Stage("square", slow_square, workers=3, capacity=3),
+            Stage("str", str),
+        ],
+    )
+    assert results == [str((x + 1) ** 2) for x in range(10)]
+    assert [(s.name, s.workers, s.items) for s in stats] == [
+        ("inc", 1, 10),
+        ("square", 3, 10),
+        ("str", 1, 10),
+    ]
+    # The slow stage is the busy one; the last stage mostly waits for it.
+    assert stats[1].busy_s > stats[2].busy_s
+    assert stats[2].wait_s > 0
+
+
+def test_bounded_queues_apply_back_pressure():
+    in_flight = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def start(x):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        return x
+
+    def slow_end(x):
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        return x
+
+    _, stats = run_pipeline(
+        range(12),
+        [Stage("start", start), Stage("end", slow_end, capacity=1)],
+    )
+    # One item being ended, one queued, one held by the blocked producer.
+    assert peak[0] <= 3
+    assert stats[0].blocked_s > 0
+
+
+def test_first_error_stops_the_pipeline():
+    seen = []
+
+    def boom(x):
+        if x == 3:
+            raise ValueError("bad item")
+        seen.append(x)
+        return x
+
+    with pytest.raises(ValueError, match="bad item"):
+        run_pipeline(range(100), [Stage("a", lambda x: x), Stage("b", boom)])
+    assert len(seen) < 100
+
+
+def test_items_left_behind_by_an_abort_are_discarded():
+    produced, handled, discarded = [], [], []
+    lock = threading.Lock()
+
+    def make(x):
+        produced.append(x)
+        return x
+
+    def slow_fail(x):
+        time.sleep(0.05)
+        if x == 1:
+            raise ValueError("bad item")
+        handled.append(x)
+        return x
+
+    def drop(x):
+        with lock:
+            discarded.append(x)
+
+    with pytest.raises(ValueError):
+        run_pipeline(
+            range(20),
+            [
+                Stage("make", make),
+                Stage("use", slow_fail, workers=2, capacity=3, discard=drop),
+            ],
+        )
+    assert 1 not in discarded and not set(handled) & set(discarded)
+    assert sorted(handled + discarded + [1]) == sorted(produced)
+    assert discarded
+
+
+class _FakeProgress:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def add_task(self, *args, **kwargs):
+        return 0
+
+    def update(self, task, description=None):
+        pass
+
+    def advance(self, task):
+        pass
+
+
+def test_embed_reports_stage_timings(tmp_path, monkeypatch):
+    for i in range(1, 4):
+        (tmp_path / f"DJI_{i:04d}.MP4").write_bytes(b"fake")
+        (tmp_path / f"DJI_{i:04d}.SRT").write_text(SRT, encoding="utf-8")
+
+    def run(cmd, *args, **kwargs):
+        if "ffmpeg" in str(cmd[0]).lower():
+            Path(cmd[-1]).write_bytes(b"embedded")
+            return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
+        out = '{"format": {"duration": "10.0"}}'
+        return type("R", (), {"returncode": 0, "stdout": out, "stderr": ""})()
+
+    monkeypatch.setattr(subprocess, "run", run)
+    monkeypatch.setattr("dji_metadata_embedder.embedder.Progress", _FakeProgress)
+    result = DJIMetadataEmbedder(str(tmp_path), jobs=2).process_directory()
+    assert result["processed"] == 3
+    stages = result["stages"]
+    assert list(stages) == ["prepare", "mux", "finish"]
+    assert stages["mux"]["workers"] == 2
+    assert all(s["items"] == 3 for s in stages.values())
+    assert set(stages["finish"]) == {"workers", "items", "busy_s", "wait_s", "blocked_s"}
+
+
+def test_embed_jsonl_summary_carries_stages(tmp_path, monkeypatch):
+    schema = json.loads(
+        (Path(__file__).parent.parent / "docs" / "progress_jsonl.schema.json")
+        .read_text(encoding="utf-8")
+    )
+    stages = {
+        name: {"workers": 1, "items": 1, "busy_s": 0.5, "wait_s": 0.1, "blocked_s": 0.0}
+        for name in ("prepare", "mux", "finish")
+    }
+    canned = {
+        "processed": 1,
+        "total_files": 1,
+        "warnings": [],
+        "errors": [],
+        "output_directory": str(tmp_path),
+        "stages": stages,
+    }
+    monkeypatch.setattr(cli_mod, "check_dependencies", lambda: (True, []))
+    monkeypatch.setattr(
+        cli_mod.DJIMetadataEmbedder,
+        "process_directory",
+        lambda self, use_exiftool=False, on_progress=None: canned,
+    )
+    res = CliRunner().invoke(main, ["embed", str(tmp_path), "--progress", "jsonl"])
+    assert res.exit_code == 0, res.output
+    last = json.loads(res.stdout.splitlines()[-1])
+    jsonschema.validate(last, schema)
+    assert last["summary"]["stages"] == stages
+
+
+def test_embed_abort_after_mux_leaves_no_temp_outputs(tmp_path, monkeypatch):
+    for i in range(1, 6):
+        (tmp_path / f"DJI_{i:04d}.MP4").write_bytes(b"fake")
+        (tmp_path / f"DJI_{i:04d}.SRT").write_text(SRT, encoding="utf-8")
+    out_dir = tmp_path / "out"
+
+    def run(cmd, *args, **kwargs):
+        if "ffmpeg" in str(cmd[0]).lower():
+            Path(cmd[-1]).write_bytes(b"embedded")
+            return type("R", (), {"returncode": 0, "stdout": "", "stderr": ""})()
+        out = '{"format": {"duration": "10.0"}}'
+        return type("R", (), {"returncode": 0, "stdout": out, "stderr": ""})()
+
+    def interrupted_finish(self, job, use_exiftool):
+        # Stop (as Ctrl-C would) once later clips' muxes are waiting.
+        deadline = time.monotonic() + 5
+        while len(list(out_dir.glob("*.tmp*"))) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(subprocess, "run", run)
+    monkeypatch.setattr("dji_metadata_embedder.embedder.Progress", _FakeProgress)
+    monkeypatch.setattr(DJIMetadataEmbedder, "_finish_clip", interrupted_finish)
+    embedder = DJIMetadataEmbedder(str(tmp_path), output_dir=str(out_dir), jobs=2)
+    with pytest.raises(KeyboardInterrupt):
+        embedder.process_directory()
+    assert not list(out_dir.glob("*.tmp*"))
@@ -0,0 +1,191 @@
+import csv
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from dji_metadata_embedder.core.validator import validate_srt_format
+from dji_metadata_embedder.srt_tokenizer import (
+    SrtParseStats,
+    _tokenize_block,
+    iter_srt_blocks,
+    iter_srt_records,
+    read_srt_records,
+)
+from dji_metadata_embedder.telemetry_converter import extract_telemetry_to_csv
+from dji_metadata_embedder.utilities import read_home
+
+SAMPLES = Path(__file__).resolve().parents[1] / "samples"
+
+MINI_BLOCK = (
+    "1\n00:00:00,000 --> 00:00:00,033\n"
+    '<font size="28">FrameCnt: 1, DiffTime: 33ms\n'
+    "2026-05-27 13:10:00.015\n"
+    "[iso: 200] [shutter: 1/6400.0] [fnum: 1.9] [ev: 0] [ct: 5845] "
+    "[color_md: dlog_m] [focal_len: 28.00] [latitude: 53.365080] "
+    "[longitude: 6.460739] [rel_alt: 5.400 abs_alt: -124.744] "
+    "[gb_yaw: -162.8 gb_pitch: -90.0 gb_roll: 0.0] </font>"
+)
+
+P4_BLOCK = (
+    "1\n00:00:00,000 --> 00:00:01,000\n"
+    "F/5.6, SS 400, ISO 100, EV 0, GPS (120.1, 30.2, 12.5M), "
+    "HOME (120.0, 30.1, 10.0m), BAROMETER:0.3M"
+)
+
+
+def test_bracket_block_fields():
+    (rec,) = iter_srt_records(MINI_BLOCK)
+    assert rec.complete and rec.html
+    assert (rec.cue, rec.cue_end) == ("00:00:00,000", "00:00:00,033")
+    assert (rec.lat, rec.lon) == (53.36508, 6.460739)
+    assert (rec.rel_alt, rec.abs_alt) == (5.4, -124.744)
+    assert rec.alt_pair == ("5.400", "-124.744")
+    assert (rec.gimbal_yaw, rec.gimbal_pitch) == (-162.8, -90.0)
+    assert rec.frame_count == 1 and rec.diff_time == "33ms"
+    assert rec.dt == datetime(2026, 5, 27, 13, 10, 0, 15000)
+    assert rec.camera == {
+        "iso": "200",
+        "shutter": "1/6400.0",
+        "fnum": "1.9",
+        "ev": "0",
+        "ct": "5845",
+        "color_md": "dlog_m",
+        "focal_len": "28.00",
+    }
+    assert rec.gps is None and rec.home is None
+    assert rec.family == "html_extended"
+
+
+def test_compact_block_fields():
+    (rec,) = iter_srt_records(P4_BLOCK)
+    assert rec.lat is None and rec.lon is None
+    assert rec.gps == (120.1, 30.2, 12.5)
+    assert rec.home == (120.0, 30.1, 10.0)
+    assert rec.barometer == 0.3
+    assert rec.camera == {"iso": "100", "shutter": "400", "fnum": "5.6", "ev": "0"}
+    assert rec.family == "p4rtk_compact"
+
+
+def test_short_and_malformed_blocks_are_yielded():
+    content = "1\n00:00:00,000 --> 00:00:01,000\n\n2\nnot a cue\n[latitude: 1.0]"
+    first, second = iter_srt_records(content)
+    assert (first.index, first.line_count, first.complete) == (1, 2, False)
+    assert first.cue == "00:00:00,000"
+    assert second.complete and second.cue is None and second.cue_end is None
+    assert second.family is None
+
+
+def test_datetime_after_negative_numbers():
+    content = "1\n00:00:00,000 --> 00:00:01,000\n[rel_alt: -1.0 abs_alt: -2.5] 2024-01-15 14:30:22,123"
+    (rec,) = iter_srt_records(content)
+    assert rec.dt == datetime(2024, 1, 15, 14, 30, 22, 123000)
+
+
+def test_every_sample_tokenizes_to_a_known_family():
+    for srt in sorted(SAMPLES.rglob("*.SRT")):
+        families = {r.family for r in read_srt_records(srt) if r.complete}
+        assert families and None not in families, srt
+
+
+def test_csv_keeps_decimal_fnum(tmp_path):
+    # The CSV export shares the embedder's camera patterns, so literal
+    # decimal apertures are no longer dropped.
+    srt = tmp_path / "clip.SRT"
+    srt.write_text(MINI_BLOCK, encoding="utf-8")
+    out = extract_telemetry_to_csv(srt, tmp_path / "clip.csv")
+    with open(out, newline="", encoding="utf-8") as f:
+        (row,) = csv.DictReader(f)
+    assert row["fnum"] == "1.9"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        " \n\n \n",
+        "\n\n1\na\nb\n\n2\nc\nd\n\n\n",
+        "1\na\nb\n\n\n\n2\nc\nd",
+        "1\na\nb \n\n2\nc\n \n\n\n\n",
+    ],
+    ids=["empty", "whitespace", "padded", "double-gap", "trailing-space"],
+)
+@pytest.mark.parametrize("size", [1, 2, 3, 1000])
+def test_streamed_blocks_match_whole_text_split(text, size):
+    chunks = [text[i : i + size] for i in range(0, len(text), size)]
+    assert list(iter_srt_blocks(chunks)) == text.strip().split("\n\n")
+
+
+def test_read_streams_crlf_and_truncated_final_block(tmp_path):
+    srt = tmp_path / "clip.SRT"
+    # CRLF endings, no trailing blank line, last block cut after its cue.
+    content = MINI_BLOCK + "\n\n2\n00:00:00,033 --> 00:00:00,066"
+    srt.write_bytes(content.replace("\n", "\r\n").encode("utf-8"))
+    first, last = read_srt_records(srt)
+    assert first == next(iter_srt_records(MINI_BLOCK))
+    assert (last.index, last.complete, last.cue) == (2, False, "00:00:00,033")
+
+
+def test_read_home_streams_the_file(tmp_path):
+    srt = tmp_path / "clip.SRT"
+    srt.write_text(MINI_BLOCK + "\n\n" + P4_BLOCK, encoding="utf-8")
+    home = read_home(srt)
+    assert (home.lat, home.lon, home.alt) == (120.0, 30.1, 10.0)
+    srt.write_text(MINI_BLOCK, encoding="utf-8")
+    assert read_home(srt) is None
+
+
+def _full(content):
+    blocks = content.strip().split("\n\n")
+    return [_tokenize_block(i, b) for i, b in enumerate(blocks, start=1)]
+
+
+@pytest.mark.parametrize(
+    "srt", sorted(SAMPLES.rglob("*.SRT")), ids=lambda p: p.parent.name + "/" + p.name
+)
+def test_family_fast_paths_match_the_full_tokenizer(srt):
+    content = srt.read_text(encoding="utf-8")
+    stats = SrtParseStats()
+    assert list(iter_srt_records(content, stats)) == _full(content)
+    assert stats.family is not None and stats.detections == 1
+
+
+def test_fast_path_handles_blocks_after_detection():
+    block = MINI_BLOCK.replace("[ct: 5845] ", "")  # no exposure run
+    content = "\n\n".join([block] * 4)
+    stats = SrtParseStats()
+    assert list(iter_srt_records(content, stats)) == _full(content)
+    assert stats.family == "html_extended"
+    assert stats.blocks == {"full": 1, "html_extended": 3}
+    assert stats.as_dict()["parsers"]["html_extended"]["blocks"] == 3
+
+
+def test_blocks_the_fast_path_cannot_vouch_for_redetect():
+    bracket = MINI_BLOCK.replace("[ct: 5845] ", "")
+    reordered = bracket.replace("[iso: 200] ", "") + " [iso: 200]"
+    with_gps = bracket.replace("</font>", "GPS(1.0,2.0,3.0) </font>")
+    blocks = [bracket, bracket, reordered, reordered, with_gps, reordered]
+    content = "\n\n".join(blocks + [P4_BLOCK, P4_BLOCK])
+    stats = SrtParseStats()
+    records = list(iter_srt_records(content, stats))
+    assert records == _full(content)
+    assert records[4].gps == (1.0, 2.0, 3.0) and records[4].lat == 53.36508
+    assert stats.family == "p4rtk_compact"
+    assert stats.detections == 2
+    # The first block of each token order, the GPS one and the first P4
+    # block went through the full tokenizer; the one-off GPS block does not
+    # cost the reordered layout its fast path.
+    assert stats.blocks == {
+        "full": 4,
+        "html_extended": 3,
+        "p4rtk_compact": 1,
+    }
+
+
+def test_validator_reports_parser_diagnostics():
+    srt = SAMPLES / "mini4pro" / "clip.SRT"
+    parser = validate_srt_format(srt)["statistics"]["parser"]
+    assert parser["family"] == "mini3_4pro"
+    assert sum(p["blocks"] for p in parser["parsers"].values()) == len(
+        list(read_srt_records(srt))
+    )
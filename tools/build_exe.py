@@ -85,10 +85,14 @@ def build_executable() -> str:
     entry_script = Path("_pyinstaller_entry.py")
     entry_script.write_text(
         """
+import multiprocessing
 import sys
 from dji_metadata_embedder.cli import main
 
 if __name__ == '__main__':
+    # flightmap/map --jobs start worker processes, which re-run this script
+    # in a frozen build.
+    multiprocessing.freeze_support()
     main()
 """
     )